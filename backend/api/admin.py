@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.utils import timezone
 from .models import Post, Message, Subdivision, Pin, Facility, Booking, News, Alert, ContactInfo, ContactMessage, ResidentPin, Visitor, House, BlogComment
-from .models import UserProfile, ServiceFee, Bulletin, Maintenance, MaintenanceRequest, CommunityMedia, VisitorRequest
+from .models import UserProfile, ServiceFee, Bulletin, Maintenance, MaintenanceRequest, CommunityMedia, VisitorRequest, AuditLogEntry
 from django.utils.html import format_html
 
 
@@ -372,4 +372,17 @@ class VisitorRequestAdmin(admin.ModelAdmin):
         readonly = list(self.readonly_fields)
         if obj and obj.status != 'pending_admin':
             readonly.extend(['status', 'approved_by', 'approved_at'])
-        return readonly
\ No newline at end of file
+        return readonly
+
+@admin.register(AuditLogEntry)
+class AuditLogEntryAdmin(admin.ModelAdmin):
+    """Read-only view of the activity log index (written by signals)"""
+    list_display = ('history_date', 'model_name', 'object_id', 'history_type', 'history_username')
+    list_filter = ('history_type', 'model_name')
+    search_fields = ('history_username', 'object_id')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
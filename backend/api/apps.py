@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate, pre_migrate
 
 
 # class ApiConfig(AppConfig):
@@ -11,3 +13,11 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         import api.signals
+        from api.utils.postgresql import lift_statement_timeout, restore_statement_timeout
+        from api.utils.query_observers import install_query_observers
+        from api.utils.sqlite import apply_sqlite_pragmas
+
+        connection_created.connect(install_query_observers, dispatch_uid='api.query_observers')
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='api.sqlite_pragmas')
+        pre_migrate.connect(lift_statement_timeout, dispatch_uid='api.lift_statement_timeout')
+        post_migrate.connect(restore_statement_timeout, dispatch_uid='api.restore_statement_timeout')
@@ -0,0 +1,250 @@
+"""
+Async versions of the I/O-bound endpoints, routed instead of the DRF views in
+api.views when settings.ASYNC_IO_VIEWS is on (core/asgi.py turns it on).
+
+While one of these waits on Google, the SMTP server or a visitor's status,
+the worker's event loop goes on serving other requests, where the DRF view
+would hold a whole worker for the duration. URLs, request fields and response
+bodies are those of the views they replace.
+
+DRF has no async views, so these are plain Django views like the event stream
+in api/sse_views.py. All of them are public (AllowAny), so no authentication is
+involved. Database work runs through the async ORM (one short hop to the
+request's sync thread per query). E-mail still goes through Django's blocking
+mail backend, on the default executor so the request's sync thread stays free.
+"""
+import asyncio
+import functools
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.core.mail import send_mail
+from django.http import JsonResponse
+from django.utils.crypto import get_random_string
+
+from . import events, recaptcha
+from .models import ResidentPin, Visitor, VisitorRequest
+from .serializers import VisitorSerializer
+from .views.accounts import password_reset_message, recaptcha_login_response
+from .views.visitor_requests import pin_verification
+
+
+logger = logging.getLogger(__name__)
+
+# Not the request's own (thread-sensitive) thread, which the ORM calls need
+send_mail_async = sync_to_async(send_mail, thread_sensitive=False)
+
+
+def csrf_exempt(view):
+    """django.views.decorators.csrf.csrf_exempt for async views - 4.2's turns them into sync ones"""
+    view.csrf_exempt = True
+    return view
+
+
+def allow_methods(*methods):
+    """@api_view(methods) for a plain async view: other methods get DRF's 405 response"""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                response = JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+                response['Allow'] = ', '.join(methods)
+                return response
+            return await view(request, *args, **kwargs)
+        return csrf_exempt(wrapper)
+    return decorator
+
+
+def request_data(request):
+    """The JSON object or form fields posted, as DRF's request.data; None when the JSON is malformed"""
+    if request.content_type != 'application/json':
+        return request.POST
+    try:
+        data = json.loads(request.body or b'{}')
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_error():
+    return JsonResponse({'detail': 'JSON parse error'}, status=400)
+
+
+# --- accounts ---
+
+@allow_methods('POST')
+async def send_verification_email(request):
+    data = request_data(request)
+    if data is None:
+        return parse_error()
+    email = data.get('email')
+    if not email:
+        return JsonResponse({'error': 'Email required'}, status=400)
+
+    code = get_random_string(6, allowed_chars='0123456789')
+    await cache.aset(email, code, timeout=300)  # valid for 5 minutes
+
+    await send_mail_async(
+        'Your Verification Code',
+        f'Your Happy Homes verification code is: {code}',
+        settings.DEFAULT_FROM_EMAIL,
+        [email],
+        fail_silently=False,
+    )
+    return JsonResponse({'message': 'Verification code sent'})
+
+
+@allow_methods('POST')
+async def send_email(request):
+    data = request_data(request)
+    if data is None:
+        return parse_error()
+    subject = data.get('subject')
+    message = data.get('message')
+    recipient = data.get('recipient')
+
+    if not subject or not message or not recipient:
+        return JsonResponse({"error": "subject, message, and recipient are required"}, status=400)
+
+    try:
+        await send_mail_async(
+            subject=subject,
+            message=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[recipient],
+            fail_silently=False,
+        )
+        return JsonResponse({"success": "Email sent successfully"})
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@allow_methods('POST')
+async def password_reset_request(request):
+    data = request_data(request)
+    if data is None:
+        return parse_error()
+    email = data.get("email")
+    if not email:
+        return JsonResponse({"error": "Email is required."}, status=400)
+
+    try:
+        user = await User.objects.aget(email=email)
+    except User.DoesNotExist:
+        return JsonResponse({"message": "If the email exists, a reset link will be sent."})  # do not reveal
+
+    subject, message = password_reset_message(user)
+    await send_mail_async(subject, message, settings.DEFAULT_FROM_EMAIL, [email])
+    return JsonResponse({"message": "If the email exists, a reset link will be sent."})
+
+
+@csrf_exempt
+async def verify_recaptcha(request):
+    if request.method != 'POST':
+        return JsonResponse({'message': 'Invalid request method'}, status=405)
+    data = request_data(request)
+    if data is None:
+        return parse_error()
+    recaptcha_token = data.get('recaptcha')
+    if not recaptcha_token:
+        return JsonResponse({'message': 'reCAPTCHA token missing'}, status=400)
+
+    return recaptcha_login_response(data, await recaptcha.averify(recaptcha_token))
+
+
+# --- gate ---
+
+@allow_methods('POST')
+async def verify_pin_view(request):
+    """Async twin of api.views.verify_pin_view (guard tablets poll it at the gate)"""
+    data = request_data(request)
+    if data is None:
+        return JsonResponse({'error': 'Invalid request format: JSON parse error'}, status=400)
+    pin = data.get('pin')
+    if not pin:
+        return JsonResponse({'error': 'PIN is required'}, status=400)
+
+    try:
+        visitor_request = await VisitorRequest.objects.select_related('resident', 'visitor_record').aget(one_time_pin=pin)
+    except VisitorRequest.DoesNotExist:
+        return JsonResponse({'valid': False, 'error': 'Invalid PIN - PIN not found'})
+    except Exception as e:
+        logger.error("Error looking up PIN: %s", e, exc_info=True)
+        return JsonResponse({'valid': False, 'error': f'Error looking up PIN: {str(e)}'}, status=500)
+
+    try:
+        return JsonResponse(pin_verification(visitor_request, pin))
+    except Exception as e:
+        logger.error("Error processing PIN verification: %s", e, exc_info=True)
+        return JsonResponse({'valid': False, 'error': f'Error processing PIN verification: {str(e)}'}, status=500)
+
+
+@sync_to_async
+def serialize_visitors(queryset):
+    return VisitorSerializer(queryset, many=True).data
+
+
+def requested_wait(request):
+    """Seconds the client is willing to wait for a change (?wait=), capped; 0 outside ASGI"""
+    if not isinstance(request, ASGIRequest):
+        return 0
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        return 0
+    return max(min(wait, getattr(settings, 'GUEST_STATUS_MAX_WAIT_SECONDS', 25)), 0)
+
+
+async def wait_for_status_change(visitors, current, timeout):
+    """
+    Hold the request until one of the visitors changes status or ``timeout``
+    passes, then return the visitors as they are. Status changes arrive through
+    the event broker, from whichever process saved them.
+    """
+    subscription = events.broker.subscribe({events.visitor_channel(visitor['id']) for visitor in current})
+    try:
+        # Read again now that we are subscribed, so a change in between is not missed
+        latest = await serialize_visitors(visitors.all())
+        if latest != current:
+            return latest
+        try:
+            await subscription.get(timeout=timeout)
+        except asyncio.TimeoutError:
+            return latest
+    finally:
+        subscription.close()
+    return await serialize_visitors(visitors.all())
+
+
+@allow_methods('GET')
+async def guest_visitor_status(request):
+    """
+    GET /api/visitor/guest-status/?name=&gmail=&pin=
+
+    With ?wait=<seconds> the answer is held back while a visitor is still
+    pending, until the resident decides or the time is up - one long poll
+    instead of a poll every few seconds.
+    """
+    name = request.GET.get('name')
+    gmail = request.GET.get('gmail')
+    pin = request.GET.get('pin')
+
+    if not name or not gmail or not pin:
+        return JsonResponse({"error": "Missing name, gmail, or resident PIN"}, status=400)
+
+    try:
+        resident = await ResidentPin.objects.aget(pin=pin)
+    except ResidentPin.DoesNotExist:
+        return JsonResponse({"error": "Invalid resident PIN"}, status=404)
+
+    visitors = Visitor.objects.filter(resident=resident, name=name, gmail=gmail)
+    data = await serialize_visitors(visitors.all())
+    wait = requested_wait(request)
+    if wait and any(visitor['status'] == 'pending' for visitor in data):
+        data = await wait_for_status_change(visitors, data, wait)
+    return JsonResponse(data, safe=False)
@@ -0,0 +1,267 @@
+"""
+Closed-loop HTTP load generator for the hot paths of the API.
+
+Each worker thread keeps its own ``requests.Session`` (keep-alive) and, until
+the duration is up, picks a scenario by weight and times it. Scenarios mirror
+what real clients do most often:
+
+    verify_pin  guard tablet checking a visitor's one-time PIN
+    map         subdivision map polling (lots + map pins)
+    listings    guest browsing the house listings and opening one
+    booking     resident booking a facility slot
+    guest_status  guest's phone polling the status of a gate check-in
+    recaptcha   login form reCAPTCHA check (needs a SiteverifyStub, below)
+
+``manage.py benchmark`` gathers the fixture data (from a ``seed_scale``
+dataset), runs the load and writes the report as JSON; compare two reports to
+see what a change did to throughput and latency. ``manage.py benchmark_modes``
+runs the same load against the app served through WSGI and through ASGI.
+"""
+import datetime
+import json
+import math
+import random
+import secrets
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+
+SCENARIOS = ('verify_pin', 'map', 'listings', 'booking', 'guest_status', 'recaptcha')
+DEFAULT_MIX = {'verify_pin': 4, 'map': 3, 'listings': 2, 'booking': 1}
+PERCENTILES = (50, 90, 95, 99)
+REQUEST_TIMEOUT = 30
+
+
+class Fixtures:
+    """Data the scenarios draw from; every list must be non-empty for the scenarios in the mix"""
+
+    def __init__(self, pins=(), house_ids=(), facility_ids=(), tokens=(), resident_pins=()):
+        self.pins = list(pins)
+        self.house_ids = list(house_ids)
+        self.facility_ids = list(facility_ids)
+        self.tokens = list(tokens)
+        self.resident_pins = list(resident_pins)
+
+
+class Worker:
+    def __init__(self, index, concurrency, base_url, fixtures, seed):
+        self.index = index
+        self.concurrency = concurrency
+        self.base_url = base_url.rstrip('/')
+        self.fixtures = fixtures
+        self.rng = random.Random(seed + index)
+        self.session = requests.Session()
+        self.token = fixtures.tokens[index % len(fixtures.tokens)] if fixtures.tokens else None
+        self.booking_sequence = 0
+
+    def request(self, method, path, **kwargs):
+        return self.session.request(method, self.base_url + path, timeout=REQUEST_TIMEOUT, **kwargs)
+
+    # --- scenarios: each returns the responses it produced ---
+
+    def verify_pin(self):
+        return [self.request('POST', '/api/visitor-requests/verify_pin/', json={'pin': self.rng.choice(self.fixtures.pins)})]
+
+    def map(self):
+        return [self.request('GET', '/api/subdivisions/real_time_data/'), self.request('GET', '/api/pins/')]
+
+    def listings(self):
+        return [
+            self.request('GET', '/api/guest/houses/'),
+            self.request('GET', f'/api/guest/houses/{self.rng.choice(self.fixtures.house_ids)}/'),
+        ]
+
+    def booking(self):
+        # Hourly slots years ahead, interleaved between workers, so bookings
+        # collide neither with the seeded ones nor with each other (overlaps
+        # are rejected with 400)
+        slot = self.booking_sequence * self.concurrency + self.index
+        self.booking_sequence += 1
+        day = datetime.date.today() + datetime.timedelta(days=1000 + slot // 14)
+        hour = 7 + slot % 14
+        return [self.request('POST', '/api/bookings/', headers={'Authorization': f'Bearer {self.token}'}, json={
+            'facility_id': self.rng.choice(self.fixtures.facility_ids),
+            'date': day.isoformat(),
+            'start_time': f'{hour:02d}:00',
+            'end_time': f'{hour + 1:02d}:00',
+        })]
+
+    def guest_status(self):
+        return [self.request('GET', '/api/visitor/guest-status/', params={
+            'name': 'Benchmark Guest', 'gmail': 'guest@example.com', 'pin': self.rng.choice(self.fixtures.resident_pins),
+        })]
+
+    def recaptcha(self):
+        # The demo credentials verify_recaptcha accepts once the token checks out;
+        # a fresh token each time (in every run): a token is good for one verification
+        return [self.request('POST', '/api/verify-captcha/', json={
+            'recaptcha': f'benchmark-{secrets.token_hex(8)}', 'username': 'test', 'password': 'password',
+        })]
+
+
+class SiteverifyStub:
+    """
+    Local stand-in for Google's reCAPTCHA siteverify endpoint: every token is
+    valid, answered after ``latency`` seconds. Point the server's
+    RECAPTCHA_VERIFY_URL at ``url`` to load the recaptcha scenario without
+    calling Google.
+
+    ``latency``, ``status`` and ``success`` can be changed while it runs, to
+    play a slow, failing or rejecting upstream; ``calls`` counts the requests
+    it received.
+    """
+
+    def __init__(self, latency=0.1, host='127.0.0.1', port=0, status=200, success=True):
+        self.latency = latency
+        self.status = status
+        self.success = success
+        self.calls = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with stub._lock:
+                    stub.calls += 1
+                time.sleep(stub.latency)
+                body = json.dumps(
+                    {'success': True, 'hostname': 'benchmark'} if stub.success
+                    else {'success': False, 'error-codes': ['invalid-input-response']}
+                ).encode()
+                self.send_response(stub.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # the client timed out and hung up
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 256
+
+        self.server = Server((host, port), Handler)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/siteverify'
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, statuses, errors, elapsed):
+    latencies = sorted(latencies)
+    summary = {
+        'requests': len(latencies),
+        'errors': errors,
+        # Connection failures are keyed by exception name next to the status codes
+        'status_codes': dict(sorted((str(code), count) for code, count in statuses.items())),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0,
+        'latency_ms': None,
+    }
+    if latencies:
+        summary['latency_ms'] = {
+            'min': round(latencies[0], 2),
+            'mean': round(sum(latencies) / len(latencies), 2),
+            **{f'p{pct}': round(percentile(latencies, pct), 2) for pct in PERCENTILES},
+            'max': round(latencies[-1], 2),
+        }
+    return summary
+
+
+def run(base_url, fixtures, concurrency=10, duration=30.0, mix=None, warmup=0.0, seed=42):
+    """
+    Drive ``concurrency`` workers for ``duration`` seconds (after ``warmup``
+    seconds whose requests are not recorded) and return the report dict.
+    Latency is recorded per scenario: a scenario making two requests counts
+    as one operation, and fails when either response is not 2xx.
+    """
+    mix = dict(mix or DEFAULT_MIX)
+    scenarios = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in scenarios]
+    lock = threading.Lock()
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    errors = Counter()
+    start = time.monotonic()
+    record_from = start + warmup
+    stop_at = record_from + duration
+
+    def work(worker):
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                return
+            name = worker.rng.choices(scenarios, weights)[0]
+            began = time.perf_counter()
+            try:
+                responses = getattr(worker, name)()
+                codes = [response.status_code for response in responses]
+                failed = any(code >= 400 for code in codes)
+            except requests.RequestException as e:
+                codes = [type(e).__name__]
+                failed = True
+            elapsed_ms = (time.perf_counter() - began) * 1000
+            if now < record_from:
+                continue
+            with lock:
+                latencies[name].append(elapsed_ms)
+                statuses[name].update(codes)
+                if failed:
+                    errors[name] += 1
+
+    workers = [Worker(index, concurrency, base_url, fixtures, seed) for index in range(concurrency)]
+    threads = [threading.Thread(target=work, args=(worker,), daemon=True) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - record_from
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_statuses = sum(statuses.values(), Counter())
+    return {
+        'scenarios': {
+            name: summarize(latencies[name], statuses[name], errors[name], elapsed) for name in scenarios
+        },
+        'total': summarize(all_latencies, all_statuses, sum(errors.values()), elapsed),
+        'elapsed_s': round(elapsed, 2),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,216 @@
+"""
+Small cache helpers: versioned keys, single-flight get_or_compute() and
+response caching for public read endpoints.
+
+Each namespace has a version counter stored in the cache. Cached entries
+embed the current version in their key, so bumping the version (from a
+model signal or after a bulk write) invalidates every entry of the namespace
+at once without having to know or delete the individual keys.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+VERSION_KEY = 'cache-version:{namespace}'
+
+
+def _next_version(current=None):
+    # Versions are microsecond timestamps rather than 1, 2, 3... so a counter
+    # that was evicted never comes back with a value an old entry or ETag used,
+    # and the version doubles as a "last changed" time (api/conditional.py)
+    version = time.time_ns() // 1000
+    if isinstance(current, int) and version <= current:
+        version = current + 1
+    return version
+
+
+def get_version(namespace):
+    key = VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        # add() so concurrent first readers agree on the same starting version
+        cache.add(key, _next_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(namespaces):
+    """{namespace: version} with a single cache round trip in the common case"""
+    keys = {VERSION_KEY.format(namespace=namespace): namespace for namespace in namespaces}
+    found = cache.get_many(list(keys))
+    versions = {keys[key]: value for key, value in found.items()}
+    for namespace in namespaces:
+        if namespace not in versions:
+            versions[namespace] = get_version(namespace)
+    return versions
+
+
+def bump_version(namespace):
+    """Invalidate everything cached under ``namespace``."""
+    key = VERSION_KEY.format(namespace=namespace)
+    version = _next_version(cache.get(key))
+    cache.set(key, version, timeout=None)
+    return version
+
+
+def versioned_key(namespace, *parts):
+    suffix = ':'.join(str(part) for part in parts)
+    return f"{namespace}:v{get_version(namespace)}:{suffix}"
+
+
+def get_or_compute(key, compute, ttl, stale_ttl=None, lock_timeout=30):
+    """
+    Cached value of ``compute()`` with single-flight refresh.
+
+    Entries are stored with a soft expiry (``ttl``) and kept for
+    ``stale_ttl`` (default 10 x ttl). When an entry goes soft-stale only the
+    request that wins ``cache.add(<lock>)`` recomputes it; everyone else keeps
+    serving the stale value instead of stampeding the database. Callers only
+    compute synchronously when there is nothing cached at all.
+    """
+    now = time.time()
+    entry = cache.get(key)
+    if entry is not None and entry['expires_at'] > now:
+        return entry['value']
+
+    lock_key = f"{key}:lock"
+    locked = cache.add(lock_key, 1, timeout=lock_timeout)
+    if entry is not None and not locked:
+        # Someone else is refreshing - the stale value is good enough meanwhile
+        return entry['value']
+    if entry is None:
+        # Cold cache: concurrent cold readers wait briefly for the lock holder's
+        # result instead of all running the computation
+        if not locked:
+            deadline = now + min(lock_timeout, 5)
+            while time.time() < deadline:
+                time.sleep(0.05)
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry['value']
+            # Lock holder is slow or gone - compute ourselves rather than fail
+
+    try:
+        value = compute()
+        cache.set(
+            key,
+            {'value': value, 'expires_at': time.time() + ttl},
+            timeout=stale_ttl if stale_ttl is not None else ttl * 10,
+        )
+        return value
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+# ====================================================
+# Public response caching
+# ====================================================
+
+PUBLIC_FAQ = 'public-faq'
+PUBLIC_NEWS = 'public-news'
+PUBLIC_ALERTS = 'public-alerts'
+PUBLIC_BULLETINS = 'public-bulletins'
+PUBLIC_CONTACT_INFO = 'public-contact-info'
+PUBLIC_POSTS = 'public-posts'
+PUBLIC_HOUSES = 'public-houses'
+
+# Models whose save/delete invalidates each cached endpoint. Users are listed
+# where the serializer embeds the username (bulletin author, house owner).
+PUBLIC_RESPONSE_DEPENDENCIES = {
+    PUBLIC_FAQ: ('api.FAQ',),
+    PUBLIC_NEWS: ('api.News',),
+    PUBLIC_ALERTS: ('api.Alert',),
+    PUBLIC_BULLETINS: ('api.Bulletin', 'auth.User'),
+    PUBLIC_CONTACT_INFO: ('api.ContactInfo',),
+    PUBLIC_POSTS: ('api.Post',),
+    PUBLIC_HOUSES: ('api.House', 'api.HouseImage', 'auth.User'),
+}
+
+def cached_response(request, namespace, build, timeout=None):
+    """
+    Serve ``build()``'s response from the cache for non-staff GET requests.
+
+    Keyed on the absolute URL (serializers embed absolute media URLs) under
+    the namespace version, so a bump_version(namespace) from the model
+    signals in api/signals.py drops every cached page of the endpoint. Staff
+    see unpublished/inactive rows and always bypass the cache.
+    """
+    from rest_framework.response import Response
+
+    user = getattr(request, 'user', None)
+    if request.method != 'GET' or (user is not None and user.is_staff):
+        return build()
+
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    key = versioned_key(namespace, url_hash)
+    cached = cache.get(key)
+    if cached is not None:
+        response = Response(cached)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    response = build()
+    if response.status_code == 200:
+        if timeout is None:
+            timeout = getattr(settings, 'PUBLIC_RESPONSE_CACHE_SECONDS', 600)
+        cache.set(key, response.data, timeout)
+        response['X-Cache'] = 'MISS'
+    return response
+
+
+class PublicResponseCacheMixin:
+    """Caches list/retrieve of a viewset under ``response_cache_namespace``"""
+
+    response_cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request, self.response_cache_namespace, lambda: super(PublicResponseCacheMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request, self.response_cache_namespace, lambda: super(PublicResponseCacheMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+
+# ====================================================
+# Model versions (conditional GET, see api/conditional.py)
+# ====================================================
+
+# Models whose save/delete bumps a per-model version counter (api/signals.py).
+# Every model a ConditionalGetMixin view depends on has to be listed here.
+VERSIONED_MODELS = (
+    'api.Alert',
+    'api.BlogComment',
+    'api.Booking',
+    'api.Bulletin',
+    'api.BulletinComment',
+    'api.FAQ',
+    'api.Facility',
+    'api.House',
+    'api.HouseImage',
+    'api.News',
+    'api.Post',
+    'api.UserProfile',
+    'api.VisitorRequest',
+    'auth.User',
+)
+_VERSIONED_LABELS = frozenset(label.lower() for label in VERSIONED_MODELS)
+
+
+def model_namespace(model_or_label):
+    label = model_or_label if isinstance(model_or_label, str) else model_or_label._meta.label
+    label = label.lower()
+    if label not in _VERSIONED_LABELS:
+        from django.core.exceptions import ImproperlyConfigured
+        raise ImproperlyConfigured(f"{label} is not in api.caching.VERSIONED_MODELS")
+    return f"model:{label}"
+
+
+def is_versioned_model(model):
+    return model._meta.label_lower in _VERSIONED_LABELS
@@ -0,0 +1,123 @@
+"""
+Conditional GET (ETag / Last-Modified) for read-mostly list and detail views.
+
+The validator is computed before serialization from:
+  * the version counters of the models behind the response (bumped by
+    api/signals.py on every save/delete, see caching.VERSIONED_MODELS), and
+  * one aggregate over the filtered queryset (row count + newest
+    updated_at/created_at), which also catches inserts and deletes that skip
+    signals, and edits to models with an updated_at field.
+Unchanged collections get a 304 without serializing or sending the body.
+"""
+import hashlib
+import time
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .caching import get_versions, model_namespace
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified to ``list`` and ``retrieve``.
+
+    ``conditional_models`` lists related models whose changes alter the
+    serialized output (e.g. the author's username); the queryset's own model
+    is always included.
+    """
+
+    conditional_models = ()
+    # Seconds; set when the output also depends on the clock (e.g. PIN validity windows)
+    conditional_time_bucket = None
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            lambda: self.conditional_object_queryset(kwargs),
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+    def conditional_object_queryset(self, kwargs):
+        """The filtered queryset narrowed to the object addressed by the URL"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        if lookup_url_kwarg in kwargs:
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def conditional_response(self, request, queryset, build):
+        """``queryset`` may be a callable so lookup errors surface here"""
+        if request.method != 'GET':
+            return build()
+
+        try:
+            if callable(queryset):
+                queryset = queryset()
+            etag, last_modified = self.get_validators(request, queryset)
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup value - let the view produce its usual 404
+            return build()
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            self._add_validator_headers(not_modified, etag, last_modified)
+            return not_modified
+
+        response = build()
+        if response.status_code == 200:
+            self._add_validator_headers(response, etag, last_modified)
+        return response
+
+    def get_validators(self, request, queryset):
+        """(ETag, Last-Modified timestamp) for ``queryset`` as seen by this request"""
+        namespaces = {model_namespace(queryset.model)}
+        namespaces.update(model_namespace(label) for label in self.conditional_models)
+        response_namespace = getattr(self, 'response_cache_namespace', None)
+        cached_body = response_namespace and not request.user.is_staff
+        if response_namespace:
+            namespaces.add(response_namespace)
+        versions = get_versions(sorted(namespaces))
+
+        parts = [request.get_full_path(), str(request.user.pk or 'anonymous')]
+        parts += [f"{namespace}={versions[namespace]}" for namespace in sorted(versions)]
+        if self.conditional_time_bucket:
+            parts.append(f"t={int(time.time() // self.conditional_time_bucket)}")
+        # Version timestamps are in microseconds (caching._next_version)
+        last_modified = max(versions.values()) / 1_000_000
+
+        if not cached_body:
+            # A body served from the public response cache is only as fresh as
+            # its namespace version, so the aggregate would add nothing there
+            stats = queryset.order_by().aggregate(rows=Count('pk'), **self._timestamp_aggregate(queryset.model))
+            parts.append(f"rows={stats['rows']}")
+            newest = stats.get('newest')
+            if newest is not None:
+                parts.append(f"newest={newest.isoformat()}")
+                last_modified = max(last_modified, newest.timestamp())
+
+        etag = 'W/"%s"' % hashlib.md5('|'.join(parts).encode()).hexdigest()
+        return etag, int(last_modified)
+
+    @staticmethod
+    def _timestamp_aggregate(model):
+        field_names = {field.name for field in model._meta.concrete_fields}
+        for name in ('updated_at', 'created_at'):
+            if name in field_names:
+                return {'newest': Max(name)}
+        return {}
+
+    @staticmethod
+    def _add_validator_headers(response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Always revalidate; per-user lists must not be stored by shared caches
+        patch_cache_control(response, private=True, no_cache=True)
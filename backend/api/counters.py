@@ -0,0 +1,204 @@
+"""
+Buffered view counters kept in a shared cache and flushed in bulk.
+
+Increments go to ``cache.incr`` instead of the database, so a popular item
+costs no write per hit. Every ``COUNTER_FLUSH_SECONDS`` the request that wins
+the flush lock (or ``manage.py flush_counters``) folds the pending deltas into
+the table with one ``UPDATE ... SET field = field + CASE ...`` statement.
+QuerySet.update() skips save(), so no history rows are written and
+``updated_at`` is left alone.
+
+The shared buffer needs a cache every worker shares, with an atomic incr():
+the "counters" cache alias, which settings only define when Redis is
+configured. Without it each worker holds its own deltas in memory and writes
+them the same way once COUNTER_FLUSH_SECONDS have passed, once
+COUNTER_MAX_PENDING items are held, or when the process exits. A worker that
+is killed outright loses what it held, at most one interval of views.
+
+The first delta for an item since the last flush appends its pk to a dirty
+list in the cache (numbered slots claimed with add()), so a flush reads only
+the items that changed instead of every row in the table.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils.connection import ConnectionProxy
+
+from .models import CommunityMedia
+
+
+logger = logging.getLogger(__name__)
+
+cache = ConnectionProxy(caches, 'counters')
+
+# How long a dirty-list slot given up by a flush stays claimed, so a writer
+# that numbered it just before the flush moves on to a new slot
+ABANDONED_SLOT_SECONDS = 3600
+
+
+class BufferedCounter:
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = tuple(fields)
+        self.prefix = f"counter:{model._meta.label_lower}"
+        # Without the shared cache: {(field, pk): delta} held by this process
+        self._local = {}
+        self._local_lock = threading.Lock()
+        self._local_flushed_at = time.monotonic()
+        atexit.register(self._flush_at_exit)
+
+    @property
+    def buffered(self):
+        return 'counters' in settings.CACHES
+
+    def _key(self, field, pk):
+        return f"{self.prefix}:{field}:{pk}"
+
+    def _slot_key(self, number):
+        return f"{self.prefix}:dirty:{number}"
+
+    def _incr(self, key, amount=1):
+        cache.add(key, 0, timeout=None)
+        try:
+            return cache.incr(key, amount)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, amount, timeout=None)
+            return amount
+
+    def increment(self, pk, field, amount=1):
+        """Buffer ``amount`` (may be negative) and flush if the interval elapsed"""
+        if not self.buffered:
+            with self._local_lock:
+                self._local[field, pk] = self._local.get((field, pk), 0) + amount
+                held = len(self._local)
+            if held >= getattr(settings, 'COUNTER_MAX_PENDING', 1000):
+                self.flush()
+            else:
+                self.flush_if_due()
+            return
+        if self._incr(self._key(field, pk), amount) == amount:
+            # First delta since the last flush
+            self._mark_dirty(pk)
+        self.flush_if_due()
+
+    def _mark_dirty(self, pk):
+        while not cache.add(self._slot_key(self._incr(f"{self.prefix}:dirty-last")), pk, timeout=None):
+            # A flush gave up on this slot before we filled it
+            pass
+
+    def _dirty_pks(self):
+        """(pks in the dirty list, slot keys read, last slot number read)"""
+        first = (cache.get(f"{self.prefix}:dirty-flushed") or 0) + 1
+        last = cache.get(f"{self.prefix}:dirty-last") or 0
+        if last < first - 1:
+            # The slot counter was evicted and restarted
+            first = 1
+        keys = [self._slot_key(number) for number in range(first, last + 1)]
+        slots = cache.get_many(keys)
+        for key in keys:
+            if key not in slots and not cache.add(key, None, timeout=ABANDONED_SLOT_SECONDS):
+                # Filled between get_many() and add()
+                slots[key] = cache.get(key)
+        return {pk for pk in slots.values() if pk is not None}, [key for key in keys if slots.get(key) is not None], last
+
+    def pending(self, pks, field):
+        """{pk: buffered delta} for ``field``; missing pks have no pending delta"""
+        if not self.buffered:
+            with self._local_lock:
+                deltas = {pk: self._local.get((field, pk)) for pk in pks}
+            return {pk: delta for pk, delta in deltas.items() if delta}
+        keys = {self._key(field, pk): pk for pk in pks}
+        return {keys[key]: value for key, value in cache.get_many(list(keys)).items() if value}
+
+    def current(self, obj, field):
+        """Database value plus the buffered delta"""
+        return getattr(obj, field) + self.pending([obj.pk], field).get(obj.pk, 0)
+
+    def flush_if_due(self):
+        interval = getattr(settings, 'COUNTER_FLUSH_SECONDS', 60)
+        if not self.buffered:
+            if time.monotonic() - self._local_flushed_at >= interval:
+                self.flush()
+            return
+        if cache.add(f"{self.prefix}:flush-due", 1, timeout=interval):
+            self.flush()
+
+    def flush(self):
+        """Write all buffered deltas. Returns the number of rows updated."""
+        if not self.buffered:
+            return self._flush_local()
+        lock_key = f"{self.prefix}:flush-lock"
+        if not cache.add(lock_key, 1, timeout=60):
+            return 0
+        try:
+            pks, slot_keys, last = self._dirty_pks()
+            deltas = {field: self.pending(pks, field) for field in self.fields}
+            updated = self._write(deltas)
+
+            # Subtract what was written rather than resetting to zero, so
+            # increments that landed during the flush are kept for next time
+            carried = set()
+            for field, pending in deltas.items():
+                for pk, delta in pending.items():
+                    try:
+                        if cache.decr(self._key(field, pk), delta):
+                            carried.add(pk)
+                    except ValueError:
+                        pass
+            cache.set(f"{self.prefix}:dirty-flushed", last, timeout=None)
+            cache.delete_many(slot_keys)
+            for pk in carried:
+                self._mark_dirty(pk)
+            return updated
+        finally:
+            cache.delete(lock_key)
+
+    def _flush_local(self):
+        with self._local_lock:
+            held, self._local = self._local, {}
+            self._local_flushed_at = time.monotonic()
+        deltas = {}
+        for (field, pk), delta in held.items():
+            if delta:
+                deltas.setdefault(field, {})[pk] = delta
+        try:
+            return self._write(deltas)
+        except DatabaseError:
+            # Held again for the next flush
+            with self._local_lock:
+                for key, delta in held.items():
+                    self._local[key] = self._local.get(key, 0) + delta
+            raise
+
+    def _flush_at_exit(self):
+        if self.buffered or not self._local:
+            return
+        try:
+            self._flush_local()
+        except DatabaseError:
+            logger.exception("Lost %d buffered %s counter increments", len(self._local), self.prefix)
+
+    def _write(self, deltas):
+        """One UPDATE for {field: {pk: delta}}. Returns the number of rows updated."""
+        dirty = set().union(*(pending.keys() for pending in deltas.values()))
+        if not dirty:
+            return 0
+        updates = {}
+        for field, pending in deltas.items():
+            if pending:
+                updates[field] = F(field) + Case(
+                    *[When(pk=pk, then=Value(delta)) for pk, delta in pending.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+        return self.model.objects.filter(pk__in=dirty).update(**updates)
+
+
+media_counters = BufferedCounter(CommunityMedia, ('views_count',))
@@ -0,0 +1,249 @@
+"""
+Event broker for the Server-Sent Events (SSE) push channel.
+
+Model signals publish small JSON events here and the SSE view in
+``api/sse_views.py`` streams them to connected clients, so residents, guests
+and the map no longer have to poll ``pending_visitors``,
+``guest_visitor_status`` or ``real_time_data`` on a timer.
+
+Channels:
+    public              -> pin changes and alerts (everyone)
+    user:<user_id>      -> per-user events (visitors, bookings, service fees)
+    visitor:<visitor_id> -> status of a single guest visitor entry
+
+Events are stored in the PushEvent table, so an event published by any
+process (another gunicorn worker, a WSGI worker, a management command)
+reaches the subscribers of every process, and its id - the SSE event id - is
+ordered across all of them for Last-Event-ID replay. A process with
+subscribers runs one relay thread that polls the table every
+SSE_POLL_SECONDS (at once for events published by the process itself) and
+hands new events to each subscriber's event loop with
+``call_soon_threadsafe``.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_CHANNEL = 'public'
+
+# Bounded per-subscriber backlog; a slow client drops its oldest events
+# instead of growing memory without limit.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Most events sent for a Last-Event-ID replay after a reconnect.
+REPLAY_LIMIT = 500
+
+# Events fetched per poll of the relay.
+RELAY_BATCH_SIZE = 500
+
+# An id skipped by the relay may belong to a transaction that commits a
+# moment after a later one; it is looked for again for this long.
+GAP_SECONDS = 5
+MAX_GAP_IDS = 100
+
+# Seconds between deletions of expired events, per process.
+PRUNE_INTERVAL_SECONDS = 60
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def visitor_channel(visitor_id):
+    return f'visitor:{visitor_id}'
+
+
+def serialize_event(event):
+    return {
+        'id': event.id,
+        'channel': event.channel,
+        'type': event.type,
+        'data': event.data,
+        'timestamp': event.created_at.isoformat(),
+    }
+
+
+class Subscription:
+    """A single connected client listening on one or more channels."""
+
+    def __init__(self, broker, channels, loop):
+        self.broker = broker
+        self.channels = frozenset(channels)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _deliver(self, event):
+        # Runs on the subscriber's event loop
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+    def push(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # Event loop already closed - client is gone
+            self.broker.unsubscribe(self)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Stores published events and relays stored ones to this process's subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._relay_thread = None
+        self._wake = threading.Event()
+        # Relay position: highest id relayed, and skipped ids still looked for
+        self._relay_since = None
+        self._last_id = None
+        self._gaps = {}
+        self._pruned_at = 0.0
+
+    def subscribe(self, channels, loop=None):
+        subscription = Subscription(self, channels, loop or asyncio.get_running_loop())
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+            if self._relay_thread is None:
+                self._start_relay()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def publish(self, channel, event_type, data=None):
+        """Store an event for the subscribers of every process (sync code only)"""
+        from .models import PushEvent
+
+        event = PushEvent.objects.create(channel=channel, type=event_type, data=data or {})
+        self._wake.set()
+        self._prune()
+        return serialize_event(event)
+
+    def replay(self, channels, last_event_id):
+        """Events on ``channels`` newer than ``last_event_id`` still stored (sync code only)"""
+        from .models import PushEvent
+
+        events = PushEvent.objects.filter(id__gt=last_event_id, channel__in=channels).order_by('id')
+        return [serialize_event(event) for event in events[:REPLAY_LIMIT]]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def relay(self):
+        """Hand the events stored since the last call to this process's subscribers"""
+        from .models import PushEvent
+
+        if self._last_id is None:
+            # Subscribers only get what is published once the relay runs; replay covers the rest
+            earlier = PushEvent.objects.filter(created_at__lt=self._relay_since)
+            self._last_id = earlier.aggregate(last=Max('id'))['last'] or 0
+        now = time.monotonic()
+        self._gaps = {event_id: seen for event_id, seen in self._gaps.items() if now - seen < GAP_SECONDS}
+        found = Q(id__gt=self._last_id)
+        if self._gaps:
+            found |= Q(id__in=list(self._gaps))
+        for event in PushEvent.objects.filter(found).order_by('id')[:RELAY_BATCH_SIZE]:
+            if self._gaps.pop(event.id, None) is None:
+                if event.id - self._last_id - 1 <= MAX_GAP_IDS:
+                    self._gaps.update((skipped, now) for skipped in range(self._last_id + 1, event.id))
+                self._last_id = max(self._last_id, event.id)
+            with self._lock:
+                targets = list(self._subscribers.get(event.channel, ()))
+            if targets:
+                payload = serialize_event(event)
+                for subscription in targets:
+                    subscription.push(payload)
+
+    def _start_relay(self):
+        # Lock held
+        self._reset_relay()
+        self._relay_thread = threading.Thread(target=self._run_relay, name='sse-relay', daemon=True)
+        self._relay_thread.start()
+
+    def _reset_relay(self):
+        # Relay the events published from now on (allowing for clock skew between processes)
+        self._relay_since = timezone.now() - timedelta(seconds=1)
+        self._last_id = None
+        self._gaps = {}
+
+    def _run_relay(self):
+        poll = getattr(settings, 'SSE_POLL_SECONDS', 1)
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        self._relay_thread = None
+                        return
+                close_old_connections()
+                try:
+                    self.relay()
+                except DatabaseError:
+                    logger.exception('Relaying push events failed')
+                self._wake.wait(poll)
+                self._wake.clear()
+        finally:
+            connection.close()
+
+    def _prune(self):
+        from .models import PushEvent
+
+        now = time.monotonic()
+        if now - self._pruned_at < PRUNE_INTERVAL_SECONDS:
+            return
+        self._pruned_at = now
+        retention = getattr(settings, 'SSE_EVENT_RETENTION_SECONDS', 3600)
+        PushEvent.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=retention)).delete()
+
+
+broker = EventBroker()
+
+
+def publish(channel, event_type, data=None):
+    """
+    Publish an event once the current transaction commits, so clients never
+    see an event for a row they cannot read yet.
+    """
+    def store():
+        try:
+            broker.publish(channel, event_type, data)
+        except DatabaseError:
+            # The change itself is committed; a lost notification must not fail the request
+            logger.exception('Publishing %s on %s failed', event_type, channel)
+
+    transaction.on_commit(store)
+
+
+def format_sse(event):
+    """Serialize an event in the text/event-stream wire format."""
+    payload = json.dumps(event['data'], default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
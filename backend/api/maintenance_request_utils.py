@@ -1,9 +1,14 @@
+import logging
+
 from django.core.mail import send_mail, EmailMessage
 from django.conf import settings
 from django.utils.html import strip_tags
 from django.contrib.auth.models import User
 
 
+logger = logging.getLogger(__name__)
+
+
 def send_maintenance_request_created_emails(maintenance_request):
     """
     Send emails when maintenance request is created:
@@ -81,7 +86,7 @@ def send_maintenance_request_created_emails(maintenance_request):
                 html_message=homeowner_html,
                 fail_silently=True,
             )
-            print(f"[SUCCESS] Confirmation email sent to homeowner: {homeowner_email}")
+            logger.info("Confirmation email sent to homeowner: %s", homeowner_email)
         
         # 2. Email to All Admins - New Request Notification
         admin_users = User.objects.filter(is_staff=True, is_active=True)
@@ -156,14 +161,12 @@ def send_maintenance_request_created_emails(maintenance_request):
                 html_message=admin_html,
                 fail_silently=True,
             )
-            print(f"[SUCCESS] Notification email sent to {len(admin_emails)} admin(s)")
+            logger.info("Notification email sent to %s admin(s)", len(admin_emails))
         
         return True
         
     except Exception as e:
-        print(f"[ERROR] Failed to send creation emails: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Failed to send creation emails: %s", e, exc_info=True)
         return False
 
 
@@ -177,7 +180,7 @@ def send_maintenance_request_approval_email(maintenance_request):
         homeowner_name = homeowner.first_name or homeowner.username
         
         if not homeowner_email:
-            print(f"[WARNING] No email found for homeowner {homeowner.username}")
+            logger.warning("No email found for homeowner %s", homeowner.username)
             return False
         
         subject = f"✅ Maintenance Request Approved - {maintenance_request.get_maintenance_type_display()}"
@@ -246,13 +249,11 @@ def send_maintenance_request_approval_email(maintenance_request):
             fail_silently=True,
         )
         
-        print(f"[SUCCESS] Approval email sent to homeowner: {homeowner_email}")
+        logger.info("Approval email sent to homeowner: %s", homeowner_email)
         return True
         
     except Exception as e:
-        print(f"[ERROR] Failed to send approval email: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Failed to send approval email: %s", e, exc_info=True)
         return False
 
 
@@ -266,7 +267,7 @@ def send_maintenance_request_decline_email(maintenance_request):
         homeowner_name = homeowner.first_name or homeowner.username
         
         if not homeowner_email:
-            print(f"[WARNING] No email found for homeowner {homeowner.username}")
+            logger.warning("No email found for homeowner %s", homeowner.username)
             return False
         
         subject = f"❌ Maintenance Request Declined - {maintenance_request.get_maintenance_type_display()}"
@@ -332,12 +333,10 @@ def send_maintenance_request_decline_email(maintenance_request):
             fail_silently=True,
         )
         
-        print(f"[SUCCESS] Decline email sent to homeowner: {homeowner_email}")
+        logger.info("Decline email sent to homeowner: %s", homeowner_email)
         return True
         
     except Exception as e:
-        print(f"[ERROR] Failed to send decline email: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Failed to send decline email: %s", e, exc_info=True)
         return False
 
@@ -0,0 +1,152 @@
+import json
+import os
+
+import requests
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api import benchmark
+from api.management.commands.seed_scale import DEFAULT_PASSWORD
+from api.models import Facility, House, Pin, ResidentPin, VisitorRequest
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-tests a running server (e.g. `manage.py runserver`) on the hot paths - gate PIN verification, '
+        'map polling, listing browse and booking creation - and writes throughput and latency percentiles '
+        'to a JSON report. Fixture data comes from this database, which must be the one the server uses; '
+        'seed it first with `manage.py seed_scale`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to load')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds of recorded load')
+        parser.add_argument('--warmup', type=float, default=5, help='Seconds of unrecorded load first')
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent clients')
+        parser.add_argument(
+            '--mix', default=','.join(f'{name}={weight}' for name, weight in benchmark.DEFAULT_MIX.items()),
+            help=(
+                'Scenario weights, e.g. "verify_pin=4,map=3,listings=2,booking=1" (0 disables one); also '
+                'guest_status, and recaptcha when the server\'s RECAPTCHA_VERIFY_URL points at a stub'
+            ),
+        )
+        parser.add_argument('--prefix', default='load', help='Username prefix of the seed_scale residents')
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Password of the seed_scale residents')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed of the clients')
+        parser.add_argument('--output', help='Report path (default: benchmarks/benchmark-<timestamp>.json)')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['duration'] <= 0:
+            raise CommandError('--concurrency and --duration must be positive')
+        mix = self.parse_mix(options['mix'])
+        base_url = options['base_url'].rstrip('/')
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Benchmarking {base_url}")
+        self.stdout.write("=" * 70)
+
+        fixtures = self.load_fixtures(base_url, mix, options)
+        self.stdout.write(
+            f"Load: {options['concurrency']} clients, {options['warmup']:g}s warm-up + {options['duration']:g}s, "
+            f"mix {mix}"
+        )
+        started_at = timezone.now()
+        report = benchmark.run(
+            base_url, fixtures, concurrency=options['concurrency'], duration=options['duration'], mix=mix,
+            warmup=options['warmup'], seed=options['seed'],
+        )
+        report['meta'] = {
+            'started_at': started_at.isoformat(),
+            'git_revision': benchmark.git_revision(),
+            'base_url': base_url,
+            'concurrency': options['concurrency'],
+            'duration_s': options['duration'],
+            'warmup_s': options['warmup'],
+            'mix': mix,
+            'dataset': {
+                'residents': User.objects.filter(username__startswith=options['prefix']).count(),
+                'houses': House.objects.count(),
+                'visitor_requests': VisitorRequest.objects.count(),
+                'pins': Pin.objects.count(),
+            },
+        }
+
+        output = options['output'] or os.path.join(
+            'benchmarks', f"benchmark-{started_at.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+
+        self.print_summary(report)
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Report written to {output}"))
+        self.stdout.write("=" * 70)
+
+    def parse_mix(self, value):
+        mix = {}
+        for part in filter(None, (part.strip() for part in value.split(','))):
+            name, _, weight = part.partition('=')
+            if name not in benchmark.SCENARIOS:
+                raise CommandError(f"Unknown scenario '{name}' (choose from {', '.join(benchmark.SCENARIOS)})")
+            try:
+                mix[name] = float(weight) if weight else 1.0
+            except ValueError:
+                raise CommandError(f"Invalid weight for '{name}': {weight}")
+        if not any(weight > 0 for weight in mix.values()):
+            raise CommandError('--mix must enable at least one scenario')
+        return mix
+
+    def load_fixtures(self, base_url, mix, options):
+        today = timezone.localdate()
+        fixtures = benchmark.Fixtures(
+            pins=VisitorRequest.objects.filter(
+                status='approved', one_time_pin__isnull=False, visit_date__lte=today,
+            ).values_list('one_time_pin', flat=True)[:5000],
+            house_ids=House.objects.values_list('pk', flat=True)[:5000],
+            facility_ids=Facility.objects.values_list('pk', flat=True),
+            resident_pins=ResidentPin.objects.exclude(pin=None).values_list('pin', flat=True)[:5000],
+        )
+        if mix.get('verify_pin') and not fixtures.pins:
+            raise CommandError('No approved visitor requests with a one-time PIN - run seed_scale first')
+        if mix.get('listings') and not fixtures.house_ids:
+            raise CommandError('No houses - run seed_scale first')
+        if mix.get('guest_status') and not fixtures.resident_pins:
+            raise CommandError('No resident PINs - run seed_scale first')
+        if mix.get('booking'):
+            if not fixtures.facility_ids:
+                raise CommandError('No facilities - run seed_scale first')
+            fixtures.tokens = self.log_in(base_url, options)
+        return fixtures
+
+    def log_in(self, base_url, options):
+        """One JWT access token per client, for distinct seeded residents"""
+        usernames = list(
+            User.objects.filter(username__startswith=options['prefix'], is_staff=False)
+            .order_by('username').values_list('username', flat=True)[:options['concurrency']]
+        )
+        if not usernames:
+            raise CommandError(f"No residents named '{options['prefix']}*' - run seed_scale first")
+        tokens = []
+        with requests.Session() as session:
+            for username in usernames:
+                try:
+                    response = session.post(f"{base_url}/api/token/", json={
+                        'username': username, 'password': options['password'],
+                    }, timeout=benchmark.REQUEST_TIMEOUT)
+                except requests.RequestException as e:
+                    raise CommandError(f"Cannot reach {base_url}: {e}")
+                if response.status_code != 200:
+                    raise CommandError(f"Login as {username} failed ({response.status_code}): {response.text[:200]}")
+                tokens.append(response.json()['access'])
+        return tokens
+
+    def print_summary(self, report):
+        self.stdout.write(f"\n{'scenario':<14}{'ops':>8}{'errors':>8}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        rows = list(report['scenarios'].items()) + [('total', report['total'])]
+        for name, summary in rows:
+            latency = summary['latency_ms'] or {}
+            self.stdout.write(
+                f"{name:<14}{summary['requests']:>8}{summary['errors']:>8}{summary['throughput_rps']:>10}"
+                f"{latency.get('p50', '-'):>10}{latency.get('p95', '-'):>10}{latency.get('p99', '-'):>10}"
+            )
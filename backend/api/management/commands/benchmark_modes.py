@@ -0,0 +1,167 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import requests
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from api import benchmark
+from api.management.commands.benchmark import Command as BenchmarkCommand
+
+
+MODES = ('wsgi', 'asgi')
+DEFAULT_MODES_MIX = 'recaptcha=1,verify_pin=1,guest_status=1'
+STARTUP_TIMEOUT = 60
+
+
+class Command(BenchmarkCommand):
+    help = (
+        'Serves the app with gunicorn in each SERVER_MODE (gunicorn.conf.py) - WSGI on sync workers, ASGI on '
+        'uvicorn workers - at the same worker count, runs the same load against each and compares '
+        'requests/sec and latency. The recaptcha scenario is answered by a local siteverify stub with '
+        'a fixed delay, standing in for a slow upstream. Seed the database with `manage.py seed_scale` first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers per mode (default 2)')
+        parser.add_argument('--modes', default=','.join(MODES), help='Modes to run, in order (default "wsgi,asgi")')
+        parser.add_argument('--port', type=int, default=8765, help='Port the server under test listens on')
+        parser.add_argument(
+            '--upstream-latency-ms', type=float, default=100,
+            help='Delay of the siteverify stub behind the recaptcha scenario (default 100)',
+        )
+        parser.add_argument('--duration', type=float, default=20, help='Seconds of recorded load per mode')
+        parser.add_argument('--warmup', type=float, default=3, help='Seconds of unrecorded load first')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients')
+        parser.add_argument(
+            '--mix', default=DEFAULT_MODES_MIX,
+            help=f'Scenario weights (default "{DEFAULT_MODES_MIX}"); booking is not supported here',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed of the clients')
+        parser.add_argument('--output', help='Report path (default: benchmarks/modes-<timestamp>.json)')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['duration'] <= 0 or options['workers'] < 1:
+            raise CommandError('--concurrency, --duration and --workers must be positive')
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown or not modes:
+            raise CommandError(f"--modes must name some of {', '.join(MODES)}")
+        mix = self.parse_mix(options['mix'])
+        if mix.get('booking'):
+            # Every run would book the same slots; all but the first would get 400s
+            raise CommandError('booking writes collide between the runs; leave it out of --mix')
+        base_url = f"http://127.0.0.1:{options['port']}"
+        fixtures = self.load_fixtures(base_url, mix, options)
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(
+            f"WSGI vs ASGI: {options['workers']} workers, {options['concurrency']} clients, "
+            f"{options['warmup']:g}s warm-up + {options['duration']:g}s per mode, mix {mix}"
+        )
+        self.stdout.write("=" * 70)
+
+        started_at = timezone.now()
+        output = options['output'] or os.path.join(
+            'benchmarks', f"modes-{started_at.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+        stub = benchmark.SiteverifyStub(latency=options['upstream_latency_ms'] / 1000).start()
+        reports = {}
+        try:
+            for mode in modes:
+                log_path = f"{os.path.splitext(output)[0]}-{mode}.log"
+                self.stdout.write(f"\n[{mode}] starting gunicorn (log: {log_path})")
+                with open(log_path, 'w') as log:
+                    server = self.start_server(mode, options, stub.url, log)
+                    try:
+                        self.wait_until_ready(server, base_url)
+                        self.stdout.write(f"[{mode}] running load...")
+                        reports[mode] = benchmark.run(
+                            base_url, fixtures, concurrency=options['concurrency'], duration=options['duration'],
+                            mix=mix, warmup=options['warmup'], seed=options['seed'],
+                        )
+                    finally:
+                        self.stop_server(server)
+                self.print_summary(reports[mode])
+        finally:
+            stub.stop()
+
+        report = {
+            'modes': reports,
+            'meta': {
+                'started_at': started_at.isoformat(),
+                'git_revision': benchmark.git_revision(),
+                'workers': options['workers'],
+                'concurrency': options['concurrency'],
+                'duration_s': options['duration'],
+                'warmup_s': options['warmup'],
+                'upstream_latency_ms': options['upstream_latency_ms'],
+                'mix': mix,
+            },
+        }
+        with open(output, 'w') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+
+        self.print_comparison(reports)
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Report written to {output}"))
+        self.stdout.write("=" * 70)
+
+    def start_server(self, mode, options, siteverify_url, log):
+        env = dict(
+            os.environ,
+            SERVER_MODE=mode,
+            RECAPTCHA_VERIFY_URL=siteverify_url,
+            DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),
+        )
+        return subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn',
+                '--config', os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'),
+                '--bind', f"127.0.0.1:{options['port']}",
+                '--workers', str(options['workers']),
+            ],
+            cwd=settings.BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+
+    def wait_until_ready(self, server, base_url):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {server.returncode} - see its log")
+            try:
+                requests.get(f"{base_url}/api/", timeout=5)
+                return
+            except requests.RequestException:
+                time.sleep(0.5)
+        raise CommandError(f"gunicorn did not answer on {base_url} within {STARTUP_TIMEOUT}s")
+
+    def stop_server(self, server):
+        if server.poll() is None:
+            server.send_signal(signal.SIGTERM)
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+    def print_comparison(self, reports):
+        if len(reports) < 2:
+            return
+        (first, first_report), (second, second_report) = list(reports.items())[:2]
+        self.stdout.write(f"\n{'ops/s':<14}{first:>10}{second:>10}{'ratio':>9}   p95 ms {first} / {second}")
+        names = list(first_report['scenarios']) + ['total']
+        for name in names:
+            a = first_report['total'] if name == 'total' else first_report['scenarios'][name]
+            b = second_report['total'] if name == 'total' else second_report['scenarios'][name]
+            ratio = f"{b['throughput_rps'] / a['throughput_rps']:.2f}x" if a['throughput_rps'] else '-'
+            p95 = [(summary['latency_ms'] or {}).get('p95', '-') for summary in (a, b)]
+            self.stdout.write(
+                f"{name:<14}{a['throughput_rps']:>10}{b['throughput_rps']:>10}{ratio:>9}   {p95[0]} / {p95[1]}"
+            )
@@ -0,0 +1,239 @@
+import datetime
+import json
+import queue
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection, connections, transaction
+from django.utils import timezone
+
+from api import benchmark
+from api.management.commands.benchmark_modes import Command as BenchmarkModesCommand
+from api.models import Booking, Facility, House, VisitorRequest
+
+
+PROFILES = ('default', 'tuned')
+
+
+# --- operations: what the app's requests do to the database most often ---
+
+def read_pin(rng, fixtures):
+    VisitorRequest.objects.select_related('resident').filter(one_time_pin=rng.choice(fixtures['pins'])).first()
+
+
+def read_bookings(rng, fixtures):
+    list(
+        Booking.objects.select_related('facility')
+        .filter(user_id=rng.choice(fixtures['user_ids'])).order_by('-date', '-start_time')[:50]
+    )
+
+
+def read_listings(rng, fixtures):
+    list(House.objects.order_by('-id')[:20])
+
+
+def write_booking(rng, fixtures):
+    # A new row from a request: the booking, its history row and its audit log entry
+    hour = rng.randint(7, 20)
+    Booking.objects.create(
+        user_id=rng.choice(fixtures['user_ids']), facility_id=rng.choice(fixtures['facility_ids']),
+        date=datetime.date.today() + datetime.timedelta(days=rng.randint(1000, 5000)),
+        start_time=datetime.time(hour), end_time=datetime.time(hour + 1),
+    )
+
+
+def write_history(rng, fixtures):
+    # A tracked row edited by a request: the row, its history row and its audit log entry
+    booking = Booking.objects.get(pk=rng.choice(fixtures['booking_ids']))
+    booking.status = rng.choice(('pending', 'approved'))
+    with transaction.atomic():
+        booking.save()
+
+
+def tuned_pragmas():
+    return {**settings.SQLITE_PRAGMAS, **settings.SQLITE_WAL_PRAGMAS}
+
+
+READS = (read_pin, read_bookings, read_listings)
+WRITES = (write_booking, write_history)
+
+
+def work(path, tuned, fixtures, write_ratio, record_from, stop_at, seed, results):
+    """One worker process: mixed operations against the copy at ``path`` until ``stop_at``"""
+    settings.SQLITE_TUNING = tuned
+    # The copies are throwaway, so the tuned profile always includes WAL
+    settings.SQLITE_PRAGMAS = tuned_pragmas()
+    connection.settings_dict['NAME'] = path
+    connection.close()
+    rng = random.Random(seed)
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    errors = Counter()
+    while True:
+        now = time.monotonic()
+        if now >= stop_at:
+            break
+        operation = rng.choice(WRITES if rng.random() < write_ratio else READS)
+        began = time.perf_counter()
+        try:
+            operation(rng, fixtures)
+            status = 'ok'
+        except DatabaseError as e:
+            status = 'locked' if 'locked' in str(e) else type(e).__name__
+        elapsed_ms = (time.perf_counter() - began) * 1000
+        if now < record_from:
+            continue
+        latencies[operation.__name__].append(elapsed_ms)
+        statuses[operation.__name__][status] += 1
+        if status != 'ok':
+            errors[operation.__name__] += 1
+    connection.close()
+    results.put((dict(latencies), {name: dict(counts) for name, counts in statuses.items()}, dict(errors)))
+
+
+class Command(BenchmarkModesCommand):
+    help = (
+        'Runs mixed database reads and writes (PIN lookups, booking lists, listings; new and edited '
+        'bookings, with their history rows) from several processes, as gunicorn workers would, against '
+        'copies of the SQLite database - once with SQLite defaults and once with the SQLITE_PRAGMAS '
+        'profile - and compares throughput, latency and "database is locked" errors. Seed the database '
+        'with `manage.py seed_scale` first; the database itself is not modified.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4, help='Worker processes (default 4)')
+        parser.add_argument('--write-ratio', type=float, default=0.2, help='Share of writes (default 0.2)')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds of recorded load per profile')
+        parser.add_argument('--warmup', type=float, default=2, help='Seconds of unrecorded load first')
+        parser.add_argument('--profiles', default=','.join(PROFILES), help='Profiles to run, in order')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed of the workers')
+        parser.add_argument('--output', help='Report path (default: benchmarks/sqlite-<timestamp>.json)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The default database is not SQLite')
+        if options['processes'] < 1 or options['duration'] <= 0 or not 0 <= options['write_ratio'] <= 1:
+            raise CommandError('--processes and --duration must be positive and --write-ratio within 0..1')
+        profiles = [profile.strip() for profile in options['profiles'].split(',') if profile.strip()]
+        if not profiles or set(profiles) - set(PROFILES):
+            raise CommandError(f"--profiles must name some of {', '.join(PROFILES)}")
+        fixtures = self.load_fixtures()
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(
+            f"SQLite defaults vs SQLITE_PRAGMAS: {options['processes']} processes, "
+            f"{options['write_ratio']:.0%} writes, {options['warmup']:g}s warm-up + {options['duration']:g}s per profile"
+        )
+        self.stdout.write("=" * 70)
+
+        started_at = timezone.now()
+        output = options['output'] or os.path.join(
+            'benchmarks', f"sqlite-{started_at.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+        reports = {}
+        with tempfile.TemporaryDirectory(prefix='benchmark-sqlite-') as directory:
+            for profile in profiles:
+                path = self.copy_database(os.path.join(directory, f'{profile}.sqlite3'), profile)
+                self.stdout.write(f"\n[{profile}] running load...")
+                reports[profile] = self.run_profile(path, profile == 'tuned', fixtures, options)
+                self.print_summary(reports[profile])
+
+        report = {
+            'profiles': reports,
+            'meta': {
+                'started_at': started_at.isoformat(),
+                'git_revision': benchmark.git_revision(),
+                'processes': options['processes'],
+                'write_ratio': options['write_ratio'],
+                'duration_s': options['duration'],
+                'warmup_s': options['warmup'],
+                'pragmas': tuned_pragmas(),
+                'sqlite_version': sqlite3.sqlite_version,
+            },
+        }
+        with open(output, 'w') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+
+        self.print_comparison(reports)
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Report written to {output}"))
+        self.stdout.write("=" * 70)
+
+    def load_fixtures(self):
+        fixtures = {
+            'pins': list(VisitorRequest.objects.exclude(one_time_pin=None).values_list('one_time_pin', flat=True)[:1000]),
+            'user_ids': list(Booking.objects.values_list('user_id', flat=True).distinct()[:1000]),
+            'booking_ids': list(Booking.objects.values_list('pk', flat=True)[:1000]),
+            'facility_ids': list(Facility.objects.values_list('pk', flat=True)),
+        }
+        missing = [name for name, values in fixtures.items() if not values]
+        if missing:
+            raise CommandError(f"No {', '.join(missing)} in the database - run `manage.py seed_scale` first")
+        return fixtures
+
+    def copy_database(self, path, profile):
+        """A consistent copy of the database, in rollback-journal mode for the default profile"""
+        source = sqlite3.connect(settings.DATABASES['default']['NAME'])
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target)
+            target.execute(f"PRAGMA journal_mode = {'wal' if profile == 'tuned' else 'delete'}")
+        finally:
+            target.close()
+            source.close()
+        return path
+
+    def run_profile(self, path, tuned, fixtures, options):
+        # Forked workers must not share the parent's connection
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        record_from = time.monotonic() + options['warmup']
+        stop_at = record_from + options['duration']
+        workers = [
+            context.Process(target=work, args=(
+                path, tuned, fixtures, options['write_ratio'], record_from, stop_at, options['seed'] + index, results,
+            ))
+            for index in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        collected = []
+        while len(collected) < len(workers):
+            try:
+                collected.append(results.get(timeout=1))
+            except queue.Empty:
+                if any(worker.exitcode for worker in workers):
+                    for worker in workers:
+                        worker.terminate()
+                    raise CommandError('A worker process failed - see its traceback above')
+        for worker in workers:
+            worker.join()
+
+        elapsed = stop_at - record_from
+        latencies, statuses, errors = defaultdict(list), defaultdict(Counter), Counter()
+        for worker_latencies, worker_statuses, worker_errors in collected:
+            for name, values in worker_latencies.items():
+                latencies[name].extend(values)
+            for name, counts in worker_statuses.items():
+                statuses[name].update(counts)
+            errors.update(worker_errors)
+        names = [operation.__name__ for operation in READS + WRITES]
+        return {
+            'scenarios': {
+                name: benchmark.summarize(latencies[name], statuses[name], errors[name], elapsed) for name in names
+            },
+            'total': benchmark.summarize(
+                [value for values in latencies.values() for value in values],
+                sum(statuses.values(), Counter()), sum(errors.values()), elapsed,
+            ),
+            'elapsed_s': round(elapsed, 2),
+        }
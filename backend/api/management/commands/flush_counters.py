@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.counters import media_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes buffered CommunityMedia view increments to the database. "
+        "Only applies when the Redis \"counters\" cache is configured (otherwise each worker "
+        "holds and writes its own); requests already flush every COUNTER_FLUSH_SECONDS, so run "
+        "this before a deploy or from a scheduler."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write("=" * 70)
+        self.stdout.write("Flushing buffered counters")
+        self.stdout.write("=" * 70)
+
+        updated = media_counters.flush()
+
+        if updated == 0:
+            self.stdout.write(self.style.SUCCESS("\n✓ No pending counter increments"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\n✓ Updated counters on {updated} media item(s)"))
+        self.stdout.write("=" * 70)
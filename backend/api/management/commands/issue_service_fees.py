@@ -0,0 +1,72 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from api.service_fee_utils import AMOUNT_RULES, issue_monthly_service_fees, send_service_fee_notifications
+
+
+class Command(BaseCommand):
+    help = 'Issues the monthly service fee to every verified homeowner (skips homeowners already billed for the month)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', required=True, help='Billing month: 1-12 or name, e.g. January')
+        parser.add_argument('--year', type=int, required=True, help='Billing year, e.g. 2025')
+        parser.add_argument('--due-date', required=True, help='Due date (YYYY-MM-DD)')
+        parser.add_argument('--amount', help='Fee amount (required for the flat rule, fallback for previous)')
+        parser.add_argument('--rule', choices=AMOUNT_RULES, default='flat', help='flat: same amount for everyone; previous: reuse each homeowner\'s last amount')
+        parser.add_argument('--overrides', help='JSON object of {homeowner_id: amount}')
+        parser.add_argument('--notes', help='Notes stored on every issued fee')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk insert')
+        parser.add_argument('--no-notify', action='store_true', help='Do not email homeowners')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be issued')
+
+    def handle(self, *args, **options):
+        due_date = parse_date(options['due_date'])
+        if due_date is None:
+            raise CommandError('--due-date must be YYYY-MM-DD')
+        if options['rule'] == 'flat' and not options['amount']:
+            raise CommandError('--amount is required for the flat rule')
+        try:
+            overrides = json.loads(options['overrides']) if options['overrides'] else None
+        except json.JSONDecodeError as e:
+            raise CommandError(f'--overrides is not valid JSON: {e}')
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Issuing service fees for {options['month']} {options['year']}" + (" (dry run)" if options['dry_run'] else ""))
+        self.stdout.write("=" * 70)
+
+        started = time.monotonic()
+        try:
+            result = issue_monthly_service_fees(
+                month=options['month'],
+                year=options['year'],
+                due_date=due_date,
+                amount=options['amount'],
+                amount_rule=options['rule'],
+                overrides=overrides,
+                notes=options['notes'],
+                batch_size=max(options['batch_size'], 1),
+                dry_run=options['dry_run'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(f"Eligible homeowners: {result['eligible']}")
+        self.stdout.write(f"Already billed (skipped): {result['skipped']}")
+        if result['without_amount']:
+            self.stdout.write(self.style.WARNING(f"Fees without an amount: {result['without_amount']}"))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"\n✓ {result['would_create']} fee(s) would be issued"))
+            self.stdout.write("=" * 70)
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Issued {len(result['created'])} fee(s) in {elapsed:.2f}s"))
+        if result['created'] and not options['no_notify']:
+            # Sent inline: a background thread would die with the command process
+            sent = send_service_fee_notifications(result['created'])
+            self.stdout.write(f"Notification emails sent: {sent}")
+        self.stdout.write("=" * 70)
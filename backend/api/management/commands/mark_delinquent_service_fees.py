@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.models import ServiceFee
+
+
+class Command(BaseCommand):
+    help = (
+        "Marks unpaid service fees past their due date as 'delayed'. "
+        "Run once a day from a scheduler (cron / Render cron job); the API already "
+        "reports overdue fees as delayed through the effective_status annotation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many fees would be marked')
+
+    def handle(self, *args, **options):
+        self.stdout.write("=" * 70)
+        self.stdout.write("Marking overdue service fees as delayed")
+        self.stdout.write("=" * 70)
+
+        today = timezone.localdate()
+        overdue = ServiceFee.objects.overdue(today)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"\n✓ {overdue.count()} fee(s) would be marked as delayed"))
+            self.stdout.write("=" * 70)
+            return
+
+        # Single UPDATE statement; like the previous in-request update this does
+        # not create HistoricalServiceFee rows
+        updated = overdue.update(status='delayed', updated_at=timezone.now())
+
+        if updated == 0:
+            self.stdout.write(self.style.SUCCESS("\n✓ No overdue service fees"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\n✓ Marked {updated} service fee(s) as delayed"))
+        self.stdout.write("=" * 70)
@@ -0,0 +1,248 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, Max, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from api.models import AuditLogEntry
+
+
+DEFAULT_POLICY = {
+    'max_age_days': None,
+    'max_records_per_object': None,
+    'collapse_duplicates': True,
+    'collapse_fields': [],
+}
+
+
+def get_policy(model_name):
+    """Merge the 'default' policy with the per-model override from settings."""
+    configured = getattr(settings, 'HISTORY_RETENTION', {})
+    policy = dict(DEFAULT_POLICY)
+    policy.update(configured.get('default', {}))
+    policy.update(configured.get(model_name, {}))
+    return policy
+
+
+def tracked_models(only=None):
+    """api models that have a simple_history manager, optionally filtered by name."""
+    result = []
+    for model in apps.get_app_config('api').get_models():
+        if not hasattr(model, 'history') or model.__name__.startswith('Historical'):
+            continue
+        if only and model.__name__ not in only:
+            continue
+        result.append(model)
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        'Applies the HISTORY_RETENTION policy to the simple_history tables: prunes old '
+        'records, caps records per object and collapses duplicate updates. Pruned rows are '
+        'archived to gzip NDJSON first. Use --restore to load an archive back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models', help='Only process this model (repeatable), e.g. --model CommunityMedia')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be pruned without deleting anything')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows archived and deleted per transaction')
+        parser.add_argument('--archive-dir', default=None, help='Directory for archives (default: settings.HISTORY_ARCHIVE_DIR)')
+        parser.add_argument('--no-archive', action='store_true', help='Delete pruned rows without writing an archive')
+        parser.add_argument('--restore', metavar='ARCHIVE', help='Restore history rows from a .ndjson.gz archive and exit')
+
+    def handle(self, *args, **options):
+        self.chunk_size = max(options['chunk_size'], 1)
+
+        if options['restore']:
+            self.restore(options['restore'])
+            return
+
+        self.stdout.write("=" * 70)
+        self.stdout.write("Applying history retention policy" + (" (dry run)" if options['dry_run'] else ""))
+        self.stdout.write("=" * 70)
+
+        archive_dir = options['archive_dir'] or getattr(settings, 'HISTORY_ARCHIVE_DIR', 'history_archive')
+        total_pruned = 0
+        for model in tracked_models(options['models']):
+            policy = get_policy(model.__name__)
+            history_model = model.history.model
+            doomed = self.collect_prunable(model, history_model, policy)
+            if not doomed:
+                continue
+
+            self.stdout.write(f"{model.__name__}: {len(doomed)} record(s) to prune")
+            if options['dry_run']:
+                total_pruned += len(doomed)
+                continue
+
+            archive_path = None
+            if not options['no_archive']:
+                os.makedirs(archive_dir, exist_ok=True)
+                stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+                archive_path = os.path.join(archive_dir, f"{model.__name__}-{stamp}.ndjson.gz")
+            total_pruned += self.archive_and_delete(model, history_model, sorted(doomed), archive_path)
+            if archive_path:
+                self.stdout.write(f"  archived to {archive_path}")
+
+        if total_pruned == 0:
+            self.stdout.write(self.style.SUCCESS("\n✓ Nothing to prune"))
+        elif options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"\n✓ {total_pruned} record(s) would be pruned"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\n✓ Pruned {total_pruned} history record(s)"))
+        self.stdout.write("=" * 70)
+
+    # --- Policy evaluation ---
+
+    def collect_prunable(self, model, history_model, policy):
+        pk_name = model._meta.pk.attname
+        doomed = set()
+
+        max_age_days = policy.get('max_age_days')
+        if max_age_days:
+            cutoff = timezone.now() - timedelta(days=max_age_days)
+            # Never drop the newest record of an object, however old it is
+            latest_ids = history_model.objects.values(pk_name).annotate(latest=Max('history_id')).values('latest')
+            doomed.update(
+                history_model.objects
+                .filter(history_date__lt=cutoff)
+                .exclude(history_id__in=latest_ids)
+                .values_list('history_id', flat=True)
+            )
+
+        max_records = policy.get('max_records_per_object')
+        if max_records:
+            ranked = history_model.objects.annotate(
+                position=Window(RowNumber(), partition_by=[F(pk_name)], order_by=F('history_id').desc())
+            )
+            doomed.update(ranked.filter(position__gt=max_records).values_list('history_id', flat=True))
+
+        if policy.get('collapse_duplicates') or policy.get('collapse_fields'):
+            doomed.update(self.collapsible_updates(model, history_model, policy.get('collapse_fields') or []))
+        return doomed
+
+    def collapsible_updates(self, model, history_model, collapse_fields):
+        """
+        Updates ('~') that changed nothing but ``collapse_fields`` compared with
+        the previous record and are followed by another update of the same
+        object. The following row carries the same state forward, so no
+        attributed change is lost and the object's latest record is always kept.
+        """
+        pk_name = model._meta.pk.attname
+        ignored = set(collapse_fields)
+        # auto_now timestamps change on every save, so they never count as a difference
+        compared = [
+            field.attname for field in model._meta.concrete_fields
+            if field.attname not in ignored and not getattr(field, 'auto_now', False)
+        ]
+        rows = (
+            history_model.objects
+            .order_by(pk_name, 'history_date', 'history_id')
+            .values_list(pk_name, 'history_id', 'history_type', *compared)
+        )
+        before, current = None, None
+        for row in rows.iterator(chunk_size=self.chunk_size):
+            if (
+                before is not None
+                and before[0] == current[0] == row[0]
+                and current[2] == '~'
+                and row[2] == '~'
+                and before[3:] == current[3:]
+            ):
+                yield current[1]
+            else:
+                before = current
+            current = row
+            if before is not None and before[0] != current[0]:
+                before = None
+
+    # --- Archive / delete ---
+
+    def archive_and_delete(self, model, history_model, history_ids, archive_path):
+        fields = [field.attname for field in history_model._meta.concrete_fields]
+        label = history_model._meta.label
+        deleted = 0
+        archive = gzip.open(archive_path, 'at', encoding='utf-8') if archive_path else None
+        try:
+            for start in range(0, len(history_ids), self.chunk_size):
+                chunk = history_ids[start:start + self.chunk_size]
+                with transaction.atomic():
+                    if archive is not None:
+                        for values in history_model.objects.filter(history_id__in=chunk).values(*fields).iterator():
+                            archive.write(json.dumps({'model': label, 'fields': values}, cls=DjangoJSONEncoder) + "\n")
+                        archive.flush()
+                    deleted += history_model.objects.filter(history_id__in=chunk).delete()[0]
+                    AuditLogEntry.objects.filter(model_name=model.__name__, history_id__in=chunk).delete()
+        finally:
+            if archive is not None:
+                archive.close()
+        return deleted
+
+    # --- Restore ---
+
+    def restore(self, path):
+        if not os.path.exists(path):
+            raise CommandError(f"Archive not found: {path}")
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Restoring history archive {path}")
+        self.stdout.write("=" * 70)
+
+        restored = 0
+        batch = []
+        current_model = None
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                history_model = apps.get_model(record['model'])
+                if current_model is not None and history_model is not current_model and batch:
+                    restored += self._restore_batch(current_model, batch)
+                    batch = []
+                current_model = history_model
+                batch.append(self._decode(history_model, record['fields']))
+                if len(batch) >= self.chunk_size:
+                    restored += self._restore_batch(current_model, batch)
+                    batch = []
+        if batch:
+            restored += self._restore_batch(current_model, batch)
+
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Restored {restored} history record(s)"))
+        self.stdout.write("=" * 70)
+
+    def _decode(self, history_model, values):
+        decoded = {}
+        for field in history_model._meta.concrete_fields:
+            if field.attname in values:
+                value = values[field.attname]
+                decoded[field.attname] = field.to_python(value) if value is not None else None
+        return history_model(**decoded)
+
+    def _restore_batch(self, history_model, rows):
+        ids = [row.history_id for row in rows]
+        with transaction.atomic():
+            existing = set(history_model.objects.filter(history_id__in=ids).values_list('history_id', flat=True))
+            missing = [row for row in rows if row.history_id not in existing]
+            users = User.objects.in_bulk({row.history_user_id for row in missing if row.history_user_id})
+            for row in missing:
+                if row.history_user_id:
+                    # Cache the user so the audit index gets the username without a query per row
+                    row.history_user = users.get(row.history_user_id)
+            history_model.objects.bulk_create(missing, batch_size=self.chunk_size)
+            AuditLogEntry.objects.bulk_create(
+                [AuditLogEntry.from_history_record(row) for row in missing],
+                batch_size=self.chunk_size,
+                ignore_conflicts=True,
+            )
+        return len(missing)
@@ -0,0 +1,255 @@
+import datetime
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.caching import PUBLIC_RESPONSE_DEPENDENCIES, VERSIONED_MODELS, bump_version, model_namespace
+from api.models import (
+    AuditLogEntry, Booking, Facility, House, HouseImage, Pin, ResidentPin, Review, UserProfile, VisitorRequest,
+)
+
+
+DEFAULT_PASSWORD = 'loadtest-pass'
+
+STREETS = ('Acacia', 'Narra', 'Molave', 'Mahogany', 'Sampaguita', 'Ilang-Ilang', 'Dao', 'Yakal')
+FIRST_NAMES = ('Juan', 'Maria', 'Jose', 'Ana', 'Pedro', 'Rosa', 'Carlo', 'Liza', 'Miguel', 'Grace')
+LAST_NAMES = ('Dela Cruz', 'Santos', 'Reyes', 'Garcia', 'Mendoza', 'Bautista', 'Torres', 'Villanueva')
+BOOKING_HOURS = range(7, 21)
+
+
+class Command(BaseCommand):
+    help = (
+        'Fills the database with a large, internally consistent synthetic dataset for load testing: '
+        'residents (verified, with resident PINs), houses with images, bookings, approved visitor requests '
+        'with one-time PINs, map pins with reviews, and their history/audit rows. Uses bulk_create; '
+        'residents are named <prefix>00001... and share --password, so `manage.py benchmark` can log in as them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--residents', type=int, default=1000, help='Residents to create')
+        parser.add_argument('--houses', type=int, help='Houses to create (default: residents / 4)')
+        parser.add_argument('--images-per-house', type=int, default=3, help='HouseImage rows per house')
+        parser.add_argument('--bookings', type=int, help='Bookings to create (default: 2 x residents)')
+        parser.add_argument('--visitor-requests', type=int, help='Visitor requests to create (default: residents)')
+        parser.add_argument('--pins', type=int, default=200, help='Map pins to create')
+        parser.add_argument('--reviews-per-pin', type=int, default=3, help='Reviews per map pin')
+        parser.add_argument('--prefix', default='load', help='Username prefix of the generated residents')
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Password of every generated resident')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed + options = same dataset)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+        parser.add_argument('--no-history', action='store_true', help='Skip the Historical<Model> and audit log rows')
+        parser.add_argument('--clear', action='store_true', help='Delete residents from a previous run with the same prefix first')
+
+    def handle(self, *args, **options):
+        residents = options['residents']
+        if residents < 1:
+            raise CommandError('--residents must be at least 1')
+        prefix = options['prefix']
+        counts = {
+            'residents': residents,
+            'houses': options['houses'] if options['houses'] is not None else max(residents // 4, 1),
+            'bookings': options['bookings'] if options['bookings'] is not None else residents * 2,
+            'visitor_requests': options['visitor_requests'] if options['visitor_requests'] is not None else residents,
+            'pins': options['pins'],
+        }
+        self.batch_size = max(options['batch_size'], 1)
+        self.history = not options['no_history']
+        self.rng = random.Random(options['seed'])
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Seeding synthetic data (prefix '{prefix}', seed {options['seed']})")
+        self.stdout.write("=" * 70)
+
+        existing = User.objects.filter(username__startswith=prefix)
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(
+                    f"{existing.count()} user(s) named '{prefix}*' already exist - pass --clear to replace them "
+                    f"or choose another --prefix"
+                )
+            # Everything else hangs off the residents and cascades; map pins do not
+            deleted, _ = existing.delete()
+            deleted += Pin.objects.filter(name__startswith=f"{prefix} lot ").delete()[0]
+            self.stdout.write(f"Deleted {deleted} row(s) from the previous '{prefix}' run")
+
+        started = time.monotonic()
+        with transaction.atomic():
+            users = self.create_residents(prefix, residents, options['password'])
+            houses = self.create_houses(users, counts['houses'], options['images_per_house'])
+            bookings = self.create_bookings(users, counts['bookings'])
+            visitor_requests = self.create_visitor_requests(users, counts['visitor_requests'])
+            pins = self.create_pins(prefix, users, counts['pins'], options['reviews_per_pin'])
+        elapsed = time.monotonic() - started
+
+        # bulk_create bypasses the post_save receivers that invalidate cached
+        # responses and conditional GET versions
+        for namespace in PUBLIC_RESPONSE_DEPENDENCIES:
+            bump_version(namespace)
+        for label in VERSIONED_MODELS:
+            bump_version(model_namespace(label))
+
+        self.stdout.write(f"Residents: {len(users)}")
+        self.stdout.write(f"Houses: {len(houses)} ({len(houses) * options['images_per_house']} images)")
+        self.stdout.write(f"Bookings: {len(bookings)}")
+        self.stdout.write(f"Visitor requests: {len(visitor_requests)}")
+        self.stdout.write(f"Map pins: {len(pins)}")
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Seeded in {elapsed:.1f}s"))
+        self.stdout.write("=" * 70)
+
+    # --- helpers ---
+
+    def bulk_create(self, model, objs, history=True):
+        """bulk_create in batches, plus history/audit rows like api.service_fee_utils does"""
+        created = []
+        for start in range(0, len(objs), self.batch_size):
+            batch = model.objects.bulk_create(objs[start:start + self.batch_size])
+            if history and self.history and hasattr(model, 'history'):
+                history_rows = model.history.bulk_history_create(batch) or []
+                AuditLogEntry.objects.bulk_create(
+                    [AuditLogEntry.from_history_record(row) for row in history_rows if row.pk],
+                    ignore_conflicts=True,
+                )
+            created.extend(batch)
+        return created
+
+    def create_residents(self, prefix, count, password):
+        # One hash for everyone: hashing per user would take minutes
+        password_hash = make_password(password)
+        width = max(len(str(count)), 5)
+        users = self.bulk_create(User, [
+            User(
+                username=f"{prefix}{index:0{width}d}",
+                email=f"{prefix}{index:0{width}d}@example.com",
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                password=password_hash,
+                date_joined=timezone.now() - datetime.timedelta(days=self.rng.randint(0, 1000)),
+            )
+            for index in range(1, count + 1)
+        ])
+        # bulk_create skips the post_save hook that creates profiles
+        self.bulk_create(UserProfile, [
+            UserProfile(
+                user=user,
+                contact_number=f"+639{self.rng.randint(100000000, 999999999)}",
+                is_verified=True,
+                document=f"documents/{user.username}.pdf",
+            )
+            for user in users
+        ])
+        pin_values = self.unique_pins(len(users), set(ResidentPin.objects.exclude(pin=None).values_list('pin', flat=True)))
+        self.bulk_create(ResidentPin, [ResidentPin(user=user, pin=pin) for user, pin in zip(users, pin_values)], history=False)
+        return users
+
+    def create_houses(self, users, count, images_per_house):
+        houses = self.bulk_create(House, [
+            House(
+                user=self.rng.choice(users),
+                title=f"{self.rng.randint(2, 5)}BR house on {self.rng.choice(STREETS)} St.",
+                price=Decimal(self.rng.randrange(1_500_000, 12_000_000, 50_000)),
+                location=f"Block {self.rng.randint(1, 40)} Lot {self.rng.randint(1, 30)}, {self.rng.choice(STREETS)} St.",
+                description='Synthetic listing for load testing',
+                listing_type=self.rng.choice(('sale', 'rent')),
+                beds=self.rng.randint(1, 5),
+                baths=self.rng.randint(1, 4),
+                floor_area=Decimal(self.rng.randint(40, 250)),
+                lot_size=Decimal(self.rng.randint(80, 400)),
+                parking_spaces=self.rng.randint(0, 2),
+                has_garden=self.rng.random() < 0.4,
+                has_security=True,
+            )
+            for _ in range(count)
+        ])
+        self.bulk_create(HouseImage, [
+            HouseImage(house=house, image=f"house-images/load-{house.pk}-{order}.jpg", order=order)
+            for house in houses
+            for order in range(images_per_house)
+        ])
+        return houses
+
+    def create_bookings(self, users, count):
+        facilities = [Facility.objects.get_or_create(name=name)[0] for name, _ in Facility.FACILITY_CHOICES]
+        today = timezone.localdate()
+        # Unique (facility, day, hour) slots so bookings never overlap, half
+        # in the past year and half in the next
+        slots = set()
+        bookings = []
+        while len(bookings) < count:
+            slot = (self.rng.randrange(len(facilities)), self.rng.randint(-365, 365), self.rng.choice(BOOKING_HOURS))
+            if slot in slots:
+                if len(slots) >= len(facilities) * 731 * len(BOOKING_HOURS):
+                    break
+                continue
+            slots.add(slot)
+            facility_index, day, hour = slot
+            bookings.append(Booking(
+                user=self.rng.choice(users),
+                facility=facilities[facility_index],
+                date=today + datetime.timedelta(days=day),
+                start_time=datetime.time(hour, 0),
+                end_time=datetime.time(hour + 1, 0),
+                status='approved' if day < 0 else self.rng.choice(('pending', 'approved')),
+            ))
+        return self.bulk_create(Booking, bookings)
+
+    def create_visitor_requests(self, users, count):
+        admin = User.objects.filter(is_staff=True).order_by('pk').first()
+        today = timezone.localdate()
+        taken = set(VisitorRequest.objects.exclude(one_time_pin=None).values_list('one_time_pin', flat=True))
+        one_time_pins = self.unique_pins(count, taken)
+        return self.bulk_create(VisitorRequest, [
+            VisitorRequest(
+                resident=self.rng.choice(users),
+                visitor_name=f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+                visitor_email='visitor@example.com',
+                visitor_contact_number=f"09{self.rng.randint(100000000, 999999999)}",
+                reason='Family visit',
+                one_time_pin=pin,
+                visit_date=today,
+                visit_end_date=today + datetime.timedelta(days=self.rng.randint(0, 3)),
+                visit_start_time=datetime.time(0, 0),
+                visit_end_time=datetime.time(23, 59),
+                status='approved',
+                approved_by=admin,
+                approved_at=timezone.now(),
+            )
+            for pin in one_time_pins
+        ])
+
+    def create_pins(self, prefix, users, count, reviews_per_pin):
+        pins = self.bulk_create(Pin, [
+            Pin(
+                name=f"{prefix} lot {index}",
+                latitude=14.5995 + self.rng.uniform(-0.01, 0.01),
+                longitude=120.9842 + self.rng.uniform(-0.01, 0.01),
+                status=self.rng.choice(('Available', 'Occupied', 'Reserved')),
+                price=f"{self.rng.randrange(1_000_000, 9_000_000, 100_000):,}",
+                square_meter=Decimal(self.rng.randint(80, 400)),
+            )
+            for index in range(1, count + 1)
+        ])
+        self.bulk_create(Review, [
+            Review(pin=pin, user=user, rating=self.rng.randint(1, 5), comment='Synthetic review')
+            for pin in pins
+            for user in self.rng.sample(users, min(reviews_per_pin, len(users)))
+        ])
+        return pins
+
+    def unique_pins(self, count, taken):
+        """``count`` distinct 6-digit PINs not in ``taken``"""
+        if count > 1_000_000 - len(taken):
+            raise CommandError('Not enough unused 6-digit PINs left')
+        taken = set(taken)
+        pins = []
+        while len(pins) < count:
+            pin = f"{self.rng.randrange(1_000_000):06d}"
+            if pin not in taken:
+                taken.add(pin)
+                pins.append(pin)
+        return pins
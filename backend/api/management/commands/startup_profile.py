@@ -0,0 +1,101 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# What a worker imports before it can serve its first request
+STARTUP_SCRIPT = (
+    "import django\n"
+    "from django.core.wsgi import get_wsgi_application\n"
+    "application = get_wsgi_application()\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr):
+    """Rows of (module, self_us, cumulative_us, depth) from `python -X importtime` output"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Reports how long a fresh worker spends importing the project - Django setup, middleware and every '
+        'URLconf/view module - per module, slowest first. Runs the imports in a child '
+        'interpreter under `python -X importtime`, so nothing already imported by this process is hidden.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25, help='Modules to list (default 25)')
+        parser.add_argument('--prefix', help='Only list modules under this package, e.g. "api"')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'))
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0 or not rows:
+            raise CommandError(f"Startup imports failed:\n{result.stderr[-2000:]}")
+
+        total_us = sum(cumulative for _module, _self, cumulative, depth in rows if depth == 0)
+        by_package = defaultdict(int)
+        for module, self_us, _cumulative, _depth in rows:
+            by_package[module.split('.')[0]] += self_us
+
+        listed = rows
+        if options['prefix']:
+            prefix = options['prefix']
+            listed = [row for row in rows if row[0] == prefix or row[0].startswith(prefix + '.')]
+        listed = sorted(listed, key=lambda row: row[2], reverse=True)[:options['limit']]
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'wall_ms': round(wall_ms, 1),
+                'import_ms': round(total_us / 1000, 1),
+                'module_count': len(rows),
+                'packages': {
+                    package: round(self_us / 1000, 2)
+                    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+                },
+                'modules': [
+                    {'module': module, 'self_ms': round(self_us / 1000, 2), 'cumulative_ms': round(cumulative / 1000, 2)}
+                    for module, self_us, cumulative, _depth in listed
+                ],
+            }, indent=2))
+            return
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(
+            f"Startup: {total_us / 1000:.0f} ms importing {len(rows)} modules "
+            f"({wall_ms:.0f} ms wall, including interpreter start)"
+        )
+        self.stdout.write("=" * 70)
+
+        self.stdout.write("\nSelf time by top-level package:")
+        for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:10]:
+            self.stdout.write(f"  {package:<40} {self_us / 1000:>9.1f} ms  {self_us * 100 / total_us:>5.1f}%")
+
+        self.stdout.write(f"\nSlowest modules (cumulative, including what they import):")
+        self.stdout.write(f"  {'module':<50} {'self ms':>9} {'cumul. ms':>10}")
+        for module, self_us, cumulative, _depth in listed:
+            self.stdout.write(f"  {module:<50} {self_us / 1000:>9.1f} {cumulative / 1000:>10.1f}")
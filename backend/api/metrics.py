@@ -0,0 +1,192 @@
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format.
+
+Metrics are per process: behind gunicorn every worker keeps its own values
+and a scrape of /metrics reports the worker that answered it. That is enough
+to find slow routes; aggregate across workers in Prometheus with sum().
+"""
+import hmac
+import logging
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+
+logger = logging.getLogger(__name__)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+
+
+class Gauge:
+    """A gauge whose value is read from a callback at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, callback, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        # callback returns {label tuple: value}, or a single number when unlabelled
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = {labels: {'counts': list(s['counts']), 'sum': s['sum'], 'count': s['count']}
+                        for labels, s in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                le = ('le', _format_number(float(bound)))
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_number(series['sum'])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {series['count']}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # Re-registering (e.g. module reload) keeps the existing series
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelnames=()):
+        return self._register(Gauge(name, documentation, callback, labelnames))
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                lines.extend(metric.samples())
+            except Exception as e:
+                logger.error("Failed to collect metric %s: %s", metric.name, e)
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# --- HTTP request metrics (recorded by api.middleware.metrics) ---
+REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'HTTP requests by method, route and status code.', ('method', 'route', 'status'))
+REQUEST_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Time spent producing the response.', ('method', 'route'))
+REQUEST_QUERIES = REGISTRY.histogram(
+    'http_request_db_queries', 'Database queries executed per request.', ('method', 'route'), QUERY_COUNT_BUCKETS)
+REQUEST_DB_TIME = REGISTRY.histogram(
+    'http_request_db_seconds', 'Time spent in database queries per request.', ('method', 'route'))
+RESPONSE_SIZE = REGISTRY.histogram(
+    'http_response_size_bytes', 'Response body size (non-streaming responses).', ('method', 'route'), SIZE_BUCKETS)
+SLOW_REQUESTS = REGISTRY.counter(
+    'http_slow_requests_total', 'Requests slower than SLOW_REQUEST_MS.', ('method', 'route'))
+
+
+def metrics_allowed(request):
+    """Bearer METRICS_TOKEN, a staff session, a METRICS_ALLOWED_IPS client, or METRICS_PUBLIC"""
+    if getattr(settings, 'METRICS_PUBLIC', False):
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ())
+
+
+def metrics_view(request):
+    """
+    GET /metrics - Prometheus text exposition.
+    Closed to the public by default: see metrics_allowed() and the METRICS_* settings.
+    """
+    if not metrics_allowed(request):
+        return HttpResponseForbidden('Forbidden\n', content_type='text/plain')
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
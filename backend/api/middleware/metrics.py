@@ -0,0 +1,139 @@
+"""
+Per-request timing, query counting and structured access logging.
+
+Records latency, database query count/time and response size per route in
+api.metrics (served on /metrics), adds a Server-Timing header, logs one JSON
+line per request to the "api.requests" logger and, for requests slower than
+SLOW_REQUEST_MS, logs a sample with the most expensive SQL statements.
+
+Works in both handler modes, so under ASGI async views are not pushed through
+a thread just to be measured.
+"""
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.functional import empty
+
+from api import metrics
+from api.utils.query_observers import observe_queries
+
+
+logger = logging.getLogger('api.requests')
+
+# Distinct statements remembered per request for the slow-request sample
+MAX_TRACKED_STATEMENTS = 200
+
+
+class QueryRecorder:
+    """observe_queries() callback that counts and times queries"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            stats = self.statements.get(sql)
+            if stats is not None:
+                stats[0] += 1
+                stats[1] += elapsed
+            elif len(self.statements) < MAX_TRACKED_STATEMENTS:
+                self.statements[sql] = [1, elapsed]
+
+    def top(self, limit=5):
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {'sql': sql[:1000], 'count': count, 'total_ms': round(total * 1000, 2)}
+            for sql, (count, total) in ranked
+        ]
+
+
+def route_label(request):
+    """URL pattern (bounded cardinality) rather than the concrete path"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    # DRF router patterns are regexes; drop their anchors
+    return '/' + (match.route or match.view_name or '').replace('^', '').replace('$', '')
+
+
+def resolved_user_id(request):
+    """The user id if authentication already ran; never triggers a lookup itself"""
+    user = request.__dict__.get('user')
+    if user is None:
+        return None
+    wrapped = getattr(user, '_wrapped', user)
+    if wrapped is empty:
+        return None
+    return getattr(wrapped, 'pk', None)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with observe_queries(recorder):
+            response = self.get_response(request)
+        return self.record(request, response, recorder, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with observe_queries(recorder):
+            response = await self.get_response(request)
+        return self.record(request, response, recorder, time.perf_counter() - start)
+
+    def record(self, request, response, recorder, duration):
+        route = route_label(request)
+        method = request.method
+        size = None if response.streaming else len(response.content)
+
+        metrics.REQUESTS.inc(method, route, str(response.status_code))
+        metrics.REQUEST_LATENCY.observe(duration, method, route)
+        metrics.REQUEST_QUERIES.observe(recorder.count, method, route)
+        metrics.REQUEST_DB_TIME.observe(recorder.duration, method, route)
+        if size is not None:
+            metrics.RESPONSE_SIZE.observe(size, method, route)
+
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"'
+        )
+
+        record = {
+            'method': method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'db_queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'response_bytes': size,
+            'user_id': resolved_user_id(request),
+        }
+        slow_ms = getattr(settings, 'SLOW_REQUEST_MS', 500)
+        if slow_ms and duration * 1000 >= slow_ms:
+            metrics.SLOW_REQUESTS.inc(method, route)
+            logger.warning('slow request', extra={**record, 'top_queries': recorder.top()})
+        else:
+            logger.info('request', extra=record)
+        return response
@@ -0,0 +1,125 @@
+"""
+Opt-in request profiling.
+
+A request is profiled when a staff user asks for it - "X-Profile: 1" header
+or ?_profile=1 - or when it is picked by PROFILING_SAMPLE_RATE. Profiled
+responses carry an X-Profile-Id header; the profile itself (cProfile hot
+spots plus the SQL timeline) is read at /api/admin/profiles/<id>/. Other
+requests only pay for a header lookup.
+
+Streaming responses are profiled up to the point the stream is returned.
+
+cProfile only sees the thread it runs on. Under ASGI a profiled request is
+therefore handled on its sync thread, where Django also runs sync views; the
+time async views spend on the event loop is not broken down.
+"""
+import logging
+import random
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+
+from api.profiling import RequestProfile
+from api.utils.query_observers import observe_queries
+from .metrics import resolved_user_id
+
+
+logger = logging.getLogger(__name__)
+
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_PARAM = '_profile'
+
+
+def profile_requested(request):
+    value = request.headers.get(PROFILE_HEADER) or request.GET.get(PROFILE_QUERY_PARAM)
+    return bool(value) and value.lower() not in ('0', 'false', 'no')
+
+
+def staff_user(request):
+    """The staff user making the request - session, else bearer token (DRF has not authenticated yet)"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except (AuthenticationFailed, TokenError):
+            return None
+        user = authenticated[0] if authenticated else None
+    return user if user is not None and user.is_staff else None
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.sync_get_response = async_to_sync(get_response)
+        else:
+            self.sync_get_response = get_response
+
+    def requested(self, request):
+        """Cheap pre-check of the header or query parameter, no database access"""
+        return getattr(settings, 'PROFILING_ENABLED', True) and profile_requested(request)
+
+    def sampled(self):
+        sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        return bool(sample_rate) and random.random() < sample_rate
+
+    def profile_reason(self, request, requested, sampled):
+        """(reason, staff user who asked) or (None, None) when the request is not profiled"""
+        if requested:
+            user = staff_user(request)
+            if user is not None:
+                return 'requested', user
+        if sampled:
+            return 'sampled', None
+        return None, None
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        requested, sampled = self.requested(request), self.sampled()
+        if not (requested or sampled):
+            return self.get_response(request)
+        return self.handle(request, requested, sampled)
+
+    async def __acall__(self, request):
+        # Decided before the hop, so only profiled requests leave the event loop
+        requested, sampled = self.requested(request), self.sampled()
+        if not (requested or sampled):
+            return await self.get_response(request)
+        return await sync_to_async(self.handle)(request, requested, sampled)
+
+    def handle(self, request, requested, sampled):
+        reason, requested_by = self.profile_reason(request, requested, sampled)
+        if reason is None:
+            return self.sync_get_response(request)
+
+        profile = RequestProfile(request, reason)
+        try:
+            profile.start()
+        except ValueError as e:
+            # Another profiler is already active (Python 3.12+ allows only one)
+            logger.error("Could not start request profiler: %s", e)
+            return self.sync_get_response(request)
+        with observe_queries(profile.sql):
+            try:
+                response = self.sync_get_response(request)
+            finally:
+                profile.stop()
+
+        # Cached responses never authenticate, so fall back to whoever asked
+        user_id = resolved_user_id(request) or getattr(requested_by, 'pk', None)
+        try:
+            response[f'{PROFILE_HEADER}-Id'] = str(profile.finish(response, user_id))
+        except Exception as e:
+            # Never fail the request because its profile could not be stored
+            logger.error("Failed to store request profile: %s", e)
+        return response
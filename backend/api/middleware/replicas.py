@@ -0,0 +1,42 @@
+"""
+Request boundaries for the primary/replica router (api/replicas.py): queries
+made while a request is served may read from a replica, and a request that
+wrote keeps its user on the primary for REPLICA_STICKY_SECONDS.
+
+A pass-through when no replicas are configured.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from api.replicas import request_routing
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not getattr(settings, 'REPLICA_DATABASES', None):
+            return self.get_response(request)
+        with request_routing(request) as state:
+            response = self.get_response(request)
+            state.finish()
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'REPLICA_DATABASES', None):
+            return await self.get_response(request)
+        with request_routing(request) as state:
+            response = await self.get_response(request)
+            if state.wrote:
+                # May read the session from the database
+                await sync_to_async(state.finish)()
+        return response
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.16 on 2026-10-19 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_audit_log(apps, schema_editor):
+    """Index the history rows that existed before the audit log table."""
+    AuditLogEntry = apps.get_model('api', 'AuditLogEntry')
+    db_alias = schema_editor.connection.alias
+    batch = []
+    for model in apps.get_app_config('api').get_models():
+        if not model.__name__.startswith('Historical'):
+            continue
+        rows = model.objects.using(db_alias).values_list(
+            'history_id', 'id', 'history_type', 'history_date',
+            'history_user_id', 'history_user__username',
+        ).order_by('history_id')
+        for history_id, object_id, history_type, history_date, user_id, username in rows.iterator(chunk_size=2000):
+            batch.append(AuditLogEntry(
+                model_name=model.__name__[len('Historical'):],
+                object_id=str(object_id),
+                history_id=history_id,
+                history_type=history_type,
+                history_date=history_date,
+                history_user_id=user_id,
+                history_username=username or '',
+            ))
+            if len(batch) >= 2000:
+                AuditLogEntry.objects.using(db_alias).bulk_create(batch, ignore_conflicts=True)
+                batch = []
+    if batch:
+        AuditLogEntry.objects.using(db_alias).bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(help_text='Tracked model class name, e.g. Booking', max_length=100)),
+                ('object_id', models.CharField(help_text='Primary key of the tracked object', max_length=64)),
+                ('history_id', models.BigIntegerField(help_text='Primary key of the row in the Historical<Model> table')),
+                ('history_type', models.CharField(choices=[('+', 'Created'), ('~', 'Updated'), ('-', 'Deleted')], max_length=1)),
+                ('history_date', models.DateTimeField()),
+                ('history_username', models.CharField(blank=True, default='', help_text='Username at the time of the change (empty for System)', max_length=150)),
+                ('history_user', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Audit Log Entry',
+                'verbose_name_plural': 'Audit Log Entries',
+                'ordering': ['-history_date', '-id'],
+                'indexes': [models.Index(fields=['-history_date', '-id'], name='audit_log_date_idx'), models.Index(fields=['model_name', '-history_date'], name='audit_log_model_date_idx'), models.Index(fields=['model_name', 'object_id'], name='audit_log_object_idx'), models.Index(fields=['history_user', '-history_date'], name='audit_log_user_date_idx'), models.Index(fields=['history_username', '-history_date'], name='audit_log_username_date_idx'), models.Index(fields=['history_type', '-history_date'], name='audit_log_type_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='auditlogentry',
+            constraint=models.UniqueConstraint(fields=('model_name', 'history_id'), name='audit_log_unique_history_row'),
+        ),
+        migrations.RunPython(backfill_audit_log, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.16 on 2026-10-19 02:34
+
+import calendar
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+
+def parse_period(month, year):
+    """(month name, year) for a stored month such as 'January 2024', 'jan' or '1'"""
+    text = (month or '').replace(',', ' ').strip()
+    if not text:
+        return None, year
+    tokens = text.split()
+    if len(tokens) == 1 and text.isdigit() and 1 <= int(text) <= 12:
+        name = MONTH_NAMES[int(text) - 1]
+    else:
+        name = next(
+            (candidate for token in tokens for candidate in MONTH_NAMES
+             if token.lower() in (candidate.lower(), candidate[:3].lower())),
+            month,
+        )
+    if year is None:
+        year = next((int(token) for token in tokens if len(token) == 4 and token.isdigit()), None)
+    return name, year
+
+
+def normalize_service_fee_periods(apps, schema_editor):
+    """
+    Store every month the way normalize_month does ('January 2024' -> 'January',
+    year 2024), then keep one fee per homeowner and period: a paid fee, else one
+    with a receipt, else the oldest. The others keep their data but lose the
+    period, with a note naming the fee they duplicate.
+    """
+    ServiceFee = apps.get_model('api', 'ServiceFee')
+    db_alias = schema_editor.connection.alias
+    fees = ServiceFee.objects.using(db_alias)
+
+    periods = defaultdict(list)
+    rows = fees.exclude(month__isnull=True).values_list('id', 'homeowner_id', 'month', 'year', 'status', 'receipt_image')
+    for fee_id, homeowner_id, month, year, status, receipt_image in rows.order_by('id').iterator(chunk_size=2000):
+        name, normalized_year = parse_period(month, year)
+        if (name, normalized_year) != (month, year):
+            fees.filter(pk=fee_id).update(month=name, year=normalized_year)
+        if name is not None and normalized_year is not None:
+            periods[homeowner_id, name, normalized_year].append((status != 'paid', not receipt_image, fee_id))
+
+    for (homeowner_id, month, year), candidates in periods.items():
+        if len(candidates) < 2:
+            continue
+        kept = min(candidates)[2]
+        for *_, fee_id in candidates:
+            if fee_id == kept:
+                continue
+            fee = fees.get(pk=fee_id)
+            note = f"Duplicate of service fee #{kept} for {month} {year}; billing period cleared when bills became unique per period."
+            fee.notes = f"{fee.notes}\n{note}" if fee.notes else note
+            fee.month = None
+            fee.year = None
+            fee.save(update_fields=['notes', 'month', 'year'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_audit_log_entry'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_service_fee_periods, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='historicalservicefee',
+            name='month',
+            field=models.CharField(blank=True, help_text='Billing month name (e.g., January)', max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='servicefee',
+            name='month',
+            field=models.CharField(blank=True, help_text='Billing month name (e.g., January)', max_length=20, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='servicefee',
+            constraint=models.UniqueConstraint(fields=('homeowner', 'month', 'year'), name='service_fee_unique_period'),
+        ),
+    ]
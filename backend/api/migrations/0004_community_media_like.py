@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-19 02:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0003_service_fee_unique_period'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommunityMediaLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('media', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='api.communitymedia')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='media_likes', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='communitymedialike',
+            constraint=models.UniqueConstraint(fields=('media', 'user'), name='community_media_like_unique_user'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.16 on 2026-10-19 03:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_community_media_like'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogcomment',
+            index=models.Index(fields=['post', '-created_at'], name='blog_comment_post_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['facility', 'date', 'status'], name='booking_facility_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-date', '-start_time'], name='booking_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='communitymedia',
+            index=models.Index(condition=models.Q(('is_approved', True), ('is_public', True)), fields=['-order', '-created_at'], name='community_media_public_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['homeowner', '-created_at'], name='maint_request_homeowner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['status', '-created_at'], name='maint_request_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicefee',
+            index=models.Index(fields=['homeowner', '-created_at', '-due_date'], name='service_fee_homeowner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicefee',
+            index=models.Index(fields=['status', 'due_date'], name='service_fee_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitor',
+            index=models.Index(fields=['resident', 'status', 'time_out'], name='visitor_resident_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorrequest',
+            index=models.Index(fields=['resident', '-created_at'], name='visitor_request_resident_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorrequest',
+            index=models.Index(fields=['status', '-created_at'], name='visitor_request_status_idx'),
+        ),
+    ]
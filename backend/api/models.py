@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework import serializers
 from simple_history.models import HistoricalRecords
 import random
@@ -23,6 +24,33 @@ class UserProfile(models.Model):
     def __str__(self):
         return self.user.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = instance._field_state()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_state = self._field_state()
+
+    def _field_state(self):
+        # Deferred fields are left out; file fields are compared by name
+        state = {}
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__:
+                value = self.__dict__[field.attname]
+                state[field.attname] = getattr(value, 'name', value) if isinstance(field, models.FileField) else value
+        return state
+
+    def get_dirty_fields(self):
+        """Names of the concrete fields changed since the profile was loaded or last saved"""
+        loaded = getattr(self, '_loaded_state', None)
+        current = self._field_state()
+        if loaded is None:
+            return set(current)
+        return {name for name, value in current.items() if name not in loaded or loaded[name] != value}
+
 
 # --- signals ---
 from django.db.models.signals import post_save
@@ -34,8 +62,15 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+def save_user_profile(sender, instance, created, **kwargs):
+    # Only persist a profile that was loaded through this user and edited in
+    # memory. Logins (last_login) and plain user edits leave it alone, so they
+    # no longer write the profile or add a UserProfile history row.
+    if created or not User.profile.related.is_cached(instance):
+        return
+    profile = User.profile.related.get_cached_value(instance)
+    if profile is not None and profile.get_dirty_fields():
+        profile.save()
 
 
 class Post(models.Model):
@@ -100,6 +135,10 @@ class BlogComment(models.Model):
         ordering = ['-created_at']  # Newest comments first
         verbose_name = "Blog Comment"
         verbose_name_plural = "Blog Comments"
+        indexes = [
+            # Comments of one post (?post_id=), newest first
+            models.Index(fields=['post', '-created_at'], name='blog_comment_post_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} commented on '{self.post.title[:30]}'"
@@ -150,11 +189,34 @@ class CommunityMedia(models.Model):
         ordering = ['-order', '-created_at']  # Featured/ordered items first, then by date
         verbose_name = "Community Media"
         verbose_name_plural = "Community Media"
+        indexes = [
+            # The public gallery in display order. Partial: Django filters booleans as bare
+            # columns ("is_approved" AND "is_public"), which a b-tree on them cannot search
+            models.Index(
+                fields=['-order', '-created_at'], condition=models.Q(is_approved=True, is_public=True),
+                name='community_media_public_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.get_media_type_display()})"
 
 
+class CommunityMediaLike(models.Model):
+    """One like per user per media item; likes_count is updated in the same transaction"""
+    media = models.ForeignKey(CommunityMedia, on_delete=models.CASCADE, related_name='likes')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='media_likes')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['media', 'user'], name='community_media_like_unique_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} likes {self.media_id}"
+
+
 class Message(models.Model):
     text = models.TextField()
     sender = models.CharField(max_length=10)
@@ -175,6 +237,15 @@ class Subdivision(models.Model):
         return f"{self.lot_number} - {'Occupied' if self.is_occupied else 'Not Occupied'}"
 
 
+class PinQuerySet(models.QuerySet):
+    def with_review_stats(self):
+        """Annotate review_total / review_average so listing pins costs no query per pin"""
+        return self.annotate(
+            review_total=models.Count('reviews'),
+            review_average=models.Avg('reviews__rating'),
+        )
+
+
 class Pin(models.Model):
     name = models.CharField(max_length=255)
     latitude = models.FloatField()
@@ -187,11 +258,15 @@ class Pin(models.Model):
     image = models.ImageField(upload_to='pin_images/', blank=True, null=True)
     history = HistoricalRecords()
 
+    objects = PinQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
     def get_average_rating(self):
         """Calculate average rating for this pin"""
+        if hasattr(self, 'review_average'):
+            return round(self.review_average, 1) if self.review_average is not None else 0.0
         reviews = self.reviews.all()
         if reviews.exists():
             return round(sum(r.rating for r in reviews) / reviews.count(), 1)
@@ -199,6 +274,8 @@ class Pin(models.Model):
 
     def get_review_count(self):
         """Get total number of reviews"""
+        if hasattr(self, 'review_total'):
+            return self.review_total
         return self.reviews.count()
 
 
@@ -255,6 +332,14 @@ class Booking(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     history = HistoricalRecords()
 
+    class Meta:
+        indexes = [
+            # Overlap check on create and the facility calendar (?facility_id=)
+            models.Index(fields=['facility', 'date', 'status'], name='booking_facility_date_idx'),
+            # A resident's own bookings, newest first
+            models.Index(fields=['user', '-date', '-start_time'], name='booking_user_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} booked {self.facility.get_name_display()} on {self.date} ({self.status})"    
 
@@ -372,6 +457,12 @@ class MaintenanceRequest(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = "Maintenance Requests"
+        indexes = [
+            # A homeowner's requests, newest first (also with ?status=: few rows per homeowner)
+            models.Index(fields=['homeowner', '-created_at'], name='maint_request_homeowner_idx'),
+            # The admin queue by status (?status=pending), newest first
+            models.Index(fields=['status', '-created_at'], name='maint_request_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_maintenance_type_display()} - {self.homeowner.username} ({self.status})"
@@ -512,6 +603,12 @@ class Visitor(models.Model):
     time_in = models.DateTimeField(null=True, blank=True)
     time_out = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # A resident's pending / active (approved, not timed out) visitors
+            models.Index(fields=['resident', 'status', 'time_out'], name='visitor_resident_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.gmail or 'No Email'})"   
 
@@ -595,6 +692,12 @@ class VisitorRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = "Visitor Request"
         verbose_name_plural = "Visitor Requests"
+        indexes = [
+            # A resident's requests, newest first (also with ?status=: few rows per resident)
+            models.Index(fields=['resident', '-created_at'], name='visitor_request_resident_idx'),
+            # The admin queue by status (?status=pending_admin), newest first
+            models.Index(fields=['status', '-created_at'], name='visitor_request_status_idx'),
+        ]
     
     def is_valid(self):
         """Check if PIN is still valid based on date and time with proper timezone handling"""
@@ -820,6 +923,28 @@ def service_fee_policy_path(instance, filename):
     return f'service_fees/user_{instance.homeowner.id}/policies/{filename}'
 
 
+class ServiceFeeQuerySet(models.QuerySet):
+    """Delinquency helpers: 'delayed' is derived from status + due_date at read time."""
+
+    def overdue(self, today=None):
+        """Unpaid fees whose due date has passed (still stored as 'unpaid')"""
+        from django.utils import timezone
+        today = today or timezone.localdate()
+        return self.filter(status='unpaid', due_date__lt=today)
+
+    def with_effective_status(self, today=None):
+        """Annotate effective_status: 'delayed' for overdue unpaid fees, else the stored status"""
+        from django.utils import timezone
+        today = today or timezone.localdate()
+        return self.annotate(
+            effective_status=models.Case(
+                models.When(status='unpaid', due_date__lt=today, then=models.Value('delayed')),
+                default=models.F('status'),
+                output_field=models.CharField(max_length=10),
+            )
+        )
+
+
 class ServiceFee(models.Model):
     STATUS_CHOICES = [
         ('unpaid', 'Unpaid'),
@@ -834,20 +959,137 @@ class ServiceFee(models.Model):
     amount = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, help_text="Service fee amount")
     due_date = models.DateField(blank=True, null=True, help_text="Due date for payment")
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='unpaid')
-    month = models.CharField(max_length=20, blank=True, null=True, help_text="Billing month (e.g., January 2024)")
+    month = models.CharField(max_length=20, blank=True, null=True, help_text="Billing month name (e.g., January)")
     year = models.IntegerField(blank=True, null=True, help_text="Billing year")
     notes = models.TextField(blank=True, null=True, help_text="Additional notes or description")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     history = HistoricalRecords()
 
+    objects = ServiceFeeQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at', '-due_date']
         verbose_name = "Service Fee"
         verbose_name_plural = "Service Fees"
+        indexes = [
+            # A homeowner's fees in list order
+            models.Index(fields=['homeowner', '-created_at', '-due_date'], name='service_fee_homeowner_idx'),
+            # Overdue fees: status='unpaid' AND due_date < today (ServiceFeeQuerySet.overdue)
+            models.Index(fields=['status', 'due_date'], name='service_fee_status_due_idx'),
+        ]
+        constraints = [
+            # One bill per homeowner per billing period (fees without month/year are not constrained)
+            models.UniqueConstraint(fields=['homeowner', 'month', 'year'], name='service_fee_unique_period'),
+        ]
 
     def __str__(self):
         return f"{self.homeowner.username} - {self.month or 'N/A'} {self.year or ''} - {self.get_status_display()}"    
+
+    def get_effective_status(self):
+        """Status as clients should see it (uses the annotation when present)"""
+        annotated = getattr(self, 'effective_status', None)
+        if annotated:
+            return annotated
+        from django.utils import timezone
+        if self.status == 'unpaid' and self.due_date and self.due_date < timezone.localdate():
+            return 'delayed'
+        return self.status
+
+
+class AuditLogEntry(models.Model):
+    """
+    Append-only index over every simple_history table.
+
+    One row is written per historical record (see api/signals.py), so the
+    activity log can be filtered, ordered and paginated in SQL instead of
+    merging 26 history tables in Python. Full field values stay in the
+    original Historical<Model> table and are loaded lazily by history_id.
+    """
+    HISTORY_TYPE_CHOICES = [
+        ('+', 'Created'),
+        ('~', 'Updated'),
+        ('-', 'Deleted'),
+    ]
+
+    model_name = models.CharField(max_length=100, help_text="Tracked model class name, e.g. Booking")
+    object_id = models.CharField(max_length=64, help_text="Primary key of the tracked object")
+    history_id = models.BigIntegerField(help_text="Primary key of the row in the Historical<Model> table")
+    history_type = models.CharField(max_length=1, choices=HISTORY_TYPE_CHOICES)
+    history_date = models.DateTimeField()
+    history_user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_constraint=False,
+        related_name='+'
+    )
+    history_username = models.CharField(max_length=150, blank=True, default='', help_text="Username at the time of the change (empty for System)")
+
+    class Meta:
+        ordering = ['-history_date', '-id']
+        verbose_name = "Audit Log Entry"
+        verbose_name_plural = "Audit Log Entries"
+        constraints = [
+            models.UniqueConstraint(fields=['model_name', 'history_id'], name='audit_log_unique_history_row'),
+        ]
+        indexes = [
+            models.Index(fields=['-history_date', '-id'], name='audit_log_date_idx'),
+            models.Index(fields=['model_name', '-history_date'], name='audit_log_model_date_idx'),
+            models.Index(fields=['model_name', 'object_id'], name='audit_log_object_idx'),
+            models.Index(fields=['history_user', '-history_date'], name='audit_log_user_date_idx'),
+            models.Index(fields=['history_username', '-history_date'], name='audit_log_username_date_idx'),
+            models.Index(fields=['history_type', '-history_date'], name='audit_log_type_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} #{self.object_id} {self.get_history_type_display()} by {self.history_username or 'System'}"
+
+    @classmethod
+    def from_history_record(cls, history_instance):
+        """Build (unsaved) index row for a Historical<Model> instance."""
+        history_user = getattr(history_instance, 'history_user', None)
+        tracked_model = history_instance.instance_type
+        return cls(
+            model_name=tracked_model.__name__,
+            object_id=str(getattr(history_instance, tracked_model._meta.pk.attname)),
+            history_id=history_instance.pk,
+            history_type=history_instance.history_type,
+            history_date=history_instance.history_date,
+            history_user_id=getattr(history_instance, 'history_user_id', None),
+            history_username=history_user.get_username() if history_user else '',
+        )
+
+    def get_history_record(self):
+        """Fetch the full Historical<Model> row this entry points at (or None)."""
+        from django.apps import apps
+        try:
+            tracked_model = apps.get_model('api', self.model_name)
+        except LookupError:
+            return None
+        return tracked_model.history.model.objects.filter(pk=self.history_id).first()
+
+
+class PushEvent(models.Model):
+    """
+    An event for the SSE push channel (api/events.py), stored so every worker
+    process can relay it to its subscribers. The id is the SSE event id that
+    clients send back as Last-Event-ID. Rows are pruned after
+    SSE_EVENT_RETENTION_SECONDS.
+    """
+    channel = models.CharField(max_length=100)
+    type = models.CharField(max_length=100)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['channel', 'id'], name='push_event_channel_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.type} on {self.channel}"
 # Store the PIN for each resident/admin
 # class ResidentPin(models.Model):
 #     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="resident_pin")
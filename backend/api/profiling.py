@@ -0,0 +1,185 @@
+"""
+On-demand request profiling (see api.middleware.profiling).
+
+A profiled request runs under cProfile with every SQL statement timed. The
+result - the hottest functions, the pstats text and the SQL timeline - is
+stored in a ring of the PROFILING_RING_SIZE most recent profiles kept in the
+shared cache, so a profile taken by any worker can be read from any other at
+/api/admin/profiles/.
+"""
+import cProfile
+import io
+import os
+import pstats
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+
+SEQUENCE_KEY = 'profiling:sequence'
+SLOT_KEY = 'profiling:slot:{slot}'
+
+# Statements kept per profile; the rest are only counted
+MAX_TIMELINE_STATEMENTS = 500
+
+
+def ring_size():
+    return max(getattr(settings, 'PROFILING_RING_SIZE', 50), 1)
+
+
+class SqlTimeline:
+    """observe_queries() callback recording when each query ran and for how long"""
+
+    def __init__(self, started):
+        self.started = started
+        self.statements = []
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if len(self.statements) < MAX_TIMELINE_STATEMENTS:
+                self.statements.append({
+                    'start_ms': round((start - self.started) * 1000, 3),
+                    'duration_ms': round(elapsed * 1000, 3),
+                    'sql': sql[:2000],
+                    'many': many,
+                })
+
+
+def _function_label(key):
+    filename, line, name = key
+    if filename == '~':
+        # built-ins such as <method 'execute' of 'sqlite3.Cursor' objects>
+        return name
+    if filename.startswith(str(settings.BASE_DIR)):
+        filename = os.path.relpath(filename, settings.BASE_DIR)
+    return f"{filename}:{line}({name})"
+
+
+def summarize_profile(profiler, limit):
+    """(top functions by cumulative time, pstats text) of a finished cProfile.Profile"""
+    stats = pstats.Stats(profiler)
+    ranked = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    functions = [
+        {
+            'function': _function_label(key),
+            'calls': total_calls,
+            'primitive_calls': primitive_calls,
+            'own_ms': round(own_time * 1000, 3),
+            'cumulative_ms': round(cumulative_time * 1000, 3),
+        }
+        for key, (primitive_calls, total_calls, own_time, cumulative_time, _callers) in ranked
+    ]
+    text = io.StringIO()
+    stats.stream = text
+    stats.sort_stats('cumulative').print_stats(limit)
+    return functions, text.getvalue()
+
+
+class RequestProfile:
+    """Profiles one request: enter around the view, then call finish() with the response"""
+
+    def __init__(self, request, reason):
+        self.request = request
+        self.reason = reason
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.started_at = timezone.now()
+        self.started = time.perf_counter()
+        self.sql = SqlTimeline(self.started)
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.duration = time.perf_counter() - self.started
+
+    def finish(self, response, user_id=None):
+        functions, text = summarize_profile(self.profiler, getattr(settings, 'PROFILING_TOP_FUNCTIONS', 40))
+        return store({
+            'method': self.request.method,
+            # Without the query string, which may carry credentials
+            'path': self.request.path,
+            'status': response.status_code,
+            'reason': self.reason,
+            'user_id': user_id,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': round(self.duration * 1000, 2),
+            'db_queries': self.sql.count,
+            'db_ms': round(self.sql.duration * 1000, 2),
+            'functions': functions,
+            'stats_text': text,
+            'sql_timeline': self.sql.statements,
+            'sql_timeline_truncated': max(self.sql.count - len(self.sql.statements), 0),
+        })
+
+
+def store(profile):
+    """Add ``profile`` to the ring (overwriting the oldest) and return its id"""
+    cache.add(SEQUENCE_KEY, 0, timeout=None)
+    try:
+        profile_id = cache.incr(SEQUENCE_KEY)
+    except ValueError:
+        # Sequence evicted between add() and incr()
+        cache.set(SEQUENCE_KEY, 1, timeout=None)
+        profile_id = 1
+    profile['id'] = profile_id
+    cache.set(SLOT_KEY.format(slot=profile_id % ring_size()), profile, timeout=None)
+    return profile_id
+
+
+def recent_profiles():
+    """Stored profiles, newest first"""
+    keys = [SLOT_KEY.format(slot=slot) for slot in range(ring_size())]
+    return sorted(cache.get_many(keys).values(), key=lambda profile: profile['id'], reverse=True)
+
+
+def get_profile(profile_id):
+    profile = cache.get(SLOT_KEY.format(slot=profile_id % ring_size()))
+    # The slot may have been reused by a newer profile
+    if profile is None or profile['id'] != profile_id:
+        return None
+    return profile
+
+
+SUMMARY_FIELDS = ('id', 'method', 'path', 'status', 'reason', 'user_id', 'started_at', 'duration_ms', 'db_queries', 'db_ms')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_list(request):
+    """
+    GET /api/admin/profiles/ - the most recent request profiles (summaries).
+    Profile a request by sending it as staff with "X-Profile: 1" or ?_profile=1.
+    """
+    return Response([
+        {field: profile.get(field) for field in SUMMARY_FIELDS} for profile in recent_profiles()
+    ])
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_detail(request, profile_id):
+    """
+    GET /api/admin/profiles/<id>/ - hottest functions, SQL timeline and pstats text.
+    ?output=text returns just the pstats report.
+    """
+    profile = get_profile(profile_id)
+    if profile is None:
+        return Response({'detail': 'Profile not found (it may have been rotated out).'}, status=404)
+    if request.query_params.get('output') == 'text':
+        return HttpResponse(profile['stats_text'], content_type='text/plain; charset=utf-8')
+    return Response(profile)
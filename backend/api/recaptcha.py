@@ -0,0 +1,363 @@
+"""
+Outbound client for Google's reCAPTCHA siteverify endpoint, shared by the sync
+and async verify_recaptcha views.
+
+Every call is bounded: one pooled keep-alive connection set per process (per
+event loop under ASGI), strict connect/read timeouts, and a few retries with
+jittered exponential backoff on timeouts, connection errors and 5xx/429
+answers. After RECAPTCHA_BREAKER_THRESHOLD verifications in a row could not
+reach Google, a circuit breaker stops calling it for
+RECAPTCHA_BREAKER_RESET_SECONDS, then lets a single trial call through.
+
+While Google is unreachable a token is accepted (RECAPTCHA_FAIL_OPEN) or the
+request is refused with a 503. A token is good for one verification, as with
+Google: once accepted it is remembered as used for
+RECAPTCHA_TOKEN_CACHE_SECONDS and a reuse is refused without calling Google
+("timeout-or-duplicate"). Rejected tokens are remembered too; answers that
+could not be obtained are not.
+
+The breaker is per process; the token cache is the shared default cache.
+Point RECAPTCHA_VERIFY_URL at api.benchmark.SiteverifyStub to run against a
+local stand-in.
+"""
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+
+from .metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'recaptcha:token:'
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Cached in place of an accepted token, so it cannot be used again
+USED_TOKEN = {'success': False, 'error_codes': ['timeout-or-duplicate']}
+MAX_BACKOFF_SECONDS = 2.0
+
+VERIFICATIONS = REGISTRY.counter(
+    'recaptcha_verifications_total',
+    'reCAPTCHA tokens checked, by outcome (valid, invalid, cached, unavailable).', ('outcome',))
+SITEVERIFY_CALLS = REGISTRY.counter(
+    'recaptcha_siteverify_calls_total',
+    'Calls to the siteverify endpoint, retries included, by result (ok, error, timeout, status code).', ('result',))
+
+
+class Unavailable(Exception):
+    """Google's answer could not be obtained; ``retry`` when another attempt may get it"""
+
+    def __init__(self, reason, retry=True):
+        super().__init__(reason)
+        self.retry = retry
+
+
+@dataclass
+class Verification:
+    success: bool
+    # False when Google could not be reached and RECAPTCHA_FAIL_OPEN decided
+    available: bool = True
+    cached: bool = False
+    error_codes: list = field(default_factory=list)
+
+
+class CircuitBreaker:
+    """
+    Closed until ``threshold`` consecutive failures, then open for
+    ``reset_seconds``; after that one trial call is let through (half-open),
+    which closes the circuit on success or opens it again on failure.
+    """
+
+    def __init__(self, threshold, reset_seconds, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'open' if self.clock() - self.opened_at < self.reset_seconds else 'half-open'
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = self.clock()
+            if now - self.opened_at < self.reset_seconds:
+                return False
+            # A trial that never reported back (worker killed mid-call) does not block forever
+            if self.trial_started is not None and now - self.trial_started < self.reset_seconds:
+                return False
+            self.trial_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = self.trial_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_started = None
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+
+
+class SiteverifyClient:
+    def __init__(self, url, secret, connect_timeout=2.0, read_timeout=5.0, retries=2, backoff=0.25,
+                 breaker=None, fail_open=False, cache_seconds=120, pool_size=10):
+        self.url = url
+        self.secret = secret
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker(threshold=5, reset_seconds=30)
+        self.fail_open = fail_open
+        self.cache_seconds = cache_seconds
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+        # httpx clients are bound to the event loop they were first used on
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            url=settings.RECAPTCHA_VERIFY_URL,
+            secret=settings.RECAPTCHA_SECRET_KEY,
+            connect_timeout=settings.RECAPTCHA_CONNECT_TIMEOUT,
+            read_timeout=settings.RECAPTCHA_READ_TIMEOUT,
+            retries=settings.RECAPTCHA_RETRIES,
+            backoff=settings.RECAPTCHA_RETRY_BACKOFF,
+            breaker=CircuitBreaker(settings.RECAPTCHA_BREAKER_THRESHOLD, settings.RECAPTCHA_BREAKER_RESET_SECONDS),
+            fail_open=settings.RECAPTCHA_FAIL_OPEN,
+            cache_seconds=settings.RECAPTCHA_TOKEN_CACHE_SECONDS,
+            pool_size=settings.RECAPTCHA_POOL_SIZE,
+        )
+
+    # --- transports ---
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    # Retries are ours (with backoff and the breaker), not urllib3's
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def async_client(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            )
+        return client
+
+    # --- shared policy ---
+
+    def cache_key(self, token):
+        return CACHE_KEY_PREFIX + hashlib.sha256(token.encode()).hexdigest()
+
+    def payload(self, token):
+        return {'secret': self.secret, 'response': token}
+
+    def backoff_delay(self, attempt):
+        """Full jitter: anywhere up to the exponential step, so retrying workers spread out"""
+        return random.uniform(0, min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** (attempt - 1)))
+
+    def interpret(self, status_code, parse_json):
+        """Verification for one siteverify answer; raises Unavailable when there is none to give"""
+        if status_code != 200:
+            SITEVERIFY_CALLS.inc(str(status_code))
+            raise Unavailable(f'siteverify answered HTTP {status_code}', retry=status_code in RETRY_STATUSES)
+        try:
+            body = parse_json()
+        except ValueError:
+            SITEVERIFY_CALLS.inc('error')
+            raise Unavailable('siteverify answered with invalid JSON')
+        SITEVERIFY_CALLS.inc('ok')
+        if not isinstance(body, dict):
+            raise Unavailable('siteverify answered with unexpected JSON', retry=False)
+        return Verification(success=bool(body.get('success')), error_codes=list(body.get('error-codes') or []))
+
+    def cached(self, value):
+        if value is None:
+            return None
+        VERIFICATIONS.inc('cached')
+        return Verification(success=value['success'], cached=True, error_codes=value['error_codes'])
+
+    def settled(self, verification):
+        VERIFICATIONS.inc('valid' if verification.success else 'invalid')
+        return verification
+
+    def remembered(self, verification):
+        """What the cache keeps for the token after ``verification`` (None: nothing)"""
+        if verification.success:
+            return USED_TOKEN
+        if verification.available:
+            return {'success': False, 'error_codes': verification.error_codes}
+        # Google was not asked; a retry may still get its answer
+        return None
+
+    def unavailable(self, reason):
+        VERIFICATIONS.inc('unavailable')
+        logger.warning(
+            "reCAPTCHA verification unavailable (%s); %s the token",
+            reason, 'accepting' if self.fail_open else 'rejecting',
+        )
+        return Verification(success=self.fail_open, available=False)
+
+    # --- sync ---
+
+    def verify(self, token):
+        verification = self.cached(cache.get(self.cache_key(token)))
+        if verification is not None:
+            return verification
+        verification = self._verify(token)
+        value = self.remembered(verification)
+        if value is not None:
+            cache.set(self.cache_key(token), value, self.cache_seconds)
+        return verification
+
+    def _verify(self, token):
+        if not self.breaker.allow():
+            return self.unavailable('circuit open')
+        try:
+            verification = self._call(token)
+        except Unavailable as e:
+            self.breaker.record_failure()
+            return self.unavailable(e)
+        self.breaker.record_success()
+        return self.settled(verification)
+
+    def _call(self, token):
+        import requests
+
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff_delay(attempt))
+            try:
+                response = self.session.post(
+                    self.url, data=self.payload(token), timeout=(self.connect_timeout, self.read_timeout))
+                return self.interpret(response.status_code, response.json)
+            except requests.Timeout as e:
+                SITEVERIFY_CALLS.inc('timeout')
+                error = Unavailable(f'timed out: {e}')
+            except requests.RequestException as e:
+                SITEVERIFY_CALLS.inc('error')
+                error = Unavailable(f'request failed: {e}')
+            except Unavailable as e:
+                error = e
+                if not e.retry:
+                    break
+        raise error
+
+    # --- async ---
+
+    async def averify(self, token):
+        verification = self.cached(await cache.aget(self.cache_key(token)))
+        if verification is not None:
+            return verification
+        verification = await self._averify(token)
+        value = self.remembered(verification)
+        if value is not None:
+            await cache.aset(self.cache_key(token), value, self.cache_seconds)
+        return verification
+
+    async def _averify(self, token):
+        if not self.breaker.allow():
+            return self.unavailable('circuit open')
+        try:
+            verification = await self._acall(token)
+        except Unavailable as e:
+            self.breaker.record_failure()
+            return self.unavailable(e)
+        self.breaker.record_success()
+        return self.settled(verification)
+
+    async def _acall(self, token):
+        import httpx
+
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_delay(attempt))
+            try:
+                response = await self.async_client().post(self.url, data=self.payload(token))
+                return self.interpret(response.status_code, response.json)
+            except httpx.TimeoutException as e:
+                SITEVERIFY_CALLS.inc('timeout')
+                error = Unavailable(f'timed out: {e!r}')
+            except httpx.HTTPError as e:
+                SITEVERIFY_CALLS.inc('error')
+                error = Unavailable(f'request failed: {e!r}')
+            except Unavailable as e:
+                error = e
+                if not e.retry:
+                    break
+        raise error
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, built from settings on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SiteverifyClient.from_settings()
+    return _client
+
+
+def _reset_client(setting, **kwargs):
+    global _client
+    if setting.startswith('RECAPTCHA_'):
+        _client = None
+
+
+setting_changed.connect(_reset_client, dispatch_uid='api.recaptcha.reset_client')
+
+
+REGISTRY.gauge(
+    'recaptcha_circuit_open', '1 while the siteverify circuit breaker is open (or half-open).',
+    lambda: 0 if _client is None or _client.breaker.state == 'closed' else 1,
+)
+
+
+def verify(token):
+    return get_client().verify(token)
+
+
+async def averify(token):
+    return await get_client().averify(token)
@@ -0,0 +1,135 @@
+"""
+Primary/replica database routing (settings.REPLICA_DATABASES, built from
+DATABASE_REPLICA_URLS).
+
+Reads made while serving a request go to one replica, picked per request;
+writes, and every query outside a request (management commands, migrations,
+startup), go to the primary. Replicas lag behind the primary, so:
+
+- after the first write of a request, the rest of that request reads from
+  the primary (as does anything inside a transaction);
+- the user who wrote reads from the primary on their next requests for
+  REPLICA_STICKY_SECONDS. The user is recognised from the JWT or the session,
+  before their own row is loaded, so even that lookup sees their change.
+  Anonymous writers only get the first rule.
+
+Sessions, the database cache and SSE push events are always read from the
+primary: they are written on one request and read on the next.
+
+ReplicaRoutingMiddleware (api/middleware/replicas.py) marks the request
+boundaries.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from api.middleware.metrics import resolved_user_id
+
+
+PRIMARY = DEFAULT_DB_ALIAS
+# Apps written on one request and read on the next, by anyone
+PRIMARY_ONLY_APPS = frozenset({'sessions', 'django_cache', 'token_blacklist'})
+PRIMARY_ONLY_MODELS = frozenset({'api.pushevent'})
+STICKY_KEY_PREFIX = 'replicas:sticky:'
+
+_state = ContextVar('replica_routing', default=None)
+
+
+def request_user_id(request):
+    """Id of the user making the request, from what authentication has or will have - no user lookup"""
+    user_id = resolved_user_id(request)
+    if user_id is not None:
+        return str(user_id)
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            user_id = authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+        except (InvalidToken, TokenError):
+            return None
+        return str(user_id) if user_id is not None else None
+    session = getattr(request, 'session', None)
+    if session is not None and settings.SESSION_COOKIE_NAME in request.COOKIES:
+        user_id = session.get(SESSION_KEY)
+        return str(user_id) if user_id is not None else None
+    return None
+
+
+class RoutingState:
+    """Routing decisions for one request"""
+
+    def __init__(self, request, replica):
+        self.request = request
+        self.replica = replica
+        self.wrote = False
+        self._pinned = None
+
+    @property
+    def pinned(self):
+        """Read from the primary: the request wrote, or its user wrote recently"""
+        if self._pinned is None:
+            # Decided on the first read, so requests answered without the database skip it
+            user_id = request_user_id(self.request)
+            self._pinned = user_id is not None and cache.get(STICKY_KEY_PREFIX + user_id) is not None
+        return self._pinned
+
+    def record_write(self):
+        self.wrote = True
+        self._pinned = True
+
+    def finish(self):
+        """Keep the user who wrote on the primary for their next requests"""
+        if not self.wrote:
+            return
+        user_id = request_user_id(self.request)
+        if user_id is not None:
+            cache.set(STICKY_KEY_PREFIX + user_id, True, getattr(settings, 'REPLICA_STICKY_SECONDS', 15))
+
+
+@contextmanager
+def request_routing(request):
+    """Route the queries made within the block on behalf of ``request``"""
+    state = RoutingState(request, random.choice(settings.REPLICA_DATABASES))
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def primary_only(model):
+    return model._meta.app_label in PRIMARY_ONLY_APPS or model._meta.label_lower in PRIMARY_ONLY_MODELS
+
+
+class PrimaryReplicaRouter:
+    """DATABASE_ROUTERS entry; core/settings.py installs it when replicas are configured"""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or primary_only(model):
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block or state.pinned:
+            return PRIMARY
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and not primary_only(model):
+            state.record_write()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
@@ -1,7 +1,14 @@
+import logging
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Billing, Post, Message, Subdivision, Pin, UserProfile, Booking, Facility, AvailableSlot, Maintenance, MaintenanceRequest, MaintenanceProvider, News, Alert, ContactInfo, ContactMessage, Review, House, HouseImage, FAQ, ServiceFee, BlogComment, Bulletin, BulletinComment, CommunityMedia, VisitorRequest
+from django.db import IntegrityError, transaction
+from .models import Billing, Post, Message, Subdivision, Pin, UserProfile, Booking, Facility, AvailableSlot, Maintenance, MaintenanceRequest, MaintenanceProvider, News, Alert, ContactInfo, ContactMessage, Review, House, HouseImage, FAQ, ServiceFee, BlogComment, Bulletin, BulletinComment, CommunityMedia, VisitorRequest, AuditLogEntry
 from simple_history.models import HistoricalRecords
+from .service_fee_utils import normalize_month
+
+
+logger = logging.getLogger(__name__)
 
 
 class PostSerializer(serializers.ModelSerializer):
@@ -281,8 +288,7 @@ class BookingSerializer(serializers.ModelSerializer):
         except Exception as e:
             # Silently fail and return default
             import traceback
-            print(f"Error in get_facility_name: {e}")
-            print(traceback.format_exc())
+            logger.error("Error in get_facility_name: %s", e, exc_info=True)
         
         return "Unknown Facility"
     
@@ -301,8 +307,7 @@ class BookingSerializer(serializers.ModelSerializer):
             return super().to_representation(instance)
         except Exception as e:
             import traceback
-            print(f"[ERROR] Error in to_representation: {e}")
-            print(traceback.format_exc())
+            logger.error("Error in to_representation: %s", e, exc_info=True)
             # Return minimal representation
             return {
                 'id': getattr(instance, 'id', None),
@@ -465,6 +470,18 @@ class HistoricalRecordSerializer(serializers.ModelSerializer):
             return 'Unknown'
 
 
+class AuditLogEntrySerializer(serializers.ModelSerializer):
+    """Row of the unified activity log (same shape as HistoricalRecordSerializer)"""
+    history_user = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AuditLogEntry
+        fields = ['id', 'history_id', 'object_id', 'history_date', 'history_type', 'history_user', 'model_name']
+
+    def get_history_user(self, obj):
+        return obj.history_username or 'System'
+
+
 class VisitorRequestSerializer(serializers.ModelSerializer):
     """Serializer for Visitor Request with one-time PIN"""
     resident_username = serializers.SerializerMethodField()
@@ -505,11 +522,8 @@ class VisitorRequestSerializer(serializers.ModelSerializer):
         except Exception as e:
             # If serialization fails, log and return minimal safe data
             import traceback
-            import logging
-            logger = logging.getLogger(__name__)
             error_msg = f"Serialization error for VisitorRequest {getattr(instance, 'id', 'unknown')}: {str(e)}"
-            logger.error(error_msg)
-            traceback.print_exc()
+            logger.error(error_msg, exc_info=True)
             
             # Return minimal safe representation
             try:
@@ -528,7 +542,7 @@ class VisitorRequestSerializer(serializers.ModelSerializer):
                     'error': 'Partial data due to serialization error'
                 }
             except Exception as fallback_error:
-                logger.error(f"Fallback serialization also failed: {fallback_error}")
+                logger.error("Fallback serialization also failed: %s", fallback_error)
                 return {
                     'id': getattr(instance, 'id', None),
                     'error': 'Serialization failed'
@@ -655,7 +669,7 @@ class HouseImageSerializer(serializers.ModelSerializer):
                     return request.build_absolute_uri(obj.image.url)
                 return obj.image.url
             except Exception as e:
-                print(f"[WARNING] Failed to build image URL: {e}")
+                logger.warning("Failed to build image URL: %s", e)
                 return obj.image.url if obj.image else None
         return None
 
@@ -671,62 +685,42 @@ class HouseSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['user', 'created_at', 'images']  # images is read-only, handled separately in views
     
+    def _house_images(self, obj):
+        """
+        The house's images in display order. Uses the views'
+        Prefetch('images', ...) when present - list endpoints would otherwise
+        run two queries per house - and queries the table otherwise.
+        """
+        prefetched = getattr(obj, '_prefetched_objects_cache', {})
+        if 'images' in prefetched:
+            return sorted(prefetched['images'], key=lambda image: (image.order, image.created_at))
+        return list(HouseImage.objects.filter(house_id=obj.pk).order_by('order', 'created_at'))
+
     def get_images(self, obj):
-        """Safely get images relation - ALWAYS query database to ensure we get images"""
+        """Serialized images of the house"""
         try:
-            if not hasattr(obj, 'images'):
-                print(f"[SERIALIZER] House {obj.pk} has no 'images' attribute")
-                return []
-            
-            # ALWAYS query directly from database to ensure we get the latest images
-            # Don't rely on prefetch cache which might be stale
-            from .models import HouseImage
-            try:
-                images_list = list(HouseImage.objects.filter(house_id=obj.pk).order_by('order', 'created_at'))
-                print(f"[SERIALIZER] House {obj.pk} - Queried {len(images_list)} images from database")
-                
-                if images_list:
-                    serialized = HouseImageSerializer(images_list, many=True, context=self.context).data
-                    print(f"[SERIALIZER] House {obj.pk} - Serialized {len(serialized)} images")
-                    return serialized
-                else:
-                    print(f"[SERIALIZER] House {obj.pk} - No images found in database")
-            except Exception as e:
-                print(f"[ERROR] Error querying images for house {obj.pk}: {e}")
-                import traceback
-                print(traceback.format_exc())
+            images_list = self._house_images(obj)
+            if images_list:
+                return HouseImageSerializer(images_list, many=True, context=self.context).data
         except Exception as e:
-            print(f"[ERROR] Error in get_images for house {obj.pk if hasattr(obj, 'pk') else 'unknown'}: {e}")
+            logger.error("Error in get_images for house %s: %s", obj.pk if hasattr(obj, 'pk') else 'unknown', e)
         return []
     
     def get_image_urls(self, obj):
-        """Get list of image URLs for easy frontend access - ALWAYS query database"""
+        """Get list of image URLs for easy frontend access"""
         request = self.context.get('request')
         image_urls = []
         
-        # ALWAYS query directly from database to ensure we get the latest images
         try:
-            from .models import HouseImage
-            # Query directly using house_id to avoid any relationship cache issues
-            images_list = list(HouseImage.objects.filter(house_id=obj.pk).order_by('order', 'created_at'))
-            print(f"[SERIALIZER] get_image_urls - House {obj.pk}: Found {len(images_list)} images in database")
-            
-            for house_image in images_list:
+            for house_image in self._house_images(obj):
                 if house_image and house_image.image:
                     try:
                         image_url = house_image.image.url
-                        if request:
-                            full_url = request.build_absolute_uri(image_url)
-                            image_urls.append(full_url)
-                            print(f"[SERIALIZER] Added image URL: {full_url}")
-                        else:
-                            image_urls.append(image_url)
+                        image_urls.append(request.build_absolute_uri(image_url) if request else image_url)
                     except Exception as e:
-                        print(f"[ERROR] Failed to get image URL for HouseImage {house_image.id}: {e}")
+                        logger.error("Failed to get image URL for HouseImage %s: %s", house_image.id, e)
         except Exception as e:
-            print(f"[ERROR] Error in get_image_urls for house {obj.pk}: {e}")
-            import traceback
-            print(traceback.format_exc())
+            logger.error("Error in get_image_urls for house %s: %s", obj.pk, e, exc_info=True)
         
         # Include the main image if it exists (for backward compatibility) - only if no images found
         if len(image_urls) == 0 and hasattr(obj, 'image') and obj.image:
@@ -738,7 +732,6 @@ class HouseSerializer(serializers.ModelSerializer):
             except Exception:
                 pass
         
-        print(f"[SERIALIZER] get_image_urls - House {obj.pk}: Returning {len(image_urls)} image URLs")
         return image_urls
 
 # serializers.py
@@ -776,6 +769,7 @@ class ServiceFeeSerializer(serializers.ModelSerializer):
     homeowner_name = serializers.CharField(source='homeowner.username', read_only=True)
     homeowner_email = serializers.CharField(source='homeowner.email', read_only=True)
     homeowner_id = serializers.IntegerField(source='homeowner.id', read_only=True)
+    effective_status = serializers.SerializerMethodField()
 
     class Meta:
         model = ServiceFee
@@ -783,10 +777,44 @@ class ServiceFeeSerializer(serializers.ModelSerializer):
             'id', 'homeowner', 'homeowner_id', 'homeowner_name', 'homeowner_email',
             'bill_image', 'receipt_image', 'policy_image',
             'bill_image_url', 'receipt_image_url', 'policy_image_url',
-            'amount', 'due_date', 'status', 'month', 'year', 
+            'amount', 'due_date', 'status', 'effective_status', 'month', 'year', 
             'notes', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at', 'homeowner_id', 'homeowner_name', 'homeowner_email']
+        # month and year stay optional; the one-bill-per-period rule is checked in validate()
+        validators = []
+
+    def validate_month(self, value):
+        if not value:
+            return None
+        try:
+            return normalize_month(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    def validate(self, attrs):
+        period = {
+            field: attrs.get(field, getattr(self.instance, field, None))
+            for field in ('homeowner', 'month', 'year')
+        }
+        if None not in period.values():
+            duplicates = ServiceFee.objects.filter(**period)
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError("This homeowner already has a service fee for this month and year.")
+        return attrs
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            # Created concurrently after validate() looked
+            raise serializers.ValidationError("This homeowner already has a service fee for this month and year.")
+
+    def get_effective_status(self, obj):
+        return obj.get_effective_status()
 
     def get_bill_image_url(self, obj):
         request = self.context.get('request')
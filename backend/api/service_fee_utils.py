@@ -0,0 +1,362 @@
+"""
+Utility functions for Service Fee issuance and notification emails
+"""
+import calendar
+import logging
+import threading
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, Max, Min, OuterRef, Q, Subquery, Sum, Value, When, CharField
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import AuditLogEntry, ServiceFee
+from . import events
+from .caching import bump_version
+
+
+logger = logging.getLogger(__name__)
+
+
+# Cache namespace for the financial summary; bumped on every ServiceFee write
+SUMMARY_CACHE_NAMESPACE = 'service-fee-summary'
+
+AGING_BUCKETS = ('0-30', '31-60', '60+')
+
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+AMOUNT_RULES = ('flat', 'previous')
+
+
+def normalize_month(value):
+    """Accept 1-12, 'January' or 'jan' and return the month name stored on ServiceFee.month"""
+    text = str(value).strip()
+    if text.isdigit() and 1 <= int(text) <= 12:
+        return MONTH_NAMES[int(text) - 1]
+    for name in MONTH_NAMES:
+        if name.lower() == text.lower() or name[:3].lower() == text.lower():
+            return name
+    raise ValueError(f"Invalid month: {value}")
+
+
+def parse_amount(value):
+    if value is None or value == '':
+        return None
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value}")
+    if amount < 0:
+        raise ValueError("Amount cannot be negative")
+    return amount
+
+
+def eligible_homeowners():
+    """Verified, active, non-staff users - the same audience that can see service fees"""
+    return User.objects.filter(is_staff=False, is_active=True, profile__is_verified=True)
+
+
+def build_service_fee_email(service_fee):
+    """Subject, plain text and HTML for the 'new service fee' notification"""
+    homeowner_name = service_fee.homeowner.username or 'Homeowner'
+    amount = service_fee.amount or 'N/A'
+    due_date = service_fee.due_date.strftime('%Y-%m-%d') if service_fee.due_date else 'N/A'
+    month = service_fee.month or 'N/A'
+    year = service_fee.year or ''
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
+
+    subject = f"New Service Fee Bill - {service_fee.month or 'Monthly'} {service_fee.year or ''}"
+    html_message = f"""
+                <html>
+                <body>
+                    <h2>New Service Fee Bill</h2>
+                    <p>Dear {homeowner_name},</p>
+                    <p>A new service fee bill has been uploaded for your account.</p>
+                    <p><strong>Amount:</strong> ₱{amount}</p>
+                    <p><strong>Due Date:</strong> {due_date}</p>
+                    <p><strong>Billing Period:</strong> {month} {year}</p>
+                    <p><strong>Status:</strong> {service_fee.get_status_display()}</p>
+                    <p>Please log in to your account to view the bill and make payment.</p>
+                    <p><a href="{frontend_url}/billing">View Your Bills</a></p>
+                    <p>Thank you,<br>Happy Homes Administration</p>
+                </body>
+                </html>
+                """
+    return subject, strip_tags(html_message), html_message
+
+
+def send_service_fee_notifications(fee_ids, chunk_size=50):
+    """
+    Email homeowners about newly issued fees, reusing one SMTP connection per
+    chunk instead of opening one per message. Returns the number sent.
+    """
+    sent = 0
+    fee_ids = list(fee_ids)
+    for start in range(0, len(fee_ids), chunk_size):
+        fees = (
+            ServiceFee.objects
+            .filter(pk__in=fee_ids[start:start + chunk_size])
+            .select_related('homeowner')
+        )
+        messages = []
+        for fee in fees:
+            if not fee.homeowner.email:
+                continue
+            subject, plain_message, html_message = build_service_fee_email(fee)
+            message = EmailMultiAlternatives(
+                subject=subject,
+                body=plain_message,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[fee.homeowner.email],
+            )
+            message.attach_alternative(html_message, 'text/html')
+            messages.append(message)
+        if not messages:
+            continue
+        try:
+            connection = get_connection(fail_silently=True)
+            sent += connection.send_messages(messages) or 0
+        except Exception as e:
+            logger.error("Failed to send service fee notifications: %s", e)
+    return sent
+
+
+def queue_service_fee_notifications(fee_ids):
+    """Send the notifications on a background thread once the transaction commits"""
+    fee_ids = list(fee_ids)
+    if not fee_ids:
+        return
+
+    def _start():
+        threading.Thread(
+            target=send_service_fee_notifications,
+            args=(fee_ids,),
+            name='service-fee-notifications',
+            daemon=True,
+        ).start()
+
+    transaction.on_commit(_start)
+
+
+def issue_monthly_service_fees(month, year, due_date, amount=None, amount_rule='flat',
+                               overrides=None, notes=None, issued_by=None,
+                               batch_size=500, dry_run=False):
+    """
+    Create one ServiceFee per eligible homeowner for the billing month.
+
+    amount_rule:
+        flat     -> every homeowner is billed ``amount``
+        previous -> each homeowner's most recent fee amount, falling back to ``amount``
+    overrides: optional {homeowner_id: amount}
+
+    Homeowners who already have a fee for the month/year are skipped (also
+    enforced by the service_fee_unique_period constraint). Fees and their
+    history rows are written with bulk_create in batches.
+
+    Returns {'created': [ids], 'skipped': n, 'without_amount': n, 'eligible': n}
+    """
+    month = normalize_month(month)
+    year = int(year)
+    if amount_rule not in AMOUNT_RULES:
+        raise ValueError(f"Invalid amount rule: {amount_rule}. Use one of: {', '.join(AMOUNT_RULES)}")
+    default_amount = parse_amount(amount)
+    overrides = {int(k): parse_amount(v) for k, v in (overrides or {}).items()}
+
+    homeowners = eligible_homeowners().order_by('pk')
+    if amount_rule == 'previous':
+        latest_amount = (
+            ServiceFee.objects
+            .filter(homeowner=OuterRef('pk'), amount__isnull=False)
+            .order_by('-due_date', '-created_at')
+            .values('amount')[:1]
+        )
+        homeowners = homeowners.annotate(previous_amount=Subquery(latest_amount))
+        rows = homeowners.values_list('pk', 'previous_amount')
+    else:
+        rows = ((pk, None) for pk in homeowners.values_list('pk', flat=True))
+
+    already_billed = set(
+        ServiceFee.objects.filter(month=month, year=year).values_list('homeowner_id', flat=True)
+    )
+
+    result = {'created': [], 'skipped': 0, 'without_amount': 0, 'eligible': 0}
+    pending = []
+    for homeowner_id, previous_amount in rows:
+        result['eligible'] += 1
+        if homeowner_id in already_billed:
+            result['skipped'] += 1
+            continue
+        # An override or previous amount of 0 (a waived fee) is an amount, not a missing one
+        fee_amount = overrides.get(homeowner_id)
+        if fee_amount is None:
+            fee_amount = previous_amount if previous_amount is not None else default_amount
+        if fee_amount is None:
+            result['without_amount'] += 1
+        pending.append(ServiceFee(
+            homeowner_id=homeowner_id,
+            amount=fee_amount,
+            due_date=due_date,
+            status='unpaid',
+            month=month,
+            year=year,
+            notes=notes,
+        ))
+
+    if dry_run:
+        result['would_create'] = len(pending)
+        return result
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        try:
+            created = _create_batch(batch, issued_by)
+        except IntegrityError:
+            # Another issuance run got there first; drop the now-duplicate rows and retry once
+            taken = set(
+                ServiceFee.objects
+                .filter(month=month, year=year, homeowner_id__in=[fee.homeowner_id for fee in batch])
+                .values_list('homeowner_id', flat=True)
+            )
+            retry = [fee for fee in batch if fee.homeowner_id not in taken]
+            result['skipped'] += len(batch) - len(retry)
+            for fee in retry:
+                fee.pk = None
+            created = _create_batch(retry, issued_by) if retry else []
+        result['created'].extend(fee.pk for fee in created)
+    if result['created']:
+        # bulk_create bypasses the post_save receiver that normally does this
+        invalidate_financial_summary()
+    return result
+
+
+def _create_batch(batch, issued_by):
+    """bulk_create fees + their history/audit rows, and publish the SSE events"""
+    with transaction.atomic():
+        created = ServiceFee.objects.bulk_create(batch)
+        history_rows = ServiceFee.history.bulk_history_create(created, default_user=issued_by) or []
+        AuditLogEntry.objects.bulk_create(
+            [AuditLogEntry.from_history_record(row) for row in history_rows if row.pk],
+            ignore_conflicts=True,
+        )
+        for fee in created:
+            events.publish(events.user_channel(fee.homeowner_id), 'service_fee.issued', {
+                'id': fee.id,
+                'amount': fee.amount,
+                'due_date': fee.due_date,
+                'month': fee.month,
+                'year': fee.year,
+                'status': fee.status,
+            })
+    return created
+
+
+# ====================================================
+# Financial summary / aging report
+# ====================================================
+
+def invalidate_financial_summary():
+    bump_version(SUMMARY_CACHE_NAMESPACE)
+
+
+def build_financial_summary(year=None, today=None):
+    """
+    Totals and counts per year / month / effective status plus overdue aging
+    buckets, computed from a single grouped query.
+    """
+    from datetime import timedelta
+    today = today or timezone.localdate()
+
+    queryset = ServiceFee.objects.order_by().with_effective_status(today)
+    if year:
+        queryset = queryset.filter(year=year)
+
+    queryset = queryset.annotate(
+        aging_bucket=Case(
+            When(~Q(effective_status='delayed'), then=Value('')),
+            When(due_date__gte=today - timedelta(days=30), then=Value('0-30')),
+            When(due_date__gte=today - timedelta(days=60), then=Value('31-60')),
+            default=Value('60+'),
+            output_field=CharField(),
+        )
+    )
+    rows = (
+        queryset
+        .values('year', 'month', 'effective_status', 'aging_bucket')
+        .annotate(count=Count('id'), total=Sum('amount'))
+    )
+
+    def _empty_totals():
+        return {'count': 0, 'total': Decimal('0')}
+
+    overall = {status: _empty_totals() for status in ('unpaid', 'delayed', 'paid')}
+    aging = {bucket: _empty_totals() for bucket in AGING_BUCKETS}
+    periods = {}
+    for row in rows:
+        total = row['total'] or Decimal('0')
+        status = row['effective_status']
+
+        overall.setdefault(status, _empty_totals())
+        overall[status]['count'] += row['count']
+        overall[status]['total'] += total
+
+        if row['aging_bucket']:
+            aging[row['aging_bucket']]['count'] += row['count']
+            aging[row['aging_bucket']]['total'] += total
+
+        period_key = (row['year'], row['month'])
+        period = periods.setdefault(period_key, {
+            'year': row['year'],
+            'month': row['month'],
+            'count': 0,
+            'total': Decimal('0'),
+            'by_status': {},
+        })
+        period['count'] += row['count']
+        period['total'] += total
+        by_status = period['by_status'].setdefault(status, _empty_totals())
+        by_status['count'] += row['count']
+        by_status['total'] += total
+
+    month_order = {name: index for index, name in enumerate(MONTH_NAMES, start=1)}
+    ordered_periods = sorted(
+        periods.values(),
+        key=lambda period: (period['year'] or 0, month_order.get(period['month'], 0)),
+        reverse=True,
+    )
+    outstanding = overall['unpaid']['total'] + overall['delayed']['total']
+    return {
+        'as_of': today.isoformat(),
+        'year': year,
+        'totals': {
+            'by_status': overall,
+            'billed': sum((item['total'] for item in overall.values()), Decimal('0')),
+            'collected': overall['paid']['total'],
+            'outstanding': outstanding,
+        },
+        'aging': aging,
+        'periods': ordered_periods,
+    }
+
+
+def outstanding_balances_queryset(today=None):
+    """Per-homeowner unpaid balance (largest first), one grouped query"""
+    today = today or timezone.localdate()
+    return (
+        ServiceFee.objects
+        .order_by()
+        .exclude(status='paid')
+        .values('homeowner_id', 'homeowner__username', 'homeowner__email')
+        .annotate(
+            outstanding=Sum('amount'),
+            unpaid_fees=Count('id'),
+            overdue_fees=Count('id', filter=Q(due_date__lt=today)),
+            oldest_due_date=Min('due_date'),
+            latest_due_date=Max('due_date'),
+        )
+        .order_by('-outstanding', 'homeowner_id')
+    )
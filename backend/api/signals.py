@@ -1,6 +1,11 @@
+import logging
+
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from api.models import Pin, Facility, Booking
+from api.models import Pin, Facility, Booking, ResidentPin
+
+
+logger = logging.getLogger(__name__)
 
 
 # Auto-create default facilities when a Pin is added
@@ -19,9 +24,9 @@ def notify_booking_created(sender, instance, created, **kwargs):
     if created:
         try:
             facility_name = instance.facility.get_name_display() if hasattr(instance, 'facility') and instance.facility else "Unknown"
-            print(f"[INFO] New booking: {instance.user.username} booked {facility_name}")
+            logger.debug("New booking: %s booked %s", instance.user.username, facility_name)
         except Exception as e:
-            print(f"[INFO] New booking created (ID: {instance.id})")
+            logger.debug("New booking created (ID: %s)", instance.id)
 
 # Log booking deletion - completely safe, no relationship access
 @receiver(post_delete, sender=Booking)
@@ -31,7 +36,197 @@ def notify_booking_deleted(sender, instance, **kwargs):
         booking_id = getattr(instance, 'id', 'N/A')
         user_id = getattr(instance, 'user_id', None)
         facility_id = getattr(instance, 'facility_id', None)
-        print(f"[INFO] Booking deleted (ID: {booking_id}, User ID: {user_id}, Facility ID: {facility_id})")
+        logger.debug("Booking deleted (ID: %s, User ID: %s, Facility ID: %s)", booking_id, user_id, facility_id)
     except Exception as e:
         # Even if getting attributes fails, just log the deletion
-        print(f"[INFO] Booking deleted (error getting details: {e})")
+        logger.debug("Booking deleted (error getting details: %s)", e)
+
+
+# ====================================================
+# SSE push events (see api/events.py)
+# ====================================================
+from django.db.models.signals import post_init
+from api.models import Alert, ServiceFee, Visitor, VisitorRequest
+from api import events
+
+
+def _remember_status(sender, instance, **kwargs):
+    # Snapshot the loaded status so post_save can tell whether it changed.
+    # Read from __dict__ so deferred fields are not fetched.
+    instance._initial_status = instance.__dict__.get('status')
+
+
+for _model in (Booking, Visitor, VisitorRequest):
+    post_init.connect(_remember_status, sender=_model, dispatch_uid=f'sse_status_{_model.__name__}')
+
+
+def _status_changed(instance, created):
+    changed = created or instance.status != getattr(instance, '_initial_status', None)
+    instance._initial_status = instance.status
+    return changed
+
+
+@receiver(post_save, sender=Visitor)
+def push_visitor_event(sender, instance, created, **kwargs):
+    if not _status_changed(instance, created):
+        return
+    data = {
+        'id': instance.id,
+        'name': instance.name,
+        'status': instance.status,
+        'time_in': instance.time_in,
+        'time_out': instance.time_out,
+    }
+    event_type = f'visitor.{instance.status}'
+    resident_user_id = (
+        ResidentPin.objects.filter(pk=instance.resident_id).values_list('user_id', flat=True).first()
+        if instance.resident_id else None
+    )
+    if resident_user_id:
+        events.publish(events.user_channel(resident_user_id), event_type, data)
+    events.publish(events.visitor_channel(instance.id), event_type, data)
+
+
+@receiver(post_save, sender=VisitorRequest)
+def push_visitor_request_event(sender, instance, created, **kwargs):
+    if not _status_changed(instance, created):
+        return
+    events.publish(events.user_channel(instance.resident_id), f'visitor_request.{instance.status}', {
+        'id': instance.id,
+        'visitor_name': instance.visitor_name,
+        'status': instance.status,
+        'visit_date': instance.visit_date,
+    })
+
+
+@receiver(post_save, sender=Booking)
+def push_booking_status_event(sender, instance, created, **kwargs):
+    if created or not _status_changed(instance, created):
+        return
+    events.publish(events.user_channel(instance.user_id), 'booking.status', {
+        'id': instance.id,
+        'facility_id': instance.facility_id,
+        'date': instance.date,
+        'start_time': instance.start_time,
+        'end_time': instance.end_time,
+        'status': instance.status,
+    })
+
+
+@receiver(post_save, sender=ServiceFee)
+def push_service_fee_event(sender, instance, created, **kwargs):
+    if not created:
+        return
+    events.publish(events.user_channel(instance.homeowner_id), 'service_fee.issued', {
+        'id': instance.id,
+        'amount': instance.amount,
+        'due_date': instance.due_date,
+        'month': instance.month,
+        'year': instance.year,
+        'status': instance.status,
+    })
+
+
+@receiver(post_save, sender=Pin)
+def push_pin_saved_event(sender, instance, created, **kwargs):
+    events.publish(events.PUBLIC_CHANNEL, 'pin.created' if created else 'pin.updated', {
+        'id': instance.id,
+        'name': instance.name,
+        'latitude': instance.latitude,
+        'longitude': instance.longitude,
+        'status': instance.status,
+    })
+
+
+@receiver(post_delete, sender=Pin)
+def push_pin_deleted_event(sender, instance, **kwargs):
+    events.publish(events.PUBLIC_CHANNEL, 'pin.deleted', {'id': instance.id})
+
+
+@receiver(post_save, sender=Alert)
+def push_alert_event(sender, instance, created, **kwargs):
+    events.publish(events.PUBLIC_CHANNEL, 'alert.created' if created else 'alert.updated', {
+        'id': instance.id,
+        'title': instance.title,
+        'message': instance.message,
+        'severity': instance.severity,
+        'is_active': instance.is_active,
+    })
+
+
+@receiver(post_delete, sender=Alert)
+def push_alert_deleted_event(sender, instance, **kwargs):
+    events.publish(events.PUBLIC_CHANNEL, 'alert.deleted', {'id': instance.id})
+
+
+# ====================================================
+# Audit log index (see AuditLogEntry)
+# ====================================================
+from simple_history.signals import post_create_historical_record
+from api.models import AuditLogEntry
+
+
+@receiver(post_create_historical_record)
+def index_history_record(sender, history_instance, using=None, **kwargs):
+    if history_instance.instance_type._meta.app_label != 'api':
+        return
+    AuditLogEntry.from_history_record(history_instance).save(using=using)
+
+
+# ====================================================
+# Service fee financial summary cache
+# ====================================================
+from api.service_fee_utils import invalidate_financial_summary
+
+
+@receiver(post_save, sender=ServiceFee)
+@receiver(post_delete, sender=ServiceFee)
+def invalidate_service_fee_summary(sender, **kwargs):
+    invalidate_financial_summary()
+
+
+# ====================================================
+# Public response cache (see api/caching.py)
+# ====================================================
+from django.apps import apps
+from django.db import transaction
+from api.caching import PUBLIC_RESPONSE_DEPENDENCIES, bump_version
+
+
+def _public_response_invalidator(namespaces):
+    def invalidate(sender, update_fields=None, **kwargs):
+        # Logins only touch last_login, which no cached endpoint exposes
+        if update_fields and set(update_fields) <= {'last_login'}:
+            return
+        # After commit, so a concurrent reader cannot re-cache the old rows
+        transaction.on_commit(lambda: [bump_version(namespace) for namespace in namespaces])
+    return invalidate
+
+
+_public_response_dependents = {}
+for _namespace, _labels in PUBLIC_RESPONSE_DEPENDENCIES.items():
+    for _label in _labels:
+        _public_response_dependents.setdefault(_label, []).append(_namespace)
+
+for _label, _namespaces in _public_response_dependents.items():
+    _handler = _public_response_invalidator(tuple(_namespaces))
+    _model = apps.get_model(_label)
+    post_save.connect(_handler, sender=_model, weak=False, dispatch_uid=f'public-response-cache-save:{_label}')
+    post_delete.connect(_handler, sender=_model, weak=False, dispatch_uid=f'public-response-cache-delete:{_label}')
+
+
+# ====================================================
+# Model versions for conditional GET (see api/conditional.py)
+# ====================================================
+from api.caching import is_versioned_model, model_namespace
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_model_version(sender, update_fields=None, **kwargs):
+    if not is_versioned_model(sender):
+        return
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    namespace = model_namespace(sender)
+    transaction.on_commit(lambda: bump_version(namespace))
@@ -0,0 +1,175 @@
+"""
+Server-Sent Events endpoint backed by the event broker in api/events.py.
+
+Only served under ASGI (core/asgi.py); the async generator below would be
+consumed eagerly by a WSGI server, so WSGI requests get a 503 instead.
+
+EventSource cannot set headers, so a browser opens its user's stream with a
+one-time ticket in the query string (POST /api/events/ticket/) rather than its
+JWT, which would otherwise end up in access logs and proxies. A ticket is used
+up by the stream it opens: when that stream ends, the client asks for a new
+ticket and reconnects with ?last_event_id=.
+"""
+import asyncio
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import events
+
+
+TICKET_KEY_PREFIX = 'sse-ticket:'
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def stream_ticket(request):
+    """
+    POST /api/events/ticket/
+
+    A one-time ticket that opens the current user's event stream
+    (GET /api/events/?ticket=...) within SSE_TICKET_SECONDS.
+    """
+    ticket = secrets.token_urlsafe(32)
+    timeout = getattr(settings, 'SSE_TICKET_SECONDS', 30)
+    cache.set(f'{TICKET_KEY_PREFIX}{ticket}', request.user.pk, timeout=timeout)
+    return Response({'ticket': ticket, 'expires_in': timeout})
+
+
+def _redeem_ticket(ticket):
+    """The active user the ticket was issued to, or None; either way it cannot be used again"""
+    key = f'{TICKET_KEY_PREFIX}{ticket}'
+    user_id = cache.get(key)
+    # delete() is True for one caller only, so two streams cannot share a ticket
+    if user_id is None or not cache.delete(key):
+        return None
+    return user_id if User.objects.filter(pk=user_id, is_active=True).exists() else None
+
+
+def _resolve_user_id(request):
+    """Authenticate via the Authorization header or the session."""
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header else None
+    if raw_token:
+        try:
+            user = authenticator.get_user(authenticator.get_validated_token(raw_token))
+        except (InvalidToken, TokenError):
+            return None
+        return user.pk if user and user.is_active else None
+
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def _resolve_visitor_id(request):
+    """Guests subscribe to their own check-in by visitor id + the gmail they entered."""
+    from .models import Visitor
+
+    visitor_id = request.GET.get('visitor')
+    gmail = request.GET.get('gmail')
+    if not visitor_id or not gmail:
+        return None
+    try:
+        return Visitor.objects.filter(pk=int(visitor_id), gmail__iexact=gmail).values_list('pk', flat=True).first()
+    except (TypeError, ValueError):
+        return None
+
+
+def _last_event_id(request):
+    raw = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+async def _stream(channels, last_event_id):
+    heartbeat = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+    max_duration = getattr(settings, 'SSE_MAX_STREAM_SECONDS', 300)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_duration
+    subscription = events.broker.subscribe(channels, loop)
+    try:
+        # Reconnect delay the browser should use once this stream ends
+        yield f"retry: {getattr(settings, 'SSE_RETRY_MILLISECONDS', 3000)}\n\n"
+        replayed = set()
+        if last_event_id is not None:
+            for event in await sync_to_async(events.broker.replay)(channels, last_event_id):
+                replayed.add(event['id'])
+                yield events.format_sse(event)
+        while loop.time() < deadline:
+            try:
+                event = await subscription.get(timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            # Stored after subscribing but before the replay: already sent
+            if event['id'] not in replayed:
+                yield events.format_sse(event)
+    finally:
+        # The stream has a bounded lifetime so connections dropped by the
+        # client are released; EventSource reconnects with Last-Event-ID.
+        subscription.close()
+
+
+async def event_stream(request):
+    """
+    GET /api/events/
+
+    Public events (pins, alerts) for everyone, plus per-user events for a
+    ?ticket= from POST /api/events/ticket/ (or a JWT in the Authorization
+    header) and a guest visitor channel when ?visitor=<id>&gmail=<email>
+    match a check-in.
+    """
+    # django.views.decorators.http.require_GET only wraps sync views in 4.2
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'detail': 'The event stream is only available when served through ASGI (core.asgi:application).'},
+            status=503,
+        )
+
+    if 'token' in request.GET:
+        return JsonResponse(
+            {'detail': 'Open the stream with a ticket from POST /api/events/ticket/, not an access token.'},
+            status=400,
+        )
+    ticket = request.GET.get('ticket')
+    if ticket:
+        user_id = await sync_to_async(_redeem_ticket)(ticket)
+        if user_id is None:
+            # Not a silent downgrade to the public stream: the client gets a new ticket
+            return JsonResponse({'detail': 'The stream ticket is invalid, expired or already used.'}, status=401)
+    else:
+        user_id = await sync_to_async(_resolve_user_id)(request)
+
+    channels = {events.PUBLIC_CHANNEL}
+    if user_id:
+        channels.add(events.user_channel(user_id))
+    visitor_id = await sync_to_async(_resolve_visitor_id)(request)
+    if visitor_id:
+        channels.add(events.visitor_channel(visitor_id))
+
+    response = StreamingHttpResponse(
+        _stream(channels, _last_event_id(request)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies (nginx / Render) from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
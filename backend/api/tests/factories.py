@@ -0,0 +1,184 @@
+"""
+Plain factory helpers for tests - no factory_boy dependency.
+
+``seed(n)`` builds a realistic slice of the subdivision: ``n`` rows of every
+listed model, spread over several residents (including the one the tests log
+in as), with the related rows serializers walk (house images, comments,
+billing files, likes). File fields only store a name; nothing is written to
+MEDIA_ROOT.
+"""
+import datetime
+import itertools
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from api.models import (
+    FAQ, Alert, AvailableSlot, Billing, BillingRecord, BlogComment, Booking, Bulletin, BulletinComment,
+    CommunityMedia, CommunityMediaLike, ContactInfo, ContactMessage, Facility, House, HouseImage, Maintenance,
+    MaintenanceProvider, MaintenanceRequest, Message, News, Pin, Post, ResidentPin, Review, ServiceFee,
+    Subdivision, Visitor, VisitorRequest,
+)
+
+
+PASSWORD = 'secret-pass'
+
+_sequence = itertools.count(1)
+
+
+def _next():
+    return next(_sequence)
+
+
+def make_user(username=None, is_staff=False, verified=True, **extra):
+    number = _next()
+    username = username or f'user{number}'
+    create = User.objects.create_superuser if is_staff else User.objects.create_user
+    user = create(username, f'{username}@example.com', PASSWORD, first_name='Juan', last_name=f'Dela Cruz {number}', **extra)
+    profile = user.profile
+    profile.contact_number = f'+6391700{number:05d}'[:14]
+    profile.is_verified = verified
+    profile.document = f'documents/{username}.pdf'
+    profile.save()
+    return user
+
+
+def make_resident_pin(user):
+    return ResidentPin.objects.create(user=user, pin=f'{_next() % 1000000:06d}')
+
+
+def make_house(user, images=3):
+    number = _next()
+    house = House.objects.create(
+        user=user, title=f'House {number}', price=Decimal('2500000.00'), location=f'Block {number} Lot 1',
+        description='Two storey corner lot', beds=3, baths=2, image=f'house-images/cover-{number}.jpg',
+    )
+    HouseImage.objects.bulk_create(
+        HouseImage(house=house, image=f'house-images/{number}-{index}.jpg', order=index) for index in range(images)
+    )
+    return house
+
+
+def make_booking(user, facility, days_ahead=1):
+    start = datetime.time(8 + _next() % 10, 0)
+    return Booking.objects.create(
+        user=user, facility=facility, date=timezone.localdate() + datetime.timedelta(days=days_ahead),
+        start_time=start, end_time=datetime.time(start.hour + 1, 0), status='approved',
+    )
+
+
+def make_bulletin(author, commenters):
+    bulletin = Bulletin.objects.create(title=f'Bulletin {_next()}', content='Water interruption on Saturday', created_by=author)
+    for user in commenters:
+        BulletinComment.objects.create(bulletin=bulletin, user=user, content='Noted, thanks')
+    return bulletin
+
+
+def make_post(commenters):
+    post = Post.objects.create(title=f'Post {_next()}', body='Clean-up drive this weekend', image='blog_images/post.jpg')
+    for user in commenters:
+        BlogComment.objects.create(post=post, user=user, content='See you there')
+    return post
+
+
+def make_media(uploader, likers=()):
+    media = CommunityMedia.objects.create(
+        title=f'Photo {_next()}', media_file='community_media/2024/01/photo.jpg', uploaded_by=uploader, approved_by=uploader,
+    )
+    CommunityMediaLike.objects.bulk_create(CommunityMediaLike(media=media, user=user) for user in likers)
+    return media
+
+
+def make_visitor(resident_pin):
+    return Visitor.objects.create(
+        name=f'Visitor {_next()}', gmail='visitor@example.com', pin_entered=resident_pin.pin, resident=resident_pin,
+        status='approved', time_in=timezone.now(),
+    )
+
+
+def make_visitor_request(resident, approved_by=None):
+    number = _next()
+    return VisitorRequest.objects.create(
+        resident=resident, visitor_name=f'Guest {number}', visitor_email='guest@example.com',
+        visitor_contact_number='09170000000', visit_date=timezone.localdate(), visit_start_time=datetime.time(8, 0),
+        visit_end_time=datetime.time(17, 0), status='approved' if approved_by else 'pending_admin',
+        approved_by=approved_by, one_time_pin=f'{number % 1000000:06d}' if approved_by else None,
+    )
+
+
+def make_maintenance_request(homeowner):
+    return MaintenanceRequest.objects.create(
+        homeowner=homeowner, maintenance_type='plumbing', description='Leaking kitchen sink',
+        preferred_date=timezone.localdate() + datetime.timedelta(days=3), preferred_time=datetime.time(9, 0),
+    )
+
+
+def make_service_fee(homeowner):
+    # One fee per billing month and homeowner (unique together)
+    months_ago = ServiceFee.objects.filter(homeowner=homeowner).count()
+    due = timezone.localdate() - datetime.timedelta(days=31 * months_ago)
+    return ServiceFee.objects.create(
+        homeowner=homeowner, amount=Decimal('1500.00'), due_date=due, month=due.strftime('%B'), year=due.year,
+        bill_image=f'service_fees/bills/{_next()}.jpg',
+    )
+
+
+def make_pin(reviewers=()):
+    number = _next()
+    pin = Pin.objects.create(
+        name=f'Lot {number}', latitude=14.5 + number / 10000, longitude=121.0, status='Available', price='1,200,000',
+    )
+    for user in reviewers:
+        Review.objects.create(pin=pin, user=user, rating=5, comment='Quiet street')
+    return pin
+
+
+def seed(n, admin, resident):
+    """
+    ``n`` rows of every model behind the API, owned by ``resident``, by
+    ``n`` other residents, or by ``admin`` as appropriate.
+    """
+    neighbours = [make_user() for _ in range(n)]
+    residents = [resident] + neighbours
+    resident_pins = [
+        ResidentPin.objects.filter(user=user).first() or make_resident_pin(user) for user in residents
+    ]
+
+    facilities = [Facility.objects.get_or_create(name=name)[0] for name in ('Court', 'Pool')]
+    today = timezone.localdate()
+    for index in range(n):
+        owner = neighbours[index]
+        facility = facilities[index % len(facilities)]
+        # Distinct days across repeated seed() calls (slots are unique per day)
+        day = today + datetime.timedelta(days=_next())
+
+        make_house(owner)
+        make_house(resident)
+        make_booking(resident, facility, days_ahead=index + 1)
+        make_booking(owner, facility, days_ahead=index + 1)
+        AvailableSlot.objects.create(facility=facility, date=day, start_time=datetime.time(8, 0), end_time=datetime.time(9, 0))
+        Maintenance.objects.create(facility=facility, start_date=day, end_date=day, reason='Repainting')
+        make_bulletin(admin, residents[:3])
+        make_post(residents[:3])
+        make_media(owner, likers=residents[:3])
+        make_pin(reviewers=residents[:2])
+        Subdivision.objects.create(lot_number=f'L-{_next()}', is_occupied=True, owner_name=owner.get_full_name())
+        News.objects.create(title=f'News {index}', content='Gate hours changed')
+        Alert.objects.create(title=f'Alert {index}', message='Typhoon signal no. 1', severity='warning')
+        FAQ.objects.create(question=f'Question {index}?', answer='Answer', order=index)
+        ContactInfo.objects.create(address='Main gate', phone='0281234567', email=f'office{index}@example.com')
+        ContactMessage.objects.create(name='Maria', email='maria@example.com', subject='Gate pass', message='How do I apply?')
+        Message.objects.create(text='Hello', sender='user')
+        MaintenanceProvider.objects.create(name=f'Provider {index}', phone='09170000000', services='plumbing, electrical', created_by=admin)
+        make_maintenance_request(resident)
+        make_maintenance_request(owner)
+        make_service_fee(resident)
+        make_service_fee(owner)
+        make_visitor_request(resident, approved_by=admin if index % 2 else None)
+        make_visitor_request(owner)
+        make_visitor(resident_pins[0])
+        make_visitor(resident_pins[index + 1])
+        BillingRecord.objects.create(user=owner, file=f'billing/{owner.username}/{index}.pdf')
+        Billing.objects.create(user_profile=owner.profile, file=f'billing/{index}.pdf')
+    return residents
@@ -0,0 +1,32 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.models import UserProfile
+from api.tests.factories import make_user
+
+
+class PendingVerificationListingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(make_user(is_staff=True))
+        self.pending = [make_user(verified=False) for _ in range(3)]
+        # A profile recreated later: its id no longer follows the user id
+        first = self.pending[0]
+        first.profile.delete()
+        UserProfile.objects.create(user=first, document='documents/again.pdf')
+        no_document = make_user(username='nodoc', verified=False)
+        UserProfile.objects.filter(user=no_document).update(document='')
+
+    def test_pages_follow_user_id_and_match_the_stats_count(self):
+        url, ids = '/api/admin/pending-verifications/?page_size=2', []
+        while url:
+            page = self.client.get(url).json()
+            ids.extend(user['id'] for user in page['results'])
+            url = page['next']
+        expected = sorted(
+            UserProfile.objects.filter(is_verified=False).exclude(document='').values_list('user_id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertIn(self.pending[0].id, ids)
+        stats = self.client.get('/api/admin/stats/').json()
+        self.assertEqual(stats['users']['pending_verification'], len(ids))
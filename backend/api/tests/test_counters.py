@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.counters import cache, media_counters
+from api.models import CommunityMedia, CommunityMediaLike
+from api.tests.factories import make_media, make_user
+
+
+SHARED_COUNTERS = {
+    **settings.CACHES,
+    'counters': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-counters'},
+}
+
+
+@override_settings(COUNTER_FLUSH_SECONDS=3600, COUNTER_MAX_PENDING=3)
+class LocalCounterTests(TestCase):
+    """Without the shared "counters" cache each process holds its own increments"""
+
+    def setUp(self):
+        self.media = [make_media(make_user()) for _ in range(3)]
+        media_counters.flush()
+
+    def views(self, media):
+        return CommunityMedia.objects.values_list('views_count', flat=True).get(pk=media.pk)
+
+    def test_increments_are_held_until_flushed(self):
+        media = self.media[0]
+        media_counters.increment(media.pk, 'views_count')
+        media_counters.increment(media.pk, 'views_count')
+        self.assertEqual(self.views(media), 0)
+        self.assertEqual(media_counters.current(media, 'views_count'), 2)
+        self.assertEqual(media_counters.flush(), 1)
+        self.assertEqual(self.views(media), 2)
+        self.assertEqual(media_counters.pending([media.pk], 'views_count'), {})
+
+    def test_flush_once_enough_items_are_held(self):
+        for media in self.media[:2]:
+            media_counters.increment(media.pk, 'views_count')
+        self.assertEqual(self.views(self.media[0]), 0)
+        media_counters.increment(self.media[2].pk, 'views_count')
+        self.assertEqual([self.views(media) for media in self.media], [1, 1, 1])
+
+    @override_settings(COUNTER_FLUSH_SECONDS=0)
+    def test_flush_when_the_interval_elapsed(self):
+        media_counters.increment(self.media[0].pk, 'views_count')
+        self.assertEqual(self.views(self.media[0]), 1)
+
+
+@override_settings(CACHES=SHARED_COUNTERS, COUNTER_FLUSH_SECONDS=3600)
+class BufferedCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.uploader = make_user()
+        self.media = [make_media(self.uploader) for _ in range(3)]
+        # Claims the flush interval, so only explicit flushes write
+        media_counters.flush_if_due()
+
+    def views(self, media):
+        return CommunityMedia.objects.values_list('views_count', flat=True).get(pk=media.pk)
+
+    def test_increments_are_held_until_flushed(self):
+        first, second, _ = self.media
+        for _ in range(3):
+            media_counters.increment(first.pk, 'views_count')
+        media_counters.increment(second.pk, 'views_count')
+        self.assertEqual(self.views(first), 0)
+        self.assertEqual(media_counters.current(first, 'views_count'), 3)
+
+        self.assertEqual(media_counters.flush(), 2)
+        self.assertEqual((self.views(first), self.views(second)), (3, 1))
+        self.assertEqual(media_counters.pending([first.pk, second.pk], 'views_count'), {})
+        self.assertEqual(media_counters.flush(), 0)
+
+    def test_flush_reads_only_the_items_that_changed(self):
+        media_counters.increment(self.media[0].pk, 'views_count')
+        table = CommunityMedia._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            media_counters.flush()
+        self.assertEqual([query['sql'].split()[0] for query in queries if table in query['sql']], ['UPDATE'])
+
+    def test_item_changed_again_after_a_flush(self):
+        media = self.media[0]
+        media_counters.increment(media.pk, 'views_count')
+        media_counters.flush()
+        media_counters.increment(media.pk, 'views_count')
+        media_counters.flush()
+        self.assertEqual(self.views(media), 2)
+
+
+class MediaLikeTests(TestCase):
+    def setUp(self):
+        self.media = make_media(make_user())
+        self.client = APIClient()
+        self.client.force_authenticate(make_user())
+        self.url = f'/api/community-media/{self.media.pk}/like/'
+
+    def test_like_and_unlike_keep_likes_count_in_step(self):
+        for method, liked, count in (('post', True, 1), ('post', True, 1), ('delete', False, 0), ('delete', False, 0)):
+            response = getattr(self.client, method)(self.url)
+            self.assertEqual(response.json(), {'liked': liked, 'likes_count': count})
+            self.media.refresh_from_db()
+            self.assertEqual(self.media.likes_count, count)
+            self.assertEqual(CommunityMediaLike.objects.filter(media=self.media).count(), count)
@@ -0,0 +1,104 @@
+"""
+The SSE event broker (api/events.py): events are stored, so they reach the
+subscribers of every process in one global order, and Last-Event-ID replay
+reads them back.
+"""
+import asyncio
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from api import events
+from api.models import PushEvent
+from api.sse_views import _redeem_ticket
+from api.tests.factories import make_user
+
+
+class ManualRelayBroker(events.EventBroker):
+    """Relays only when the test calls relay()"""
+
+    def _start_relay(self):
+        self._reset_relay()
+        self._relay_thread = object()
+
+
+class EventBrokerTests(TransactionTestCase):
+    def test_published_after_commit(self):
+        with transaction.atomic():
+            events.publish(events.user_channel(1), 'booking.status', {'id': 5})
+            self.assertFalse(PushEvent.objects.exists())
+        event = PushEvent.objects.get()
+        self.assertEqual((event.channel, event.type, event.data), ('user:1', 'booking.status', {'id': 5}))
+
+    def test_replay_after_last_event_id(self):
+        broker = events.EventBroker()
+        first = broker.publish(events.PUBLIC_CHANNEL, 'pin.created', {'id': 1})
+        second = broker.publish(events.user_channel(1), 'booking.status', {'id': 2})
+        broker.publish(events.user_channel(2), 'booking.status', {'id': 3})
+        replayed = broker.replay({events.PUBLIC_CHANNEL, events.user_channel(1)}, first['id'])
+        self.assertEqual([event['id'] for event in replayed], [second['id']])
+
+    def test_event_stored_by_another_process_reaches_subscribers(self):
+        broker = events.EventBroker()
+
+        async def receive():
+            subscription = broker.subscribe({events.user_channel(1)})
+            try:
+                # As another worker process would: straight to the table
+                await sync_to_async(PushEvent.objects.create)(
+                    channel=events.user_channel(1), type='booking.status', data={'id': 7})
+                return await subscription.get(timeout=5)
+            finally:
+                subscription.close()
+
+        event = async_to_sync(receive)()
+        self.assertEqual((event['type'], event['data']), ('booking.status', {'id': 7}))
+
+    def test_event_committed_late_is_still_relayed(self):
+        broker = ManualRelayBroker()
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        subscription = broker.subscribe({events.PUBLIC_CHANNEL}, loop)
+        broker.relay()
+        # Ids handed out in one order, committed in another
+        late, early = (PushEvent.objects.create(channel=events.PUBLIC_CHANNEL, type=name) for name in ('late', 'early'))
+        late_id = late.id
+        late.delete()
+        broker.relay()
+        PushEvent.objects.create(id=late_id, channel=events.PUBLIC_CHANNEL, type='late')
+        broker.relay()
+        received = [loop.run_until_complete(subscription.get(timeout=1))['type'] for _ in range(2)]
+        self.assertEqual(received, ['early', 'late'])
+
+
+class StreamTicketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_ticket_opens_one_stream(self):
+        response = self.api.post('/api/events/ticket/')
+        self.assertEqual(response.status_code, 200)
+        ticket = response.json()['ticket']
+        self.assertEqual(_redeem_ticket(ticket), self.user.pk)
+        self.assertIsNone(_redeem_ticket(ticket))
+
+    def test_ticket_needs_a_user(self):
+        self.assertEqual(APIClient().post('/api/events/ticket/').status_code, 401)
+
+    def test_ticket_of_a_deactivated_user(self):
+        ticket = self.api.post('/api/events/ticket/').json()['ticket']
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(_redeem_ticket(ticket))
+
+    async def test_stream_rejects_bad_tickets_and_access_tokens(self):
+        response = await self.async_client.get('/api/events/', {'ticket': 'not-a-ticket'})
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api/events/', {'token': 'an-access-token'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,31 @@
+from django.test import TestCase, override_settings
+
+from api.tests.factories import make_user
+
+
+@override_settings(METRICS_TOKEN='scrape-secret', METRICS_ALLOWED_IPS=['10.0.0.5'], METRICS_PUBLIC=False)
+class MetricsAccessTests(TestCase):
+    def get(self, **extra):
+        return self.client.get('/metrics', REMOTE_ADDR='203.0.113.9', **extra)
+
+    def test_closed_by_default(self):
+        self.assertEqual(self.get().status_code, 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.client.force_login(make_user())
+        self.assertEqual(self.get().status_code, 403)
+
+    def test_token(self):
+        response = self.get(HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('http_requests_total', response.content.decode())
+
+    def test_staff_session(self):
+        self.client.force_login(make_user(is_staff=True))
+        self.assertEqual(self.get().status_code, 200)
+
+    def test_allowed_ip(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 200)
+
+    @override_settings(METRICS_PUBLIC=True)
+    def test_public_opt_in(self):
+        self.assertEqual(self.get().status_code, 200)
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import UserProfile
+
+
+LOGINS = 25
+
+
+def profile_writes(queries):
+    """INSERT/UPDATE statements against the profile table or its history table"""
+    table = UserProfile._meta.db_table
+    return [
+        query['sql'] for query in queries
+        if table in query['sql'] and query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+    ]
+
+
+class UserProfileWriteTests(TestCase):
+    """The User post_save hook must only write the profile when it actually changed"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('resident', 'resident@example.com', 'secret-pass')
+
+    def test_signup_writes_profile_once(self):
+        user = User.objects.create_user('another', 'another@example.com', 'secret-pass')
+        self.assertEqual(UserProfile.history.filter(user_id=user.pk).count(), 1)
+
+    def test_session_logins_do_not_write_profile(self):
+        history_before = UserProfile.history.count()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(LOGINS):
+                self.assertTrue(self.client.login(username='resident', password='secret-pass'))
+                self.client.logout()
+        self.assertEqual(profile_writes(queries), [])
+        self.assertEqual(UserProfile.history.count(), history_before)
+
+    @override_settings(SIMPLE_JWT={'UPDATE_LAST_LOGIN': True})
+    def test_token_logins_do_not_write_profile(self):
+        history_before = UserProfile.history.count()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(LOGINS):
+                response = self.client.post(
+                    '/api/token/', {'username': 'resident', 'password': 'secret-pass'}
+                )
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(profile_writes(queries), [])
+        self.assertEqual(UserProfile.history.count(), history_before)
+
+    def test_user_edit_with_loaded_profile_does_not_write_profile(self):
+        user = User.objects.select_related('profile').get(pk=self.user.pk)
+        user.first_name = 'Renamed'
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertEqual(profile_writes(queries), [])
+
+    def test_profile_changes_are_still_saved_with_the_user(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.profile.contact_number = '+639171234567'
+        user.save()
+        self.assertEqual(UserProfile.objects.get(user=user).contact_number, '+639171234567')
+        self.assertEqual(user.profile.get_dirty_fields(), set())
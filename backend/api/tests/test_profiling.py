@@ -0,0 +1,41 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from api.middleware.profiling import ProfilingMiddleware
+from api.tests.factories import make_user
+
+
+class RequestProfileTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(make_user(is_staff=True))
+
+    def test_path_is_stored_without_the_query_string(self):
+        response = self.client.get('/api/admin/profiles/?_profile=1&token=secret')
+        profile = self.client.get(f"/api/admin/profiles/{response['X-Profile-Id']}/").json()
+        self.assertEqual(profile['path'], '/api/admin/profiles/')
+
+
+@override_settings(PROFILING_SAMPLE_RATE=0.5)
+class AsyncSamplingTests(TestCase):
+    def setUp(self):
+        async def get_response(request):
+            return HttpResponse()
+        self.middleware = ProfilingMiddleware(get_response)
+        self.request = RequestFactory().get('/api/')
+
+    def test_unsampled_request_stays_on_the_event_loop(self):
+        with mock.patch('api.middleware.profiling.random.random', return_value=0.9), \
+                mock.patch('api.middleware.profiling.sync_to_async') as sync_to_async:
+            response = async_to_sync(self.middleware)(self.request)
+        sync_to_async.assert_not_called()
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_sampled_request_is_profiled(self):
+        with mock.patch('api.middleware.profiling.random.random', return_value=0.1):
+            response = async_to_sync(self.middleware)(self.request)
+        self.assertIn('X-Profile-Id', response)
@@ -0,0 +1,206 @@
+"""
+Query-count budgets for every GET endpoint in api/urls.py.
+
+Each route is requested as an anonymous visitor, a resident and an admin,
+first with ``N`` seeded rows per model and again with ``10 * N``. A route
+fails when it runs more queries than its budget, or when its query count
+grows with the data (an N+1 in a view or serializer). Responses are built
+cold - the shared cache is cleared before every request - so a cached page
+cannot hide a regression.
+
+When a route legitimately needs more queries, raise its entry in
+QUERY_BUDGETS in the same change and say why in the review.
+"""
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection, reset_queries
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver
+from rest_framework.test import APIClient
+
+from api import urls as api_urls
+from api.models import (
+    FAQ, Alert, AuditLogEntry, Booking, Bulletin, BulletinComment, BlogComment, CommunityMedia, ContactInfo, ContactMessage,
+    Facility, House, Maintenance, MaintenanceProvider, MaintenanceRequest, AvailableSlot, News, Pin, Post, ResidentPin, Review,
+    ServiceFee, Subdivision, Visitor, VisitorRequest,
+)
+from .factories import make_user, seed
+
+
+N = 3
+ROLES = ('anonymous', 'resident', 'admin')
+
+# Routes that cannot be requested from a test client
+SKIPPED_ROUTES = {
+    'events/': 'server-sent event stream never completes',
+    'visitor-requests/<pk>/pdf/': 'renders the pass with ReportLab and writes it to MEDIA_ROOT',
+}
+
+# Routes not listed here must stay within DEFAULT_BUDGET queries
+DEFAULT_BUDGET = 3
+QUERY_BUDGETS = {
+    # one COUNT per dashboard figure
+    'admin/dashboard-stats/': 6,
+    'admin/pin-stats/': 6,
+    'admin/stats/': 6,
+    # house, owner and images plus the conditional GET validators
+    'guest/houses/': 4,
+    'guest/houses/<int:pk>/': 5,
+    'house/<int:pk>/': 5,
+    # creates the caller's PIN on first use
+    'resident-pin/my/': 6,
+}
+
+# Model used to pick the object for a route's <pk>, by route prefix. The
+# lowest pk of every model is created for the logged-in resident by seed();
+# user routes get the resident.
+DETAIL_MODELS = {
+    'alerts/': Alert,
+    'available-slots/': AvailableSlot,
+    'blog-comments/': BlogComment,
+    'bookings/': Booking,
+    'bulletin-comments/': BulletinComment,
+    'bulletins/': Bulletin,
+    'community-media/': CommunityMedia,
+    'contact-info/': ContactInfo,
+    'contact-messages/': ContactMessage,
+    'facilities/': Facility,
+    'faq/': FAQ,
+    'guest/houses/': House,
+    'house/': House,
+    'houses/': House,
+    'maintenance-providers/': MaintenanceProvider,
+    'maintenance-requests/': MaintenanceRequest,
+    'maintenance/': Maintenance,
+    'news/': News,
+    'pins/': Pin,
+    'posts/': Post,
+    'resident-pin/': ResidentPin,
+    'residents/': User,
+    'reviews/': Review,
+    'service-fees/': ServiceFee,
+    'subdivisions/': Subdivision,
+    'url/': Pin,
+    'user-history/': AuditLogEntry,
+    'admin/users/': User,
+    'admin/visitors/': Visitor,
+    'visitor-requests/': VisitorRequest,
+    'visitor/': Visitor,
+}
+
+
+def _route(pattern):
+    """Readable route for a path() or DRF router regex pattern"""
+    route = str(pattern.pattern)
+    route = re.sub(r'\(\?P<(\w+)>[^)]*\)', r'<\1>', route)
+    return route.replace('^', '').replace('$', '')
+
+
+def api_routes(patterns=None, prefix=''):
+    """Every distinct route in api/urls.py, router routes included"""
+    routes = []
+    for pattern in api_urls.urlpatterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            routes.extend(api_routes(pattern.url_patterns, prefix + _route(pattern)))
+        elif isinstance(pattern, URLPattern):
+            route = prefix + _route(pattern)
+            # DRF's format-suffix twins (".json"), the API root and the DEBUG
+            # media file server add nothing
+            if re.search(r'<(\w+:)?format>', route) or route == '' or pattern.callback.__module__ == 'django.views.static':
+                continue
+            if route not in routes:
+                routes.append(route)
+    return routes
+
+
+def detail_model(route):
+    for prefix in sorted(DETAIL_MODELS, key=len, reverse=True):
+        if route.startswith(prefix):
+            return DETAIL_MODELS[prefix]
+    return None
+
+
+# Seeding creates dozens of users; PBKDF2 would dominate the run time
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('budget-admin', is_staff=True)
+        cls.resident = make_user('budget-resident')
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def resolve_path(self, route):
+        """Concrete path for ``route``, or None when it needs an object that does not exist"""
+        path = route
+        for name in re.findall(r'<(?:\w+:)?(\w+)>', route):
+            if name == 'file_format':
+                value = 'csv'
+            elif name == 'profile_id':
+                # Request profiles live in the cache, not the database
+                value = 1
+            elif name == 'user_id' or detail_model(route) is User:
+                value = self.resident.pk
+            else:
+                model = detail_model(route)
+                if model is None:
+                    return None
+                value = model.objects.order_by('pk').values_list('pk', flat=True).first()
+                if value is None:
+                    return None
+            path = re.sub(rf'<(?:\w+:)?{name}>', str(value), path, count=1)
+        return '/api/' + path
+
+    def client_for(self, role):
+        client = APIClient()
+        if role != 'anonymous':
+            # Fresh instance per request so nothing cached on it carries over
+            user_id = self.admin.pk if role == 'admin' else self.resident.pk
+            client.force_authenticate(User.objects.get(pk=user_id))
+        return client
+
+    def measure(self):
+        """{(route, role): (status, query count)} for every route"""
+        results = {}
+        for route in api_routes():
+            if route in SKIPPED_ROUTES:
+                continue
+            path = self.resolve_path(route)
+            self.assertIsNotNone(path, f'no object to request {route} with - add it to DETAIL_MODELS')
+            for role in ROLES:
+                client = self.client_for(role)
+                caches['default'].clear()
+                # Seeding fills the capped queries_log; CaptureQueriesContext
+                # indexes into it and would report 0 once it has wrapped
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(path)
+                results[route, role] = (response.status_code, len(queries))
+        return results
+
+    def test_every_route_is_covered(self):
+        routes = api_routes()
+        self.assertGreater(len(routes), 50)
+        unknown = set(QUERY_BUDGETS) - set(routes)
+        self.assertEqual(unknown, set(), 'QUERY_BUDGETS lists routes that no longer exist')
+
+    def test_query_counts_stay_within_budget_and_flat(self):
+        seed(N, self.admin, self.resident)
+        small = self.measure()
+        seed(9 * N, self.admin, self.resident)
+        large = self.measure()
+
+        for (route, role), (status, count) in large.items():
+            budget = QUERY_BUDGETS.get(route, DEFAULT_BUDGET)
+            with self.subTest(route=route, role=role):
+                self.assertLess(status, 500, f'GET {route} as {role} failed')
+                self.assertLessEqual(count, budget, f'GET {route} as {role}: {count} queries, budget {budget}')
+                self.assertLessEqual(
+                    count, small[route, role][1],
+                    f'GET {route} as {role}: {small[route, role][1]} queries at {N} rows, {count} at {10 * N}',
+                )
@@ -0,0 +1,105 @@
+"""
+EXPLAIN checks for the hot filtered queries.
+
+Each query is taken from the view that runs it (get_queryset with a request
+of the right user and query params) where there is one, planned on seeded
+data, and must search its table through the index added for it in
+0005_hot_path_indexes - not scan the table. Walking a partial index whose
+condition is the query's filter reads only the matching rows, so it counts as
+a search. Where the index also matches the query's ORDER BY, the plan must not
+sort either.
+
+When a view's filter or ordering changes, change its index (and this table)
+in the same migration.
+"""
+import re
+import unittest
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Booking, Facility, Post, ServiceFee, Visitor
+from api.views import (
+    BlogCommentViewSet, BookingViewSet, CommunityMediaViewSet, MaintenanceRequestViewSet, ServiceFeeViewSet,
+    VisitorRequestViewSet,
+)
+from .factories import make_user, seed
+
+
+N = 20
+
+
+def full_scan(plan, queryset, index):
+    """Whether ``plan`` reads every row of the queryset's table"""
+    meta = queryset.model._meta
+    scans = re.findall(rf'\bSCAN (?:TABLE )?{meta.db_table}\b(.*)', plan)
+    if any(i.name == index and i.condition is not None for i in meta.indexes):
+        scans = [rest for rest in scans if not re.match(rf' USING (?:COVERING )?INDEX {index}\b', rest)]
+    return bool(scans)
+
+
+def view_queryset(viewset, user=None, **params):
+    """What ``viewset``'s list action would query for ``user`` with ``params``"""
+    request = Request(APIRequestFactory().get('/', params))
+    request.user = user or AnonymousUser()
+    view = viewset(request=request, action='list', format_kwarg=None, kwargs={})
+    return view.get_queryset()
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'plans are read in SQLite EXPLAIN QUERY PLAN format')
+class HotQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user(is_staff=True)
+        cls.resident = make_user()
+        seed(N, cls.admin, cls.resident)
+
+    def hot_queries(self):
+        """(name, queryset, index, ordered_by_index)"""
+        resident, admin = self.resident, self.admin
+        facility = Facility.objects.first()
+        booking = Booking.objects.filter(facility=facility).first()
+        return [
+            ('own bookings', view_queryset(BookingViewSet, resident),
+             'booking_user_date_idx', True),
+            ('facility calendar', view_queryset(BookingViewSet, admin, facility_id=facility.pk),
+             'booking_facility_date_idx', False),
+            ('booking overlap check', Booking.objects.filter(
+                facility=facility, date=booking.date, status__in=['pending', 'approved']),
+             'booking_facility_date_idx', False),
+            ('active visitors', Visitor.objects.filter(
+                resident__user=resident, time_out__isnull=True, status='approved'),
+             'visitor_resident_status_idx', False),
+            ('pending visitors', Visitor.objects.filter(resident__user=resident, status='pending'),
+             'visitor_resident_status_idx', False),
+            ('own visitor requests', view_queryset(VisitorRequestViewSet, resident),
+             'visitor_request_resident_idx', True),
+            ('own visitor requests by status', view_queryset(VisitorRequestViewSet, resident, status='approved'),
+             'visitor_request_resident_idx', True),
+            ('visitor request queue', view_queryset(VisitorRequestViewSet, admin, status='pending_admin'),
+             'visitor_request_status_idx', True),
+            ('own maintenance requests', view_queryset(MaintenanceRequestViewSet, resident),
+             'maint_request_homeowner_idx', True),
+            ('maintenance request queue', view_queryset(MaintenanceRequestViewSet, admin, status='pending'),
+             'maint_request_status_idx', True),
+            ('own service fees', view_queryset(ServiceFeeViewSet, resident),
+             'service_fee_homeowner_idx', True),
+            ('overdue service fees', ServiceFee.objects.order_by().overdue(),
+             'service_fee_status_due_idx', False),
+            ('post comments', view_queryset(BlogCommentViewSet, post_id=Post.objects.first().pk),
+             'blog_comment_post_idx', True),
+            ('public gallery', view_queryset(CommunityMediaViewSet),
+             'community_media_public_idx', True),
+        ]
+
+    def test_hot_queries_use_their_index(self):
+        for name, queryset, index, ordered in self.hot_queries():
+            with self.subTest(name):
+                plan = queryset.explain()
+                self.assertFalse(full_scan(plan, queryset, index), f'{name}: full table scan\n{plan}')
+                self.assertIn(index, plan, f'{name}: {index} not used\n{plan}')
+                if ordered:
+                    self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan, f'{name}: sorted outside the index\n{plan}')
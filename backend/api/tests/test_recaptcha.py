@@ -0,0 +1,153 @@
+"""
+The siteverify client (api/recaptcha.py) against a local stub of Google's
+endpoint: keep-alive, retries, timeouts, the circuit breaker, fail open/closed
+and the per-token result cache.
+"""
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from api import recaptcha
+from api.benchmark import SiteverifyStub
+
+
+FAST_CLIENT = dict(
+    RECAPTCHA_CONNECT_TIMEOUT=1,
+    RECAPTCHA_READ_TIMEOUT=0.2,
+    RECAPTCHA_RETRIES=2,
+    RECAPTCHA_RETRY_BACKOFF=0.01,
+    RECAPTCHA_BREAKER_THRESHOLD=2,
+    RECAPTCHA_BREAKER_RESET_SECONDS=60,
+    RECAPTCHA_FAIL_OPEN=False,
+    RECAPTCHA_TOKEN_CACHE_SECONDS=120,
+)
+
+
+class SiteverifyClientTests(SimpleTestCase):
+    def setUp(self):
+        self.stub = SiteverifyStub(latency=0).start()
+        self.addCleanup(self.stub.stop)
+        settings_override = override_settings(RECAPTCHA_VERIFY_URL=self.stub.url, **FAST_CLIENT)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+    def login(self, token):
+        return self.client.post(
+            '/api/verify-captcha/', {'recaptcha': token, 'username': 'test', 'password': 'password'},
+            content_type='application/json',
+        )
+
+    def test_valid_token_logs_in(self):
+        response = self.login('token-1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stub.calls, 1)
+
+    def test_rejected_token(self):
+        self.stub.success = False
+        response = self.login('token-1')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'message': 'reCAPTCHA verification failed'})
+
+    def test_token_is_good_for_one_login(self):
+        self.assertEqual(self.login('token-1').status_code, 200)
+        self.assertEqual(self.login('token-1').status_code, 400)
+        self.assertEqual(self.stub.calls, 1)
+        verification = recaptcha.verify('token-1')
+        self.assertTrue(verification.cached)
+        self.assertEqual(verification.error_codes, ['timeout-or-duplicate'])
+
+    @override_settings(RECAPTCHA_FAIL_OPEN=True)
+    def test_token_accepted_while_unavailable_is_used_up(self):
+        self.stub.status = 500
+        self.assertTrue(recaptcha.verify('token-1').success)
+        self.assertFalse(recaptcha.verify('token-1').success)
+
+    def test_server_errors_are_retried(self):
+        self.stub.status = 503
+        verification = recaptcha.verify('token-1')
+        self.assertFalse(verification.available)
+        self.assertEqual(self.stub.calls, 3)  # first attempt + RECAPTCHA_RETRIES
+
+    def test_client_errors_are_not_retried(self):
+        self.stub.status = 400
+        self.assertFalse(recaptcha.verify('token-1').available)
+        self.assertEqual(self.stub.calls, 1)
+
+    def test_slow_upstream_is_cut_off(self):
+        self.stub.latency = 1
+        started = time.monotonic()
+        verification = recaptcha.verify('token-1')
+        self.assertFalse(verification.available)
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_unavailable_fails_closed(self):
+        self.stub.status = 500
+        response = self.login('token-1')
+        self.assertEqual(response.status_code, 503)
+
+    @override_settings(RECAPTCHA_FAIL_OPEN=True)
+    def test_unavailable_fails_open(self):
+        self.stub.status = 500
+        response = self.login('token-1')
+        self.assertEqual(response.status_code, 200)
+
+    def test_unavailable_answers_are_not_cached(self):
+        self.stub.status = 500
+        self.assertFalse(recaptcha.verify('token-1').available)
+        self.stub.status = 200
+        verification = recaptcha.verify('token-1')
+        self.assertTrue(verification.success)
+        self.assertFalse(verification.cached)
+
+    def test_breaker_stops_calls_while_open(self):
+        self.stub.status = 500
+        for token in ('token-1', 'token-2'):
+            recaptcha.verify(token)
+        calls = self.stub.calls
+        self.assertFalse(recaptcha.verify('token-3').available)
+        self.assertEqual(self.stub.calls, calls)
+        self.assertEqual(recaptcha.get_client().breaker.state, 'open')
+
+    def test_async_client(self):
+        self.assertTrue(async_to_sync(recaptcha.averify)('token-1').success)
+        reused = async_to_sync(recaptcha.averify)('token-1')
+        self.assertTrue(reused.cached)
+        self.assertFalse(reused.success)
+        self.stub.status = 502
+        self.assertFalse(async_to_sync(recaptcha.averify)('token-2').available)
+        self.assertEqual(self.stub.calls, 4)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0
+        self.breaker = recaptcha.CircuitBreaker(threshold=2, reset_seconds=30, clock=lambda: self.now)
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_the_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_half_open_lets_one_trial_through(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now = 31
+        self.assertEqual(self.breaker.state, 'half-open')
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'open')
+        self.now = 62
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, 'closed')
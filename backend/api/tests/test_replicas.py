@@ -0,0 +1,134 @@
+"""
+Primary/replica routing (api/replicas.py) with a second local database as
+the replica. Nothing replicates between the two, so a row written through
+the API only shows up where the router sent the read - the worst case of
+replica lag.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api import replicas
+from api.models import FAQ, UserProfile
+from .factories import make_user
+
+
+REPLICA = 'replica'
+REPLICA_DATABASE = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+
+
+def replicate(*objects):
+    """Copy rows to the replica as replication would (bulk_create: no signals fire)"""
+    for obj in objects:
+        type(obj).objects.using(REPLICA).bulk_create([obj])
+
+
+@override_settings(
+    REPLICA_DATABASES=[REPLICA],
+    DATABASE_ROUTERS=['api.replicas.PrimaryReplicaRouter'],
+    REPLICA_STICKY_SECONDS=15,
+)
+class ReplicaRoutingTests(TransactionTestCase):
+    # Not TestCase: its per-test transaction would keep every read on the primary.
+    # The replica joins `databases` in setUpClass; the runner never sees it.
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        # A second in-memory database, only for this class: registered with the
+        # connection handler and migrated before the routing settings apply
+        connections.settings[REPLICA] = connections.configure_settings(
+            {**settings.DATABASES, REPLICA: REPLICA_DATABASE}
+        )[REPLICA]
+        call_command('migrate', database=REPLICA, verbosity=0)
+        cls.databases = {'default', REPLICA}
+        try:
+            super().setUpClass()
+        except Exception:
+            cls._remove_replica()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._remove_replica()
+
+    @classmethod
+    def _remove_replica(cls):
+        # close() keeps an in-memory database open; close the underlying connection
+        replica = connections[REPLICA]
+        if replica.connection is not None:
+            replica.connection.close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        cache.clear()
+        self.resident = make_user()
+        self.neighbour = make_user()
+        replicate(self.resident, self.resident.profile, self.neighbour, self.neighbour.profile)
+
+    def tearDown(self):
+        # The flush between tests skips the replica: the router allows no migrations there
+        replica = connections[REPLICA]
+        replica.ops.execute_sql_flush(replica.ops.sql_flush(no_style(), replica.introspection.table_names()))
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def test_request_reads_go_to_the_replica(self):
+        FAQ.objects.create(question='Only on the primary?', answer='Yes')
+        replicate(FAQ(question='Replicated?', answer='Yes'))
+        response = APIClient().get('/api/faq/')
+        self.assertEqual([faq['question'] for faq in response.json()], ['Replicated?'])
+
+    def test_reads_outside_requests_go_to_the_primary(self):
+        FAQ.objects.create(question='Only on the primary?', answer='Yes')
+        self.assertEqual(FAQ.objects.count(), 1)
+
+    def test_request_reads_its_own_writes(self):
+        with replicas.request_routing(RequestFactory().get('/')):
+            self.assertEqual(FAQ.objects.count(), 0)
+            FAQ.objects.create(question='New?', answer='Yes')
+            self.assertEqual(FAQ.objects.count(), 1)
+
+    def test_reads_in_a_transaction_go_to_the_primary(self):
+        FAQ.objects.create(question='Only on the primary?', answer='Yes')
+        with replicas.request_routing(RequestFactory().get('/')):
+            with transaction.atomic():
+                self.assertEqual(FAQ.objects.count(), 1)
+
+    def test_writer_sticks_to_the_primary(self):
+        client = self.client_for(self.resident)
+        response = client.put('/api/profile/update/', {'first_name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # Read back within the same request
+        self.assertEqual(response.json()['first_name'], 'Renamed')
+        # The user row is loaded by authentication, before the view runs
+        self.assertEqual(client.get('/api/profile/').json()['first_name'], 'Renamed')
+        self.assertEqual(User.objects.using(REPLICA).get(pk=self.resident.pk).first_name, 'Juan')
+
+    def test_other_users_keep_reading_the_replica(self):
+        self.client_for(self.resident).put('/api/profile/update/', {'first_name': 'Renamed'}, format='json')
+        UserProfile.objects.filter(user=self.neighbour).update(contact_number='+639170000000')
+        response = self.client_for(self.neighbour).get('/api/profile/')
+        self.assertNotEqual(response.json()['profile']['contact_number'], '+639170000000')
+
+    @override_settings(REPLICA_STICKY_SECONDS=0)
+    def test_stickiness_expires(self):
+        client = self.client_for(self.resident)
+        client.put('/api/profile/update/', {'first_name': 'Renamed'}, format='json')
+        self.assertEqual(client.get('/api/profile/').json()['first_name'], 'Juan')
+
+    def test_migrations_only_run_on_the_primary(self):
+        router = replicas.PrimaryReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'api'))
+        self.assertFalse(router.allow_migrate(REPLICA, 'api'))
@@ -0,0 +1,70 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+
+from api.models import ServiceFee
+from api.service_fee_utils import issue_monthly_service_fees
+from api.tests.factories import make_user
+
+
+class ServiceFeeSerializerTests(TestCase):
+    """month and year are optional; a homeowner gets at most one fee per month and year"""
+
+    def setUp(self):
+        self.homeowner = make_user()
+        self.client.force_login(make_user(is_staff=True))
+
+    def create(self, **data):
+        return self.client.post('/api/service-fees/', {'homeowner': self.homeowner.pk, 'amount': '500.00', **data})
+
+    def test_create_without_month_or_year(self):
+        response = self.create(year='')
+        self.assertEqual(response.status_code, 201, response.content)
+        response = self.create()
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(ServiceFee.objects.filter(homeowner=self.homeowner, month=None).count(), 2)
+
+    def test_update_without_month_or_year(self):
+        fee = ServiceFee.objects.create(homeowner=self.homeowner, amount=Decimal('500.00'), month='March', year=2025)
+        response = self.client.put(
+            f'/api/service-fees/{fee.pk}/', {'homeowner': self.homeowner.pk, 'amount': '650.00'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        fee.refresh_from_db()
+        self.assertEqual((fee.amount, fee.month, fee.year), (Decimal('650.00'), 'March', 2025))
+
+    def test_month_is_normalized(self):
+        response = self.create(month='jan', year=2025)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['month'], 'January')
+
+    def test_second_fee_for_the_same_period(self):
+        self.assertEqual(self.create(month='January', year=2025).status_code, 201)
+        response = self.create(month='1', year=2025)
+        self.assertEqual(response.status_code, 400)
+        fee = ServiceFee.objects.create(homeowner=self.homeowner, month='February', year=2025)
+        response = self.client.patch(f'/api/service-fees/{fee.pk}/', {'month': 'January'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_overdue_fee_keeps_its_stored_status(self):
+        fee = ServiceFee.objects.create(
+            homeowner=self.homeowner, amount=Decimal('500.00'), due_date=datetime.date(2025, 1, 15),
+        )
+        data = self.client.get(f'/api/service-fees/{fee.pk}/').json()
+        self.assertEqual((data['status'], data['effective_status']), ('unpaid', 'delayed'))
+
+
+class BulkIssueTests(TestCase):
+    def test_zero_override_waives_the_fee(self):
+        waived, billed = make_user(), make_user()
+        ServiceFee.objects.create(homeowner=waived, amount=Decimal('800.00'), month='January', year=2025)
+        result = issue_monthly_service_fees(
+            'February', 2025, datetime.date(2025, 2, 15), amount='500.00', amount_rule='previous',
+            overrides={str(waived.pk): '0'},
+        )
+        self.assertEqual(len(result['created']), 2)
+        fees = ServiceFee.objects.filter(month='February', year=2025)
+        self.assertEqual(fees.get(homeowner=waived).amount, Decimal('0.00'))
+        self.assertEqual(fees.get(homeowner=billed).amount, Decimal('500.00'))
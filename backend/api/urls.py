@@ -3,19 +3,27 @@ from rest_framework.routers import DefaultRouter
 from . import views
 from .views import (
     BookingViewSet, FacilityViewSet, HouseDetailView, VisitorViewSet, admin_user_bills, delete_billing, password_reset_confirm, pending_visitors, register, get_posts, get_user_posts, get_user_profile, admin_change_user_password, admin_update_user, 
-    message_list_create, send_email, subdivision_list_create, subdivision_detail, PinViewSet,
+    message_list_create, subdivision_list_create, subdivision_detail, PinViewSet,
     SubdivisionViewSet, update_user_profile, ChangePasswordView,
     admin_user_list, admin_user_delete, admin_user_update, admin_user_detail,
-    admin_dashboard_stats, admin_pin_stats,
-    NewsViewSet, AlertViewSet, ContactInfoViewSet, ContactMessageViewSet, password_reset_request, visitor_approval,
+    admin_dashboard_stats, admin_pin_stats, admin_stats,
+    NewsViewSet, AlertViewSet, ContactInfoViewSet, ContactMessageViewSet, visitor_approval,
     AvailableSlotViewSet, MaintenanceViewSet, ReviewViewSet, admin_create_user, BulletinViewSet
 )
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from .views import UserHistoryListView, my_resident_pin, visitor_checkin, visitor_checkout, ResidentPinViewSet, ResidentApprovalViewSet, visitor_timeout, VisitorTrackingViewSet, HouseListCreateView, HouseViewSet, GuestHouseListView, GuestHouseDetailView, ReviewViewSet, FAQViewSet, ServiceFeeViewSet, BlogCommentViewSet, BulletinCommentViewSet, CommunityMediaViewSet, VisitorRequestViewSet, MaintenanceRequestViewSet, MaintenanceProviderViewSet, verify_pin_view
+from .sse_views import event_stream, stream_ticket
+from .profiling import profile_list, profile_detail
+from .views import UserHistoryListView, UserHistoryDetailView, UserHistoryExportView, user_history_filters, my_resident_pin, visitor_checkin, visitor_checkout, ResidentPinViewSet, ResidentApprovalViewSet, visitor_timeout, VisitorTrackingViewSet, HouseListCreateView, HouseViewSet, GuestHouseListView, GuestHouseDetailView, ReviewViewSet, FAQViewSet, ServiceFeeViewSet, BlogCommentViewSet, BulletinCommentViewSet, CommunityMediaViewSet, VisitorRequestViewSet, MaintenanceRequestViewSet, MaintenanceProviderViewSet, verify_pin_view
 
 
+# Served by their async versions when running under ASGI (see core/asgi.py)
+if settings.ASYNC_IO_VIEWS:
+    from . import async_views as io_views
+else:
+    io_views = views
+
 router = DefaultRouter()
 router.register(r'pins', PinViewSet, basename='pin')
 router.register(r'url', PinViewSet, basename='pins-legacy')
@@ -49,7 +57,9 @@ urlpatterns = [
     path('register/', register),
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('visitor-requests/verify_pin/', views.verify_pin_view, name='verify-pin'),
+    path('visitor-requests/verify_pin/', io_views.verify_pin_view, name='verify-pin'),
+    path('events/', event_stream, name='event-stream'),
+    path('events/ticket/', stream_ticket, name='event-stream-ticket'),
     path('posts/', get_posts),
     path('posts/<int:pk>/', views.post_detail, name='post-detail'),
     path('myposts/', get_user_posts),
@@ -65,7 +75,7 @@ urlpatterns = [
     path('visitor/approval/<int:visitor_id>/', views.visitor_approval),
     path('visitors/', views.all_visitors, name='visitors-all'), 
     path('visitor/status/', views.visitor_status),
-    path('visitor/guest-status/', views.guest_visitor_status, name='guest-visitor-status'),
+    path('visitor/guest-status/', io_views.guest_visitor_status, name='guest-visitor-status'),
     path('visitor/guest-checkin/', views.guest_visitor_checkin, name='guest-visitor-checkin'),
     path('resident/visitors/', views.resident_visitors, name='resident-visitors'),
     path("visitor/timeout/<int:pk>/", visitor_timeout, name="visitor-timeout"),
@@ -91,21 +101,28 @@ urlpatterns = [
     path('admin/users/<int:user_id>/update/', admin_user_update, name='admin_user_update'),
     path('admin/users/<int:pk>/', admin_user_detail, name='admin_user_detail'),
     path('change-password/', ChangePasswordView.as_view(), name='change-password'),
-    path('notifications/send-email/', send_email, name='send_email'),
+    path('notifications/send-email/', io_views.send_email, name='send_email'),
     # ✅ Dashboard & pins stats
     path('admin/dashboard-stats/', admin_dashboard_stats, name='admin_dashboard_stats'),
     path('admin/pin-stats/', admin_pin_stats, name='admin_pin_stats'),
+    path('admin/stats/', admin_stats, name='admin_stats'),
+    # Request profiles taken by api.middleware.profiling
+    path('admin/profiles/', profile_list, name='admin_profile_list'),
+    path('admin/profiles/<int:profile_id>/', profile_detail, name='admin_profile_detail'),
         
     # ✅ Password reset
-    path('password-reset/', password_reset_request, name='password_reset'),
+    path('password-reset/', io_views.password_reset_request, name='password_reset'),
     path('password-reset-confirm/', password_reset_confirm, name='password_reset_confirm'),
     path('user-history/', UserHistoryListView.as_view(), name='user-history'),
+    path('user-history/filters/', user_history_filters, name='user-history-filters'),
+    path('user-history/export.<str:file_format>', UserHistoryExportView.as_view(), name='user-history-export'),
+    path('user-history/<int:pk>/', UserHistoryDetailView.as_view(), name='user-history-detail'),
     path('profile/upload-document/', views.upload_document, name='upload_document'),
     path('admin/pending-verifications/', views.pending_verifications),
     path('admin/verify-user/<int:user_id>/', views.verify_user),
     path('admin/reject-user/<int:user_id>/', views.reject_user),
 
-    path('send_verification_email/', views.send_verification_email, name='send_verification_email'),
+    path('send_verification_email/', io_views.send_verification_email, name='send_verification_email'),
     path('verify_email_code/', views.verify_email_code, name='verify_email_code'),
     
     path('', include(router.urls)),
@@ -0,0 +1,33 @@
+"""
+logging.Formatter that writes one JSON object per record.
+
+Everything passed through ``extra=`` becomes a top-level key, so
+``logger.info('request', extra={'route': ..., 'duration_ms': ...})``
+produces a line log aggregators can filter on directly.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+
+
+# Attributes every LogRecord has; anything else came from extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # already rendered by api.utils.log_queue.QueuedStreamHandler
+            payload['exc_info'] = record.exc_text
+        return json.dumps(payload, default=str)
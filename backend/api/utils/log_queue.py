@@ -0,0 +1,96 @@
+"""
+Non-blocking log handlers for request threads.
+
+``QueuedStreamHandler`` is a ``QueueHandler`` that owns its ``QueueListener``:
+the request thread only puts the record on an in-memory queue, and a
+background thread formats it and writes it to the stream. When the queue is
+full (the stream cannot keep up) records are dropped and counted rather than
+blocking the request; the count is reported on the next record written.
+
+``DebugSampleFilter`` passes a fraction of DEBUG records, so verbose debug
+logging can be switched on in production without flooding the output.
+
+Both are configured from settings.LOGGING.
+"""
+import copy
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedStreamHandler(QueueHandler):
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = None
+        self._start_listener()
+        # The listener thread does not survive fork(); gunicorn --preload
+        # workers get their own
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_after_fork)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def _restart_after_fork(self):
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._start_listener()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        """
+        Merge the arguments into the message and render the traceback now -
+        both may reference objects the request thread goes on to change - but
+        leave the final formatting to the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = (self.target.formatter or logging.Formatter()).formatException(record.exc_info)
+            record.exc_info = None
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            record.dropped_records = dropped
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        # Called by logging.shutdown() at exit: drain the queue first
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+class DebugSampleFilter(logging.Filter):
+    """Pass ``rate`` (0.0-1.0) of DEBUG records; other levels always pass"""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
@@ -0,0 +1,29 @@
+"""
+statement_timeout for ``migrate`` (see ApiConfig.ready).
+
+Every PostgreSQL connection starts with a server-side statement_timeout
+(settings.DATABASE_STATEMENT_TIMEOUT_MS) so a runaway query cannot hold a web
+worker. Data backfills and index builds on large tables legitimately run
+longer, and ``migrate`` runs in every start command, so it lifts the timeout
+for its own connection while migrations run and restores it afterwards.
+Other management commands keep it.
+"""
+from django.db import connections
+
+
+def lift_statement_timeout(sender, using, **kwargs):
+    """pre_migrate receiver: no statement_timeout on the connection being migrated"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SET statement_timeout = 0')
+
+
+def restore_statement_timeout(sender, using, **kwargs):
+    """post_migrate receiver: back to the timeout the connection started with"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('RESET statement_timeout')
@@ -0,0 +1,45 @@
+"""
+Per-request SQL observers that work under both WSGI and ASGI.
+
+``connection.execute_wrapper()`` only applies to the calling thread's
+connection. Under ASGI a request's middleware runs on the event loop while its
+(sync) view and ORM calls run on a worker thread with connections of their
+own, so a wrapper installed by the middleware would never see the queries.
+
+Instead one wrapper is installed on every connection when it is opened, and it
+hands each query to the observers registered for the current request through
+a context variable, which asgiref carries across sync_to_async/async_to_sync.
+"""
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_observers = ContextVar('query_observers', default=())
+
+
+@contextmanager
+def observe_queries(observer):
+    """
+    Call ``observer(execute, sql, params, many, context)`` - the
+    ``execute_wrapper`` signature - for every query run within the block, on
+    any connection and in any thread the request hops to.
+    """
+    token = _observers.set(_observers.get() + (observer,))
+    try:
+        yield observer
+    finally:
+        _observers.reset(token)
+
+
+def _notify_observers(execute, sql, params, many, context):
+    observers = _observers.get()
+    for observer in reversed(observers):
+        execute = functools.partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+def install_query_observers(sender, connection, **kwargs):
+    """connection_created receiver (see ApiConfig.ready)"""
+    if _notify_observers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_notify_observers)
@@ -0,0 +1,31 @@
+"""
+SQLite performance profile (settings.SQLITE_PRAGMAS), applied to every new
+SQLite connection by a connection_created receiver (see ApiConfig.ready).
+
+With the default rollback journal a writer locks out every reader until it
+commits, so gunicorn workers writing view counters, history rows or fee
+updates stall each other and fail with "database is locked". In WAL mode
+readers and the single writer no longer block each other, and writers queue
+for busy_timeout instead of failing at once.
+
+journal_mode is stored in the database file itself, so WAL (and the
+synchronous level that goes with it) is only part of the profile when
+SQLITE_WAL is set for the served app. Switching it back needs
+``PRAGMA journal_mode=DELETE`` on the file, not only SQLITE_WAL=False.
+"""
+from django.conf import settings
+
+
+def pragma_statements(pragmas):
+    """``PRAGMA name = value`` statements, busy_timeout first so the others wait for locks"""
+    ordered = sorted(pragmas.items(), key=lambda item: item[0] != 'busy_timeout')
+    return [f'PRAGMA {name} = {value}' for name, value in ordered]
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """connection_created receiver (see ApiConfig.ready)"""
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_TUNING', False):
+        return
+    # On the raw connection: not a query of whichever request opened it
+    for statement in pragma_statements(getattr(settings, 'SQLITE_PRAGMAS', {})):
+        connection.connection.execute(statement)
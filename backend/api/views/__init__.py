@@ -0,0 +1,52 @@
+"""
+API views, one module per domain (accounts, admin_users, bookings, visitors, ...).
+
+Everything the URLconfs reference is re-exported here, so ``from .views import X``
+and ``views.X`` keep working. Dependencies that are slow to import and only needed
+by a few endpoints - requests, smtplib/email.mime, csv and the ReportLab PDF code in
+api.visitor_request_utils - are imported inside the views that use them, so a
+worker does not pay for them at startup. ``manage.py startup_profile`` shows what
+importing the project costs.
+"""
+from .root import api_root
+from .accounts import (
+    send_verification_email, verify_email_code, upload_document, send_email, password_reset_request,
+    password_reset_confirm, ChangePasswordView, register, update_user, get_user_profile, profile,
+    update_user_profile, verify_recaptcha, upload_verification_document,
+)
+from .admin_users import (
+    AdminUserCursorPagination, PendingVerificationCursorPagination, pending_verifications, verify_user, reject_user,
+    admin_user_list, admin_user_delete, admin_user_update, admin_user_detail, admin_create_user, admin_update_user,
+    admin_change_user_password,
+)
+from .dashboard import (
+    SUBDIVISION_CAPACITY, build_admin_dashboard_stats, get_admin_dashboard_stats, admin_stats,
+    admin_pin_stats, admin_dashboard_stats,
+)
+from .history import (
+    AuditLogCursorPagination, UserHistoryListView, UserHistoryDetailView, AUDIT_EXPORT_COLUMNS,
+    UserHistoryExportView, user_history_filters,
+)
+from .community import (
+    get_posts, get_user_posts, post_detail, message_list_create, NewsViewSet, AlertViewSet, BulletinViewSet,
+    ContactInfoViewSet, ContactMessageViewSet, BlogCommentViewSet, BulletinCommentViewSet,
+    CommunityMediaViewSet, FAQViewSet,
+)
+from .subdivision import (
+    subdivision_list_create, subdivision_detail, PinViewSet, SubdivisionViewSet, ReviewViewSet,
+)
+from .bookings import (
+    FacilityViewSet, IsAdminOrOwner, BookingViewSet, AvailableSlotViewSet, MaintenanceViewSet,
+)
+from .visitors import (
+    my_resident_pin, visitor_checkin, guest_visitor_checkin, visitor_approval, visitor_checkout,
+    active_visitors, pending_visitors, VisitorViewSet, ResidentPinViewSet, ResidentApprovalViewSet,
+    all_visitors, VisitorListView, guest_visitors, VisitorCheckinView, visitor_status, guest_visitor_status,
+    resident_visitors, visitor_timeout, VisitorTrackingViewSet,
+)
+from .visitor_requests import VisitorRequestViewSet, verify_pin_view
+from .houses import (
+    HouseListCreateView, HouseDetailView, HouseViewSet, GuestHouseListView, GuestHouseDetailView,
+)
+from .billing import upload_billing, admin_user_bills, delete_billing, ServiceFeeViewSet
+from .maintenance_requests import MaintenanceRequestViewSet, MaintenanceProviderViewSet
@@ -0,0 +1,369 @@
+"""
+Registration, e-mail verification, passwords and the signed-in user's own profile.
+"""
+import json
+
+from django.conf import settings
+from django.contrib.auth import update_session_auth_hash
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.mail import send_mail
+from django.http import JsonResponse
+from django.utils.crypto import get_random_string
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.views.decorators.csrf import csrf_exempt
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .. import recaptcha
+from ..models import UserProfile
+from ..serializers import UserSerializer
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def send_verification_email(request):
+    email = request.data.get('email')
+    if not email:
+        return Response({'error': 'Email required'}, status=400)
+
+    code = get_random_string(6, allowed_chars='0123456789')
+    cache.set(email, code, timeout=300)  # valid for 5 minutes
+
+    send_mail(
+    'Your Verification Code',
+    f'Your Happy Homes verification code is: {code}',
+    settings.DEFAULT_FROM_EMAIL,
+    [email],
+    fail_silently=False,
+    )
+
+    return Response({'message': 'Verification code sent'})
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def verify_email_code(request):
+    email = request.data.get('email')
+    code = request.data.get('code')
+
+    if not email or not code:
+        return Response({'error': 'Email and code required'}, status=400)
+
+    stored_code = cache.get(email)
+    if stored_code == code:
+        return Response({'verified': True})
+    else:
+        return Response({'verified': False}, status=400)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_document(request):
+    """
+    Allows a user to upload their own document.
+    """
+    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+
+    if 'document' not in request.FILES:
+        return Response({'detail': 'No document provided.'}, status=400)
+
+    profile.document = request.FILES['document']
+    profile.save()
+
+    return Response({'detail': 'Document uploaded successfully.'})
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])  # ✅ allow anyone
+def send_email(request):
+    data = request.data
+    subject = data.get('subject')
+    message = data.get('message')
+    recipient = data.get('recipient')
+
+    if not subject or not message or not recipient:
+        return Response({"error": "subject, message, and recipient are required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        send_mail(
+            subject=subject,
+            message=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[recipient],
+            fail_silently=False,
+        )
+        return Response({"success": "Email sent successfully"})
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def password_reset_message(user):
+    """(subject, body) of the password reset e-mail for ``user``"""
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = default_token_generator.make_token(user)
+
+    reset_link = f"{settings.FRONTEND_URL}/reset-password?uid={uid}&token={token}"
+
+    subject = "Reset Your Password"
+    message = f"Hi {user.username},\n\nClick the link below to reset your password:\n{reset_link}\n\nIf you didn't request this, ignore this email."
+    return subject, message
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def password_reset_request(request):
+    email = request.data.get("email")
+    if not email:
+        return Response({"error": "Email is required."}, status=400)
+
+    try:
+        user = User.objects.get(email=email)
+    except User.DoesNotExist:
+        return Response({"message": "If the email exists, a reset link will be sent."}, status=200)  # do not reveal
+
+    subject, message = password_reset_message(user)
+    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [email])
+
+    return Response({"message": "If the email exists, a reset link will be sent."})
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def password_reset_confirm(request):
+    uidb64 = request.data.get('uid')
+    token = request.data.get('token')
+    new_password = request.data.get('new_password')
+
+    if not uidb64 or not token or not new_password:
+        return Response({"error": "All fields are required."}, status=400)
+
+    try:
+        uid = urlsafe_base64_decode(uidb64).decode()
+        user = User.objects.get(pk=uid)
+    except (TypeError, ValueError, OverflowError, User.DoesNotExist):
+        return Response({"error": "Invalid link"}, status=400)
+
+    if not default_token_generator.check_token(user, token):
+        return Response({"error": "Invalid or expired token."}, status=400)
+
+    user.set_password(new_password)
+    user.save()
+
+    return Response({"message": "Password reset successful."}, status=200)
+
+
+class ChangePasswordView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        user = request.user
+        old_password = request.data.get("old_password")
+        new_password = request.data.get("new_password")
+
+        if not old_password or not new_password:
+            return Response({"detail": "Both old and new passwords are required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not user.check_password(old_password):
+            return Response({"detail": "Old password is incorrect."}, status=status.HTTP_400_BAD_REQUEST)
+
+        user.set_password(new_password)
+        user.save()
+
+        # Keep user logged in after password change
+        update_session_auth_hash(request, user)
+
+        return Response({"detail": "Password updated successfully!"}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def register(request):
+    try:
+        data = request.data
+
+        username = data.get('username', '').strip()
+        email = data.get('email', '').strip().lower()  # normalize email
+        password = data.get('password', '')
+        first_name = data.get('first_name', '')
+        last_name = data.get('last_name', '')
+        contact_number = data.get('contact_number', '')
+
+        # ✅ Validate required fields
+        if not username:
+            return Response({'detail': 'Username is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not email:
+            return Response({'detail': 'Email is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not password:
+            return Response({'detail': 'Password is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ✅ Check if username already exists
+        if User.objects.filter(username=username).exists():
+            return Response({'detail': 'Username already exists.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ✅ Check if email already exists
+        if User.objects.filter(email=email).exists():
+            return Response({'detail': 'This email is already registered.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ✅ Create user
+        user = User.objects.create_user(
+            username=username,
+            password=password,
+            first_name=first_name,
+            last_name=last_name,
+            email=email
+        )
+
+        # ✅ Create or update user profile
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        profile.contact_number = contact_number
+        profile.save()
+
+        # ✅ Serialize and return tokens
+        serializer = UserSerializer(user)
+        refresh = RefreshToken.for_user(user)
+
+        return Response({
+            'user': serializer.data,
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+        }, status=status.HTTP_201_CREATED)
+    except Exception as e:
+        return Response({'detail': f'Registration failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAdminUser])
+def update_user(request, id):
+    try:
+        user = User.objects.get(id=id)
+    except User.DoesNotExist:
+        return Response({'detail': 'User not found'}, status=404)
+
+    # Update basic user info
+    user.first_name = request.data.get('first_name', user.first_name)
+    user.last_name = request.data.get('last_name', user.last_name)
+    user.email = request.data.get('email', user.email)
+    user.username = request.data.get('username', user.username)
+    user.save()
+
+    # Update profile
+    profile, _ = UserProfile.objects.get_or_create(user=user)
+    profile_data = request.data.get('profile', {})
+
+    profile.contact_number = profile_data.get('contact_number', profile.contact_number)
+
+    # Update verification status if provided
+    if 'is_verified' in profile_data:
+        profile.is_verified = profile_data['is_verified']
+
+    # Update profile image if provided
+    if 'profile_image' in request.FILES:
+        profile.profile_image = request.FILES['profile_image']
+
+    # Update document if provided
+    if 'document' in request.FILES:
+        profile.document = request.FILES['document']
+
+    profile.save()
+
+    return Response({'detail': 'User updated successfully'})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_user_profile(request):
+    serializer = UserSerializer(request.user, context={'request': request})
+    return Response(serializer.data)
+
+
+# --- Profile GET ---
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile(request):
+    serializer = UserSerializer(request.user)
+    return Response(serializer.data)
+
+
+# --- Profile UPDATE (with image) ---
+# ✅ Update profile (name, email, password, image, etc.)
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def update_user_profile(request):
+    user = request.user
+    profile, created = UserProfile.objects.get_or_create(user=user)
+
+    # Update User fields
+    user.first_name = request.data.get('first_name', user.first_name)
+    user.last_name = request.data.get('last_name', user.last_name)
+    user.email = request.data.get('email', user.email)
+    user.username = request.data.get('username', user.username)
+    if 'password' in request.data and request.data['password']:
+        user.set_password(request.data['password'])
+    user.save()
+
+    # Update UserProfile fields (IMPORTANT: include contact_number)
+    profile.contact_number = request.data.get('contact_number', profile.contact_number)
+    if 'profile_image' in request.FILES:
+        profile.profile_image = request.FILES['profile_image']
+    profile.save()
+
+    # Refresh both user and profile to ensure updated data
+    user.refresh_from_db()
+    profile.refresh_from_db()
+
+    # Serialize full user including profile
+    serializer = UserSerializer(user, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+# --- reCAPTCHA ---
+def recaptcha_login_response(data, verification):
+    """Answer to a login attempt given the api.recaptcha ``verification`` of its token"""
+    if not verification.success:
+        if not verification.available:
+            return JsonResponse({'message': 'reCAPTCHA verification is temporarily unavailable'}, status=503)
+        return JsonResponse({'message': 'reCAPTCHA verification failed'}, status=400)
+
+    # Example login check (replace with your own logic)
+    username = data.get('username')
+    password = data.get('password')
+    if username == 'test' and password == 'password':
+        return JsonResponse({'access': 'fake-jwt-token'}, status=200)
+
+    return JsonResponse({'message': 'Invalid username or password'}, status=400)
+
+
+@csrf_exempt
+def verify_recaptcha(request):
+    if request.method == 'POST':
+        data = json.loads(request.body)
+        recaptcha_token = data.get('recaptcha')
+
+        if not recaptcha_token:
+            return JsonResponse({'message': 'reCAPTCHA token missing'}, status=400)
+
+        return recaptcha_login_response(data, recaptcha.verify(recaptcha_token))
+
+    return JsonResponse({'message': 'Invalid request method'}, status=405)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_verification_document(request):
+    profile = request.user.profile
+    file = request.FILES.get('document')
+    if not file:
+        return Response({"error": "No document uploaded"}, status=400)
+
+    profile.document = file
+    profile.is_verified = False  # Set to False initially; admin will verify later
+    profile.save()
+    return Response({"message": "Document uploaded successfully!"})
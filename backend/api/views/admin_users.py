@@ -0,0 +1,353 @@
+"""
+Staff management of user accounts and resident verification.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import Billing, UserProfile
+from ..serializers import UserSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+# --- Admin user listings ---
+class AdminUserCursorPagination(CursorPagination):
+    """Keyset pagination for the admin user listings (oldest account first)"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('id',)
+
+
+class PendingVerificationCursorPagination(AdminUserCursorPagination):
+    """Same order as the other admin listings: by user id, not profile id"""
+    ordering = ('user_id',)
+
+
+def _search_users(queryset, term, prefix=''):
+    """?search= over username, email and first/last name"""
+    term = (term or '').strip()
+    if not term:
+        return queryset
+    query = Q()
+    for field in ('username', 'email', 'first_name', 'last_name'):
+        query |= Q(**{f'{prefix}{field}__icontains': term})
+    return queryset.filter(query)
+
+
+def _paginated_admin_listing(request, queryset, serialize, pagination_class=AdminUserCursorPagination):
+    paginator = pagination_class()
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response([serialize(obj) for obj in page])
+
+
+# Get pending verifications
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def pending_verifications(request):
+    pending_profiles = _search_users(
+        UserProfile.objects
+        .filter(is_verified=False, document__isnull=False)
+        .exclude(document='')
+        .select_related('user')
+        .only('id', 'is_verified', 'document', 'user__id', 'user__username', 'user__email',
+              'user__first_name', 'user__last_name'),
+        request.query_params.get('search'),
+        prefix='user__',
+    )
+
+    def serialize(profile):
+        return {
+            'id': profile.user.id,
+            'username': profile.user.username,
+            'email': profile.user.email,
+            'document': profile.document.url if profile.document else None,
+            'is_verified': profile.is_verified
+        }
+
+    return _paginated_admin_listing(request, pending_profiles, serialize, PendingVerificationCursorPagination)
+
+
+# ✅ Approve (verify) uploaded document
+@api_view(['PUT'])
+@permission_classes([IsAdminUser])
+def verify_user(request, user_id):
+    user = get_object_or_404(User, id=user_id)
+    profile = user.profile  # assumes OneToOne relationship
+
+    if not profile.document:
+        return Response({"error": "No document uploaded to verify."}, status=status.HTTP_400_BAD_REQUEST)
+
+    profile.is_verified = True
+    profile.save()
+
+    # ✅ Send approval email about verified document
+    try:
+        send_mail(
+            subject="✅ Document Verification Approved - Happy Homes System",
+            message=(
+                f"Hello {user.username},\n\n"
+                f"We have reviewed your submitted verification document, and it has been approved.\n\n"
+                f"Your account is now fully verified and you may continue using Happy Homes.\n\n"
+                f"Thank you for using Happy Homes!\n\n"
+                f"Thank you for providing a valid document!\n\n"
+                f"Best regards,\nHappy Homes Admin Team"
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[user.email],
+            fail_silently=False,
+        )
+    except Exception as e:
+        logger.error("Error sending approval email: %s", e)
+
+    return Response({"detail": "User document verified successfully"})
+
+
+# ❌ Reject uploaded document or Unverify user
+@api_view(['PUT'])
+@permission_classes([IsAdminUser])
+def reject_user(request, user_id):
+    try:
+        profile = UserProfile.objects.get(user__id=user_id)
+        user = profile.user
+
+        # Check if this is a rejection (has document) or unverification (no document but was verified)
+        is_rejection = profile.document is not None
+        was_verified = profile.is_verified
+
+        if is_rejection:
+            # Rejecting a document submission
+            profile.is_verified = False
+            # Optional: remove invalid document from storage
+            if profile.document:
+                profile.document.delete(save=True)
+            profile.save()
+
+            # ✅ Send rejection email
+            try:
+                send_mail(
+                    subject="❌ Document Verification Rejected - Happy Homes System",
+                    message=(
+                        f"Hello {user.username},\n\n"
+                        f"Unfortunately, your submitted verification document could not be approved.\n"
+                        f"Please ensure the uploaded document is clear, complete, and legitimate, then re-upload for review.\n\n"
+                        f"If you have any questions, please contact the admin.\n\n"
+                        f"Best regards,\nHappy Homes Admin Team"
+                    ),
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[user.email],
+                    fail_silently=False,
+                )
+            except Exception as e:
+                logger.error("Error sending rejection email: %s", e)
+
+            return Response({'message': 'User document rejected successfully'})
+        elif was_verified:
+            # Unverifying a previously verified user
+            profile.is_verified = False
+            profile.save()
+
+            # ✅ Send unverification email
+            try:
+                send_mail(
+                    subject="⚠️ Account Verification Revoked - Happy Homes System",
+                    message=(
+                        f"Hello {user.username},\n\n"
+                        f"Your account verification has been revoked by an administrator.\n"
+                        f"Your account status has been changed to unverified.\n\n"
+                        f"If you believe this is an error or have questions, please contact the admin.\n\n"
+                        f"Best regards,\nHappy Homes Admin Team"
+                    ),
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[user.email],
+                    fail_silently=False,
+                )
+            except Exception as e:
+                logger.error("Error sending unverification email: %s", e)
+
+            return Response({'message': 'User unverified successfully'})
+        else:
+            return Response({"error": "User is not verified and has no document to reject."}, status=status.HTTP_400_BAD_REQUEST)
+
+    except UserProfile.DoesNotExist:
+        return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+# Admin-only user list
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_user_list(request):
+    from django.db.models import Prefetch
+    users = _search_users(
+        User.objects
+        .select_related('profile')
+        .prefetch_related(
+            Prefetch('profile__billing_records', queryset=Billing.objects.only('id', 'user_profile_id', 'file'))
+        )
+        .only('id', 'username', 'email', 'first_name', 'last_name', 'is_staff',
+              'profile__id', 'profile__user_id', 'profile__profile_image', 'profile__contact_number',
+              'profile__is_verified', 'profile__document'),
+        request.query_params.get('search'),
+    )
+    paginator = AdminUserCursorPagination()
+    page = paginator.paginate_queryset(users, request)
+    serializer = UserSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
+
+# Admin can delete a user
+@api_view(['DELETE'])
+@permission_classes([IsAdminUser])
+def admin_user_delete(request, user_id):
+    try:
+        user = User.objects.get(id=user_id)
+        if user.is_superuser:
+            return Response({'detail': 'Cannot delete superuser.'}, status=status.HTTP_403_FORBIDDEN)
+        user.delete()
+        return Response({'detail': 'User deleted.'}, status=status.HTTP_200_OK)
+    except User.DoesNotExist:
+        return Response({'detail': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+
+# Admin can update a user (basic fields)
+@api_view(['PUT'])
+@permission_classes([IsAdminUser])
+def admin_user_update(request, user_id):
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        return Response({'detail': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    user.first_name = request.data.get('first_name', user.first_name)
+    user.last_name = request.data.get('last_name', user.last_name)
+    user.email = request.data.get('email', user.email)
+    user.username = request.data.get('username', user.username)
+    user.is_staff = request.data.get('is_staff', user.is_staff)
+    user.save()
+
+    serializer = UserSerializer(user, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_user_detail(request, pk):
+    try:
+        user = User.objects.get(id=pk)
+    except User.DoesNotExist:
+        return Response({'detail': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    serializer = UserSerializer(user, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_create_user(request):
+    """Admin endpoint to create a new user with default password 'user123'"""
+    try:
+        data = request.data
+
+        username = data.get('username', '').strip()
+        email = data.get('email', '').strip().lower()
+        first_name = data.get('first_name', '').strip()
+        last_name = data.get('last_name', '').strip()
+        contact_number = data.get('contact_number', '').strip()
+
+        # Validate required fields
+        if not username:
+            return Response({'detail': 'Username is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not email:
+            return Response({'detail': 'Email is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Check if username already exists
+        if User.objects.filter(username=username).exists():
+            return Response({'detail': 'Username already exists.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Check if email already exists
+        if User.objects.filter(email=email).exists():
+            return Response({'detail': 'This email is already registered.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Create user with default password
+        DEFAULT_PASSWORD = 'user123'
+        user = User.objects.create_user(
+            username=username,
+            password=DEFAULT_PASSWORD,
+            first_name=first_name,
+            last_name=last_name,
+            email=email
+        )
+
+        # Create or update user profile
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        if contact_number:
+            profile.contact_number = contact_number
+        profile.save()
+
+        # Serialize and return user data
+        serializer = UserSerializer(user)
+        return Response({
+            'user': serializer.data,
+            'detail': 'User created successfully with default password: user123'
+        }, status=status.HTTP_201_CREATED)
+    except Exception as e:
+        logger.error("Error creating user: %s", e, exc_info=True)
+        return Response({'detail': f'Failed to create user: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAdminUser])
+def admin_update_user(request, user_id):
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        return Response({"detail": "User not found"}, status=404)
+
+    data = request.data
+    user.first_name = data.get("first_name", user.first_name)
+    user.last_name = data.get("last_name", user.last_name)
+    user.email = data.get("email", user.email)
+    user.save()
+
+    # Update profile if exists
+    profile_data = data.get("profile", {})
+    profile = getattr(user, "profile", None)
+    if profile:
+        profile.contact_number = profile_data.get("contact_number", profile.contact_number)
+        profile.save()
+
+    return Response({"detail": "User updated successfully"}, status=200)
+
+
+# -------------------------
+# Admin: Change User Password
+# -------------------------
+@api_view(['PUT'])
+@permission_classes([IsAdminUser])
+def admin_change_user_password(request, user_id):
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        return Response({"detail": "User not found"}, status=404)
+
+    new_password = request.data.get("new_password")
+    if not new_password:
+        return Response({"detail": "New password is required"}, status=400)
+
+    user.password = make_password(new_password)
+    user.save()
+
+    return Response({"detail": "Password updated successfully"}, status=200)
@@ -0,0 +1,392 @@
+"""
+Billing files and monthly service fees.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import Billing, BillingRecord, ServiceFee
+from ..serializers import BillingSerializer, ServiceFeeSerializer
+from .admin_users import _paginated_admin_listing, _search_users
+
+
+logger = logging.getLogger(__name__)
+
+
+# views.py
+# Upload Billing (User)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_billing(request):
+    file = request.FILES.get('billing')
+    if not file:
+        return Response({'error': 'No file uploaded'}, status=400)
+
+    billing = Billing.objects.create(user_profile=request.user.profile, file=file)
+    serializer = BillingSerializer(billing, context={'request': request})
+    return Response(serializer.data)
+
+
+# Fetch all users with billing records
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_user_bills(request):
+    from django.db.models import Prefetch
+    users = _search_users(
+        User.objects
+        .prefetch_related(
+            Prefetch('billing_records', queryset=BillingRecord.objects.only('id', 'user_id', 'file'))
+        )
+        .only('id', 'username', 'first_name', 'last_name', 'email'),
+        request.query_params.get('search'),
+    )
+
+    def serialize(user):
+        return {
+            "id": user.id,
+            "username": user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "email": user.email,
+            "profile": {
+                "billing_records": [b.file.url for b in user.billing_records.all()]
+            }
+        }
+
+    return _paginated_admin_listing(request, users, serialize)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_billing(request):
+    user = request.user
+
+    billing_id = request.data.get("id")
+    if not billing_id:
+        return Response({"error": "Billing ID is required"}, status=400)
+
+    try:
+        billing = Billing.objects.get(id=billing_id, user_profile=user.profile)
+    except Billing.DoesNotExist:
+        return Response({"error": "Billing not found"}, status=404)
+
+    # Delete file from storage
+    if billing.file and billing.file.name:
+        billing.file.delete(save=False)
+
+    billing.delete()
+    return Response({"success": "Billing record deleted"})
+
+
+class ServiceFeeViewSet(viewsets.ModelViewSet):
+    serializer_class = ServiceFeeSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def get_queryset(self):
+        user = self.request.user
+
+        # Admins can see all service fees
+        if user.is_staff:
+            queryset = ServiceFee.objects.all()
+
+            # Filter by homeowner ID or name
+            homeowner_id = self.request.query_params.get('homeowner_id')
+            homeowner_name = self.request.query_params.get('homeowner_name')
+
+            if homeowner_id:
+                queryset = queryset.filter(homeowner_id=homeowner_id)
+            if homeowner_name:
+                queryset = queryset.filter(homeowner__username__icontains=homeowner_name)
+
+            queryset = queryset.order_by('-created_at', '-due_date')
+        else:
+            # Homeowners can only see their own service fees (if verified)
+            if hasattr(user, 'profile') and user.profile.is_verified:
+                queryset = ServiceFee.objects.filter(homeowner=user).order_by('-created_at', '-due_date')
+            else:
+                # Unverified users see nothing
+                return ServiceFee.objects.none()
+
+        # Delinquency is derived in SQL (effective_status) instead of being
+        # written here; manage.py mark_delinquent_service_fees persists it.
+        queryset = queryset.select_related('homeowner').with_effective_status()
+
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(effective_status=status_filter)
+
+        return queryset
+
+    def get_permissions(self):
+        # Only authenticated users can access
+        if hasattr(self, 'action'):
+            # Homeowners can upload receipts via partial_update
+            if self.action == 'partial_update':
+                user = self.request.user
+                # Check if user is the homeowner and verified
+                if hasattr(user, 'profile') and user.profile.is_verified:
+                    # Allow if they're updating their own service fee
+                    return [IsAuthenticated()]
+            # Only admins can create/update/delete
+            if self.action in ['create', 'update', 'destroy', 'bulk_issue', 'summary']:
+                return [IsAdminUser()]
+        return [IsAuthenticated()]  # Authenticated users can view
+
+    def get_object(self):
+        """Override to check ownership for homeowners"""
+        obj = super().get_object()
+        user = self.request.user
+
+        # If homeowner is trying to update, ensure they own this service fee
+        if not user.is_staff and hasattr(user, 'profile') and user.profile.is_verified:
+            if obj.homeowner != user:
+                from rest_framework.exceptions import PermissionDenied
+                raise PermissionDenied(detail="You can only update your own service fees.")
+
+        return obj
+
+    def perform_create(self, serializer):
+        """Create service fee and send email notification to homeowner"""
+        try:
+            service_fee = serializer.save()
+        except Exception as e:
+            logger.error("Error saving service fee: %s", e)
+            raise
+
+        # Send email notification to homeowner (non-blocking)
+        if service_fee.homeowner and service_fee.homeowner.email:
+            try:
+                from ..service_fee_utils import build_service_fee_email
+                subject, plain_message, html_message = build_service_fee_email(service_fee)
+
+                send_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[service_fee.homeowner.email],
+                    html_message=html_message,
+                    fail_silently=True,  # Don't fail if email can't be sent
+                )
+            except Exception as e:
+                logger.error("Error sending email notification: %s", e)
+                # Don't raise - email failure shouldn't prevent service fee creation
+
+    @action(detail=False, methods=['post'], url_path='bulk-issue')
+    def bulk_issue(self, request):
+        """
+        Issue the monthly service fee to every verified homeowner (admin only).
+
+        POST /api/service-fees/bulk-issue/
+        {
+            "month": "January" | 1,
+            "year": 2025,
+            "due_date": "2025-01-15",
+            "amount": "500.00",
+            "amount_rule": "flat" | "previous",   (optional, default flat)
+            "overrides": {"<homeowner_id>": "750.00"},   (optional)
+            "notes": "...",                       (optional)
+            "notify": true,                       (optional, default true)
+            "dry_run": false                      (optional)
+        }
+        Homeowners already billed for the month/year are skipped.
+        """
+        from ..service_fee_utils import issue_monthly_service_fees, queue_service_fee_notifications
+        data = request.data
+
+        missing = [field for field in ('month', 'year', 'due_date') if not data.get(field)]
+        if missing:
+            return Response({'error': f"Missing required field(s): {', '.join(missing)}"}, status=status.HTTP_400_BAD_REQUEST)
+        due_date = parse_date(str(data.get('due_date')))
+        if due_date is None:
+            return Response({'error': 'due_date must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+        if data.get('amount_rule', 'flat') == 'flat' and data.get('amount') in (None, ''):
+            return Response({'error': 'amount is required for the flat amount rule'}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+        try:
+            result = issue_monthly_service_fees(
+                month=data.get('month'),
+                year=data.get('year'),
+                due_date=due_date,
+                amount=data.get('amount'),
+                amount_rule=data.get('amount_rule', 'flat'),
+                overrides=data.get('overrides') or None,
+                notes=data.get('notes') or None,
+                issued_by=request.user,
+                dry_run=dry_run,
+            )
+        except (ValueError, TypeError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        notify = str(data.get('notify', 'true')).lower() not in ('0', 'false', 'no')
+        if notify and not dry_run:
+            queue_service_fee_notifications(result['created'])
+
+        summary = {
+            'created': len(result['created']),
+            'skipped_existing': result['skipped'],
+            'without_amount': result['without_amount'],
+            'eligible_homeowners': result['eligible'],
+            'notifications_queued': notify and not dry_run,
+        }
+        if dry_run:
+            summary['would_create'] = result['would_create']
+            return Response(summary, status=status.HTTP_200_OK)
+        return Response(summary, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='summary')
+    def summary(self, request):
+        """
+        Collection report for admins.
+
+        GET /api/service-fees/summary/?year=2025&page=1&page_size=50
+        - totals / counts per year, month and effective status
+        - aging buckets (0-30, 31-60, 60+ days overdue)
+        - outstanding balance per homeowner (paginated, largest first)
+
+        Cached; any ServiceFee write invalidates it.
+        """
+        from django.core.cache import cache
+        from django.core.paginator import Paginator, EmptyPage
+        from ..caching import versioned_key
+        from ..service_fee_utils import SUMMARY_CACHE_NAMESPACE, build_financial_summary, outstanding_balances_queryset
+
+        year = request.query_params.get('year')
+        try:
+            year = int(year) if year else None
+            page_number = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 50)), 1), 500)
+        except ValueError:
+            return Response({'error': 'year, page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        today = timezone.localdate()
+        ttl = getattr(settings, 'SERVICE_FEE_SUMMARY_CACHE_SECONDS', 300)
+
+        summary_key = versioned_key(SUMMARY_CACHE_NAMESPACE, 'summary', today, year or 'all')
+        report = cache.get(summary_key)
+        if report is None:
+            report = build_financial_summary(year=year, today=today)
+            cache.set(summary_key, report, ttl)
+
+        balances_key = versioned_key(SUMMARY_CACHE_NAMESPACE, 'balances', today, page_number, page_size)
+        balances = cache.get(balances_key)
+        if balances is None:
+            paginator = Paginator(outstanding_balances_queryset(today), page_size)
+            try:
+                page = paginator.page(page_number)
+                results = list(page.object_list)
+                has_next, has_previous = page.has_next(), page.has_previous()
+            except EmptyPage:
+                results, has_next, has_previous = [], False, page_number > 1
+            balances = {
+                'count': paginator.count,
+                'page': page_number,
+                'page_size': page_size,
+                'has_next': has_next,
+                'has_previous': has_previous,
+                'results': [
+                    {
+                        'homeowner_id': row['homeowner_id'],
+                        'homeowner_name': row['homeowner__username'],
+                        'homeowner_email': row['homeowner__email'],
+                        'outstanding': row['outstanding'],
+                        'unpaid_fees': row['unpaid_fees'],
+                        'overdue_fees': row['overdue_fees'],
+                        'oldest_due_date': row['oldest_due_date'],
+                        'latest_due_date': row['latest_due_date'],
+                    }
+                    for row in results
+                ],
+            }
+            cache.set(balances_key, balances, ttl)
+
+        return Response({**report, 'outstanding_balances': balances})
+
+    def perform_update(self, serializer):
+        """Update service fee and notify if status changes"""
+        user = self.request.user
+        old_status = self.get_object().status
+
+        # If homeowner is updating, only allow receipt_image to be updated
+        if not user.is_staff and hasattr(user, 'profile') and user.profile.is_verified:
+            # Only allow receipt_image to be updated by homeowners
+            allowed_fields = {'receipt_image'}
+            data = serializer.validated_data
+            restricted_fields = set(data.keys()) - allowed_fields
+            if restricted_fields:
+                from rest_framework.exceptions import ValidationError
+                raise ValidationError(f"Homeowners can only update receipt_image. Restricted fields: {', '.join(restricted_fields)}")
+
+        service_fee = serializer.save()
+
+        # Send email if status changed to paid (only if admin changed it)
+        if user.is_staff and old_status != service_fee.status and service_fee.status == 'paid' and service_fee.homeowner.email:
+            try:
+                subject = f"Service Fee Payment Confirmed - {service_fee.month or 'Monthly'} {service_fee.year or ''}"
+                message = f"""
+Dear {service_fee.homeowner.username},
+
+Your service fee payment for {service_fee.month or 'Monthly'} {service_fee.year or ''} has been confirmed.
+
+Amount: ₱{service_fee.amount or 'N/A'}
+Status: Paid
+
+Thank you for your payment.
+
+Happy Homes Administration
+                """
+                send_mail(
+                    subject=subject,
+                    message=message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[service_fee.homeowner.email],
+                    fail_silently=True,
+                )
+            except Exception as e:
+                logger.error("Error sending payment confirmation email: %s", e)
+
+        # Notify admin when homeowner uploads receipt
+        if not user.is_staff and hasattr(user, 'profile') and user.profile.is_verified:
+            if 'receipt_image' in serializer.validated_data and service_fee.receipt_image:
+                try:
+                    # Get admin users to notify
+                    from django.contrib.auth.models import User
+                    admin_users = User.objects.filter(is_staff=True, is_active=True)
+                    admin_emails = [admin.email for admin in admin_users if admin.email]
+
+                    if admin_emails:
+                        subject = f"Receipt Uploaded - {service_fee.homeowner.username} - {service_fee.month or 'Monthly'} {service_fee.year or ''}"
+                        message = f"""
+A homeowner has uploaded a payment receipt.
+
+Homeowner: {service_fee.homeowner.username} ({service_fee.homeowner.email})
+Service Fee: {service_fee.month or 'Monthly'} {service_fee.year or ''}
+Amount: ₱{service_fee.amount or 'N/A'}
+
+Please review the receipt in the admin panel.
+
+Happy Homes System
+                        """
+                        send_mail(
+                            subject=subject,
+                            message=message,
+                            from_email=settings.DEFAULT_FROM_EMAIL,
+                            recipient_list=admin_emails,
+                            fail_silently=True,
+                        )
+                except Exception as e:
+                    logger.error("Error sending receipt notification to admin: %s", e)
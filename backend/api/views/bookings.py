@@ -0,0 +1,1009 @@
+"""
+Facilities, facility bookings, available slots and facility maintenance windows.
+"""
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+
+from rest_framework import permissions, status, viewsets
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..conditional import ConditionalGetMixin
+from ..models import AvailableSlot, Booking, Facility, Maintenance
+from ..serializers import (
+    AvailableSlotSerializer, BookingSerializer, FacilitySerializer, MaintenanceSerializer,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class FacilityViewSet(viewsets.ModelViewSet):
+    queryset = Facility.objects.all()
+    serializer_class = FacilitySerializer
+    permission_classes = [AllowAny]  # Allow public access by default
+    authentication_classes = []  # No authentication required by default
+
+    def get_authenticators(self):
+        """Override to require authentication only for write operations"""
+        # Check request method - GET requests don't need authentication
+        request = getattr(self, 'request', None)
+        if request and request.method in ['GET', 'OPTIONS', 'HEAD']:
+            return []  # No authentication for read
+        # Require authentication for create, update, delete (POST, PUT, PATCH, DELETE)
+        return [JWTAuthentication()]
+
+    def get_permissions(self):
+        # Allow public read access, but require admin for write operations
+        if self.action in ['list', 'retrieve']:
+            return [AllowAny()]
+        # For write operations, require authentication and admin
+        return [IsAuthenticated(), IsAdminUser()]
+
+
+class IsAdminOrOwner(permissions.BasePermission):
+    """
+    Custom permission to only allow admins or the owner of the object to access it.
+    """
+    def has_permission(self, request, view):
+        """Allow authenticated users to create/list bookings"""
+        # For create/list actions, just check if user is authenticated
+        # The IsAuthenticated permission class already handles this, but we add it here for clarity
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return True
+
+    def has_object_permission(self, request, view, obj):
+        """For retrieve/update/delete, check if user is admin or owner"""
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return request.user.is_staff or obj.user == request.user
+
+
+class BookingViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    serializer_class = BookingSerializer
+    conditional_models = ('auth.User', 'api.Facility')
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminOrOwner]
+
+    def get_queryset(self):
+        facility_id = self.request.query_params.get("facility_id")
+
+        # Ensure user is authenticated
+        if not self.request.user or not self.request.user.is_authenticated:
+            return Booking.objects.none()
+
+        # Admins can see all bookings
+        if self.request.user.is_staff:
+            qs = Booking.objects.select_related('facility', 'user').all()
+        else:
+            # Homeowners/residents see only their own bookings
+            qs = Booking.objects.select_related('facility', 'user').filter(user=self.request.user)
+
+        if facility_id:
+            qs = qs.filter(facility_id=facility_id)
+
+        return qs.order_by("-date", "-start_time")  # Order by newest first
+
+    def get_serializer_context(self):
+        """Ensure request is always in serializer context"""
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def create(self, request, *args, **kwargs):
+        """Override create to reload booking with relationships before response"""
+        # Import exceptions explicitly to avoid scoping issues
+        from rest_framework.exceptions import ValidationError as VE, PermissionDenied as PD
+        try:
+            # Validate input data first
+            logger.debug("Received booking data: %s", request.data)
+            logger.debug("Request user: %s", request.user.username if request.user.is_authenticated else 'Not authenticated')
+            logger.debug("User is staff: %s", request.user.is_staff if request.user.is_authenticated else False)
+
+            # Check if user is authenticated
+            if not request.user or not request.user.is_authenticated:
+                return Response(
+                    {"detail": "Authentication required."},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
+
+            # Validate serializer
+            serializer = self.get_serializer(data=request.data)
+            try:
+                serializer.is_valid(raise_exception=True)
+                logger.debug("Serializer validated: %s", serializer.validated_data)
+            except Exception as validation_error:
+                logger.error("Serializer validation failed: %s", validation_error, exc_info=True)
+                # Return validation error as 400
+                error_detail = str(validation_error)
+                if hasattr(validation_error, 'detail'):
+                    error_detail = validation_error.detail
+                return Response(
+                    {"detail": error_detail},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Perform create (this saves the booking)
+            try:
+                self.perform_create(serializer)
+            except VE as ve:
+                # Re-raise ValidationError so it can be caught by outer handler
+                logger.error("ValidationError in perform_create: %s", ve)
+                raise
+            except PD as pd:
+                # Re-raise PermissionDenied so it can be caught by outer handler
+                logger.error("PermissionDenied in perform_create: %s", pd)
+                raise
+            except Exception as perform_error:
+                logger.error("perform_create failed with unexpected error: %s", perform_error, exc_info=True)
+                # Return as 400 error
+                return Response(
+                    {"detail": f"An error occurred: {str(perform_error)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Get the created booking instance
+            booking = serializer.instance
+            if not booking:
+                return Response(
+                    {"detail": "Booking instance was not created"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+            if not hasattr(booking, 'pk') or not booking.pk:
+                return Response(
+                    {"detail": "Booking was not saved properly"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+            logger.debug("Booking created with ID: %s", booking.pk)
+
+            # Reload booking with all relationships for proper serialization
+            try:
+                booking = Booking.objects.select_related('facility', 'user').get(pk=booking.pk)
+                logger.debug("Booking reloaded with relationships")
+            except Booking.DoesNotExist:
+                logger.warning("Could not reload booking, using original instance")
+                booking = serializer.instance
+            except Exception as reload_error:
+                logger.warning("Error reloading booking: %s", reload_error)
+                booking = serializer.instance
+
+            # Create response serializer with reloaded booking
+            try:
+                response_serializer = self.get_serializer(booking)
+                response_data = response_serializer.data
+                logger.debug("Response serialized successfully")
+            except Exception as serialize_error:
+                logger.error("Error serializing booking response: %s", serialize_error, exc_info=True)
+                # Fallback to basic data
+                try:
+                    facility_name = 'Unknown'
+                    if hasattr(booking, 'facility') and booking.facility:
+                        try:
+                            facility_name = booking.facility.get_name_display()
+                        except:
+                            try:
+                                facility_name = str(booking.facility.name)
+                            except:
+                                facility_name = 'Unknown'
+                except:
+                    facility_name = 'Unknown'
+
+                try:
+                    user_name = 'Unknown'
+                    if hasattr(booking, 'user') and booking.user:
+                        user_name = booking.user.username
+                except:
+                    user_name = 'Unknown'
+
+                response_data = {
+                    'id': getattr(booking, 'id', None),
+                    'facility_id': getattr(booking, 'facility_id', None),
+                    'facility_name': facility_name,
+                    'date': str(getattr(booking, 'date', '')) if hasattr(booking, 'date') else '',
+                    'start_time': str(getattr(booking, 'start_time', '')) if hasattr(booking, 'start_time') else '',
+                    'end_time': str(getattr(booking, 'end_time', '')) if hasattr(booking, 'end_time') else '',
+                    'status': getattr(booking, 'status', 'pending'),
+                    'user_name': user_name,
+                }
+
+            headers = self.get_success_headers(response_data)
+            return Response(
+                response_data,
+                status=status.HTTP_201_CREATED,
+                headers=headers
+            )
+        except VE as e:
+            logger.error("Validation error in create: %s", e, exc_info=True)
+            # Return validation error
+            error_detail = e.detail if hasattr(e, 'detail') else str(e)
+            return Response(
+                {"detail": error_detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except PD as e:
+            logger.error("Permission denied in create: %s", e, exc_info=True)
+            # Return permission error
+            error_detail = e.detail if hasattr(e, 'detail') else "Permission denied."
+            return Response(
+                {"detail": error_detail},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        except Exception as e:
+            logger.error("Unexpected error in create: %s", e, exc_info=True)
+            # Return a user-friendly error message
+            error_message = str(e)
+            if "facility" in error_message.lower():
+                error_message = "Invalid facility selected. Please try again."
+            elif "time" in error_message.lower() or "date" in error_message.lower():
+                error_message = "Invalid date or time selected. Please check your selection."
+            elif "verified" in error_message.lower() or "permission" in error_message.lower():
+                error_message = "Your account needs to be verified before booking facilities. Please contact admin."
+            else:
+                error_message = "An error occurred while creating the booking. Please try again or contact support."
+            return Response(
+                {"detail": error_message},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def perform_create(self, serializer):
+        """Handle booking creation with validation"""
+        # Import ValidationError at the start to ensure it's in scope
+        from rest_framework.exceptions import ValidationError as VE, PermissionDenied as PD
+
+        try:
+            user = self.request.user
+            profile = getattr(user, "profile", None)
+
+            # Admins can book without verification
+            if not user.is_staff:
+                if not profile or not profile.is_verified:
+                    raise PD(
+                        detail="Your account is not verified. "
+                               "Please upload your documents and wait for admin approval before booking."
+                    )
+
+            # Check if booking date/time is in the past
+            booking_data = serializer.validated_data
+            booking_date = booking_data.get('date')
+            booking_start_time = booking_data.get('start_time')
+            booking_end_time = booking_data.get('end_time')
+            facility = booking_data.get('facility')
+
+            from django.utils import timezone
+
+            # Validate required fields
+            if not booking_date or not booking_start_time or not booking_end_time or not facility:
+                raise VE({"detail": "Missing required booking information."})
+
+            # Check for past dates/times
+            now = timezone.now()
+            current_date = now.date()
+            current_time = now.time()
+
+            if booking_date < current_date:
+                raise VE({"detail": "Cannot book dates in the past."})
+
+            if booking_date == current_date and booking_start_time < current_time:
+                raise VE({"detail": "Cannot book times in the past for today's date."})
+
+            # Validate time range
+            if booking_end_time <= booking_start_time:
+                raise VE({"detail": "End time must be after start time."})
+
+            # Check for duplicate/overlapping bookings (pending or approved only)
+            # Rejected bookings don't block the slot
+            existing_bookings = Booking.objects.filter(
+                facility=facility,
+                date=booking_date,
+                status__in=['pending', 'approved']  # Only pending and approved block the slot
+            )
+
+            for existing_booking in existing_bookings:
+                # Check if time slots overlap
+                # Overlap occurs if: new_start < existing_end AND new_end > existing_start
+                if not (booking_end_time <= existing_booking.start_time or
+                        booking_start_time >= existing_booking.end_time):
+                    raise VE({
+                        "detail": f"This time slot is already booked. "
+                                 f"Existing booking: {existing_booking.start_time.strftime('%I:%M %p')} - "
+                                 f"{existing_booking.end_time.strftime('%I:%M %p')} (Status: {existing_booking.status.upper()})"
+                    })
+
+            # Check if facility is under maintenance
+            maintenance_periods = Maintenance.objects.filter(
+                facility=facility,
+                start_date__lte=booking_date,
+                end_date__gte=booking_date
+            )
+
+            for maintenance in maintenance_periods:
+                if maintenance.start_time and maintenance.end_time:
+                    # Specific time maintenance - check if booking overlaps
+                    if not (booking_end_time <= maintenance.start_time or booking_start_time >= maintenance.end_time):
+                        raise VE({
+                            "detail": f"Facility is under maintenance from {maintenance.start_time.strftime('%I:%M %p')} "
+                                     f"to {maintenance.end_time.strftime('%I:%M %p')} on {maintenance.start_date.strftime('%B %d, %Y')}. "
+                                     f"Reason: {maintenance.reason or 'Maintenance period'}"
+                        })
+                else:
+                    # All-day maintenance
+                    raise VE({
+                        "detail": f"Facility is under maintenance all day on {maintenance.start_date.strftime('%B %d, %Y')}. "
+                                 f"Reason: {maintenance.reason or 'Maintenance period'}"
+                    })
+
+            # Save the booking
+            try:
+                booking = serializer.save(user=user)
+                logger.debug("Booking saved successfully: ID=%s", booking.id if hasattr(booking, 'id') else 'N/A')
+
+                # Reload booking with relationships before sending emails
+                try:
+                    booking = Booking.objects.select_related('facility', 'user').get(pk=booking.pk)
+                    logger.debug("Booking reloaded - User: %s, Email: %s", booking.user.username, booking.user.email)
+                except Booking.DoesNotExist:
+                    logger.warning("Could not reload booking for email notification")
+
+                # Send email notifications after successful booking creation
+                # Use try-except to prevent email errors from breaking booking creation
+                try:
+                    self._send_booking_created_emails(booking)
+                except Exception as email_error:
+                    logger.warning("Email notification failed (booking still created): %s", email_error, exc_info=True)
+            except Exception as save_error:
+                logger.error("Error saving booking: %s", save_error, exc_info=True)
+                # Re-raise the error so it can be caught by the create method
+                raise
+        except VE as ve:
+            # Re-raise validation errors as-is so they can be caught by create method
+            logger.error("ValidationError in perform_create: %s", ve)
+            raise
+        except PD as pd:
+            # Re-raise permission errors as-is
+            logger.error("PermissionDenied in perform_create: %s", pd)
+            raise
+        except Exception as e:
+            # Log unexpected errors and convert to ValidationError
+            logger.error("Unexpected error in perform_create: %s", e, exc_info=True)
+            # Use VE which was imported at the start of the method
+            raise VE({"detail": f"An error occurred while creating the booking: {str(e)}"})
+
+    def destroy(self, request, *args, **kwargs):
+        """Override destroy to handle deletion properly"""
+        booking_id = kwargs.get('pk')
+        try:
+            # Get booking with relationships pre-loaded from queryset
+            queryset = self.get_queryset()
+            try:
+                instance = queryset.get(pk=booking_id)
+            except Booking.DoesNotExist:
+                return Response(
+                    {"detail": "Booking not found."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            # Check permissions
+            if not request.user.is_staff and instance.user_id != request.user.id:
+                raise PermissionDenied("You can only delete your own bookings.")
+
+            # Store booking info for email notification (before deletion)
+            # Safely access relationships with fallbacks
+            booking_id_val = instance.id
+            user_id = instance.user_id
+            facility_id = instance.facility_id
+            booking_date = instance.date
+            start_time = instance.start_time
+            end_time = instance.end_time
+
+            # Safely get user email
+            user_email = None
+            try:
+                if hasattr(instance, 'user') and instance.user:
+                    user_email = getattr(instance.user, 'email', None)
+            except (AttributeError, TypeError):
+                # If user relationship fails, try to get email from user_id
+                try:
+                    from django.contrib.auth.models import User
+                    user = User.objects.get(id=user_id)
+                    user_email = user.email
+                except (User.DoesNotExist, AttributeError):
+                    user_email = None
+
+            # Safely get facility name
+            facility_name = "Unknown Facility"
+            try:
+                if hasattr(instance, 'facility') and instance.facility:
+                    # Use get_name_display() for proper display name
+                    if hasattr(instance.facility, 'get_name_display'):
+                        facility_name = instance.facility.get_name_display()
+                    else:
+                        facility_name = getattr(instance.facility, 'name', 'Unknown Facility')
+            except (AttributeError, TypeError):
+                # If facility relationship fails, try to get name from facility_id
+                try:
+                    facility = Facility.objects.get(id=facility_id)
+                    if hasattr(facility, 'get_name_display'):
+                        facility_name = facility.get_name_display()
+                    else:
+                        facility_name = getattr(facility, 'name', 'Unknown Facility')
+                except (Facility.DoesNotExist, AttributeError):
+                    facility_name = "Unknown Facility"
+
+            was_admin_delete = request.user.is_staff and instance.user_id != request.user.id
+
+            # Delete using queryset to avoid relationship access issues
+            Booking.objects.filter(pk=booking_id_val).delete()
+
+            # Send email notification if admin deleted homeowner's booking
+            if was_admin_delete and user_email:
+                try:
+                    self._send_booking_deleted_email(user_email, facility_name, booking_date, start_time, end_time)
+                except Exception as email_error:
+                    # Don't fail deletion if email fails
+                    logger.warning("Failed to send deletion email: %s", email_error)
+
+            return Response(
+                {"detail": "Booking deleted successfully"},
+                status=status.HTTP_200_OK
+            )
+        except PermissionDenied:
+            raise
+        except Exception as e:
+            logger.error("Error deleting booking %s: %s", booking_id, e, exc_info=True)
+            return Response(
+                {"detail": f"Failed to delete booking: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    # Utility: format time
+    def format_time_am_pm(self, time_input) -> str:
+        """Format time to AM/PM format. Accepts time object or string."""
+        try:
+            # If it's already a time object, format it directly
+            if hasattr(time_input, 'strftime'):
+                return time_input.strftime("%I:%M %p")
+
+            # If it's a string, try to parse it
+            time_str = str(time_input)
+
+            # Try different time formats
+            for fmt in ["%H:%M:%S", "%H:%M", "%I:%M %p", "%I:%M:%S %p"]:
+                try:
+                    time_obj = datetime.strptime(time_str, fmt)
+                    return time_obj.strftime("%I:%M %p")
+                except (ValueError, TypeError):
+                    continue
+
+            # If all parsing fails, return as-is
+            return time_str
+        except Exception as e:
+            logger.warning("Error formatting time %s: %s", time_input, e)
+            return str(time_input)
+
+    # Send email notifications when booking is created
+    def _send_booking_created_emails(self, booking):
+        """Send emails to homeowner (pending status) and all admins (new booking notification)"""
+        from django.template.loader import strip_tags
+
+        try:
+            # Ensure relationships are loaded
+            if not hasattr(booking, 'facility') or not booking.facility:
+                logger.error("Booking facility not loaded")
+                return
+            if not hasattr(booking, 'user') or not booking.user:
+                logger.error("Booking user not loaded")
+                return
+
+            # Get facility name (use get_name_display() for choice fields)
+            facility_name = booking.facility.get_name_display() if hasattr(booking.facility, 'get_name_display') else str(booking.facility.name)
+
+            # Format time for display
+            start_time = self.format_time_am_pm(str(booking.start_time))
+            end_time = self.format_time_am_pm(str(booking.end_time))
+            booking_date = booking.date.strftime('%B %d, %Y')
+
+            # 1. Email to Homeowner - Booking Pending
+            homeowner_email = booking.user.email
+            logger.debug("Homeowner email check: %s", homeowner_email)
+            logger.debug("User: %s, Email: %s", booking.user.username, homeowner_email)
+
+            if homeowner_email:
+                logger.debug("Preparing to send email to homeowner: %s", homeowner_email)
+                homeowner_subject = f"Booking Request Submitted - {facility_name}"
+                homeowner_html = f"""
+                <html>
+                <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                        <h2 style="color: #2e6F40;">Booking Request Submitted</h2>
+                        <p>Dear {booking.user.first_name or booking.user.username},</p>
+                        <p>Your booking request has been successfully submitted and is now <strong style="color: #f0ad4e;">PENDING</strong> admin approval.</p>
+                        <div style="background-color: #f8f9fa; padding: 15px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #2e6F40;">
+                            <p style="margin: 5px 0;"><strong>Facility:</strong> {facility_name}</p>
+                            <p style="margin: 5px 0;"><strong>Date:</strong> {booking_date}</p>
+                            <p style="margin: 5px 0;"><strong>Time:</strong> {start_time} - {end_time}</p>
+                            <p style="margin: 5px 0;"><strong>Status:</strong> <span style="color: #f0ad4e; font-weight: bold;">PENDING</span></p>
+                        </div>
+                        <p>You will receive an email notification once the admin reviews your booking request.</p>
+                        <p>You can view your booking status at: <a href="{settings.FRONTEND_URL}/booking-amenities" style="color: #2e6F40;">View My Bookings</a></p>
+                        <p style="margin-top: 30px;">Thank you,<br><strong>Happy Homes Administration</strong></p>
+                    </div>
+                </body>
+                </html>
+                """
+                homeowner_plain = strip_tags(homeowner_html)
+
+                try:
+                    logger.debug("Sending email from: %s", settings.DEFAULT_FROM_EMAIL)
+                    logger.debug("Sending email to: %s", homeowner_email)
+                    logger.debug("Email subject: %s", homeowner_subject)
+
+                    # Try sending email - catch errors but don't break booking
+                    try:
+                        result = send_mail(
+                            subject=homeowner_subject,
+                            message=homeowner_plain,
+                            from_email=settings.DEFAULT_FROM_EMAIL,
+                            recipient_list=[homeowner_email],
+                            html_message=homeowner_html,
+                            fail_silently=False,  # Set to False to see actual errors
+                        )
+                        logger.info("Email sent to homeowner: %s (result: %s)", homeowner_email, result)
+                        if result == 0:
+                            logger.warning("Email send returned 0 - email may not have been sent")
+                    except Exception as email_send_error:
+                        logger.error("Failed to send email to homeowner: %s", email_send_error, exc_info=True)
+                        # Try with fail_silently=True as fallback
+                        try:
+                            result2 = send_mail(
+                                subject=homeowner_subject,
+                                message=homeowner_plain,
+                                from_email=settings.DEFAULT_FROM_EMAIL,
+                                recipient_list=[homeowner_email],
+                                html_message=homeowner_html,
+                                fail_silently=True,
+                            )
+                            logger.info("Email sent with fail_silently=True (result: %s)", result2)
+                        except Exception as e2:
+                            logger.error("Email completely failed even with fail_silently=True: %s", e2)
+                    # Don't raise - email failure shouldn't break booking
+                except Exception as outer_error:
+                    logger.error("Unexpected error in email sending block: %s", outer_error, exc_info=True)
+                    # Don't raise - email failure shouldn't break booking
+            else:
+                logger.warning("Homeowner email is empty or not set for user: %s", booking.user.username)
+                logger.warning("User ID: %s, Username: %s", booking.user.id, booking.user.username)
+
+            # 2. Email to All Admins - New Booking Notification
+            admin_users = User.objects.filter(is_staff=True, is_active=True)
+            admin_emails = [admin.email for admin in admin_users if admin.email]
+
+            if admin_emails:
+                admin_subject = f"New Booking Request - {facility_name}"
+                admin_html = f"""
+                <html>
+                <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                        <h2 style="color: #2e6F40;">New Booking Request</h2>
+                        <p>Dear Admin,</p>
+                        <p>A new booking request has been submitted and requires your review.</p>
+                        <div style="background-color: #f8f9fa; padding: 15px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #2e6F40;">
+                            <p style="margin: 5px 0;"><strong>Homeowner:</strong> {booking.user.first_name or ''} {booking.user.last_name or ''} ({booking.user.username})</p>
+                            <p style="margin: 5px 0;"><strong>Email:</strong> {booking.user.email}</p>
+                            <p style="margin: 5px 0;"><strong>Facility:</strong> {facility_name}</p>
+                            <p style="margin: 5px 0;"><strong>Date:</strong> {booking_date}</p>
+                            <p style="margin: 5px 0;"><strong>Time:</strong> {start_time} - {end_time}</p>
+                            <p style="margin: 5px 0;"><strong>Status:</strong> <span style="color: #f0ad4e; font-weight: bold;">PENDING</span></p>
+                            <p style="margin: 5px 0;"><strong>Booking ID:</strong> #{booking.id}</p>
+                        </div>
+                        <p>Please review and approve or reject this booking request.</p>
+                        <p><a href="{settings.FRONTEND_URL}/booking-amenities" style="background-color: #2e6F40; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">Review Booking</a></p>
+                        <p style="margin-top: 30px;">Thank you,<br><strong>Happy Homes System</strong></p>
+                    </div>
+                </body>
+                </html>
+                """
+                admin_plain = strip_tags(admin_html)
+
+                try:
+                    result = send_mail(
+                        subject=admin_subject,
+                        message=admin_plain,
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        recipient_list=admin_emails,
+                        html_message=admin_html,
+                        fail_silently=True,
+                    )
+                    logger.info("Email sent to %s admin(s) (result: %s)", len(admin_emails), result)
+                    logger.info("Email sent to %s admin(s)", len(admin_emails))
+                except Exception as e:
+                    logger.error("Failed to send email to admins: %s", e)
+        except Exception as e:
+            logger.error("Error in _send_booking_created_emails: %s", e, exc_info=True)
+
+    # Update method to send email when status changes
+    def update(self, request, *args, **kwargs):
+        booking = self.get_object()
+        old_status = booking.status
+        logger.debug("Update booking %s: old_status=%s, new_data=%s", booking.id, old_status, request.data)
+        logger.debug("User is staff: %s", request.user.is_staff if request.user.is_authenticated else False)
+
+        response = super().update(request, *args, **kwargs)
+        booking.refresh_from_db()
+
+        logger.debug("After update: booking.status=%s, old_status=%s", booking.status, old_status)
+
+        if old_status != booking.status:
+            logger.debug("Status changed from %s to %s, sending email", old_status, booking.status)
+            self._send_booking_status_change_email(booking, old_status)
+        else:
+            logger.warning("Status did not change! Still %s", booking.status)
+
+        return response
+
+    # Partial update to send email when status changes
+    def partial_update(self, request, *args, **kwargs):
+        try:
+            booking = self.get_object()
+            old_status = booking.status
+            logger.debug("Partial update booking %s: old_status=%s, new_data=%s", booking.id, old_status, request.data)
+            logger.debug("User is staff: %s", request.user.is_staff if request.user.is_authenticated else False)
+
+            # Ensure serializer has request context
+            serializer = self.get_serializer(booking, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+            # Reload booking with relationships to ensure proper serialization
+            booking.refresh_from_db()
+            # Reload with relationships for proper serialization
+            booking = Booking.objects.select_related('facility', 'user').get(pk=booking.pk)
+
+            logger.debug("After partial_update: booking.status=%s, old_status=%s", booking.status, old_status)
+
+            # Create fresh serializer with reloaded booking for response
+            response_serializer = self.get_serializer(booking)
+            response_data = response_serializer.data
+            logger.debug("Serializer response data: %s", response_data)
+
+            # Send email notification (don't let email errors break the response)
+            if old_status != booking.status:
+                logger.debug("Status changed from %s to %s, sending email", old_status, booking.status)
+                try:
+                    self._send_booking_status_change_email(booking, old_status)
+                except Exception as email_error:
+                    # Log email error but don't fail the request
+                    logger.warning("Failed to send status change email: %s", email_error, exc_info=True)
+            else:
+                logger.warning("Status did not change! Still %s", booking.status)
+
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error("Error in partial_update: %s", e, exc_info=True)
+            # Return a proper error response instead of letting it bubble up as 500
+            return Response(
+                {"detail": f"Failed to update booking: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    # Send email when booking is deleted by admin
+    def _send_booking_deleted_email(self, user_email, facility_name, booking_date, start_time, end_time):
+        """Send email to homeowner when admin deletes their booking"""
+        from django.template.loader import strip_tags
+
+        try:
+            start_time_str = self.format_time_am_pm(str(start_time))
+            end_time_str = self.format_time_am_pm(str(end_time))
+            booking_date_str = booking_date.strftime('%B %d, %Y')
+
+            subject = f"Booking Cancelled - {facility_name}"
+            html_message = f"""
+            <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <h2 style="color: #dc3545;">Booking Cancelled</h2>
+                    <p>Dear Homeowner,</p>
+                    <p>Your booking has been cancelled by the administrator.</p>
+                    <div style="background-color: #f8f9fa; padding: 15px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #dc3545;">
+                        <p style="margin: 5px 0;"><strong>Facility:</strong> {facility_name}</p>
+                        <p style="margin: 5px 0;"><strong>Date:</strong> {booking_date_str}</p>
+                        <p style="margin: 5px 0;"><strong>Time:</strong> {start_time_str} - {end_time_str}</p>
+                        <p style="margin: 5px 0;"><strong>Status:</strong> <span style="color: #dc3545; font-weight: bold;">CANCELLED</span></p>
+                    </div>
+                    <p>If you have any questions or concerns, please contact the administration.</p>
+                    <p>You can make a new booking at: <a href="{settings.FRONTEND_URL}/booking-amenities" style="color: #2e6F40;">Book Facility</a></p>
+                    <p style="margin-top: 30px;">Thank you,<br><strong>Happy Homes Administration</strong></p>
+                </div>
+            </body>
+            </html>
+            """
+            plain_message = strip_tags(html_message)
+
+            send_mail(
+                subject=subject,
+                message=plain_message,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                recipient_list=[user_email],
+                html_message=html_message,
+                fail_silently=True,
+            )
+            logger.info("Deletion email sent to homeowner: %s", user_email)
+        except Exception as e:
+            logger.error("Failed to send deletion email: %s", e, exc_info=True)
+
+    # Send email when booking status changes (approved/rejected)
+    def _send_booking_status_change_email(self, booking, old_status):
+        """Send email to homeowner when booking status changes"""
+        from django.template.loader import strip_tags
+
+        # Safely get user email
+        user_email = None
+        try:
+            if hasattr(booking, 'user') and booking.user:
+                user_email = getattr(booking.user, 'email', None)
+        except (AttributeError, TypeError):
+            # If user relationship fails, try to get email from user_id
+            try:
+                from django.contrib.auth.models import User
+                user = User.objects.get(id=booking.user_id)
+                user_email = user.email
+            except (User.DoesNotExist, AttributeError):
+                user_email = None
+
+        if not user_email:
+            logger.warning("No email found for booking %s, skipping email", booking.id)
+            return
+
+        try:
+            start_time = self.format_time_am_pm(str(booking.start_time))
+            end_time = self.format_time_am_pm(str(booking.end_time))
+            booking_date = booking.date.strftime('%B %d, %Y')
+
+            # Determine status color and message
+            if booking.status == 'approved':
+                status_color = '#2e6F40'
+                status_message = 'APPROVED'
+                action_message = 'Your booking request has been approved!'
+            elif booking.status == 'rejected':
+                status_color = '#dc3545'
+                status_message = 'REJECTED'
+                action_message = 'Your booking request has been rejected.'
+            else:
+                status_color = '#f0ad4e'
+                status_message = booking.status.upper()
+                action_message = f'Your booking status has been changed to {status_message}.'
+
+            # Safely get facility name
+            facility_name = "Unknown Facility"
+            try:
+                if hasattr(booking, 'facility') and booking.facility:
+                    if hasattr(booking.facility, 'get_name_display'):
+                        facility_name = booking.facility.get_name_display()
+                    else:
+                        facility_name = str(getattr(booking.facility, 'name', 'Unknown Facility'))
+            except (AttributeError, TypeError):
+                # If facility relationship fails, try to get name from facility_id
+                try:
+                    facility = Facility.objects.get(id=booking.facility_id)
+                    if hasattr(facility, 'get_name_display'):
+                        facility_name = facility.get_name_display()
+                    else:
+                        facility_name = str(getattr(facility, 'name', 'Unknown Facility'))
+                except (Facility.DoesNotExist, AttributeError):
+                    facility_name = "Unknown Facility"
+
+            # Safely get user name
+            user_name = "Homeowner"
+            try:
+                if hasattr(booking, 'user') and booking.user:
+                    user_name = booking.user.first_name or booking.user.username or "Homeowner"
+            except (AttributeError, TypeError):
+                user_name = "Homeowner"
+
+            subject = f"Booking {booking.status.capitalize()} - {facility_name}"
+            html_message = f"""
+            <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <h2 style="color: {status_color};">Booking {status_message}</h2>
+                    <p>Dear {user_name},</p>
+                    <p>{action_message}</p>
+                    <div style="background-color: #f8f9fa; padding: 15px; border-radius: 8px; margin: 20px 0; border-left: 4px solid {status_color};">
+                        <p style="margin: 5px 0;"><strong>Facility:</strong> {facility_name}</p>
+                        <p style="margin: 5px 0;"><strong>Date:</strong> {booking_date}</p>
+                        <p style="margin: 5px 0;"><strong>Time:</strong> {start_time} - {end_time}</p>
+                        <p style="margin: 5px 0;"><strong>Status:</strong> <span style="color: {status_color}; font-weight: bold;">{status_message}</span></p>
+                    </div>
+                    <p>You can view your booking status at: <a href="{settings.FRONTEND_URL}/booking-amenities" style="color: #2e6F40;">View My Bookings</a></p>
+                    <p style="margin-top: 30px;">Thank you,<br><strong>Happy Homes Administration</strong></p>
+                </div>
+            </body>
+            </html>
+            """
+            plain_message = strip_tags(html_message)
+
+            send_mail(
+                subject=subject,
+                message=plain_message,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                recipient_list=[user_email],
+                html_message=html_message,
+                fail_silently=True,
+            )
+            logger.info("Status change email sent to homeowner: %s", user_email)
+        except Exception as e:
+            logger.error("Failed to send status change email: %s", e, exc_info=True)
+
+
+# --- Available Slot ViewSet (All users can view, only admins can manage) ---
+class AvailableSlotViewSet(viewsets.ModelViewSet):
+    serializer_class = AvailableSlotSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]  # All authenticated users can view
+
+    def get_queryset(self):
+        facility_id = self.request.query_params.get("facility_id")
+        qs = AvailableSlot.objects.select_related('facility')
+
+        if facility_id:
+            qs = qs.filter(facility_id=facility_id)
+
+        return qs.order_by("date", "start_time")
+
+    def get_permissions(self):
+        """
+        Allow all authenticated users to view (GET, LIST),
+        but only admins can create, update, or delete.
+        """
+        if self.action in ['list', 'retrieve']:
+            return [IsAuthenticated()]
+        return [IsAuthenticated(), IsAdminUser()]
+
+
+# --- Maintenance ViewSet (All users can view, only admins can manage) ---
+class MaintenanceViewSet(viewsets.ModelViewSet):
+    serializer_class = MaintenanceSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]  # All authenticated users can view
+
+    def get_queryset(self):
+        facility_id = self.request.query_params.get("facility_id")
+        qs = Maintenance.objects.select_related('facility')
+
+        if facility_id:
+            qs = qs.filter(facility_id=facility_id)
+
+        return qs.order_by("start_date", "start_time")
+
+    def get_permissions(self):
+        """
+        Allow all authenticated users to view (GET, LIST),
+        but only admins can create, update, or delete.
+        """
+        if self.action in ['list', 'retrieve']:
+            return [IsAuthenticated()]
+        return [IsAuthenticated(), IsAdminUser()]
+
+    def perform_create(self, serializer):
+        """Override to save maintenance and notify all verified users"""
+        maintenance = serializer.save()
+
+        # Send email notifications to all verified users after successful creation
+        # Use try-except to prevent email errors from breaking maintenance creation
+        try:
+            self._send_maintenance_notification_emails(maintenance)
+        except Exception as email_error:
+            logger.warning("Email notification failed (maintenance still created): %s", email_error, exc_info=True)
+
+    def _send_maintenance_notification_emails(self, maintenance):
+        """Send email notifications to all verified users about the maintenance period"""
+        from django.template.loader import strip_tags
+
+        try:
+            # Ensure facility is loaded
+            if not hasattr(maintenance, 'facility') or not maintenance.facility:
+                logger.error("Maintenance facility not loaded")
+                return
+
+            # Get facility name
+            facility_name = maintenance.facility.get_name_display() if hasattr(maintenance.facility, 'get_name_display') else str(maintenance.facility.name)
+
+            # Format dates and times
+            start_date_str = maintenance.start_date.strftime('%B %d, %Y')
+            end_date_str = maintenance.end_date.strftime('%B %d, %Y')
+
+            # Get all verified users (homeowners)
+            verified_users = User.objects.filter(
+                profile__is_verified=True,
+                is_active=True
+            ).exclude(email='').exclude(email__isnull=True)
+
+            verified_emails = [user.email for user in verified_users if user.email]
+
+            if not verified_emails:
+                logger.debug("No verified users with email addresses found")
+                return
+
+            logger.debug("Sending maintenance notification to %s verified user(s)", len(verified_emails))
+
+            # Format time display - if all day, show 12:00 AM to 11:59 PM, otherwise show the specific times
+            if maintenance.start_time and maintenance.end_time:
+                start_time_str = self._format_time_am_pm(maintenance.start_time)
+                end_time_str = self._format_time_am_pm(maintenance.end_time)
+                time_display = f"{start_time_str} to {end_time_str}"
+            else:
+                time_display = "12:00 AM to 11:59 PM"
+
+            # Format date - if same start and end date, show single date, otherwise show range
+            if maintenance.start_date == maintenance.end_date:
+                date_display = start_date_str
+            else:
+                date_display = f"{start_date_str} to {end_date_str}"
+
+            # Create email content matching the sample format
+            subject = f"Maintenance Scheduled - {facility_name}"
+            html_message = f"""
+            <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <p>Hello,</p>
+                    <p>This is to inform you that <strong>{facility_name}</strong> will be under maintenance:</p>
+                    <p><strong>Date:</strong> {date_display}</p>
+                    <p><strong>Time:</strong> {time_display}</p>
+                    <p>Please note that this facility will be unavailable for booking during this period.</p>
+                    <p>We apologize for any inconvenience this may cause.</p>
+                    <p style="margin-top: 30px;">Thank you,<br><strong>Happy Homes Admin</strong></p>
+                </div>
+            </body>
+            </html>
+            """
+            plain_message = strip_tags(html_message)
+
+            # Send email to all verified users
+            try:
+                result = send_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=verified_emails,
+                    html_message=html_message,
+                    fail_silently=True,
+                )
+                logger.info("Maintenance notification sent to %s verified user(s) (result: %s)", len(verified_emails), result)
+            except Exception as e:
+                logger.error("Failed to send maintenance notification emails: %s", e, exc_info=True)
+        except Exception as e:
+            logger.error("Error in _send_maintenance_notification_emails: %s", e, exc_info=True)
+
+    def _format_time_am_pm(self, time_input) -> str:
+        """Format time to AM/PM format. Accepts time object or string."""
+        try:
+            # If it's already a time object, format it directly
+            if hasattr(time_input, 'strftime'):
+                return time_input.strftime("%I:%M %p")
+
+            # If it's a string, try to parse it
+            time_str = str(time_input)
+
+            # Try different time formats
+            for fmt in ["%H:%M:%S", "%H:%M", "%I:%M %p", "%I:%M:%S %p"]:
+                try:
+                    time_obj = datetime.strptime(time_str, fmt)
+                    return time_obj.strftime("%I:%M %p")
+                except (ValueError, TypeError):
+                    continue
+
+            # If all parsing fails, return as-is
+            return time_str
+        except Exception as e:
+            logger.warning("Error formatting time %s: %s", time_input, e)
+            return str(time_input)
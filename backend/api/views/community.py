@@ -0,0 +1,689 @@
+"""
+Posts, bulletins, comments, community media, news, alerts, FAQ and contact endpoints.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import F
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..caching import (
+    cached_response, PUBLIC_ALERTS, PUBLIC_BULLETINS, PUBLIC_CONTACT_INFO, PUBLIC_FAQ, PUBLIC_NEWS,
+    PUBLIC_POSTS, PublicResponseCacheMixin,
+)
+from ..conditional import ConditionalGetMixin
+from ..models import (
+    Alert, BlogComment, Bulletin, BulletinComment, CommunityMedia, ContactInfo, ContactMessage, FAQ, Message,
+    News, Post,
+)
+from ..serializers import (
+    AlertSerializer, BlogCommentSerializer, BulletinCommentSerializer, BulletinSerializer,
+    CommunityMediaSerializer, ContactInfoSerializer, ContactMessageSerializer, FAQSerializer,
+    MessageSerializer, NewsSerializer, PostSerializer,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# --- Posts ---
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])  # Allow public access for GET, will check auth in POST handler
+def get_posts(request):
+    if request.method == 'GET':
+        # Anyone can view posts
+        def build():
+            posts = Post.objects.all()
+            serializer = PostSerializer(posts, many=True, context={'request': request})
+            return Response(serializer.data)
+        return cached_response(request, PUBLIC_POSTS, build)
+    elif request.method == 'POST':
+        # Only authenticated users (preferably admins) can create posts
+        if not request.user.is_authenticated:
+            return Response(
+                {'detail': 'Authentication required to create posts'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        serializer = PostSerializer(data=request.data, context={'request': request})
+        if serializer.is_valid():
+            post = serializer.save()
+            # Re-serialize with image URL
+            response_serializer = PostSerializer(post, context={'request': request})
+            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_user_posts(request):
+    # Post model doesn't have a user field, so return all posts for now
+    # or filter by some other criteria if needed
+    posts = Post.objects.all()
+    serializer = PostSerializer(posts, many=True, context={'request': request})
+    return Response(serializer.data)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([AllowAny])  # GET is public, PUT/DELETE require auth check inside
+def post_detail(request, pk):
+    """
+    Retrieve, update or delete a post instance.
+    GET: Public access
+    PUT/DELETE: Only admin or post owner can modify/delete
+    """
+    try:
+        post = Post.objects.get(pk=pk)
+    except Post.DoesNotExist:
+        return Response(
+            {'detail': 'Post not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    if request.method == 'GET':
+        # Anyone can view posts
+        serializer = PostSerializer(post)
+        return Response(serializer.data)
+
+    elif request.method == 'PUT':
+        # Only authenticated users can update posts
+        if not request.user.is_authenticated:
+            return Response(
+                {'detail': 'Authentication required to update posts'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        # Only admin or post owner can update
+        # Note: Post model doesn't have a user field, so only admins can update for now
+        if not request.user.is_staff:
+            return Response(
+                {'detail': 'Only admins can update posts'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        serializer = PostSerializer(post, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    elif request.method == 'DELETE':
+        # Only authenticated users can delete posts
+        if not request.user.is_authenticated:
+            return Response(
+                {'detail': 'Authentication required to delete posts'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        # Only admin or post owner can delete
+        # Note: Post model doesn't have a user field, so only admins can delete for now
+        if not request.user.is_staff:
+            return Response(
+                {'detail': 'Only admins can delete posts'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        try:
+            from django.db import transaction
+
+            # Store image path before deletion (if exists)
+            image_path = None
+            try:
+                if post.image:
+                    image_path = str(post.image.name) if hasattr(post.image, 'name') and post.image.name else None
+            except Exception as img_path_error:
+                logger.warning("Could not get image path: %s", img_path_error)
+
+            # Use transaction to ensure atomic deletion
+            with transaction.atomic():
+                post_id = post.id
+                # Delete the post (BlogComment will be deleted automatically due to CASCADE)
+                # HistoricalRecords will handle the history entry
+                post.delete()
+
+            # Delete the image file after post deletion (if it exists)
+            # Do this outside the transaction to avoid file system issues affecting DB
+            if image_path:
+                try:
+                    from django.core.files.storage import default_storage
+                    if default_storage.exists(image_path):
+                        default_storage.delete(image_path)
+                        logger.debug("Deleted image file: %s", image_path)
+                except Exception as img_error:
+                    # Log but don't fail if image deletion fails
+                    logger.warning("Could not delete post image file %s: %s", image_path, img_error)
+
+            logger.debug("Successfully deleted post %s", post_id)
+            return Response({'detail': 'Post deleted successfully'}, status=status.HTTP_200_OK)
+        except Post.DoesNotExist:
+            return Response(
+                {'detail': 'Post not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            error_msg = str(e)
+            error_type = type(e).__name__
+            logger.error("Error deleting post %s (%s): %s", pk, error_type, error_msg, exc_info=True)
+
+            # Return more detailed error for debugging
+            return Response(
+                {
+                    'detail': f'Error deleting post: {error_msg}',
+                    'error_type': error_type
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+# --- Messenger (temporary) ---
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def message_list_create(request):
+    if request.method == 'GET':
+        messages = Message.objects.all().order_by('timestamp')
+        serializer = MessageSerializer(messages, many=True)
+        return Response(serializer.data)
+
+    if request.method == 'POST':
+        serializer = MessageSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=201)
+        return Response(serializer.errors, status=400)
+
+
+class NewsViewSet(ConditionalGetMixin, PublicResponseCacheMixin, viewsets.ModelViewSet):
+    queryset = News.objects.all().order_by('-created_at')
+    serializer_class = NewsSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    response_cache_namespace = PUBLIC_NEWS
+
+    def perform_create(self, serializer):
+        news = serializer.save()
+        # Send email to all users
+        recipients = list(User.objects.values_list('email', flat=True))
+        send_mail(
+            subject=f"📰 New News: {news.title}",
+            message=f"{news.content}\n\nView on site.",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=recipients,
+            fail_silently=True,
+        )
+
+
+class AlertViewSet(ConditionalGetMixin, PublicResponseCacheMixin, viewsets.ModelViewSet):
+    queryset = Alert.objects.all().order_by('-created_at')
+    serializer_class = AlertSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    response_cache_namespace = PUBLIC_ALERTS
+
+    def perform_create(self, serializer):
+        alert = serializer.save()
+        # Send email to all users
+        recipients = list(User.objects.values_list('email', flat=True))
+        send_mail(
+            subject=f"🚨 New Alert: {alert.title}",
+            message=f"Severity: {alert.severity}\n\n{alert.message}",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=recipients,
+            fail_silently=True,
+        )
+
+
+class BulletinViewSet(ConditionalGetMixin, PublicResponseCacheMixin, viewsets.ModelViewSet):
+    """ViewSet for Bulletin Board - Admin can CRUD, users can read published"""
+    serializer_class = BulletinSerializer
+    conditional_models = ('auth.User',)
+    queryset = Bulletin.objects.none()  # Will be set by get_queryset
+    response_cache_namespace = PUBLIC_BULLETINS
+
+    def get_queryset(self):
+        # If user is admin, show all bulletins
+        try:
+            if self.request.user.is_authenticated and self.request.user.is_staff:
+                return Bulletin.objects.select_related('created_by').order_by('-created_at')
+        except (AttributeError, TypeError):
+            pass
+        # Otherwise, only show published bulletins
+        return Bulletin.objects.select_related('created_by').filter(is_published=True).order_by('-created_at')
+
+    def get_permissions(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return [IsAdminUser()]
+        return [AllowAny()]
+
+    def perform_create(self, serializer):
+        try:
+            if hasattr(self.request, 'user') and self.request.user.is_authenticated:
+                serializer.save(created_by=self.request.user)
+            else:
+                serializer.save()
+        except Exception as e:
+            logger.error("Error in perform_create: %s", e, exc_info=True)
+            raise
+
+
+# --- Contact Info (singleton style, first row) ---
+class ContactInfoViewSet(PublicResponseCacheMixin, viewsets.ModelViewSet):
+    queryset = ContactInfo.objects.all()
+    serializer_class = ContactInfoSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    response_cache_namespace = PUBLIC_CONTACT_INFO
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        return qs[:1]
+
+
+# --- Contact Messages ---
+class ContactMessageViewSet(viewsets.ModelViewSet):
+    queryset = ContactMessage.objects.all().order_by('-created_at')
+    serializer_class = ContactMessageSerializer
+    permission_classes = [AllowAny]  # Allow public contact form submissions
+
+    def perform_create(self, serializer):
+        instance = serializer.save()
+        # Send notification email to default admin inbox
+        from django.core.mail import send_mail
+        subject = f"New contact message: {instance.subject}"
+        body = f"From: {instance.name} <{instance.email}>\n\n{instance.message}"
+        send_mail(
+            subject,
+            body,
+            settings.DEFAULT_FROM_EMAIL,
+            [getattr(settings, 'CONTACT_INBOX_EMAIL', settings.DEFAULT_FROM_EMAIL)],
+            fail_silently=True,
+        )
+
+
+class BlogCommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for Blog Comments
+
+    Permissions:
+    - GET (list, retrieve): Anyone can view comments (guests, users, admins)
+    - POST (create): Only authenticated users (users and admins) can create comments
+    - PUT/PATCH (update): Only the comment owner or admin can update
+    - DELETE: Only the comment owner or admin can delete
+    """
+    serializer_class = BlogCommentSerializer
+    conditional_models = ('auth.User', 'api.UserProfile', 'api.Post')
+    authentication_classes = [JWTAuthentication]
+    # Allow read access to everyone, but require authentication for write operations
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get_queryset(self):
+        """
+        Filter comments by post_id if provided in query params
+        Example: /api/blog-comments/?post_id=1
+        """
+        post_id = self.request.query_params.get("post_id")
+        qs = BlogComment.objects.select_related('user__profile', 'post')
+
+        if post_id:
+            qs = qs.filter(post_id=post_id)
+
+        return qs.order_by("-created_at")  # Newest comments first
+
+    def get_authenticators(self):
+        """
+        Override authentication to allow unauthenticated access for read operations.
+        This allows guests to view comments without authentication.
+        """
+        # Check request method - GET requests don't need authentication
+        # Use getattr to safely access request in case it's not initialized yet
+        request = getattr(self, 'request', None)
+        if request and request.method in ['GET', 'OPTIONS']:
+            # No authentication required for viewing comments
+            return []
+        # Require authentication for create, update, delete (POST, PUT, PATCH, DELETE)
+        return [JWTAuthentication()]
+
+    def get_serializer_context(self):
+        """Pass request context to serializer for absolute URLs"""
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def perform_create(self, serializer):
+        """
+        Automatically set the user to the current authenticated user when creating a comment
+        """
+        serializer.save(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        """
+        Override create to provide better error messages
+        """
+        try:
+            return super().create(request, *args, **kwargs)
+        except Exception as e:
+            # Return a more user-friendly error message
+            return Response(
+                {'detail': f'Error creating comment: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    def get_permissions(self):
+        """
+        Override permissions for different actions:
+        - list, retrieve: AllowAny (anyone can view)
+        - create: IsAuthenticated (only authenticated users can comment)
+        - update, destroy: IsAuthenticated + check if owner or admin
+        """
+        if self.action in ['list', 'retrieve']:
+            # Anyone can view comments (guests, users, admins)
+            permission_classes = [AllowAny]
+        elif self.action == 'create':
+            # Only authenticated users can create comments
+            permission_classes = [IsAuthenticated]
+        else:
+            # For update/delete, use default IsAuthenticatedOrReadOnly
+            permission_classes = [IsAuthenticated]
+
+        return [permission() for permission in permission_classes]
+
+    def update(self, request, *args, **kwargs):
+        """
+        Only allow the comment owner or admin to update
+        """
+        comment = self.get_object()
+
+        # Check if user is the owner or admin
+        if comment.user != request.user and not request.user.is_staff:
+            from rest_framework.exceptions import PermissionDenied
+            raise PermissionDenied("You can only update your own comments.")
+
+        return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Only allow the comment owner or admin to delete
+        """
+        comment = self.get_object()
+
+        # Check if user is the owner or admin
+        if comment.user != request.user and not request.user.is_staff:
+            from rest_framework.exceptions import PermissionDenied
+            raise PermissionDenied("You can only delete your own comments.")
+
+        return super().destroy(request, *args, **kwargs)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+
+class BulletinCommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for Bulletin Comments
+
+    Permissions:
+    - GET (list, retrieve): Only authenticated users can view comments (for verified homeowners and admins)
+    - POST (create): Only authenticated and verified users or admins can create comments
+    - PUT/PATCH (update): Only the comment owner or admin can update
+    - DELETE: Only the comment owner or admin can delete
+    """
+    serializer_class = BulletinCommentSerializer
+    conditional_models = ('auth.User', 'api.UserProfile', 'api.Bulletin')
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Filter comments by bulletin_id if provided in query params
+        Example: /api/bulletin-comments/?bulletin_id=1
+        Only show comments from verified users to admins, or all comments if admin
+        """
+        bulletin_id = self.request.query_params.get("bulletin_id")
+        qs = BulletinComment.objects.select_related('user__profile', 'bulletin')
+
+        if bulletin_id:
+            qs = qs.filter(bulletin_id=bulletin_id)
+
+        # If user is admin, show all comments
+        # Otherwise, only show comments from verified users
+        if not (self.request.user.is_authenticated and self.request.user.is_staff):
+            qs = qs.filter(user__profile__is_verified=True)
+
+        return qs.order_by("-created_at")  # Newest comments first
+
+    def perform_create(self, serializer):
+        """
+        Automatically set the user to the current authenticated user when creating a comment
+        Only verified users or admins can comment
+        """
+        user = self.request.user
+
+        # Check if user is verified or admin
+        is_verified = hasattr(user, 'profile') and user.profile.is_verified
+        if not (is_verified or user.is_staff):
+            raise PermissionDenied("Only verified homeowners and admins can comment on bulletins.")
+
+        serializer.save(user=user)
+
+    def create(self, request, *args, **kwargs):
+        """
+        Override create to provide better error messages
+        """
+        try:
+            return super().create(request, *args, **kwargs)
+        except Exception as e:
+            # Return a more user-friendly error message
+            return Response(
+                {'detail': f'Error creating comment: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    def get_permissions(self):
+        """
+        Override permissions for different actions:
+        - list, retrieve: IsAuthenticated (only authenticated users can view)
+        - create: IsAuthenticated + check if verified or admin
+        - update, destroy: IsAuthenticated + check if owner or admin
+        """
+        if self.action in ['list', 'retrieve']:
+            # Only authenticated users can view comments
+            permission_classes = [IsAuthenticated]
+        elif self.action == 'create':
+            # Only authenticated users can create comments (verified check in perform_create)
+            permission_classes = [IsAuthenticated]
+        else:
+            # For update/delete, use IsAuthenticated
+            permission_classes = [IsAuthenticated]
+
+        return [permission() for permission in permission_classes]
+
+    def update(self, request, *args, **kwargs):
+        """
+        Override update to check if user is owner or admin
+        """
+        instance = self.get_object()
+
+        # Allow update if user is admin or the comment owner
+        if request.user.is_staff or instance.user == request.user:
+            return super().update(request, *args, **kwargs)
+
+        return Response(
+            {'detail': 'You do not have permission to perform this action.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Override destroy to check if user is owner or admin
+        """
+        instance = self.get_object()
+
+        # Allow deletion if user is admin or the comment owner
+        if request.user.is_staff or instance.user == request.user:
+            return super().destroy(request, *args, **kwargs)
+
+        return Response(
+            {'detail': 'You do not have permission to perform this action.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+
+class CommunityMediaViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for Community Media Gallery
+
+    Permissions:
+    - GET (list, retrieve): Anyone can view public media (guests, users, admins)
+    - POST (create): Only authenticated users can create (admins auto-approved, users need approval)
+    - PUT/PATCH (update): Only admin can update
+    - DELETE: Only admin can delete
+    """
+    serializer_class = CommunityMediaSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get_queryset(self):
+        """
+        Filter media by category, featured status, or public visibility
+        Query params:
+        - category: Filter by category (events, facilities, properties, activities, announcements)
+        - featured: Filter only featured items (true/false)
+        - is_public: Filter public items (true/false, default: true for guests)
+        """
+        qs = CommunityMedia.objects.select_related('uploaded_by', 'approved_by')
+
+        # If not authenticated or not admin, only show approved and public media
+        if not (self.request.user.is_authenticated and self.request.user.is_staff):
+            qs = qs.filter(is_approved=True, is_public=True)
+
+        # Filter by category
+        category = self.request.query_params.get('category')
+        if category:
+            qs = qs.filter(category=category)
+
+        # Filter by featured
+        featured = self.request.query_params.get('featured')
+        if featured and featured.lower() == 'true':
+            qs = qs.filter(is_featured=True)
+
+        # Filter by public (for admin)
+        if self.request.user.is_authenticated and self.request.user.is_staff:
+            is_public = self.request.query_params.get('is_public')
+            if is_public:
+                qs = qs.filter(is_public=(is_public.lower() == 'true'))
+
+        return qs.order_by('-order', '-created_at')
+
+    def get_authenticators(self):
+        """Allow unauthenticated access for viewing media"""
+        request = getattr(self, 'request', None)
+        if request and request.method in ['GET', 'OPTIONS']:
+            return []
+        return [JWTAuthentication()]
+
+    def get_serializer_context(self):
+        """Pass request context to serializer for absolute URLs"""
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def perform_create(self, serializer):
+        """Set uploaded_by to current user, auto-approve if admin"""
+        user = self.request.user
+        is_admin = user.is_staff
+
+        serializer.save(
+            uploaded_by=user,
+            is_approved=is_admin,  # Auto-approve admin uploads
+            approved_by=user if is_admin else None
+        )
+
+    def get_permissions(self):
+        """Override permissions - allow anyone to view, require auth for write"""
+        if self.action in ['list', 'retrieve', 'increment_views']:
+            permission_classes = [AllowAny]
+        elif self.action == 'create':
+            permission_classes = [IsAuthenticated]
+        else:
+            # Update/Delete only for admins
+            permission_classes = [IsAuthenticated]
+
+        return [permission() for permission in permission_classes]
+
+    def update(self, request, *args, **kwargs):
+        """Only admin can update media"""
+        if not request.user.is_staff:
+            return Response(
+                {'detail': 'Only administrators can update media.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # If approving media, set approved_by
+        instance = self.get_object()
+        if 'is_approved' in request.data and request.data['is_approved']:
+            request.data['approved_by'] = request.user.id
+
+        return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        """Only admin can delete media"""
+        if not request.user.is_staff:
+            return Response(
+                {'detail': 'Only administrators can delete media.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return super().destroy(request, *args, **kwargs)
+
+    @action(detail=True, methods=['post'])
+    def increment_views(self, request, pk=None):
+        """Increment view count (public action, buffered - see api/counters.py)"""
+        from ..counters import media_counters
+        media = self.get_object()
+        media_counters.increment(media.pk, 'views_count')
+        return Response({'views_count': media_counters.current(media, 'views_count')})
+
+    @action(detail=True, methods=['post', 'delete'])
+    def like(self, request, pk=None):
+        """POST likes the media item, DELETE removes the like; one like per user"""
+        from ..models import CommunityMediaLike
+        media = self.get_object()
+        liked = request.method == 'POST'
+        # likes_count moves in the same transaction as the like row, so the two never drift
+        with transaction.atomic():
+            if liked:
+                changed = CommunityMediaLike.objects.get_or_create(media=media, user=request.user)[1]
+            else:
+                changed = CommunityMediaLike.objects.filter(media=media, user=request.user).delete()[0] > 0
+            if changed:
+                CommunityMedia.objects.filter(pk=media.pk).update(likes_count=F('likes_count') + (1 if liked else -1))
+        media.refresh_from_db(fields=['likes_count'])
+        return Response({
+            'liked': liked,
+            'likes_count': media.likes_count,
+        })
+
+
+class FAQViewSet(ConditionalGetMixin, PublicResponseCacheMixin, viewsets.ModelViewSet):
+    queryset = FAQ.objects.filter(is_active=True).order_by('order', 'created_at')
+    serializer_class = FAQSerializer
+    response_cache_namespace = PUBLIC_FAQ
+
+    def get_queryset(self):
+        # Admins can see all FAQs (including inactive), regular users only see active ones
+        if hasattr(self.request, 'user') and self.request.user.is_authenticated and self.request.user.is_staff:
+            return FAQ.objects.all().order_by('order', 'created_at')
+        return FAQ.objects.filter(is_active=True).order_by('order', 'created_at')
+
+    def get_permissions(self):
+        # Allow read access to everyone, but require admin for write operations
+        if hasattr(self, 'action') and self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return [IsAdminUser()]
+        # For list, retrieve, and any other read operations (including when action is None)
+        return [AllowAny()]
@@ -0,0 +1,119 @@
+"""
+Admin dashboard figures.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.utils import timezone
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..models import Booking, MaintenanceRequest, Pin, ServiceFee, VisitorRequest
+
+
+# --- Admin dashboard statistics ---
+# Fixed capacity of 200 slots for subdivision capacity
+SUBDIVISION_CAPACITY = 200
+
+
+def build_admin_dashboard_stats():
+    """
+    Every dashboard counter, one conditional-aggregation query per table
+    (instead of a separate count() per number).
+    """
+    from django.db.models import Count, Sum
+    today = timezone.localdate()
+
+    users = User.objects.aggregate(
+        total=Count('id'),
+        staff=Count('id', filter=Q(is_staff=True)),
+        residents=Count('id', filter=Q(is_staff=False)),
+        verified=Count('id', filter=Q(is_staff=False, profile__is_verified=True)),
+        pending_verification=Count(
+            'id',
+            filter=Q(profile__is_verified=False, profile__document__isnull=False) & ~Q(profile__document=''),
+        ),
+    )
+    bookings = Booking.objects.aggregate(
+        total=Count('id'),
+        approved=Count('id', filter=Q(status='approved')),
+        pending=Count('id', filter=Q(status='pending')),
+        rejected=Count('id', filter=Q(status='rejected')),
+    )
+    pins = Pin.objects.aggregate(
+        total=Count('id'),
+        # Consider either explicit status or legacy name marker
+        occupied=Count('id', filter=Q(status__iexact='occupied') | Q(name__icontains='occupied')),
+    )
+    visitor_requests = VisitorRequest.objects.aggregate(
+        pending=Count('id', filter=Q(status='pending_admin')),
+        approved_today=Count('id', filter=Q(status='approved', visit_date=today)),
+    )
+    maintenance_requests = MaintenanceRequest.objects.aggregate(
+        pending=Count('id', filter=Q(status='pending')),
+        urgent_pending=Count('id', filter=Q(status='pending', is_urgent=True)),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+    )
+    overdue = Q(status='unpaid', due_date__lt=today) | Q(status='delayed')
+    service_fees = ServiceFee.objects.order_by().aggregate(
+        unpaid=Count('id', filter=Q(status='unpaid') & ~Q(due_date__lt=today)),
+        delayed=Count('id', filter=overdue),
+        outstanding_amount=Sum('amount', filter=~Q(status='paid')),
+    )
+
+    occupied = pins['occupied']
+    return {
+        'users': users,
+        'bookings': bookings,
+        'pins': {
+            'total_pins': pins['total'],
+            'occupied': occupied,
+            'available': max(SUBDIVISION_CAPACITY - occupied, 0),
+            'max_subdivisions': SUBDIVISION_CAPACITY,
+        },
+        'visitor_requests': visitor_requests,
+        'maintenance_requests': maintenance_requests,
+        'service_fees': {
+            **service_fees,
+            'outstanding_amount': service_fees['outstanding_amount'] or 0,
+        },
+        'generated_at': timezone.now().isoformat(),
+    }
+
+
+def get_admin_dashboard_stats():
+    """Cached for ADMIN_STATS_CACHE_SECONDS; one request refreshes while others get the previous value"""
+    from ..caching import get_or_compute
+    return get_or_compute(
+        'admin-dashboard-stats',
+        build_admin_dashboard_stats,
+        ttl=getattr(settings, 'ADMIN_STATS_CACHE_SECONDS', 30),
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_stats(request):
+    """All admin dashboard counters in one response (cached briefly)"""
+    return Response(get_admin_dashboard_stats())
+
+
+# Pin statistics for dashboard
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_pin_stats(request):
+    return Response(get_admin_dashboard_stats()['pins'])
+
+
+# Admin dashboard stats endpoint
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_dashboard_stats(request):
+    stats = get_admin_dashboard_stats()
+    return Response({
+        "total_users": stats['users']['total'],
+        "active_bookings": stats['bookings']['approved'],
+        "pending_approvals": stats['bookings']['pending']
+    })
@@ -0,0 +1,259 @@
+"""
+Audit log (user history) listing, detail and export.
+"""
+import json
+from datetime import datetime
+from itertools import chain
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from rest_framework import generics, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..models import AuditLogEntry
+from ..serializers import AuditLogEntrySerializer
+
+
+class AuditLogCursorPagination(CursorPagination):
+    """Keyset pagination over AuditLogEntry (newest first)"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-history_date', '-id')
+
+
+def _filter_audit_log(queryset, params):
+    """
+    Apply the activity log query-string filters in SQL.
+    Supported: model, user (username or 'System'), object_id, type (+ ~ -),
+    date_from / date_to (ISO date or datetime).
+    """
+    filter_model = params.get('model')
+    if filter_model and filter_model != 'all':
+        queryset = queryset.filter(model_name=filter_model)
+
+    filter_user = params.get('user')
+    if filter_user and filter_user != 'all':
+        if filter_user == 'System':
+            queryset = queryset.filter(history_username='')
+        else:
+            queryset = queryset.filter(history_username=filter_user)
+
+    object_id = params.get('object_id')
+    if object_id:
+        queryset = queryset.filter(object_id=object_id)
+
+    history_type = params.get('type')
+    if history_type in ('+', '~', '-'):
+        queryset = queryset.filter(history_type=history_type)
+
+    date_from = _parse_history_date(params.get('date_from'))
+    if date_from:
+        queryset = queryset.filter(history_date__gte=date_from)
+    date_to = _parse_history_date(params.get('date_to'), end_of_day=True)
+    if date_to:
+        queryset = queryset.filter(history_date__lte=date_to)
+    return queryset
+
+
+def _parse_history_date(value, end_of_day=False):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValidationError({'detail': f'Invalid date: {value}'})
+        parsed = datetime.combine(day, datetime.max.time() if end_of_day else datetime.min.time())
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class UserHistoryListView(generics.ListAPIView):
+    """
+    Activity log across every model with HistoricalRecords.
+
+    Reads the AuditLogEntry index (one indexed row per history record), so
+    filtering, ordering and cursor pagination all happen in SQL.
+    Response: {"next": ..., "previous": ..., "results": [...]}
+    """
+    permission_classes = [AllowAny]
+    serializer_class = AuditLogEntrySerializer
+    pagination_class = AuditLogCursorPagination
+
+    def get_queryset(self):
+        return _filter_audit_log(AuditLogEntry.objects.all(), self.request.query_params)
+
+
+class UserHistoryDetailView(APIView):
+    """
+    Full snapshot and field changes of a single activity log entry.
+    Loaded lazily from the original Historical<Model> table.
+
+    Permissions:
+    - Admin only
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        try:
+            entry = AuditLogEntry.objects.get(pk=pk)
+        except AuditLogEntry.DoesNotExist:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        data = AuditLogEntrySerializer(entry).data
+        record = entry.get_history_record()
+        if record is None:
+            data['snapshot'] = None
+            data['changes'] = []
+            return Response(data)
+
+        tracked_fields = [field.attname for field in record.instance_type._meta.fields]
+        data['snapshot'] = {name: _history_value(getattr(record, name, None)) for name in tracked_fields}
+        data['history_change_reason'] = record.history_change_reason
+
+        changes = []
+        previous = record.prev_record if entry.history_type == '~' else None
+        if previous is not None:
+            delta = record.diff_against(previous)
+            changes = [
+                {'field': change.field, 'old': _history_value(change.old), 'new': _history_value(change.new)}
+                for change in delta.changes
+            ]
+        data['changes'] = changes
+        return Response(data)
+
+
+def _history_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, 'name') and hasattr(value, 'storage'):
+        return value.name or None
+    return str(value)
+
+
+class _EchoBuffer:
+    """File-like object whose write() just returns the value (for csv.writer streaming)"""
+    def write(self, value):
+        return value
+
+
+AUDIT_EXPORT_COLUMNS = ['id', 'history_date', 'model_name', 'object_id', 'history_type', 'history_user', 'history_id']
+
+
+class UserHistoryExportView(APIView):
+    """
+    Stream the activity log as CSV or NDJSON with flat memory use.
+
+    GET /api/user-history/export.csv
+    GET /api/user-history/export.ndjson
+
+    Accepts the same filters as /api/user-history/ (model, user, object_id,
+    type, date_from, date_to). Rows are read in keyset-paginated batches
+    (history_date, id) and written as they are produced. With ?snapshot=1
+    each row also carries the full field values from its history table.
+
+    Permissions:
+    - Admin only
+    """
+    permission_classes = [IsAdminUser]
+    batch_size = 2000
+
+    def get(self, request, file_format):
+        import csv
+        if file_format not in ('csv', 'ndjson'):
+            return Response({'detail': 'Unsupported export format. Use csv or ndjson.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = _filter_audit_log(AuditLogEntry.objects.all(), request.query_params)
+        include_snapshot = request.query_params.get('snapshot') in ('1', 'true', 'yes')
+        rows = self._iter_rows(queryset, include_snapshot)
+
+        if file_format == 'csv':
+            writer = csv.writer(_EchoBuffer())
+            columns = AUDIT_EXPORT_COLUMNS + (['snapshot'] if include_snapshot else [])
+            content = chain(
+                [writer.writerow(columns)],
+                (writer.writerow([
+                    json.dumps(row[column], cls=DjangoJSONEncoder) if column == 'snapshot' else row[column]
+                    for column in columns
+                ]) for row in rows),
+            )
+            content_type = 'text/csv'
+        else:
+            content = (json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows)
+            content_type = 'application/x-ndjson'
+
+        filename = f"activity-log-{timezone.now().strftime('%Y%m%d-%H%M%S')}.{file_format}"
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def _iter_rows(self, queryset, include_snapshot):
+        queryset = queryset.order_by('-history_date', '-id')
+        last = None
+        while True:
+            page = queryset
+            if last is not None:
+                page = page.filter(
+                    Q(history_date__lt=last.history_date) |
+                    Q(history_date=last.history_date, id__lt=last.id)
+                )
+            batch = list(page[:self.batch_size])
+            if not batch:
+                return
+            snapshots = self._load_snapshots(batch) if include_snapshot else {}
+            for entry in batch:
+                row = {
+                    'id': entry.id,
+                    'history_date': entry.history_date.isoformat(),
+                    'model_name': entry.model_name,
+                    'object_id': entry.object_id,
+                    'history_type': entry.history_type,
+                    'history_user': entry.history_username or 'System',
+                    'history_id': entry.history_id,
+                }
+                if include_snapshot:
+                    row['snapshot'] = snapshots.get((entry.model_name, entry.history_id))
+                yield row
+            last = batch[-1]
+
+    def _load_snapshots(self, batch):
+        """One query per history table in the batch instead of one per row"""
+        from django.apps import apps
+        ids_by_model = {}
+        for entry in batch:
+            ids_by_model.setdefault(entry.model_name, []).append(entry.history_id)
+
+        snapshots = {}
+        for model_name, history_ids in ids_by_model.items():
+            try:
+                tracked_model = apps.get_model('api', model_name)
+            except LookupError:
+                continue
+            fields = [field.attname for field in tracked_model._meta.concrete_fields]
+            values = tracked_model.history.model.objects.filter(history_id__in=history_ids).values('history_id', *fields)
+            for value in values:
+                snapshots[(model_name, value.pop('history_id'))] = value
+        return snapshots
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def user_history_filters(request):
+    """Distinct model names and usernames for the activity log filter dropdowns"""
+    model_names = AuditLogEntry.objects.order_by().values_list('model_name', flat=True).distinct()
+    users = AuditLogEntry.objects.order_by().values_list('history_username', flat=True).distinct()
+    return Response({
+        'models': sorted(model_names),
+        'users': sorted(username or 'System' for username in set(users)),
+    })
@@ -0,0 +1,561 @@
+"""
+House listings (owners and guests) and their images.
+"""
+import logging
+
+from django.db.models import Prefetch
+
+from rest_framework import generics, permissions, status, viewsets
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..caching import cached_response, PUBLIC_HOUSES
+from ..conditional import ConditionalGetMixin
+from ..models import House, HouseImage
+from ..serializers import HouseSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+class HouseListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    queryset = House.objects.select_related('user').prefetch_related(
+        Prefetch('images', queryset=HouseImage.objects.all().order_by('order', 'created_at'))
+    ).order_by("-created_at")
+    serializer_class = HouseSerializer
+    conditional_models = ('api.HouseImage', 'auth.User')
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    # CRITICAL: Add parser classes to handle multipart/form-data (file uploads)
+    from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def _handle_images(self, house, request):
+        """Handle multiple image uploads for a house - same as HouseViewSet"""
+        from ..models import HouseImage
+
+        try:
+            # Ensure house is saved before creating images
+            if not house.pk:
+                house.save()
+                logger.debug("[HouseListCreateView] Saved house first to get PK: %s", house.pk)
+
+            # Get images from request.FILES (FormData sends files here)
+            images = []
+            if hasattr(request, 'FILES') and request.FILES:
+                # Try to get images with key 'images'
+                images = request.FILES.getlist('images')
+                logger.debug("[HouseListCreateView] Received %s image(s) from request.FILES.getlist('images')", len(images))
+
+                # If no images found, check all FILES keys for debugging
+                if not images:
+                    logger.debug("[HouseListCreateView] No images found with key 'images'. Available keys: %s", list(request.FILES.keys()))
+                    for key in request.FILES.keys():
+                        files = request.FILES.getlist(key)
+                        logger.debug("[HouseListCreateView] Key '%s': %s file(s)", key, len(files))
+                        if files:
+                            logger.debug("[HouseListCreateView] Found %s file(s) with key '%s'", len(files), key)
+            else:
+                logger.warning("[HouseListCreateView] request.FILES is empty or doesn't exist!")
+
+            if images:
+                # Get current count for ordering
+                current_count = house.images.count() if house.pk else 0
+                logger.debug("[HouseListCreateView] Current image count: %s, adding %s new image(s)", current_count, len(images))
+
+                # Create HouseImage instances for each uploaded image
+                created_images = []
+                for index, image_file in enumerate(images):
+                    try:
+                        # Ensure house is saved before creating image
+                        if not house.pk:
+                            house.save()
+                            logger.debug("[HouseListCreateView] Saved house to get PK: %s", house.pk)
+
+                        house_image = HouseImage.objects.create(
+                            house=house,
+                            image=image_file,
+                            order=current_count + index
+                        )
+                        created_images.append(house_image.id)
+                        logger.debug("[HouseListCreateView] Created HouseImage %s (ID: %s) for house %s", current_count + index, house_image.id, house.id)
+
+                        # Verify the image was saved
+                        if house_image.image:
+                            logger.debug("[HouseListCreateView] HouseImage %s has image: %s", house_image.id, house_image.image.name)
+                        else:
+                            logger.warning("[HouseListCreateView] HouseImage %s has no image file!", house_image.id)
+
+                    except Exception as e:
+                        logger.error("[HouseListCreateView] Failed to create HouseImage %s: %s", index, e, exc_info=True)
+                        # Continue with other images even if one fails
+
+                logger.debug("[HouseListCreateView] Successfully created %s/%s images", len(created_images), len(images))
+                return len(created_images)
+            else:
+                logger.warning("[HouseListCreateView] No images to process for house %s", house.pk)
+                return 0
+        except Exception as e:
+            logger.error("[HouseListCreateView] Error in _handle_images: %s", e, exc_info=True)
+            # Don't raise - let the house creation succeed even if images fail
+            return 0
+
+    def perform_create(self, serializer):
+        house = serializer.save(user=self.request.user)
+        logger.debug("[HouseListCreateView] House saved with PK: %s", house.pk)
+
+        # Handle images
+        images_created = self._handle_images(house, self.request)
+        logger.debug("[HouseListCreateView] Created %s image(s) for house %s", images_created, house.pk)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def create(self, request, *args, **kwargs):
+        """Override create to ensure images are included in response"""
+        logger.debug("[HouseListCreateView] ========== CREATING HOUSE ==========")
+        logger.debug("[HouseListCreateView] Request method: %s", request.method)
+        logger.debug("[HouseListCreateView] Request.FILES exists: %s", hasattr(request, 'FILES'))
+        logger.debug("[HouseListCreateView] Request.FILES keys: %s", list(request.FILES.keys()) if request.FILES else 'None')
+
+        # Call parent create which will call perform_create (which handles images)
+        response = super().create(request, *args, **kwargs)
+
+        # Reload house with images for proper serialization
+        house_id = response.data.get('id')
+        if house_id:
+            from django.db.models import Prefetch
+            from ..models import HouseImage
+            house = House.objects.prefetch_related(
+                Prefetch('images', queryset=HouseImage.objects.all().order_by('order', 'created_at'))
+            ).select_related('user').get(pk=house_id)
+
+            # Re-serialize with images
+            serializer = self.get_serializer(house, context={'request': request})
+            response.data.update(serializer.data)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[HouseListCreateView] House %s created with %s images", house_id, house.images.count())
+
+        logger.debug("[HouseListCreateView] ====================================")
+        return response
+
+
+class HouseDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = House.objects.all()
+    serializer_class = HouseSerializer
+    conditional_models = ('api.HouseImage', 'auth.User')
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def _handle_images(self, house, request):
+        """Handle multiple image uploads for a house"""
+        from ..models import HouseImage
+
+        # Get images from request
+        images = request.FILES.getlist('images')
+
+        if images:
+            # Create HouseImage instances for each uploaded image
+            for index, image_file in enumerate(images):
+                HouseImage.objects.create(
+                    house=house,
+                    image=image_file,
+                    order=house.images.count() + index
+                )
+
+    def perform_update(self, serializer):
+        # Prevent switching owners
+        house = serializer.save(user=self.request.user)
+        # Handle multiple images (new images will be added)
+        self._handle_images(house, self.request)
+
+
+class HouseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    serializer_class = HouseSerializer
+    conditional_models = ('api.HouseImage', 'auth.User')
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    # CRITICAL: Add parser classes to handle multipart/form-data (file uploads)
+    from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def get_queryset(self):
+        user = self.request.user
+        from django.db.models import Prefetch
+        base_queryset = House.objects.prefetch_related(
+            Prefetch('images', queryset=HouseImage.objects.all().order_by('order', 'created_at'))
+        ).select_related('user')
+        if user.is_staff:
+            return base_queryset.all().order_by('-created_at')
+        return base_queryset.filter(user=user).order_by('-created_at')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def list(self, request, *args, **kwargs):
+        """Override list to ensure images are included"""
+        response = super().list(request, *args, **kwargs)
+        # Response data is already serialized with images due to prefetch_related
+        return response
+
+    def _handle_images(self, house, request):
+        """Handle multiple image uploads for a house"""
+        from ..models import HouseImage
+
+        try:
+            # Ensure house is saved before creating images
+            if not house.pk:
+                house.save()
+                logger.debug("Saved house first to get PK: %s", house.pk)
+
+            # Get images from request.FILES (FormData sends files here)
+            images = []
+            if hasattr(request, 'FILES') and request.FILES:
+                # Try to get images with key 'images'
+                images = request.FILES.getlist('images')
+                logger.debug("Received %s image(s) from request.FILES.getlist('images')", len(images))
+
+                # If no images found, check all FILES keys for debugging
+                if not images:
+                    logger.debug("No images found with key 'images'. Available keys: %s", list(request.FILES.keys()))
+                    for key in request.FILES.keys():
+                        files = request.FILES.getlist(key)
+                        logger.debug("Key '%s': %s file(s)", key, len(files))
+                        # If we find files with a different key, log it
+                        if files:
+                            logger.debug("Found %s file(s) with key '%s'", len(files), key)
+            else:
+                logger.warning("request.FILES is empty or doesn't exist")
+
+            if images:
+                # Get current count for ordering
+                current_count = house.images.count() if house.pk else 0
+                logger.debug("Current image count: %s, adding %s new image(s)", current_count, len(images))
+
+                # Create HouseImage instances for each uploaded image
+                created_images = []
+                for index, image_file in enumerate(images):
+                    try:
+                        # Validate file is actually an image
+                        if not hasattr(image_file, 'content_type'):
+                            logger.warning("Image %s has no content_type", index)
+
+                        # Ensure house is saved before creating image
+                        if not house.pk:
+                            house.save()
+                            logger.debug("Saved house to get PK: %s", house.pk)
+
+                        house_image = HouseImage.objects.create(
+                            house=house,
+                            image=image_file,
+                            order=current_count + index
+                        )
+                        created_images.append(house_image.id)
+                        logger.debug("Created HouseImage %s (ID: %s) for house %s", current_count + index, house_image.id, house.id)
+
+                        # Verify the image was saved
+                        if house_image.image:
+                            logger.debug("HouseImage %s has image: %s", house_image.id, house_image.image.name)
+                        else:
+                            logger.warning("HouseImage %s has no image file!", house_image.id)
+
+                    except Exception as e:
+                        logger.error("Failed to create HouseImage %s: %s", index, e, exc_info=True)
+                        # Continue with other images even if one fails
+
+                # Force database commit and verify
+                if house.pk:
+                    from django.db import transaction
+                    from django.db import connection
+
+                    # Commit transaction to ensure images are saved
+                    transaction.commit()
+
+                    # Clear any cached queries
+                    connection.queries_log.clear()
+
+                    # The checks below only feed debug output; skip their queries and file stats otherwise
+                    if logger.isEnabledFor(logging.DEBUG):
+                        # Verify images are in database with a fresh query
+                        db_count = HouseImage.objects.filter(house_id=house.pk).count()
+                        logger.debug("[IMAGES] Verified: %s images in database for house %s", db_count, house.pk)
+
+                        # Verify each image file exists
+                        for img_id in created_images:
+                            try:
+                                img = HouseImage.objects.get(id=img_id)
+                                if img.image:
+                                    import os
+                                    from django.conf import settings
+                                    file_path = os.path.join(settings.MEDIA_ROOT, img.image.name)
+                                    if os.path.exists(file_path):
+                                        logger.debug("[IMAGES] Image %s file exists: %s", img_id, img.image.name)
+                                    else:
+                                        logger.error("[IMAGES] Image %s file NOT found: %s", img_id, file_path)
+                            except Exception as e:
+                                logger.error("[IMAGES] Error verifying image %s: %s", img_id, e)
+
+                    # Force reload relationship by clearing cache
+                    if hasattr(house, '_prefetched_objects_cache'):
+                        house._prefetched_objects_cache.clear()
+
+                logger.debug("[IMAGES] Successfully created %s/%s images", len(created_images), len(images))
+                return len(created_images)
+            else:
+                logger.warning("No images to process for house %s", house.pk)
+                return 0
+        except Exception as e:
+            logger.error("Error in _handle_images: %s", e, exc_info=True)
+            # Don't raise - let the house creation succeed even if images fail
+            return 0
+
+    def create(self, request, *args, **kwargs):
+        """Override create to ensure images are included in response"""
+        logger.debug("[CREATE] ========== CREATING HOUSE ==========")
+        logger.debug("[CREATE] Request method: %s", request.method)
+        logger.debug("[CREATE] Request content_type: %s", getattr(request, 'content_type', 'N/A'))
+        logger.debug("[CREATE] Request.META CONTENT_TYPE: %s", request.META.get('CONTENT_TYPE', 'N/A'))
+        logger.debug("[CREATE] request.FILES exists: %s", hasattr(request, 'FILES'))
+        logger.debug("[CREATE] request.FILES type: %s", type(request.FILES))
+        logger.debug("[CREATE] request.FILES keys: %s", list(request.FILES.keys()) if request.FILES else 'None')
+        logger.debug("[CREATE] request.FILES dict: %s", dict(request.FILES) if request.FILES else 'Empty')
+
+        # Try to get images from request.FILES
+        images_in_request = []
+        if request.FILES:
+            images_in_request = request.FILES.getlist('images')
+            logger.debug("[CREATE] Images from getlist('images'): %s", len(images_in_request))
+
+            # Also check all files in request.FILES
+            all_files = []
+            for key in request.FILES.keys():
+                files = request.FILES.getlist(key)
+                all_files.extend(files)
+                logger.debug("[CREATE] Files with key '%s': %s", key, len(files))
+            logger.debug("[CREATE] Total files in request.FILES: %s", len(all_files))
+        else:
+            logger.warning("[CREATE] request.FILES is empty or doesn't exist!")
+
+        logger.debug("[CREATE] Images count in request: %s", len(images_in_request))
+
+        # Create a copy of request.data without 'images' to avoid serializer validation issues
+        # NOTE: 'images' in request.data might be a list of file names, but actual files are in request.FILES
+        # IMPORTANT: Use dict() to create a mutable copy if request.data is a QueryDict
+        if hasattr(request.data, 'copy'):
+            data = request.data.copy()
+        else:
+            data = dict(request.data)
+
+        # Remove 'images' from data dict if present (files are in request.FILES, not request.data)
+        if 'images' in data:
+            logger.debug("[CREATE] Found 'images' in request.data (removing from data dict): %s", data.get('images'))
+            if isinstance(data, dict):
+                data.pop('images', None)
+            else:
+                # If it's a QueryDict, use the proper method
+                data = dict(data)
+                data.pop('images', None)
+
+        logger.debug("[CREATE] Data dict keys (after removing images): %s", list(data.keys()))
+        logger.debug("[CREATE] Data dict: %s", data)
+
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+
+        # Get the house instance (should already have images loaded from perform_create)
+        house = serializer.instance
+        logger.debug("[CREATE] House ID: %s", house.pk)
+
+        # Force reload to ensure images are fresh - CRITICAL STEP
+        from django.db.models import Prefetch
+        house = House.objects.prefetch_related(
+            Prefetch('images', queryset=HouseImage.objects.all().order_by('order', 'created_at'))
+        ).select_related('user').get(pk=house.pk)
+
+        # CRITICAL: Verify images exist in database
+        image_count = house.images.count()
+        logger.debug("[CREATE] House has %s images in database", image_count)
+
+        if image_count > 0:
+            images_list = list(house.images.all())
+            logger.debug("[CREATE] First image file: %s", images_list[0].image.name if images_list else 'None')
+            # Test URL access
+            try:
+                test_url = images_list[0].image.url
+                logger.debug("[CREATE] First image URL: %s", test_url)
+            except Exception as e:
+                logger.error("[CREATE] ERROR accessing image URL: %s", e)
+        else:
+            logger.error("[CREATE] No images found in database!")
+
+        # Serialize with request context for proper URL building
+        response_serializer = self.get_serializer(house, context={'request': request})
+        response_data = response_serializer.data
+
+        # CRITICAL: Verify response has images
+        image_urls = response_data.get('image_urls', [])
+        images_array = response_data.get('images', [])
+        logger.debug("[CREATE] Response check - image_urls: %s, images array: %s", len(image_urls), len(images_array))
+
+        if len(image_urls) == 0 and len(images_array) == 0:
+            logger.error("[CREATE] CRITICAL ERROR: NO IMAGES IN RESPONSE!")
+            logger.debug("[CREATE] House has %s images in DB but serializer returned 0!", image_count)
+            logger.debug("[CREATE] Attempting manual fix...")
+
+            # MANUAL FIX: If serializer failed, manually add image URLs
+            if image_count > 0:
+                images_list = list(house.images.all())
+                manual_urls = []
+                for img in images_list:
+                    if img.image:
+                        try:
+                            url = request.build_absolute_uri(img.image.url)
+                            manual_urls.append(url)
+                            logger.debug("[CREATE] Manually added image URL: %s", url)
+                        except Exception as e:
+                            logger.debug("[CREATE] Error building URL: %s", e)
+
+                if manual_urls:
+                    logger.debug("[CREATE] Manually added %s image URLs to response", len(manual_urls))
+                    response_data['image_urls'] = manual_urls
+        else:
+            logger.debug("[CREATE] SUCCESS: Images included in response!")
+            if len(image_urls) > 0:
+                logger.debug("[CREATE] First image_url: %s", image_urls[0])
+
+        logger.debug("[CREATE] ====================================")
+
+        headers = self.get_success_headers(response_data)
+        return Response(response_data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def perform_create(self, serializer):
+        # Save house first to ensure it has a PK
+        house = serializer.save(user=self.request.user)
+        logger.debug("House saved with PK: %s", house.pk)
+
+        # DEBUG: Check request.FILES before calling _handle_images
+        logger.debug("perform_create - request.FILES exists: %s", hasattr(self.request, 'FILES'))
+        logger.debug("perform_create - request.FILES: %s", self.request.FILES if hasattr(self.request, 'FILES') else 'N/A')
+        logger.debug("perform_create - request.FILES keys: %s", list(self.request.FILES.keys()) if hasattr(self.request, 'FILES') and self.request.FILES else 'N/A')
+        logger.debug("perform_create - request.content_type: %s", getattr(self.request, 'content_type', 'N/A'))
+
+        # Handle multiple images (house must have PK for ForeignKey)
+        images_created = self._handle_images(house, self.request)
+        logger.debug("Created %s image(s) for house %s", images_created, house.pk)
+
+        # Update serializer.instance to the house with images loaded
+        # This ensures the instance has the images relationship loaded
+        house = House.objects.prefetch_related('images').select_related('user').get(pk=house.pk)
+        serializer.instance = house
+
+    def update(self, request, *args, **kwargs):
+        """Override update to ensure images are included in response"""
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        # Reload house with images for proper serialization
+        house = serializer.instance
+        house = House.objects.prefetch_related('images').get(pk=house.pk)
+
+        # Create fresh serializer with reloaded house
+        response_serializer = self.get_serializer(house)
+        return Response(response_serializer.data)
+
+    def perform_update(self, serializer):
+        house = serializer.save(user=self.request.user)
+        # Handle multiple images (new images will be added)
+        self._handle_images(house, self.request)
+
+
+# -----------------------------------------
+# GUEST VIEWS (READ ONLY)
+# -----------------------------------------
+class GuestHouseListView(ConditionalGetMixin, generics.ListAPIView):
+    """Allows non-logged-in users to view all houses."""
+    serializer_class = HouseSerializer
+    permission_classes = [AllowAny]  # 👈 Guest access
+    conditional_models = ('api.HouseImage', 'auth.User')
+    response_cache_namespace = PUBLIC_HOUSES
+
+    def get_queryset(self):
+        """Prefetch images and user for efficient querying"""
+        from django.db.models import Prefetch
+        return House.objects.prefetch_related(
+            Prefetch('images', queryset=HouseImage.objects.all().order_by('order', 'created_at'))
+        ).select_related('user').all().order_by("-created_at")
+
+    def get_serializer_context(self):
+        """Ensure request context is passed to serializer"""
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def list(self, request, *args, **kwargs):
+        """Served from the public response cache (invalidated on House/HouseImage writes)"""
+        return self.conditional_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            lambda: cached_response(request, PUBLIC_HOUSES, lambda: self._list_with_images(request, *args, **kwargs)),
+        )
+
+    def _list_with_images(self, request, *args, **kwargs):
+        # Images come from the Prefetch in get_queryset; a house with neither
+        # images nor a cover image has none to add, so there is no per-house
+        # fallback query here
+        return super().list(request, *args, **kwargs)
+
+
+class GuestHouseDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """Allows non-logged-in users to view a single house."""
+    serializer_class = HouseSerializer
+    permission_classes = [AllowAny]
+    conditional_models = ('api.HouseImage', 'auth.User')
+
+    def get_queryset(self):
+        """Prefetch images and user for efficient querying"""
+        from django.db.models import Prefetch
+        return House.objects.prefetch_related(
+            Prefetch('images', queryset=HouseImage.objects.all().order_by('order', 'created_at'))
+        ).select_related('user').all()
+
+    def get_serializer_context(self):
+        """Ensure request context is passed to serializer"""
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            lambda: self.conditional_object_queryset(kwargs),
+            lambda: self._retrieve_with_images(request, *args, **kwargs),
+        )
+
+    def _retrieve_with_images(self, request, *args, **kwargs):
+        """Override retrieve to ensure images are included"""
+        instance = self.get_object()
+
+        # Force reload with images
+        from django.db.models import Prefetch
+        instance = House.objects.prefetch_related(
+            Prefetch('images', queryset=HouseImage.objects.all().order_by('order', 'created_at'))
+        ).select_related('user').get(pk=instance.pk)
+
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
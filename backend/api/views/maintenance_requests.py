@@ -0,0 +1,352 @@
+"""
+Homeowner maintenance requests and service providers.
+"""
+import logging
+
+from django.utils import timezone
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..maintenance_request_utils import (
+    send_maintenance_request_approval_email, send_maintenance_request_created_emails,
+    send_maintenance_request_decline_email,
+)
+from ..models import MaintenanceProvider, MaintenanceRequest
+from ..serializers import MaintenanceProviderSerializer, MaintenanceRequestSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# MAINTENANCE REQUEST VIEWSET
+# ============================================================================
+class MaintenanceRequestViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing maintenance requests
+
+    Permissions:
+    - GET (list, retrieve): Residents see their own, admins see all
+    - POST (create): Only authenticated residents can create requests
+    - PUT/PATCH (update): Only admins can update (for approval)
+    - DELETE: Only admins can delete
+    """
+    serializer_class = MaintenanceRequestSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Filter requests based on user role:
+        - Residents see only their own requests
+        - Admins see all requests
+        """
+        user = self.request.user
+
+        if user.is_staff:
+            # Admin can see all requests
+            queryset = MaintenanceRequest.objects.all()
+        else:
+            # Residents see only their own requests
+            queryset = MaintenanceRequest.objects.filter(homeowner=user)
+
+        # Filter by status if provided
+        status = self.request.query_params.get('status', None)
+        if status:
+            queryset = queryset.filter(status=status)
+
+        return queryset.select_related('homeowner', 'approved_by').order_by('-created_at')
+
+    def get_serializer_context(self):
+        """Pass request context to serializer for absolute URLs"""
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def perform_create(self, serializer):
+        """Set homeowner and send email notifications"""
+        maintenance_request = serializer.save(homeowner=self.request.user)
+
+        # Send email notifications (non-blocking)
+        try:
+            send_maintenance_request_created_emails(maintenance_request)
+        except Exception as email_error:
+            logger.warning("Email notification failed (request still created): %s", email_error, exc_info=True)
+
+    def update(self, request, *args, **kwargs):
+        """
+        Allow homeowners to update their own pending requests
+        Admins can update any request
+        """
+        maintenance_request = self.get_object()
+        user = request.user
+
+        # Check permissions
+        if not user.is_staff:
+            # Homeowners can only update their own requests
+            if maintenance_request.homeowner != user:
+                return Response(
+                    {'error': 'You can only update your own maintenance requests'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            # Homeowners can only update pending requests
+            if maintenance_request.status != 'pending':
+                return Response(
+                    {'error': 'You can only update pending requests. This request is already processed.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        # Proceed with update
+        partial = kwargs.pop('partial', False)
+        serializer = self.get_serializer(maintenance_request, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        return Response(serializer.data)
+
+    def perform_update(self, serializer):
+        """Save the updated request"""
+        serializer.save()
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Delete maintenance request with proper validation
+        - Admins can delete any request
+        - Homeowners can only delete their own pending/declined requests
+        """
+        maintenance_request = self.get_object()
+        user = request.user
+
+        # Admins can delete any request
+        if user.is_staff:
+            maintenance_request.delete()
+            return Response(
+                {'message': 'Maintenance request deleted successfully'},
+                status=status.HTTP_200_OK
+            )
+
+        # Homeowners can only delete their own requests
+        if maintenance_request.homeowner != user:
+            return Response(
+                {'error': 'You can only delete your own maintenance requests'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # Homeowners can delete any of their own requests (pending, declined, approved, etc.)
+        # This allows them to clean up their request list
+        maintenance_request.delete()
+        return Response(
+            {'message': 'Maintenance request deleted successfully'},
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
+    def approve(self, request, pk=None):
+        """
+        Admin action to approve a maintenance request
+        - Updates status
+        - Sends email to homeowner
+        """
+        maintenance_request = self.get_object()
+
+        if maintenance_request.status != 'pending':
+            return Response(
+                {'error': f'Request is already {maintenance_request.get_status_display()}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            # Update status and approval info
+            maintenance_request.status = 'approved'
+            maintenance_request.approved_by = request.user
+            maintenance_request.approved_at = timezone.now()
+            maintenance_request.save()
+
+            # Send approval email
+            try:
+                send_maintenance_request_approval_email(maintenance_request)
+            except Exception as email_error:
+                logger.warning("Failed to send approval email: %s", email_error)
+
+            serializer = self.get_serializer(maintenance_request)
+            return Response({
+                'message': 'Maintenance request approved successfully',
+                'maintenance_request': serializer.data
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error("Failed to approve request: %s", e, exc_info=True)
+            return Response(
+                {'error': f'Failed to approve request: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
+    def decline(self, request, pk=None):
+        """
+        Admin action to decline a maintenance request
+        - Updates status with decline reason
+        - Sends email to homeowner
+        """
+        maintenance_request = self.get_object()
+        declined_reason = request.data.get('declined_reason', '')
+
+        if maintenance_request.status != 'pending':
+            return Response(
+                {'error': f'Request is already {maintenance_request.get_status_display()}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            maintenance_request.status = 'declined'
+            maintenance_request.declined_reason = declined_reason
+            maintenance_request.approved_by = request.user
+            maintenance_request.approved_at = timezone.now()
+            maintenance_request.save()
+
+            # Send decline email
+            try:
+                send_maintenance_request_decline_email(maintenance_request)
+            except Exception as email_error:
+                logger.warning("Failed to send decline email: %s", email_error)
+
+            serializer = self.get_serializer(maintenance_request)
+            return Response({
+                'message': 'Maintenance request declined',
+                'maintenance_request': serializer.data
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error("Failed to decline request: %s", e, exc_info=True)
+            return Response(
+                {'error': f'Failed to decline request: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=True, methods=['post', 'patch'], permission_classes=[IsAdminUser])
+    def add_feedback(self, request, pk=None):
+        """
+        Admin action to add or update feedback on a maintenance request
+        Can be used at any stage (pending, approved, in_progress, completed)
+        """
+        maintenance_request = self.get_object()
+        admin_feedback = request.data.get('admin_feedback', '')
+
+        try:
+            maintenance_request.admin_feedback = admin_feedback
+            maintenance_request.save()
+
+            serializer = self.get_serializer(maintenance_request)
+            return Response({
+                'message': 'Admin feedback updated successfully',
+                'maintenance_request': serializer.data
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error("Failed to update feedback: %s", e, exc_info=True)
+            return Response(
+                {'error': f'Failed to update feedback: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def _get_status_message(self, visitor_request, is_valid, is_used, is_expired, is_approved,
+                           is_pending, is_declined, is_not_yet_valid, is_past_valid, is_within_window,
+                           visit_datetime_start, visit_datetime_end):
+        """Helper method to generate detailed status message based on time/date intervals"""
+        from django.utils import timezone
+        from django.utils.formats import date_format, time_format
+
+        # Wrong PIN case is handled before this method is called
+
+        if is_declined:
+            return 'This PIN has been declined by admin'
+
+        if is_pending:
+            return 'This PIN is pending admin approval'
+
+        if is_used:
+            return 'This PIN has already been used'
+
+        if is_expired:
+            return 'This PIN has expired'
+
+        if is_approved:
+            # Check time/date scenarios - order matters!
+            # First check if it's past the valid time window
+            if is_past_valid and visit_datetime_end:
+                # Format the end datetime for display
+                end_str = visit_datetime_end.strftime('%Y-%m-%d %I:%M %p')
+                return f'PIN is approved, but has passed the valid time/date. Valid until: {end_str}'
+
+            # Then check if it's not yet valid (before the time window)
+            if is_not_yet_valid and visit_datetime_start:
+                # Format the start datetime for display
+                start_str = visit_datetime_start.strftime('%Y-%m-%d %I:%M %p')
+                return f'PIN is approved, but the visit time/date is not yet valid. Valid from: {start_str}'
+
+            # If within window, it's valid
+            if is_within_window:
+                return 'PIN is valid and ready for use'
+
+            # Fallback if date/time info is missing
+            return 'PIN is approved'
+
+        # Fallback for any other status
+        if is_expired or not is_valid:
+            return 'This PIN has expired or is outside valid time window'
+
+        return 'Unknown status'
+
+
+class MaintenanceProviderViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing maintenance providers
+
+    Permissions:
+    - GET (list, retrieve): All authenticated users can view approved providers
+    - POST/PUT/PATCH/DELETE: Only admins can manage providers
+    """
+    serializer_class = MaintenanceProviderSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Filter providers based on user role:
+        - All users see approved and active providers
+        - Admins see all providers (including unapproved/inactive)
+        - Filter by maintenance_type if provided
+        """
+        user = self.request.user
+        maintenance_type = self.request.query_params.get('maintenance_type', None)
+
+        if user.is_staff:
+            # Admin can see all providers
+            queryset = MaintenanceProvider.objects.all()
+        else:
+            # Regular users see only approved and active providers
+            queryset = MaintenanceProvider.objects.filter(is_approved=True, is_active=True)
+
+        # Filter by maintenance type if provided
+        if maintenance_type:
+            # Search in services field (comma-separated)
+            queryset = queryset.filter(services__icontains=maintenance_type)
+
+        return queryset.select_related('created_by').order_by('-is_approved', '-is_active', 'name')
+
+    def get_permissions(self):
+        """
+        Allow all authenticated users to view (GET, LIST),
+        but only admins can create, update, or delete.
+        """
+        if self.action in ['list', 'retrieve']:
+            return [IsAuthenticated()]
+        return [IsAuthenticated(), IsAdminUser()]
+
+    def perform_create(self, serializer):
+        """Set created_by when creating a provider"""
+        serializer.save(created_by=self.request.user)
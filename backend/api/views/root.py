@@ -0,0 +1,63 @@
+"""
+Entry point listing the API.
+"""
+import logging
+
+from django.http import JsonResponse
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['GET', 'HEAD', 'OPTIONS'])
+@permission_classes([AllowAny])
+def api_root(request):
+    """Root API endpoint that provides basic API information"""
+    try:
+        data = {
+            'message': 'Happy Homes API',
+            'version': '1.0',
+            'endpoints': {
+                'api': '/api/',
+                'admin': '/admin/',
+                'token': '/api/token/',
+                'register': '/api/register/',
+            }
+        }
+
+        # Handle OPTIONS request for CORS preflight
+        if request.method == 'OPTIONS':
+            response = Response(status=status.HTTP_200_OK)
+        else:
+            response = Response(data, status=status.HTTP_200_OK)
+
+        return response
+    except Exception as e:
+        # Log the error for debugging
+        logger.error("Error in api_root: %s", e, exc_info=True)
+
+        # Fallback to JsonResponse if DRF Response fails
+        try:
+            return JsonResponse({
+                'message': 'Happy Homes API',
+                'version': '1.0',
+                'endpoints': {
+                    'api': '/api/',
+                    'admin': '/admin/',
+                    'token': '/api/token/',
+                    'register': '/api/register/',
+                }
+            }, status=200)
+        except Exception as e2:
+            # Ultimate fallback - plain text response
+            from django.http import HttpResponse
+            return HttpResponse(
+                '{"message":"Happy Homes API","version":"1.0","endpoints":{"api":"/api/","admin":"/admin/","token":"/api/token/","register":"/api/register/"}}',
+                content_type='application/json',
+                status=200
+            )
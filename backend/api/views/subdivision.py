@@ -0,0 +1,184 @@
+"""
+Subdivision lots, map pins and pin reviews.
+"""
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+
+from rest_framework import status, viewsets
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import ModelViewSet
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..models import Pin, Review, Subdivision
+from ..serializers import PinSerializer, ReviewSerializer, SubdivisionSerializer
+
+
+# --- Subdivisions ---
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def subdivision_list_create(request):
+    if request.method == 'GET':
+        subdivisions = Subdivision.objects.all()
+        serializer = SubdivisionSerializer(subdivisions, many=True)
+        return Response(serializer.data)
+
+    elif request.method == 'POST':
+        serializer = SubdivisionSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def subdivision_detail(request, pk):
+    try:
+        subdivision = Subdivision.objects.get(pk=pk)
+    except Subdivision.DoesNotExist:
+        return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'GET':
+        serializer = SubdivisionSerializer(subdivision)
+        return Response(serializer.data)
+
+    elif request.method == 'PUT':
+        serializer = SubdivisionSerializer(subdivision, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    elif request.method == 'DELETE':
+        subdivision.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PinViewSet(ModelViewSet):
+    queryset = Pin.objects.with_review_stats()
+    serializer_class = PinSerializer
+    # Temporarily allow open write access to unblock pinning; tighten later
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def perform_create(self, serializer):
+        # Ensure optional fields are saved from incoming payload
+        serializer.save()
+
+    def perform_update(self, serializer):
+        serializer.save()
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SubdivisionViewSet(ModelViewSet):
+    queryset = Subdivision.objects.all()
+    serializer_class = SubdivisionSerializer
+    permission_classes = [AllowAny]
+    authentication_classes = [BasicAuthentication]
+
+    @action(detail=False, methods=['get'])
+    def occupancy_stats(self, request):
+        """Get real-time subdivision occupancy statistics based on pins"""
+        # Get all pins
+        all_pins = Pin.objects.all()
+        total_pins = all_pins.count()
+
+        # Count occupied pins (prefer status, fallback to legacy name marker)
+        occupied_pins = all_pins.filter(
+            Q(status__iexact='occupied') |
+            Q(name__iregex=r'(^|\b)occupied($|\b)')
+        ).count()
+        available_pins = max(total_pins - occupied_pins, 0)
+
+        # Use fixed capacity of 200 slots for subdivision capacity
+        capacity = 200
+        max_subdivisions = capacity
+        total_subdivisions = capacity
+        occupied_subdivisions = occupied_pins
+        available_subdivisions = max(total_subdivisions - occupied_subdivisions, 0)
+
+        return Response({
+            'total': total_subdivisions,
+            'occupied': occupied_subdivisions,
+            'available': available_subdivisions,
+            'occupancy_rate': (occupied_subdivisions / total_subdivisions * 100) if total_subdivisions > 0 else 0,
+            'total_pins': total_pins,
+            'occupied_pins': occupied_pins,
+            'available_pins': available_pins
+        })
+
+    @action(detail=False, methods=['get'])
+    def real_time_data(self, request):
+        """Get real-time data for map including pins and occupancy"""
+        # Get all pins
+        pins = Pin.objects.all()
+        pin_serializer = PinSerializer(pins.with_review_stats(), many=True)
+
+        # Calculate occupancy stats based on pins
+        total_pins = pins.count()
+        occupied_pins = pins.filter(
+            Q(status__iexact='occupied') |
+            Q(name__iregex=r'(^|\b)occupied($|\b)')
+        ).count()
+        available_pins = max(total_pins - occupied_pins, 0)
+
+        # Use fixed capacity of 200 slots for subdivision capacity
+        capacity = 200
+        max_subdivisions = capacity
+        total_subdivisions = capacity
+        occupied_subdivisions = occupied_pins
+        available_subdivisions = max(total_subdivisions - occupied_subdivisions, 0)
+
+        return Response({
+            'pins': pin_serializer.data,
+            'occupancy': {
+                'total': total_subdivisions,
+                'occupied': occupied_subdivisions,
+                'available': available_subdivisions,
+                'occupancy_rate': (occupied_subdivisions / total_subdivisions * 100) if total_subdivisions > 0 else 0,
+                'total_pins': total_pins,
+                'occupied_pins': occupied_pins,
+                'available_pins': available_pins
+            },
+            'timestamp': timezone.now().isoformat()
+        })
+
+
+# --- ViewSets ---
+@method_decorator(csrf_exempt, name='dispatch')
+class ReviewViewSet(viewsets.ModelViewSet):
+    serializer_class = ReviewSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        pin_id = self.request.query_params.get("pin_id")
+        qs = Review.objects.select_related('user__profile', 'pin')
+
+        if pin_id:
+            qs = qs.filter(pin_id=pin_id)
+
+        return qs.order_by("-created_at")
+
+    def perform_create(self, serializer):
+        # Ensure user can only create one review per pin
+        pin = serializer.validated_data['pin']
+        user = self.request.user
+
+        # Check if review already exists
+        existing_review = Review.objects.filter(pin=pin, user=user).first()
+        if existing_review:
+            from rest_framework.exceptions import ValidationError
+            raise ValidationError("You have already reviewed this location. You can update your existing review.")
+
+        serializer.save(user=user)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
@@ -0,0 +1,642 @@
+"""
+Pre-registered visitor requests and one-time PIN verification at the gate.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+
+from django.http import HttpResponse
+from django.utils import timezone
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..conditional import ConditionalGetMixin
+from ..models import Visitor, VisitorRequest
+from ..serializers import VisitorRequestSerializer, VisitorSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+class VisitorRequestViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for managing visitor requests with one-time PIN generation
+
+    Permissions:
+    - GET (list, retrieve): Residents see their own, admins see all
+    - POST (create): Only authenticated residents can create requests
+    - PUT/PATCH (update): Only admins can update (for approval)
+    - DELETE: Only admins can delete
+    """
+    serializer_class = VisitorRequestSerializer
+    authentication_classes = [JWTAuthentication]  # Default, overridden in get_authenticators for verify_pin
+    conditional_models = ('auth.User',)
+    # is_valid depends on the visit window, so validators also roll over every minute
+    conditional_time_bucket = 60
+    permission_classes = [IsAuthenticated]
+
+    # Explicitly allow POST for custom actions
+    http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']
+
+    def get_queryset(self):
+        """
+        Filter requests based on user role:
+        - Residents see only their own requests
+        - Admins see all requests
+        """
+        user = self.request.user
+
+        # Handle unauthenticated users (shouldn't happen for list, but safety check)
+        if not user or not user.is_authenticated:
+            return VisitorRequest.objects.none()
+
+        # Use select_related to optimize queries and prevent serialization issues
+        # Note: visitor_record is nullable, so we handle it separately if needed
+        base_queryset = VisitorRequest.objects.select_related(
+            'resident',
+            'approved_by'
+        )
+
+        if user.is_staff:
+            # Admin can see all requests
+            queryset = base_queryset.all()
+        else:
+            # Residents see only their own requests
+            queryset = base_queryset.filter(resident=user)
+
+        # Filter by status if provided
+        status = self.request.query_params.get('status', None)
+        if status:
+            queryset = queryset.filter(status=status)
+
+        return queryset.order_by('-created_at')
+
+    def get_serializer_context(self):
+        """Pass request context to serializer for absolute URLs"""
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def get_authenticators(self):
+        """Override to allow unauthenticated access for verify_pin action"""
+        # Check action first (set after dispatch)
+        action = getattr(self, 'action', None)
+        if action == 'verify_pin':
+            return []  # No authentication required for PIN verification
+
+        # Fallback: check request path from META (available during initialization)
+        try:
+            request = getattr(self, 'request', None)
+            if request:
+                # Try to get path from request object or META
+                path = getattr(request, 'path', None) or getattr(request, 'META', {}).get('PATH_INFO', '')
+                if path and 'verify_pin' in path:
+                    return []  # No authentication required for PIN verification
+        except (AttributeError, TypeError, KeyError):
+            pass
+
+        return [JWTAuthentication()]
+
+    def get_permissions(self):
+        """Override to allow unauthenticated access for verify_pin action"""
+        # Check action first (set after dispatch)
+        action = getattr(self, 'action', None)
+        if action == 'verify_pin':
+            return [AllowAny()]  # No permission required for PIN verification
+
+        # Fallback: check request path from META
+        try:
+            request = getattr(self, 'request', None)
+            if request:
+                # Try to get path from request object or META
+                path = getattr(request, 'path', None) or getattr(request, 'META', {}).get('PATH_INFO', '')
+                if path and 'verify_pin' in path:
+                    return [AllowAny()]  # No permission required for PIN verification
+        except (AttributeError, TypeError, KeyError):
+            pass
+
+        return [IsAuthenticated()]
+
+    def perform_create(self, serializer):
+        """Set resident to current user when creating request"""
+        serializer.save(resident=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            lambda: self._safe_list(request, *args, **kwargs),
+        )
+
+    def _safe_list(self, request, *args, **kwargs):
+        """Override list to add error handling and safe serialization"""
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(queryset)
+
+            if page is not None:
+                # Paginated response
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+            # Non-paginated response - serialize with error handling per object
+            serializer = self.get_serializer(queryset, many=True)
+
+            # Filter out any objects that failed to serialize
+            safe_data = []
+            for i, obj in enumerate(queryset):
+                try:
+                    obj_serializer = self.get_serializer(obj)
+                    safe_data.append(obj_serializer.data)
+                except Exception as obj_error:
+                    import traceback
+                    logger.warning("Failed to serialize VisitorRequest %s: %s", obj.id, obj_error)
+                    # Try to get at least basic data
+                    try:
+                        safe_data.append({
+                            'id': obj.id,
+                            'visitor_name': obj.visitor_name,
+                            'status': obj.status,
+                            'visit_date': str(obj.visit_date) if obj.visit_date else None,
+                            'error': 'Partial serialization'
+                        })
+                    except:
+                        # Skip this object if even basic serialization fails
+                        pass
+
+            return Response(safe_data)
+
+        except Exception as e:
+            import traceback
+            from django.conf import settings
+
+            # Log the full error for debugging
+            error_traceback = traceback.format_exc()
+            logger.error("Error in VisitorRequestViewSet.list: %s", e, exc_info=True)
+
+            return Response(
+                {
+                    'error': f'Error fetching visitor requests: {str(e)}',
+                    'detail': str(e),
+                    'traceback': error_traceback if settings.DEBUG else None
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
+    def approve(self, request, pk=None):
+        """
+        Admin action to approve a visitor request
+        - Generates one-time PIN
+        - Creates PDF
+        - Sends email to homeowner with PDF
+        """
+        from ..visitor_request_utils import generate_visitor_request_pdf
+        from ..visitor_request_utils import send_visitor_request_approval_email
+        visitor_request = self.get_object()
+
+        if visitor_request.status != 'pending_admin':
+            return Response(
+                {'error': f'Request is already {visitor_request.get_status_display()}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            # Generate one-time PIN
+            visitor_request.generate_one_time_pin()
+
+            # Update status and approval info
+            visitor_request.status = 'approved'
+            visitor_request.approved_by = request.user
+            visitor_request.approved_at = timezone.now()
+            visitor_request.save()
+
+            # Create Visitor record so it appears in visitors list
+            # Find or create ResidentPin for the homeowner
+            from ..models import ResidentPin, Visitor
+            resident_pin, _ = ResidentPin.objects.get_or_create(user=visitor_request.resident)
+
+            # Create Visitor record (but don't set time_in yet - that happens when guard checks in)
+            visitor = Visitor.objects.create(
+                name=visitor_request.visitor_name,
+                gmail=visitor_request.visitor_email,
+                contact_number=visitor_request.visitor_contact_number or '',
+                reason=visitor_request.reason or '',
+                pin_entered=visitor_request.one_time_pin,
+                resident=resident_pin,
+                status='approved',  # Already approved via request
+                # Don't set time_in yet - guard will set it when checking in
+            )
+
+            # Link visitor record to request
+            visitor_request.visitor_record = visitor
+            visitor_request.save()
+
+            # Generate PDF
+            pdf_path = generate_visitor_request_pdf(visitor_request)
+            if pdf_path:
+                visitor_request.pdf_file_path = pdf_path
+                visitor_request.pdf_generated = True
+                visitor_request.save()
+
+            # Send email with PDF attachment
+            email_sent = send_visitor_request_approval_email(visitor_request)
+            if email_sent:
+                visitor_request.email_sent = True
+                visitor_request.email_sent_at = timezone.now()
+                visitor_request.save()
+
+            serializer = self.get_serializer(visitor_request)
+            return Response({
+                'message': 'Visitor request approved successfully',
+                'visitor_request': serializer.data
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error("Failed to approve request: %s", e, exc_info=True)
+            return Response(
+                {'error': f'Failed to approve request: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
+    def decline(self, request, pk=None):
+        """
+        Admin action to decline a visitor request
+        """
+        visitor_request = self.get_object()
+        declined_reason = request.data.get('declined_reason', '')
+
+        if visitor_request.status != 'pending_admin':
+            return Response(
+                {'error': f'Request is already {visitor_request.get_status_display()}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        visitor_request.status = 'declined'
+        visitor_request.declined_reason = declined_reason
+        visitor_request.approved_by = request.user
+        visitor_request.approved_at = timezone.now()
+        visitor_request.save()
+
+        # TODO: Send decline email to homeowner (optional)
+
+        serializer = self.get_serializer(visitor_request)
+        return Response({
+            'message': 'Visitor request declined',
+            'visitor_request': serializer.data
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def pdf(self, request, pk=None):
+        """
+        Download PDF for a visitor request
+        Allows admins to download any PDF, residents to download their own
+        """
+        from ..visitor_request_utils import generate_visitor_request_pdf
+        visitor_request = self.get_object()
+
+        # Check permissions: admin can access any, residents can only access their own
+        if not request.user.is_staff and visitor_request.resident != request.user:
+            return Response(
+                {'error': 'You do not have permission to access this PDF'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if not visitor_request.pdf_file_path:
+            # Generate PDF if it doesn't exist
+            pdf_path = generate_visitor_request_pdf(visitor_request)
+            if pdf_path:
+                visitor_request.pdf_file_path = pdf_path
+                visitor_request.pdf_generated = True
+                visitor_request.save()
+            else:
+                return Response(
+                    {'error': 'Failed to generate PDF'},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+        try:
+            file_path = visitor_request.pdf_file_path.path
+            if os.path.exists(file_path):
+                with open(file_path, 'rb') as f:
+                    pdf_content = f.read()
+                    # Verify it's actually a PDF by checking the PDF header
+                    if pdf_content[:4] != b'%PDF':
+                        return Response(
+                            {'error': 'File is not a valid PDF'},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
+
+                    response = HttpResponse(pdf_content, content_type='application/pdf')
+                    # Use 'inline' instead of 'attachment' to open in browser
+                    # Properly encode filename for international characters
+                    filename = f"visitor_request_{visitor_request.id}.pdf"
+                    response['Content-Disposition'] = f'inline; filename="{filename}"'
+                    response['Content-Length'] = len(pdf_content)
+                    # Additional headers to ensure proper PDF handling
+                    response['X-Content-Type-Options'] = 'nosniff'
+                    return response
+            else:
+                return Response(
+                    {'error': 'PDF file not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to retrieve PDF: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    def checkin_one_time(self, request):
+        """
+        Check-in using one-time PIN (public endpoint)
+        Validates PIN and creates Visitor record
+        """
+        pin = request.data.get('pin')
+        name = request.data.get('name')
+        gmail = request.data.get('gmail')
+        contact_number = request.data.get('contact_number', '')
+        reason = request.data.get('reason', '')
+
+        if not pin or not name or not gmail:
+            return Response(
+                {'error': 'PIN, name, and email are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            visitor_request = VisitorRequest.objects.get(one_time_pin=pin, status='approved')
+        except VisitorRequest.DoesNotExist:
+            return Response(
+                {'error': 'Invalid or expired PIN'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Validate PIN is still valid (check date/time)
+        if not visitor_request.is_valid():
+            visitor_request.status = 'expired'
+            visitor_request.save()
+            return Response(
+                {'error': 'PIN has expired'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Check if PIN was already used (has time_in set)
+        if visitor_request.visitor_record:
+            if visitor_request.visitor_record.time_in:
+                visitor_request.status = 'used'
+                visitor_request.save()
+                return Response(
+                    {'error': 'PIN has already been used'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            else:
+                # Visitor record exists but not checked in yet - update it
+                visitor = visitor_request.visitor_record
+                visitor.time_in = timezone.now()
+                visitor.save()
+                visitor_request.status = 'used'
+                visitor_request.save()
+                serializer = VisitorSerializer(visitor)
+                return Response({
+                    'message': 'Check-in successful',
+                    'visitor': serializer.data
+                }, status=status.HTTP_200_OK)
+
+        # If no visitor record exists, create one (shouldn't happen if approve creates it, but safety check)
+        from ..models import ResidentPin
+        resident_pin, _ = ResidentPin.objects.get_or_create(user=visitor_request.resident)
+
+        # Create Visitor record
+        visitor = Visitor.objects.create(
+            name=name,
+            gmail=gmail,
+            contact_number=contact_number,
+            reason=reason or visitor_request.reason,
+            pin_entered=pin,
+            resident=resident_pin,
+            status='approved',  # Already approved via request
+            time_in=timezone.now()
+        )
+
+        # Link visitor record to request
+        visitor_request.visitor_record = visitor
+        visitor_request.status = 'used'
+        visitor_request.save()
+
+        serializer = VisitorSerializer(visitor)
+        return Response({
+            'message': 'Check-in successful',
+            'visitor': serializer.data
+        }, status=status.HTTP_201_CREATED)
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Delete visitor request with proper validation
+        - Admins can delete any request (with warning if used)
+        - Homeowners can only delete their own pending/declined requests
+        """
+        visitor_request = self.get_object()
+
+        # Admins can delete any request
+        if request.user.is_staff:
+            visitor_request.delete()
+            return Response(
+                {'message': 'Visitor request deleted successfully'},
+                status=status.HTTP_200_OK
+            )
+
+        # Homeowners can only delete their own requests
+        if visitor_request.resident != request.user:
+            return Response(
+                {'error': 'You can only delete your own visitor requests'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # Homeowners can delete any of their own requests (pending, declined, approved, or used)
+        # Frontend will show appropriate warnings for approved/used requests
+        visitor_request.delete()
+        return Response(
+            {'message': 'Visitor request deleted successfully'},
+            status=status.HTTP_200_OK
+        )
+
+
+def pin_verification(visitor_request, pin):
+    """Response body for a gate PIN check of ``visitor_request`` (shared with the async view)"""
+    # Check basic PIN status - handle visitor_record safely
+    is_used = False
+    try:
+        if visitor_request.visitor_record and hasattr(visitor_request.visitor_record, 'time_in'):
+            is_used = visitor_request.visitor_record.time_in is not None
+    except (AttributeError, Exception):
+        is_used = False
+    is_expired_status = visitor_request.status == 'expired'
+    is_approved = visitor_request.status == 'approved'
+    is_pending = visitor_request.status == 'pending_admin'
+    is_declined = visitor_request.status == 'declined'
+
+    visit_datetime_start = None
+    visit_datetime_end = None
+    now = timezone.now()
+
+    # Check time/date validity
+    is_not_yet_valid = False
+    is_past_valid = False
+    is_within_window = False
+
+    if visitor_request.visit_date and visitor_request.visit_start_time:
+        visit_datetime_start_naive = datetime.combine(visitor_request.visit_date, visitor_request.visit_start_time)
+        visit_datetime_start = timezone.make_aware(visit_datetime_start_naive)
+
+    end_date = visitor_request.visit_end_date if visitor_request.visit_end_date else visitor_request.visit_date
+    if end_date and visitor_request.visit_end_time:
+        visit_datetime_end_naive = datetime.combine(end_date, visitor_request.visit_end_time)
+        visit_datetime_end = timezone.make_aware(visit_datetime_end_naive)
+
+        if visit_datetime_end and visit_datetime_start and visit_datetime_end < visit_datetime_start and visitor_request.visit_date == end_date:
+            visit_datetime_end += timedelta(days=1)
+
+    # Check time/date intervals
+    if visit_datetime_start and visit_datetime_end:
+        if now < visit_datetime_start:
+            is_not_yet_valid = True
+        elif now > visit_datetime_end:
+            is_past_valid = True
+        else:
+            is_within_window = True
+
+    # Determine overall validity
+    is_valid = is_approved and not is_used and is_within_window and not is_expired_status and not is_past_valid
+
+    # Get status message
+    if is_declined:
+        status_message = 'This PIN has been declined by admin'
+    elif is_pending:
+        status_message = 'This PIN is pending admin approval'
+    elif is_used:
+        status_message = 'This PIN has already been used'
+    elif is_expired_status:
+        status_message = 'This PIN has expired'
+    elif is_approved:
+        if is_past_valid and visit_datetime_end:
+            end_str = visit_datetime_end.strftime('%Y-%m-%d %I:%M %p')
+            status_message = f'PIN is approved, but has passed the valid time/date. Valid until: {end_str}'
+        elif is_not_yet_valid and visit_datetime_start:
+            start_str = visit_datetime_start.strftime('%Y-%m-%d %I:%M %p')
+            status_message = f'PIN is approved, but the visit time/date is not yet valid. Valid from: {start_str}'
+        elif is_within_window:
+            status_message = 'PIN is valid and ready for use'
+        else:
+            status_message = 'PIN is approved'
+    else:
+        status_message = 'Unknown status'
+
+    return {
+        'valid': is_valid,
+        'pin': pin,
+        'visitor_request': {
+            'id': visitor_request.id,
+            'visitor_name': visitor_request.visitor_name,
+            'visitor_email': visitor_request.visitor_email,
+            'visitor_contact_number': visitor_request.visitor_contact_number or '',
+            'vehicle_plate_number': visitor_request.vehicle_plate_number or '',
+            'reason': visitor_request.reason or '',
+            'visit_date': visitor_request.visit_date.strftime('%Y-%m-%d') if visitor_request.visit_date else '',
+            'visit_end_date': visitor_request.visit_end_date.strftime('%Y-%m-%d') if visitor_request.visit_end_date else None,
+            'visit_start_time': visitor_request.visit_start_time.strftime('%H:%M') if visitor_request.visit_start_time else '',
+            'visit_end_time': visitor_request.visit_end_time.strftime('%H:%M') if visitor_request.visit_end_time else '',
+            'status': visitor_request.status,
+            'resident_name': visitor_request.resident.username if visitor_request.resident else 'Unknown',
+            'resident_email': visitor_request.resident.email if visitor_request.resident else '',
+            'visit_datetime_start': visit_datetime_start.isoformat() if visit_datetime_start else None,
+            'visit_datetime_end': visit_datetime_end.isoformat() if visit_datetime_end else None,
+        },
+        'details': {
+            'is_approved': is_approved,
+            'is_used': is_used,
+            'is_expired': is_expired_status,
+            'is_valid': is_valid,
+            'is_pending': is_pending,
+            'is_declined': is_declined,
+            'is_not_yet_valid': is_not_yet_valid,
+            'is_past_valid': is_past_valid,
+            'is_within_window': is_within_window,
+            'status_message': status_message
+        }
+    }
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def verify_pin_view(request):
+    """
+    Standalone view for PIN verification (bypasses ViewSet routing issues)
+    Guard/Entrance endpoint to verify one-time PIN
+    Returns visitor request details without creating Visitor record
+    Public endpoint - no authentication required
+    """
+    from ..models import VisitorRequest
+    from django.conf import settings
+    from rest_framework import status
+    import traceback
+
+    # Safely get PIN from request
+    try:
+        if hasattr(request, 'data'):
+            pin = request.data.get('pin')
+        else:
+            import json
+            body = request.body.decode('utf-8')
+            data = json.loads(body) if body else {}
+            pin = data.get('pin')
+    except (AttributeError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        return Response(
+            {'error': f'Invalid request format: {str(e)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not pin:
+        return Response(
+            {'error': 'PIN is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        visitor_request = VisitorRequest.objects.select_related('resident').get(one_time_pin=pin)
+    except VisitorRequest.DoesNotExist:
+        return Response(
+            {
+                'valid': False,
+                'error': 'Invalid PIN - PIN not found'
+            },
+            status=status.HTTP_200_OK
+        )
+    except Exception as e:
+        logger.error("Error looking up PIN: %s", e, exc_info=True)
+        return Response(
+            {
+                'valid': False,
+                'error': f'Error looking up PIN: {str(e)}'
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    try:
+        return Response(pin_verification(visitor_request, pin), status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error("Error processing PIN verification: %s", e, exc_info=True)
+        return Response(
+            {
+                'valid': False,
+                'error': f'Error processing PIN verification: {str(e)}',
+                'traceback': traceback.format_exc() if settings.DEBUG else None
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
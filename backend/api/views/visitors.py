@@ -0,0 +1,408 @@
+"""
+Resident PINs and gate visitor check-in/check-out.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+from django.utils import timezone
+from django.utils.timezone import now
+
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..models import ResidentPin, UserProfile, Visitor
+from ..serializers import ResidentPinSerializer, UserProfileSerializer, VisitorSerializer
+
+
+# ✅ Resident PIN (GET/POST)
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def my_resident_pin(request):
+    user = request.user
+    pin_obj, _ = ResidentPin.objects.get_or_create(user=user)
+
+    if request.method == "POST":
+        pin_obj.generate_pin()
+
+    serializer = ResidentPinSerializer(pin_obj)
+    return Response(serializer.data)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def visitor_checkin(request):
+    serializer = VisitorSerializer(data=request.data)
+    if serializer.is_valid():
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def guest_visitor_checkin(request):
+    name = request.data.get('name')
+    gmail = request.data.get('gmail')
+    contact_number = request.data.get('contact_number', None)
+    pin = request.data.get('pin')
+    reason = request.data.get('reason', '')
+
+    # Validate required fields
+    if not name or not gmail or not pin:
+        return Response({"error": "Missing name, gmail, or resident PIN"}, status=400)
+
+    try:
+        resident = ResidentPin.objects.get(pin=pin)
+    except ResidentPin.DoesNotExist:
+        return Response({"error": "Invalid resident PIN"}, status=404)
+
+    visitor = Visitor.objects.create(
+        name=name,
+        gmail=gmail,
+        contact_number=contact_number,  # Optional
+        reason=reason,
+        resident=resident,
+        status='pending'
+    )
+
+    # ✅ Send Gmail notification to resident
+    if resident.user.email:
+        send_mail(
+            subject="🆕 New Visitor Check-In Pending Approval",
+            message=(
+                f"Hello {resident.user.username},\n\n"
+                f"A new visitor has submitted a check-in request.\n"
+                f"Details:\n"
+                f"Name: {name}\n"
+                f"Gmail: {gmail}\n"
+                f"Contact: {contact_number or '-'}\n"
+                # f"Reason: {reason or '-'}\n\n"
+                f"Please approve or decline this visitor in the dashboard."
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[resident.user.email],
+            fail_silently=True,
+        )
+
+    serializer = VisitorSerializer(visitor)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def visitor_approval(request, visitor_id):
+    approve = request.data.get("approve", False)
+
+    try:
+        visitor = Visitor.objects.get(id=visitor_id)
+    except Visitor.DoesNotExist:
+        return Response({"error": "Visitor not found"}, status=404)
+
+    visitor.status = "approved" if approve else "declined"
+    if approve:
+        visitor.time_in = timezone.now()
+    visitor.save()
+
+    # ✅ Notify resident
+    if visitor.resident.user.email:
+        send_mail(
+            subject="✅ Visitor Approved" if approve else "❌ Visitor Declined",
+            message=(
+                f"Visitor {visitor.name} has been {'approved' if approve else 'declined'} "
+                f"by {visitor.resident.user.username}."
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[visitor.resident.user.email],
+            fail_silently=True,
+        )
+
+    # ✅ Notify visitor if approved
+    if approve and visitor.gmail:
+        send_mail(
+            subject="✅ Your Visitor Check-In Has Been Approved",
+            message=(
+                f"Hello {visitor.name},\n\n"
+                f"Your visitor check-in has been approved by {visitor.resident.user.username}.\n"
+                f"Details:\n"
+                f"Name: {visitor.name}\n"
+                f"Gmail: {visitor.gmail}\n"
+                f"Contact: {visitor.contact_number or '-'}\n"
+                f"Reason: {visitor.reason or '-'}\n\n"
+                f"Time In: {visitor.time_in}\n"
+                f"Enjoy your visit!"
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[visitor.gmail],
+            fail_silently=True,
+        )
+
+    serializer = VisitorSerializer(visitor)
+    return Response(serializer.data)
+
+
+# ✅ Visitor check-out
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def visitor_checkout(request, visitor_id):
+    try:
+        visitor = Visitor.objects.get(id=visitor_id)
+    except Visitor.DoesNotExist:
+        return Response({"error": "Visitor not found"}, status=404)
+
+    if visitor.status != "approved":
+        return Response({"error": "Cannot check out unapproved visitor"}, status=400)
+
+    visitor.time_out = timezone.now()
+    visitor.save()
+
+    # ✅ Send Gmail notification to resident
+    if visitor.resident.user.email:
+        send_mail(
+            subject="🚪 Visitor Checked Out",
+            message=f"Visitor {visitor.name} has checked out successfully.",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[visitor.resident.user.email],
+            fail_silently=True,
+        )
+
+    serializer = VisitorSerializer(visitor)
+    return Response(serializer.data)
+
+
+# ✅ Active visitors
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def active_visitors(request):
+    visitors = Visitor.objects.filter(
+        resident__user=request.user,
+        time_out__isnull=True,
+        status="approved"
+    )
+    serializer = VisitorSerializer(visitors, many=True)
+    return Response(serializer.data)
+
+
+# ✅ Pending visitors
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def pending_visitors(request):
+    visitors = Visitor.objects.filter(
+        resident__user=request.user,
+        status="pending"
+    )
+    serializer = VisitorSerializer(visitors, many=True)
+    return Response(serializer.data)
+
+
+class VisitorViewSet(viewsets.ModelViewSet):
+    serializer_class = VisitorSerializer
+
+    def get_queryset(self):
+        """
+        Return visitors for the logged-in resident.
+        Guests (anonymous) will use direct PK lookup in time_in/time_out.
+        """
+        user = self.request.user
+        if user.is_authenticated:
+            return Visitor.objects.filter(resident__user=user).order_by('-time_in')
+        # For anonymous users, allow all visitors (used only in time_in/time_out)
+        return Visitor.objects.all()
+
+    @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated])
+    def approve(self, request, pk=None):
+        visitor = self.get_object()
+        visitor.status = "approved"
+        visitor.time_in = now()
+        visitor.save()
+        return Response({"message": "Visitor approved."}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated])
+    def decline(self, request, pk=None):
+        visitor = self.get_object()
+        visitor.status = "declined"
+        visitor.time_out = now()
+        visitor.save()
+        return Response({"message": "Visitor declined."}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['patch'], permission_classes=[AllowAny], url_path='time-in')
+    def time_in(self, request, pk=None):
+        """
+        Update visitor time-in. Allows guests to check in using visitor ID.
+        """
+        visitor = Visitor.objects.get(pk=pk)  # Direct lookup, bypass user filter
+        visitor.time_in = now()
+        visitor.save()
+        return Response({"time_in": visitor.time_in}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['patch'], permission_classes=[AllowAny], url_path='time-out')
+    def time_out(self, request, pk=None):
+        """
+        Update visitor time-out. Allows guests to check out using visitor ID.
+        """
+        visitor = Visitor.objects.get(pk=pk)  # Direct lookup
+        visitor.time_out = now()
+        visitor.save()
+        return Response({"time_out": visitor.time_out}, status=status.HTTP_200_OK)
+
+
+class ResidentPinViewSet(viewsets.ModelViewSet):
+    queryset = ResidentPin.objects.select_related('user')
+    serializer_class = ResidentPinSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class ResidentApprovalViewSet(viewsets.ModelViewSet):
+    queryset = UserProfile.objects.select_related('user').prefetch_related('billing_records')
+    serializer_class = UserProfileSerializer
+    permission_classes = [IsAdminUser]
+
+    def update(self, request, *args, **kwargs):
+        """Allow admin to approve or decline a resident."""
+        profile = self.get_object()
+        is_verified = request.data.get('is_verified', None)
+
+        if is_verified is not None:
+            profile.is_verified = is_verified
+            profile.save()
+            return Response({
+                "message": f"Resident {'approved ✅' if is_verified else 'declined ❌'} successfully."
+            }, status=status.HTTP_200_OK)
+
+        return Response({"error": "is_verified field required"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def all_visitors(request):
+    visitors = Visitor.objects.filter(resident__user=request.user)
+    serializer = VisitorSerializer(visitors, many=True)
+    return Response(serializer.data)
+
+
+class VisitorListView(generics.ListAPIView):
+    serializer_class = VisitorSerializer
+
+    def get_queryset(self):
+        gmail = self.request.query_params.get("gmail")
+        if gmail:
+            return Visitor.objects.filter(gmail=gmail)
+        return Visitor.objects.all()
+
+
+def guest_visitors(request):
+    email = request.query_params.get('email')
+    visitors = Visitor.objects.filter(email=email)
+    serializer = VisitorSerializer(visitors, many=True)
+    return Response(serializer.data)
+
+
+class VisitorCheckinView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = VisitorSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(status="pending")  # set status server-side
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+def visitor_status(request):
+    name = request.GET.get('name')
+    gmail = request.GET.get('gmail')
+    pin = request.GET.get('pin')
+
+    if not all([name, gmail, pin]):
+        return Response({"error": "Missing parameters"}, status=400)
+
+    visitors = Visitor.objects.filter(
+        name=name,
+        gmail=gmail,
+        resident__pin=pin
+    )
+    serializer = VisitorSerializer(visitors, many=True)
+    return Response(serializer.data)
+
+
+# Guest visitor status check
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def guest_visitor_status(request):
+    name = request.GET.get('name')
+    gmail = request.GET.get('gmail')
+    pin = request.GET.get('pin')
+
+    if not name or not gmail or not pin:
+        return Response({"error": "Missing name, gmail, or resident PIN"}, status=400)
+
+    try:
+        resident = ResidentPin.objects.get(pin=pin)
+    except ResidentPin.DoesNotExist:
+        return Response({"error": "Invalid resident PIN"}, status=404)
+
+    visitors = Visitor.objects.filter(resident=resident, name=name, gmail=gmail)
+    serializer = VisitorSerializer(visitors, many=True)
+    return Response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def resident_visitors(request):
+    """
+    Returns all visitor requests for the logged-in resident.
+    """
+    user = request.user
+    # Assuming Resident PIN is linked to user
+    visitor_requests = Visitor.objects.filter(resident__user=user)
+    serializer = VisitorSerializer(visitor_requests, many=True)
+    return Response(serializer.data)
+
+
+@api_view(["PATCH"])
+@permission_classes([IsAuthenticated])
+def visitor_timeout(request, pk):
+    try:
+        visitor = Visitor.objects.get(id=pk)
+        visitor.time_out = timezone.now()
+        visitor.save()
+        return Response({"detail": "Time out updated."})
+    except Visitor.DoesNotExist:
+        return Response({"detail": "Visitor not found."}, status=404)
+
+
+class VisitorTrackingViewSet(viewsets.ModelViewSet):
+    queryset = Visitor.objects.all()
+    serializer_class = VisitorSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        """Return all visitors, including those without time_in (approved but not checked in yet)
+        Order by time_in (most recent first), then by id for those without time_in
+        """
+        return Visitor.objects.all().order_by('-time_in', '-id')
+
+    @action(detail=True, methods=["patch"])
+    def approve(self, request, pk=None):
+        visitor = self.get_object()
+        visitor.status = "approved"
+        visitor.time_in = now()
+        visitor.save()
+        return Response({"message": "Visitor approved."}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["patch"])
+    def decline(self, request, pk=None):
+        visitor = self.get_object()
+        visitor.status = "declined"
+        visitor.time_out = now()
+        visitor.save()
+        return Response({"message": "Visitor declined."}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["patch"])
+    def timeout(self, request, pk=None):
+        visitor = self.get_object()
+        visitor.time_out = now()  # ✅ Make sure now() is imported
+        visitor.save()
+        return Response({"message": "Visitor time-out recorded."}, status=status.HTTP_200_OK)
@@ -2,6 +2,7 @@
 Utility functions for Visitor Request PDF generation and email sending
 """
 import os
+import logging
 from io import BytesIO
 from django.conf import settings
 from django.core.mail import EmailMessage
@@ -22,6 +23,9 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
 
 
+logger = logging.getLogger(__name__)
+
+
 def generate_visitor_request_pdf(visitor_request):
     """
     Generate a formal, modern PDF document for a visitor request with all details
@@ -362,9 +366,7 @@ def generate_visitor_request_pdf(visitor_request):
         return relative_path
         
     except Exception as e:
-        print(f"[ERROR] Failed to generate PDF for visitor request {visitor_request.id}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Failed to generate PDF for visitor request %s: %s", visitor_request.id, e, exc_info=True)
         return None
 
 
@@ -426,7 +428,7 @@ Happy Homes Community Management System
         return relative_path
         
     except Exception as e:
-        print(f"[ERROR] Failed to generate text document: {e}")
+        logger.error("Failed to generate text document: %s", e)
         return None
 
 
@@ -436,7 +438,7 @@ def send_visitor_request_approval_email(visitor_request):
     """
     try:
         if not visitor_request.pdf_file_path:
-            print(f"[WARNING] No PDF file found for visitor request {visitor_request.id}")
+            logger.warning("No PDF file found for visitor request %s", visitor_request.id)
             return False
         
         # Prepare email
@@ -543,8 +545,6 @@ Happy Homes Community Management
         return True
         
     except Exception as e:
-        print(f"[ERROR] Failed to send approval email: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Failed to send approval email: %s", e, exc_info=True)
         return False
 
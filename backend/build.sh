@@ -10,5 +10,8 @@ python manage.py collectstatic --noinput
 # Run migrations
 python manage.py migrate
 
+# Cache table for the database cache backend (no-op when it already exists)
+python manage.py createcachetable
+
 echo "Backend build completed successfully!"
 
@@ -5,6 +5,12 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+Served by gunicorn with uvicorn workers when SERVER_MODE=asgi (see
+gunicorn.conf.py), or directly with ``uvicorn core.asgi:application``. Under
+ASGI the Server-Sent Events stream at /api/events/ is available and the
+I/O-bound endpoints use their async versions (settings.ASYNC_IO_VIEWS, on
+unless ASYNC_IO_VIEWS=false is set).
 """
 
 import os
@@ -12,5 +18,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ASYNC_IO_VIEWS', 'True')
 
 application = get_asgi_application()
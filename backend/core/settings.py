@@ -136,11 +136,17 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # After WhiteNoise so static files are not measured
+    "api.middleware.metrics.RequestMetricsMiddleware",
+    # Read replicas for the queries below it (no-op without DATABASE_REPLICA_URLS)
+    "api.middleware.replicas.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Needs request.user for the staff check; profiles everything below it
+    "api.middleware.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "simple_history.middleware.HistoryRequestMiddleware",
@@ -168,6 +174,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
 
 # ---------------------------------------------------------
 # DATABASE
@@ -190,6 +197,111 @@ else:
         }
     }
 
+# Read replicas: comma-separated database URLs (PostgreSQL deployments).
+# Reads made while serving a request go to a replica, everything else to the
+# primary (api/replicas.py). A user who wrote reads from the primary for
+# REPLICA_STICKY_SECONDS afterwards, to see their change despite replica lag.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_DATABASES = []
+for _index, _url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    REPLICA_DATABASES.append(f"replica_{_index}")
+    DATABASES[f"replica_{_index}"] = {
+        **dj_database_url.parse(_url, conn_max_age=600, ssl_require=True),
+        # Tests run against the primary's test database
+        "TEST": {"MIRROR": "default"},
+    }
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "15"))
+if REPLICA_DATABASES:
+    DATABASE_ROUTERS = ["api.replicas.PrimaryReplicaRouter"]
+
+# PostgreSQL connections (primary and replicas): Django's persistent
+# CONN_MAX_AGE connections. CONN_HEALTH_CHECKS tests an idle connection before
+# reusing it, and TCP keepalives notice dropped ones.
+DATABASE_CONN_HEALTH_CHECKS = os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "True").lower() == "true"
+DATABASE_CONNECT_TIMEOUT = int(os.environ.get("DATABASE_CONNECT_TIMEOUT", "5"))
+# Queries running longer are cancelled by the server (0 disables). `migrate`
+# lifts it on its own connection while migrations run (api/utils/postgresql.py),
+# so data backfills and index builds are not cut off mid-deploy.
+DATABASE_STATEMENT_TIMEOUT_MS = int(os.environ.get("DATABASE_STATEMENT_TIMEOUT_MS", "30000"))
+for _database in DATABASES.values():
+    if _database["ENGINE"] != "django.db.backends.postgresql":
+        continue
+    _database["CONN_HEALTH_CHECKS"] = DATABASE_CONN_HEALTH_CHECKS
+    _database["OPTIONS"] = {
+        **_database.get("OPTIONS", {}),
+        "connect_timeout": DATABASE_CONNECT_TIMEOUT,
+        "options": f"-c statement_timeout={DATABASE_STATEMENT_TIMEOUT_MS}",
+        "keepalives": 1,
+        "keepalives_idle": 60,
+        "keepalives_interval": 10,
+        "keepalives_count": 3,
+    }
+
+# SQLite performance profile, applied to every new SQLite connection
+# (api/utils/sqlite.py). SQLITE_TUNING=False keeps SQLite's defaults.
+SQLITE_TUNING = os.environ.get("SQLITE_TUNING", "True").lower() == "true"
+SQLITE_PRAGMAS = {
+    # Milliseconds a writer waits for the lock before "database is locked"
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    # Bytes of the file read through mmap instead of read() calls
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024))),
+    # Page cache per connection; negative means KiB
+    "cache_size": -int(os.environ.get("SQLITE_CACHE_SIZE_KB", "20000")),
+    # Sorts and temporary indexes in memory
+    "temp_store": "memory",
+}
+# WAL lets readers run while a worker writes; synchronous=NORMAL is durable
+# across crashes of the app in WAL mode (a power loss can drop the last
+# commits). journal_mode is written into the database file, so it is opt-in
+# for the served app (SQLITE_WAL=True) rather than switched on by every
+# manage.py check/test/makemigrations against the tracked db.sqlite3.
+SQLITE_WAL = os.environ.get("SQLITE_WAL", "False").lower() == "true"
+SQLITE_WAL_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+}
+if SQLITE_WAL:
+    SQLITE_PRAGMAS.update(SQLITE_WAL_PRAGMAS)
+
+# ---------------------------------------------------------
+# CACHES
+# ---------------------------------------------------------
+# The default cache is shared by every worker (verification codes, cached
+# responses, dashboard stats). CACHE_URL (or REDIS_URL) selects the backend:
+#   redis://host:6379/0  -> Redis (requires the `redis` package)
+#   file:///path/to/dir  -> file-based cache
+#   db://                -> database cache table (`manage.py createcachetable`)
+#   locmem://            -> per-process memory (single worker only)
+# Unset: the database cache when DATABASE_URL is set, otherwise a file cache.
+CACHE_URL = os.environ.get("CACHE_URL") or os.environ.get("REDIS_URL", "")
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "happyhomes")
+
+if CACHE_URL.startswith(("redis://", "rediss://")):
+    _default_cache = {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}
+elif CACHE_URL.startswith("file://"):
+    _default_cache = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": CACHE_URL[len("file://"):]}
+elif CACHE_URL.startswith("locmem://"):
+    _default_cache = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+elif CACHE_URL.startswith("db://") or DATABASE_URL:
+    _default_cache = {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "django_cache"}
+else:
+    _default_cache = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(BASE_DIR / ".django_cache"),
+    }
+
+CACHES = {
+    "default": {**_default_cache, "KEY_PREFIX": CACHE_KEY_PREFIX, "TIMEOUT": 300},
+}
+if _default_cache["BACKEND"].endswith("RedisCache"):
+    # Buffered view counters (api/counters.py) need a shared cache with an
+    # atomic incr(); without this alias they are written straight to the table
+    CACHES["counters"] = {**_default_cache, "KEY_PREFIX": CACHE_KEY_PREFIX}
+
+# Lifetime of cached public GET responses; entries are also invalidated on
+# every save/delete of the models behind them (api/signals.py)
+PUBLIC_RESPONSE_CACHE_SECONDS = int(os.environ.get("PUBLIC_RESPONSE_CACHE_SECONDS", 600))
+
 # ---------------------------------------------------------
 # PASSWORD VALIDATION
 # ---------------------------------------------------------
@@ -245,6 +357,144 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# ---------------------------------------------------------
+# HISTORY RETENTION (manage.py prune_history)
+# ---------------------------------------------------------
+# Per-model policy for the simple_history tables, keyed by model name.
+#   max_age_days           -> prune records older than this (latest record per object is kept)
+#   max_records_per_object -> keep only the newest N records per object
+#   collapse_duplicates    -> drop updates identical to the following update
+#   collapse_fields        -> also treat updates that only touch these fields as duplicates
+# Pruned rows are written to gzip NDJSON archives in HISTORY_ARCHIVE_DIR first.
+HISTORY_ARCHIVE_DIR = os.environ.get("HISTORY_ARCHIVE_DIR", str(BASE_DIR / "history_archive"))
+HISTORY_RETENTION = {
+    "default": {
+        "max_age_days": None,
+        "max_records_per_object": None,
+        "collapse_duplicates": True,
+        "collapse_fields": [],
+    },
+    "CommunityMedia": {
+        "max_records_per_object": 50,
+        "collapse_fields": ["views_count", "likes_count"],
+    },
+    "UserProfile": {
+        "max_age_days": 365,
+    },
+}
+
+# ---------------------------------------------------------
+# ADMIN DASHBOARD
+# ---------------------------------------------------------
+# How long /api/admin/stats/ (and the legacy dashboard/pin stats) may be served from cache
+ADMIN_STATS_CACHE_SECONDS = int(os.environ.get("ADMIN_STATS_CACHE_SECONDS", 30))
+
+# ---------------------------------------------------------
+# SERVICE FEES
+# ---------------------------------------------------------
+# Cache lifetime of /api/service-fees/summary/ (also invalidated on every fee write)
+SERVICE_FEE_SUMMARY_CACHE_SECONDS = int(os.environ.get("SERVICE_FEE_SUMMARY_CACHE_SECONDS", 300))
+
+# ---------------------------------------------------------
+# BUFFERED COUNTERS (api/counters.py)
+# ---------------------------------------------------------
+# CommunityMedia view increments are held and written in bulk at most once per
+# interval: with Redis in the shared "counters" cache (also: manage.py
+# flush_counters), otherwise in each worker's memory, which is also written
+# once it holds COUNTER_MAX_PENDING items and when the worker exits
+COUNTER_FLUSH_SECONDS = int(os.environ.get("COUNTER_FLUSH_SECONDS", "60"))
+COUNTER_MAX_PENDING = int(os.environ.get("COUNTER_MAX_PENDING", "1000"))
+
+# ---------------------------------------------------------
+# SERVER-SENT EVENTS (/api/events/, ASGI only)
+# ---------------------------------------------------------
+SSE_HEARTBEAT_SECONDS = int(os.environ.get("SSE_HEARTBEAT_SECONDS", 15))
+SSE_MAX_STREAM_SECONDS = int(os.environ.get("SSE_MAX_STREAM_SECONDS", 300))
+SSE_RETRY_MILLISECONDS = int(os.environ.get("SSE_RETRY_MILLISECONDS", 3000))
+# Lifetime of the one-time tickets from POST /api/events/ticket/ that open a
+# user's stream (kept in the default cache, shared by all workers)
+SSE_TICKET_SECONDS = int(os.environ.get("SSE_TICKET_SECONDS", 30))
+# Events are stored (api.models.PushEvent) so every worker process relays them;
+# a process with subscribers looks for new ones this often
+SSE_POLL_SECONDS = float(os.environ.get("SSE_POLL_SECONDS", 1))
+# How long events stay available for Last-Event-ID replay
+SSE_EVENT_RETENTION_SECONDS = int(os.environ.get("SSE_EVENT_RETENTION_SECONDS", 3600))
+
+# ---------------------------------------------------------
+# ASGI SERVING (SERVER_MODE=asgi, see gunicorn.conf.py)
+# ---------------------------------------------------------
+# Route reCAPTCHA verification, the e-mail sending endpoints, gate PIN
+# verification and the guest status check to their async versions in
+# api/async_views.py. core/asgi.py turns this on; WSGI keeps the DRF views.
+ASYNC_IO_VIEWS = os.environ.get("ASYNC_IO_VIEWS", "False").lower() == "true"
+# Longest ?wait= a guest status check may be held open for a pending visitor
+GUEST_STATUS_MAX_WAIT_SECONDS = int(os.environ.get("GUEST_STATUS_MAX_WAIT_SECONDS", 25))
+
+# ---------------------------------------------------------
+# OBSERVABILITY (api/middleware/metrics.py, GET /metrics)
+# ---------------------------------------------------------
+# Requests at least this slow are logged with their most expensive SQL
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 500))
+# /metrics answers only a scraper sending "Authorization: Bearer <METRICS_TOKEN>",
+# a logged-in staff user, or a client in METRICS_ALLOWED_IPS (default: this host).
+# METRICS_PUBLIC=True opens it to everyone.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip()]
+METRICS_PUBLIC = os.environ.get("METRICS_PUBLIC", "False").lower() == "true"
+# INFO logs every request as a JSON line; WARNING keeps only slow requests
+REQUEST_LOG_LEVEL = os.environ.get("REQUEST_LOG_LEVEL", "WARNING" if DEBUG else "INFO")
+
+# Request profiling (api/middleware/profiling.py, GET /api/admin/profiles/).
+# Staff profile a request with "X-Profile: 1" or ?_profile=1; PROFILING_SAMPLE_RATE
+# additionally profiles that fraction of all requests (0.01 = 1%).
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "True").lower() == "true"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+# Most recent profiles kept (in the default cache, shared by all workers)
+PROFILING_RING_SIZE = int(os.environ.get("PROFILING_RING_SIZE", 50))
+PROFILING_TOP_FUNCTIONS = int(os.environ.get("PROFILING_TOP_FUNCTIONS", 40))
+
+# Application logging (the api.* loggers). LOG_LEVEL applies to all of them,
+# INFO by default even with DEBUG on, so tests and runserver stay readable;
+# LOG_LEVELS overrides single modules, e.g. "api.views=DEBUG,api.signals=WARNING".
+# LOG_DEBUG_SAMPLE_RATE keeps that fraction of DEBUG records (1 = all), so
+# debug detail can be switched on for a busy server.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = dict(
+    (name.strip(), level.strip().upper())
+    for name, _, level in (item.partition("=") for item in os.environ.get("LOG_LEVELS", "").split(","))
+    if name.strip() and level.strip()
+)
+LOG_DEBUG_SAMPLE_RATE = float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "1"))
+# "json" (one object per line) or "text"
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text" if DEBUG else "json")
+
+# Records are handed to a background thread (api/utils/log_queue.py), so a
+# request never waits on stdout/stderr
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "api.utils.json_log.JsonFormatter"},
+        "text": {"format": "%(asctime)s %(levelname)s %(name)s: %(message)s"},
+    },
+    "filters": {
+        "debug_sample": {"()": "api.utils.log_queue.DebugSampleFilter", "rate": LOG_DEBUG_SAMPLE_RATE},
+    },
+    "handlers": {
+        "json_console": {"()": "api.utils.log_queue.QueuedStreamHandler", "formatter": "json"},
+        "app_console": {
+            "()": "api.utils.log_queue.QueuedStreamHandler",
+            "formatter": LOG_FORMAT if LOG_FORMAT in ("json", "text") else "json",
+            "filters": ["debug_sample"],
+        },
+    },
+    "loggers": {
+        "api.requests": {"handlers": ["json_console"], "level": REQUEST_LOG_LEVEL, "propagate": False},
+        "api": {"handlers": ["app_console"], "level": LOG_LEVEL, "propagate": False},
+        **{name: {"level": level} for name, level in LOG_LEVELS.items()},
+    },
+}
+
 # ---------------------------------------------------------
 # CORS & CSRF
 # ---------------------------------------------------------
@@ -332,6 +582,30 @@ EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "happyphhomes@gmail.com")
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", f"Happy Homes <{EMAIL_HOST_USER}>")
 
+# ---------------------------------------------------------
+# RECAPTCHA (/api/verify-captcha/)
+# ---------------------------------------------------------
+RECAPTCHA_SECRET_KEY = os.environ.get("RECAPTCHA_SECRET_KEY", "")
+RECAPTCHA_VERIFY_URL = os.environ.get("RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify")
+# Per attempt: seconds to connect, and to wait for the answer once connected
+RECAPTCHA_CONNECT_TIMEOUT = float(os.environ.get("RECAPTCHA_CONNECT_TIMEOUT", "2"))
+RECAPTCHA_READ_TIMEOUT = float(os.environ.get("RECAPTCHA_READ_TIMEOUT", "5"))
+# Extra attempts after a timeout, connection error or 5xx/429, with jittered
+# exponential backoff starting at RECAPTCHA_RETRY_BACKOFF seconds
+RECAPTCHA_RETRIES = int(os.environ.get("RECAPTCHA_RETRIES", "2"))
+RECAPTCHA_RETRY_BACKOFF = float(os.environ.get("RECAPTCHA_RETRY_BACKOFF", "0.25"))
+# Verifications in a row that could not reach Google before calls stop for
+# RECAPTCHA_BREAKER_RESET_SECONDS (per worker process)
+RECAPTCHA_BREAKER_THRESHOLD = int(os.environ.get("RECAPTCHA_BREAKER_THRESHOLD", "5"))
+RECAPTCHA_BREAKER_RESET_SECONDS = float(os.environ.get("RECAPTCHA_BREAKER_RESET_SECONDS", "30"))
+# While Google is unreachable: True accepts the token, False answers 503
+RECAPTCHA_FAIL_OPEN = os.environ.get("RECAPTCHA_FAIL_OPEN", "False").lower() == "true"
+# How long a used or rejected token is refused without asking Google again
+# (a token itself lives 2 minutes)
+RECAPTCHA_TOKEN_CACHE_SECONDS = int(os.environ.get("RECAPTCHA_TOKEN_CACHE_SECONDS", "120"))
+# Keep-alive connections to Google per worker process
+RECAPTCHA_POOL_SIZE = int(os.environ.get("RECAPTCHA_POOL_SIZE", "10"))
+
 # ---------------------------------------------------------
 # FRONTEND URL
 # ---------------------------------------------------------
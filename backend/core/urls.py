@@ -22,9 +22,16 @@ from django.conf.urls.static import static
 
 from api import views 
 from api.views import UserHistoryListView, active_visitors, api_root
+from api.metrics import metrics_view
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
+# Served by their async versions when running under ASGI (see core/asgi.py)
+if settings.ASYNC_IO_VIEWS:
+    from api import async_views as io_views
+else:
+    io_views = views
+
 @csrf_exempt
 def simple_api_root(request):
     """Simple fallback API root that doesn't use DRF"""
@@ -44,13 +51,14 @@ urlpatterns = [
     # Fallback route (commented out - use if api_root fails)
     # path('', simple_api_root, name='simple_api_root'),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('admin/users/', views.admin_user_list, name='admin_user_list'),
     path('admin/users/<int:pk>/', views.admin_user_detail, name='admin_user_detail'),
     path('api/', include('api.urls')),  # your api app URLs
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/register/', views.register, name='register'),
-    path('api/verify-captcha/', views.verify_recaptcha, name='verify_recaptcha'),
+    path('api/verify-captcha/', io_views.verify_recaptcha, name='verify_recaptcha'),
     path("api/user-history/", UserHistoryListView.as_view(), name="user-history"),
     path('api/admin/pending-verifications/', views.pending_verifications, name='pending_verifications'),
     path('api/admin/verify-user/<int:user_id>/', views.verify_user, name='verify_user'),
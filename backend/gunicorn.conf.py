@@ -0,0 +1,23 @@
+"""
+gunicorn settings, read from the working directory (backend/), so the start
+command is just ``gunicorn --bind 0.0.0.0:$PORT``.
+
+SERVER_MODE selects how the app is served:
+    wsgi (default)  core.wsgi:application on sync workers
+    asgi            core.asgi:application on uvicorn workers - async versions
+                    of the I/O-bound endpoints and the SSE stream at /api/events/
+
+The worker count is gunicorn's own WEB_CONCURRENCY (default 1); keep it the
+same when comparing the two modes (manage.py benchmark_modes).
+"""
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'core.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif SERVER_MODE == 'wsgi':
+    wsgi_app = 'core.wsgi:application'
+else:
+    raise ValueError(f"SERVER_MODE must be 'wsgi' or 'asgi', not {SERVER_MODE!r}")
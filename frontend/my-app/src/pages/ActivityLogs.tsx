@@ -1,5 +1,5 @@
 // src/pages/ActivityLog.tsx
-import React, { useEffect, useState, useMemo } from "react";
+import React, { useEffect, useState } from "react";
 import axios from "axios";
 import { ToastContainer, toast } from "react-toastify";
 import "react-toastify/dist/ReactToastify.css";
@@ -25,82 +25,87 @@ const historyTypeMap: Record<string, string> = {
   "-": "Deleted",
 };
 
+interface HistoryPage {
+  next: string | null;
+  previous: string | null;
+  results: HistoryRecord[];
+}
+
 const ActivityLog: React.FC = () => {
   const navigate = useNavigate();
   const [records, setRecords] = useState<HistoryRecord[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
+  const [loadedOnce, setLoadedOnce] = useState<boolean>(false);
   const [filterModel, setFilterModel] = useState<string>("all"); // "all" or specific model name
   const [filterUser, setFilterUser] = useState<string>("all"); // "all" or specific user
+  // Filter options come from the whole log, not just the page on screen
+  const [modelOptions, setModelOptions] = useState<string[]>([]);
+  const [userOptions, setUserOptions] = useState<string[]>([]);
+  // Cursor paging: pageUrl is null for the first page of the current filters
+  const [pageUrl, setPageUrl] = useState<string | null>(null);
+  const [pageNumber, setPageNumber] = useState<number>(1);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [previousUrl, setPreviousUrl] = useState<string | null>(null);
+
+  useEffect(() => {
+    const fetchFilters = async () => {
+      try {
+        const res = await axios.get(`${API_URL}/user-history/filters/`, {
+          withCredentials: true,
+        });
+        setModelOptions(res.data.models || []);
+        setUserOptions(res.data.users || []);
+      } catch (err: any) {
+        console.error("Failed to fetch activity log filters", err);
+      }
+    };
+    fetchFilters();
+  }, []);
 
   useEffect(() => {
     const fetchHistory = async () => {
       try {
         setLoading(true);
-        // Fetch all records from backend
-        const res = await axios.get(`${API_URL}/user-history/`, {
+        // Filtering and ordering happen on the server; next/previous links keep the filters
+        const params = new URLSearchParams();
+        if (filterModel !== "all") params.set("model", filterModel);
+        if (filterUser !== "all") params.set("user", filterUser);
+        const res = await axios.get<HistoryPage>(pageUrl || `${API_URL}/user-history/?${params.toString()}`, {
           withCredentials: true,
         });
-        
-        // Ensure we get an array of records
-        const data = Array.isArray(res.data) ? res.data : (res.data.results || []);
-        
-        if (data.length === 0) {
-          toast.info("No activity records found");
-        } else {
-          toast.success(`Loaded ${data.length} activity records`);
-        }
-        
-        setRecords(data);
+
+        setRecords(res.data.results || []);
+        setNextUrl(res.data.next);
+        setPreviousUrl(res.data.previous);
       } catch (err: any) {
         console.error("Failed to fetch history", err);
         const errorMessage = err.response?.data?.detail || err.response?.data?.message || "Failed to fetch activity log";
         toast.error(errorMessage);
         setRecords([]); // Set empty array on error
+        setNextUrl(null);
+        setPreviousUrl(null);
       } finally {
         setLoading(false);
+        setLoadedOnce(true);
       }
     };
     fetchHistory();
-  }, []);
-
-  // Get unique values for filters
-  const uniqueModels = useMemo(() => {
-    return Array.from(new Set(records.map(r => r.model_name))).sort();
-  }, [records]);
-
-  const uniqueUsers = useMemo(() => {
-    return Array.from(new Set(records.map(r => r.history_user || "System").filter(Boolean))).sort();
-  }, [records]);
+  }, [pageUrl, filterModel, filterUser]);
 
-  // Filter and sort records based on selected filters - using useMemo to ensure reactivity
-  const filteredRecords = useMemo(() => {
-    // Start with all records
-    let result = records;
+  const changeFilters = (model: string, user: string) => {
+    setFilterModel(model);
+    setFilterUser(user);
+    setPageUrl(null);
+    setPageNumber(1);
+  };
 
-    // Apply Model filter - must match exactly (case-sensitive)
-    if (filterModel && filterModel !== "all") {
-      result = result.filter((record) => {
-        return record.model_name && record.model_name === filterModel;
-      });
-    }
+  const goToPage = (url: string | null, step: number) => {
+    if (!url) return;
+    setPageUrl(url);
+    setPageNumber((page) => page + step);
+  };
 
-    // Apply User filter - must match exactly (case-sensitive)
-    if (filterUser && filterUser !== "all") {
-      result = result.filter((record) => {
-        const userName = record.history_user || "System";
-        return userName === filterUser;
-      });
-    }
-
-    // Sort by date (newest first)
-    return [...result].sort((a, b) => {
-      const dateA = new Date(a.history_date).getTime();
-      const dateB = new Date(b.history_date).getTime();
-      return dateB - dateA; // Descending order (newest first)
-    });
-  }, [records, filterModel, filterUser]);
-
-  if (loading) {
+  if (loading && !loadedOnce) {
     return (
       <div className="dashboard-layout">
         <Sidebar />
@@ -145,24 +150,24 @@ const ActivityLog: React.FC = () => {
             {/* Stats Cards */}
             <div className="stats-cards">
               <div className="stat-card">
-                <div className="stat-value">{records.length}</div>
-                <div className="stat-label">Total Records</div>
+                <div className="stat-value">{pageNumber}</div>
+                <div className="stat-label">Page</div>
               </div>
               <div className="stat-card">
                 <div className="stat-value" style={{ color: '#2e6F40' }}>
-                  {filteredRecords.length}
+                  {records.length}
                 </div>
-                <div className="stat-label">Filtered Results</div>
+                <div className="stat-label">Records on Page</div>
               </div>
               <div className="stat-card">
                 <div className="stat-value" style={{ color: '#007bff' }}>
-                  {uniqueModels.length}
+                  {modelOptions.length}
                 </div>
                 <div className="stat-label">Models</div>
               </div>
               <div className="stat-card">
                 <div className="stat-value" style={{ color: '#6c757d' }}>
-                  {uniqueUsers.length}
+                  {userOptions.length}
                 </div>
                 <div className="stat-label">Users</div>
               </div>
@@ -175,10 +180,10 @@ const ActivityLog: React.FC = () => {
                 <label>Filter by Model:</label>
                 <select
                   value={filterModel}
-                  onChange={(e) => setFilterModel(e.target.value)}
+                  onChange={(e) => changeFilters(e.target.value, filterUser)}
                 >
                   <option value="all">All Models</option>
-                  {uniqueModels.map((model) => (
+                  {modelOptions.map((model) => (
                     <option key={model} value={model}>
                       {model}
                     </option>
@@ -191,10 +196,10 @@ const ActivityLog: React.FC = () => {
                 <label>Filter by User:</label>
                 <select
                   value={filterUser}
-                  onChange={(e) => setFilterUser(e.target.value)}
+                  onChange={(e) => changeFilters(filterModel, e.target.value)}
                 >
                   <option value="all">All Users</option>
-                  {uniqueUsers.map((user) => (
+                  {userOptions.map((user) => (
                     <option key={user} value={user}>
                       {user}
                     </option>
@@ -206,10 +211,7 @@ const ActivityLog: React.FC = () => {
               {(filterModel !== "all" || filterUser !== "all") && (
                 <div className="filter-group">
                   <button
-                    onClick={() => {
-                      setFilterModel("all");
-                      setFilterUser("all");
-                    }}
+                    onClick={() => changeFilters("all", "all")}
                     style={{
                       padding: "10px 20px",
                       backgroundColor: "#6c757d",
@@ -238,7 +240,8 @@ const ActivityLog: React.FC = () => {
               borderRadius: '8px',
               boxShadow: '0 2px 4px rgba(0,0,0,0.1)'
             }}>
-              Showing <strong>{filteredRecords.length}</strong> of <strong>{records.length}</strong> records
+              Showing <strong>{records.length}</strong> records on page <strong>{pageNumber}</strong>
+              {loading && " (loading...)"}
             </div>
 
           <div className="activity-log-table-container">
@@ -253,7 +256,7 @@ const ActivityLog: React.FC = () => {
                 </tr>
               </thead>
               <tbody>
-                {filteredRecords.length === 0 ? (
+                {records.length === 0 ? (
                   <tr>
                     <td colSpan={5} style={{ 
                       textAlign: 'center', 
@@ -269,7 +272,7 @@ const ActivityLog: React.FC = () => {
                     </td>
                   </tr>
                 ) : (
-                  filteredRecords.map((record, index) => {
+                  records.map((record, index) => {
                     const dateObj = new Date(record.history_date);
                     // Create a unique key by combining id, model_name, and history_date to avoid duplicates
                     const uniqueKey = `${record.id}-${record.model_name}-${record.history_date}-${index}`;
@@ -306,6 +309,38 @@ const ActivityLog: React.FC = () => {
               </tbody>
             </table>
           </div>
+
+          {/* Pagination */}
+          <div style={{
+            display: 'flex',
+            justifyContent: 'center',
+            alignItems: 'center',
+            gap: '15px',
+            marginTop: '20px'
+          }}>
+            {[
+              { label: "← Previous", url: previousUrl, step: -1 },
+              { label: "Next →", url: nextUrl, step: 1 },
+            ].map(({ label, url, step }) => (
+              <button
+                key={label}
+                onClick={() => goToPage(url, step)}
+                disabled={!url || loading}
+                style={{
+                  padding: "10px 20px",
+                  backgroundColor: url && !loading ? "#2e6F40" : "#ccc",
+                  color: "white",
+                  border: "none",
+                  borderRadius: "6px",
+                  cursor: url && !loading ? "pointer" : "not-allowed",
+                  fontSize: "14px",
+                  fontWeight: "500"
+                }}
+              >
+                {label}
+              </button>
+            ))}
+          </div>
           </div>
         </main>
       </div>
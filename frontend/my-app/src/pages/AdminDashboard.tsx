@@ -72,13 +72,14 @@ const AdminDashboard: React.FC = () => {
         const [
           visitorsRes,
           housesRes,
-          pendingVerificationsRes,
+          adminStatsRes,
           serviceFeeRes,
           maintenanceRequestsRes,
         ] = await Promise.all([
           fetch(`${API_URL}/admin/visitors/`, { headers: authHeaders }).catch(() => null),
           fetch(`${API_URL}/houses/`, { headers: authHeaders }).catch(() => null),
-          fetch(`${API_URL}/admin/pending-verifications/`, { headers: authHeaders }).catch(() => null),
+          // The verification queue is cursor-paginated (no count); the stats endpoint has the total
+          fetch(`${API_URL}/admin/stats/`, { headers: authHeaders }).catch(() => null),
           fetch(`${API_URL}/service-fees/`, { headers: authHeaders }).catch(() => null),
           fetch(`${API_URL}/maintenance-requests/`, { headers: authHeaders }).catch(() => null),
         ]);
@@ -95,7 +96,7 @@ const AdminDashboard: React.FC = () => {
 
         const visitorsData = await getJsonData(visitorsRes);
         const housesData = await getJsonData(housesRes);
-        const pendingVerificationsData = await getJsonData(pendingVerificationsRes);
+        const adminStatsData = await getJsonData(adminStatsRes);
         const serviceFeeData = await getJsonData(serviceFeeRes);
         const maintenanceRequestsData = await getJsonData(maintenanceRequestsRes);
 
@@ -110,7 +111,7 @@ const AdminDashboard: React.FC = () => {
         setAdditionalStats({
           visitorsCount: getCount(visitorsData),
           saleRentCount: getCount(housesData),
-          pendingVerificationsCount: getCount(pendingVerificationsData),
+          pendingVerificationsCount: adminStatsData?.users?.pending_verification ?? 0,
           serviceFeeCount: getCount(serviceFeeData),
           maintenanceRequestsCount: getCount(maintenanceRequestsData),
         });
@@ -11,6 +11,7 @@ import Sidebar from './Sidebar';
 import axios from 'axios';
 import { getToken } from '../utils/auth';
 import API_URL from '../utils/config';
+import { fetchAllPages } from '../utils/pagination';
 import DeleteIcon from '@mui/icons-material/Delete';
 import EditIcon from '@mui/icons-material/Edit';
 import AddIcon from '@mui/icons-material/Add';
@@ -36,6 +37,8 @@ interface ServiceFee {
   amount?: string;
   due_date?: string;
   status: 'unpaid' | 'paid' | 'delayed';
+  // Stored status, with overdue unpaid bills reported as delayed
+  effective_status?: 'unpaid' | 'paid' | 'delayed';
   month?: string;
   year?: number;
   notes?: string;
@@ -98,8 +101,7 @@ const AdminServiceFee: React.FC = () => {
         headers.Authorization = `Bearer ${token}`;
       }
       // Fetch verified homeowners (non-admin users)
-      const response = await axios.get(`${API_URL}/admin/users/`, { headers });
-      const users = Array.isArray(response.data) ? response.data : (response.data.results || []);
+      const users = await fetchAllPages(`${API_URL}/admin/users/?page_size=500`, { headers });
       // Filter to only verified, non-admin users
       const verifiedHomeowners = users
         .filter((user: any) => !user.is_staff && (user.profile?.is_verified || user.is_verified))
@@ -706,9 +708,9 @@ const AdminServiceFee: React.FC = () => {
                       <td>
                         <span
                           className="status-badge"
-                          style={{ backgroundColor: getStatusColor(serviceFee.status) }}
+                          style={{ backgroundColor: getStatusColor(serviceFee.effective_status ?? serviceFee.status) }}
                         >
-                          {serviceFee.status.toUpperCase()}
+                          {(serviceFee.effective_status ?? serviceFee.status).toUpperCase()}
                         </span>
                       </td>
                       <td>
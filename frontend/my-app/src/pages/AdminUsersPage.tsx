@@ -111,23 +111,34 @@ const AdminUsersPage: React.FC = () => {
       return;
     }
     try {
-      const res = await fetch('https://caps-em1t.onrender.com/api/admin/users/', {
-        headers: { Authorization: `Bearer ${currentToken}` },
-      });
-      if (res.status === 401) {
+      // Cursor-paginated: follow `next` until every user is loaded
+      const allUsers: User[] = [];
+      let nextUrl: string | null = 'https://caps-em1t.onrender.com/api/admin/users/?page_size=500';
+      while (nextUrl) {
+        const res: Response = await fetch(nextUrl, {
+          headers: { Authorization: `Bearer ${currentToken}` },
+        });
+        if (res.status === 401) {
+          const data = await res.json();
+          if (data.detail?.includes('token')) {
+            toast.error('Session expired. Please login again.');
+            localStorage.removeItem('access');
+            navigate('/login');
+          } else {
+            toast.error('Unauthorized: Admin only');
+          }
+          setLoading(false);
+          return;
+        }
         const data = await res.json();
-        if (data.detail?.includes('token')) {
-          toast.error('Session expired. Please login again.');
-          localStorage.removeItem('access');
-          navigate('/login');
-        } else {
-          toast.error('Unauthorized: Admin only');
+        if (Array.isArray(data)) {
+          allUsers.push(...data);
+          break;
         }
-        setLoading(false);
-        return;
+        allUsers.push(...(data.results || []));
+        nextUrl = data.next || null;
       }
-      const data = await res.json();
-      setUsers(data);
+      setUsers(allUsers);
     } catch (err) {
       console.error('Error fetching users:', err);
       toast.error('Failed to fetch users');
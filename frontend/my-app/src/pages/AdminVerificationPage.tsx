@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from "react";
 import axios from "axios";
 import { getToken, logout } from "../utils/auth";
+import { fetchAllPages } from "../utils/pagination";
 import { useNavigate, Link } from "react-router-dom";
 import Footer from "./Footer";
 import logo from '../images/logo.png';
@@ -30,10 +31,10 @@ const AdminVerificationPage: React.FC = () => {
   const fetchPendingUsers = async () => {
     try {
       setLoading(true);
-      const res = await axios.get("https://caps-em1t.onrender.com/api/admin/pending-verifications/", {
+      const users = await fetchAllPages<PendingUser>("https://caps-em1t.onrender.com/api/admin/pending-verifications/?page_size=500", {
         headers: { Authorization: `Bearer ${token}` },
       });
-      setPendingUsers(res.data);
+      setPendingUsers(users);
     } catch (err) {
       console.error(err);
       logout();
@@ -24,6 +24,8 @@ interface ServiceFee {
   amount?: string;
   due_date?: string;
   status: 'unpaid' | 'paid' | 'delayed';
+  // Stored status, with overdue unpaid bills reported as delayed
+  effective_status?: 'unpaid' | 'paid' | 'delayed';
   month?: string;
   year?: number;
   notes?: string;
@@ -113,22 +115,7 @@ const Billing: React.FC = () => {
 
       const data = Array.isArray(response.data) ? response.data : (response.data.results || []);
       
-      // Automatically mark bills as delayed if past due date
-      const updatedData = data.map((fee: ServiceFee) => {
-        if (fee.status === 'unpaid' && fee.due_date) {
-          const dueDate = new Date(fee.due_date);
-          const today = new Date();
-          today.setHours(0, 0, 0, 0);
-          dueDate.setHours(0, 0, 0, 0);
-          
-          if (dueDate < today) {
-            return { ...fee, status: 'delayed' as const };
-          }
-        }
-        return fee;
-      });
-      
-      setServiceFees(updatedData);
+      setServiceFees(data);
     } catch (err: any) {
       console.error('Error fetching service fees:', err);
       if (err.code === 'ECONNABORTED') {
@@ -147,6 +134,8 @@ const Billing: React.FC = () => {
     }
   };
 
+  const displayStatus = (fee: ServiceFee) => fee.effective_status ?? fee.status;
+
   const getStatusIcon = (status: string) => {
     switch (status) {
       case 'paid':
@@ -262,9 +251,9 @@ const Billing: React.FC = () => {
     });
   };
 
-  const unpaidCount = serviceFees.filter((fee) => fee.status === 'unpaid').length;
-  const delayedCount = serviceFees.filter((fee) => fee.status === 'delayed').length;
-  const paidCount = serviceFees.filter((fee) => fee.status === 'paid').length;
+  const unpaidCount = serviceFees.filter((fee) => displayStatus(fee) === 'unpaid').length;
+  const delayedCount = serviceFees.filter((fee) => displayStatus(fee) === 'delayed').length;
+  const paidCount = serviceFees.filter((fee) => displayStatus(fee) === 'paid').length;
 
   return (
     <>
@@ -345,10 +334,10 @@ const Billing: React.FC = () => {
                           <td>
                             <span
                               className="status-badge"
-                              style={{ backgroundColor: getStatusColor(serviceFee.status) }}
+                              style={{ backgroundColor: getStatusColor(displayStatus(serviceFee)) }}
                             >
-                              {getStatusIcon(serviceFee.status)}
-                              <span>{serviceFee.status.toUpperCase()}</span>
+                              {getStatusIcon(displayStatus(serviceFee))}
+                              <span>{displayStatus(serviceFee).toUpperCase()}</span>
                             </span>
                           </td>
                           <td>
@@ -0,0 +1,15 @@
+import axios from 'axios';
+
+// Cursor-paginated listings ({ next, previous, results }) have no page count;
+// follow `next` until the last page. Bare arrays are returned as-is.
+export const fetchAllPages = async <T = any>(url: string, config: any = {}): Promise<T[]> => {
+  const items: T[] = [];
+  let nextUrl: string | null = url;
+  while (nextUrl) {
+    const response: { data: any } = await axios.get(nextUrl, config);
+    if (Array.isArray(response.data)) return response.data;
+    items.push(...(response.data.results || []));
+    nextUrl = response.data.next || null;
+  }
+  return items;
+};